@@ -0,0 +1 @@
+"""Performance benchmarks of the integration, run against an emulated controller."""
@@ -0,0 +1,11 @@
+"""Run the benchmark suite: `python -m benchmarks [pytest options]`.
+
+The same as `python -m pytest benchmarks`; `--update-baselines` records the
+results as the new baselines.
+"""
+
+import sys
+
+import pytest
+
+sys.exit(pytest.main(["benchmarks", "-p", "no:sugar", *sys.argv[1:]]))
@@ -0,0 +1,86 @@
+"""Benchmark metrics and the JSON baselines they are compared against.
+
+A baseline file holds, per metric, the recorded value, its unit and
+optionally its own `tolerance`: the growth over the recorded value, as a
+fraction of it, beyond which the metric counts as regressed. Metrics
+without one use the default of their unit. Lower is better for every
+metric; one that improved is never a failure, record it with
+`--update-baselines` to tighten the bound.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import platform
+from typing import Any
+
+BASELINES = Path(__file__).parent / "baselines"
+
+# Timings are noisy: on a shared machine whole runs come out half as slow
+# again as others, so only a doubling is flagged reliably. Byte counts and
+# allocations are close to deterministic and get a tighter bound.
+DEFAULT_TOLERANCE = 1.0
+TOLERANCES = {"kib": 0.2, "bytes": 0.1, "count": 0.1}
+
+
+@dataclass
+class Metric:
+    """One measured value and its unit."""
+
+    value: float
+    unit: str
+
+
+def regressions(
+    metrics: dict[str, Metric], recorded: dict[str, dict[str, Any]]
+) -> list[str]:
+    """Describe every metric that exceeds its recorded value plus tolerance."""
+    found = []
+    for name, metric in metrics.items():
+        entry = recorded.get(name)
+        if entry is None:
+            continue
+        tolerance = entry.get(
+            "tolerance", TOLERANCES.get(metric.unit, DEFAULT_TOLERANCE)
+        )
+        limit = entry["value"] * (1 + tolerance)
+        if metric.value > limit:
+            found.append(
+                f"{name}: {metric.value:.3f} {metric.unit} > {limit:.3f} "
+                f"(baseline {entry['value']} + {tolerance:.0%})"
+            )
+    return found
+
+
+def load(name: str) -> dict[str, dict[str, Any]] | None:
+    """Return the recorded metrics of baseline `name`, if it exists."""
+    path = BASELINES / f"{name}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))["metrics"]
+
+
+def record(name: str, metrics: dict[str, Metric]) -> None:
+    """Store `metrics` as baseline `name`, keeping hand-set tolerances."""
+    previous = load(name) or {}
+    stored: dict[str, dict[str, Any]] = {}
+    for metric_name, metric in metrics.items():
+        entry: dict[str, Any] = {"value": round(metric.value, 3), "unit": metric.unit}
+        if "tolerance" in previous.get(metric_name, {}):
+            entry["tolerance"] = previous[metric_name]["tolerance"]
+        stored[metric_name] = entry
+    BASELINES.mkdir(exist_ok=True)
+    (BASELINES / f"{name}.json").write_text(
+        json.dumps(
+            {
+                "machine": f"{platform.machine()} {platform.system()}, "
+                f"Python {platform.python_version()}",
+                "metrics": stored,
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
@@ -0,0 +1,142 @@
+"""Fixtures of the benchmark suite: the emulated controller and the baselines.
+
+Benchmarks are not part of the test run (`testpaths` is `tests`); run them
+explicitly with `python -m pytest benchmarks` or `python -m benchmarks`.
+Each benchmark measures a set of metrics and hands them to the `baseline`
+fixture, which compares them against the JSON file of the same name in
+`baselines/` and fails the benchmark when one regressed beyond its
+tolerance (see baseline.py).
+
+Timings depend on the machine, so the committed baselines are only
+meaningful on a machine comparable to the one they were recorded on.
+Record your own before changing anything with `--update-baselines`, and
+compare against those.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import json
+from pathlib import Path
+
+import pytest
+
+from custom_components.luxtronik2.update import LuxtronikUpdateEntity
+from tests.conftest import (
+    DEFAULT_CALCULATIONS,
+    DEFAULT_PARAMETERS,
+    DEFAULT_VISIBILITIES,
+)
+from tools.luxtronik_emulator import (
+    LuxtronikEmulator,
+    blocks_from_dump,
+    blocks_from_values,
+)
+
+from . import baseline as baseline_file
+from .baseline import Metric
+
+_RESULTS = pytest.StashKey[dict[str, dict[str, Metric]]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="record the measured metrics as the new baselines",
+    )
+    parser.addoption(
+        "--dump",
+        type=Path,
+        help="serve the registers of this diagnostics download instead of the "
+        "test suite's values (compare against baselines recorded with it)",
+    )
+    parser.addoption(
+        "--session",
+        type=Path,
+        help="replay this session log through the integration "
+        "(test_session_replay.py; compare against baselines recorded with it)",
+    )
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    """List every measured metric after the run."""
+    results = config.stash.get(_RESULTS, {})
+    if not results:
+        return
+    terminalreporter.section("benchmark results")
+    for name, metrics in results.items():
+        for metric_name, metric in metrics.items():
+            terminalreporter.write_line(
+                f"{f'{name}.{metric_name}':<44} {metric.value:>10.3f} {metric.unit}"
+            )
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components in every benchmark."""
+
+
+@pytest.fixture(autouse=True)
+def no_firmware_check(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the update entity's firmware check off the internet.
+
+    It is not part of a poll, the harness cannot reach the download portal,
+    and a failed lookup would only add its error handling to the setup time.
+    """
+
+    async def _unavailable(self: LuxtronikUpdateEntity) -> None:
+        return None
+
+    monkeypatch.setattr(
+        LuxtronikUpdateEntity, "_request_available_firmware_version", _unavailable
+    )
+
+
+@pytest.fixture
+def register_blocks(request: pytest.FixtureRequest) -> dict[str, list[int]]:
+    """Full-size raw blocks: the test suite's values, or those of `--dump`."""
+    dump: Path | None = request.config.getoption("--dump")
+    if dump is not None:
+        return blocks_from_dump(json.loads(dump.read_text(encoding="utf-8")))
+    return blocks_from_values(
+        DEFAULT_PARAMETERS, DEFAULT_CALCULATIONS, DEFAULT_VISIBILITIES
+    )
+
+
+@pytest.fixture
+def emulator(
+    socket_enabled: None, register_blocks: dict[str, list[int]]
+) -> Iterator[LuxtronikEmulator]:
+    """A controller serving `register_blocks`.
+
+    Requests `socket_enabled`: the client talks to it over real loopback
+    sockets, which the test harness blocks by default.
+    """
+    with LuxtronikEmulator(register_blocks) as running:
+        yield running
+
+
+@pytest.fixture
+def baseline(
+    request: pytest.FixtureRequest,
+) -> Callable[[str, dict[str, Metric]], None]:
+    """Compare metrics against `baselines/<name>.json`, or record them there.
+
+    A baseline that does not exist yet is recorded rather than compared.
+    """
+    update = request.config.getoption("--update-baselines")
+    results = request.config.stash.setdefault(_RESULTS, {})
+
+    def check(name: str, metrics: dict[str, Metric]) -> None:
+        results[name] = metrics
+        recorded = baseline_file.load(name)
+        if update or recorded is None:
+            baseline_file.record(name, metrics)
+            return
+        regressed = baseline_file.regressions(metrics, recorded)
+        assert not regressed, "Regressed against the baseline:\n" + "\n".join(regressed)
+
+    return check
@@ -0,0 +1,227 @@
+"""Microbenchmarks of the functions every poll calls per entity or per register.
+
+They run on full-size register blocks parsed by the library with the
+integration's overrides applied, the same objects a poll produces, and
+iterate over the keys the predefined entity tables actually read - so a
+per-call time here, multiplied by the entity count, is what the function
+costs a poll. Each metric is the best of several repeats, in microseconds
+per call.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import logging
+import timeit
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant.const import CONF_HOST, CONF_PORT
+from luxtronik.datatypes import Base
+import pytest
+
+from custom_components.luxtronik2 import lux_overrides
+from custom_components.luxtronik2.binary_sensor_entities_predefined import (
+    BINARY_SENSORS,
+)
+from custom_components.luxtronik2.common import (
+    _derive_operation_mode,
+    get_sensor_data,
+    key_exists,
+    normalize_sensor_value,
+    read_smart_grid_inputs,
+)
+from custom_components.luxtronik2.const import DEFAULT_PORT, LuxCalculation as LC
+from custom_components.luxtronik2.coordinator import (
+    LuxtronikCoordinator,
+    apply_library_overrides,
+)
+from custom_components.luxtronik2.diagnostics import _dump_items, _substitute
+from custom_components.luxtronik2.lux_helper import Luxtronik
+from custom_components.luxtronik2.model import (
+    LuxtronikCoordinatorData,
+    LuxtronikEntityDescription,
+)
+from custom_components.luxtronik2.number_entities_predefined import NUMBER_SENSORS
+from custom_components.luxtronik2.select_entities_predefined import SELECT_ENTITIES
+from custom_components.luxtronik2.sensor_entities_predefined import (
+    SENSORS,
+    SENSORS_STATUS,
+)
+from custom_components.luxtronik2.switch_entities_predefined import SWITCHES
+
+from .baseline import Metric
+
+REPEATS = 5
+# Target duration of one repeat; the loop count is calibrated to it.
+REPEAT_SECONDS = 0.05
+
+_DESCRIPTIONS: list[LuxtronikEntityDescription] = [
+    *SENSORS,
+    *SENSORS_STATUS,
+    *BINARY_SENSORS,
+    *NUMBER_SENSORS,
+    *SELECT_ENTITIES,
+    *SWITCHES,
+]
+
+
+def _per_call(function: Callable[[], Any], calls: int = 1) -> float:
+    """Best time of `function` over `REPEATS`, in microseconds per call.
+
+    `calls` is how many calls one invocation of `function` makes, for the
+    benchmarks that loop over a key list.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    number = max(1, int(number * REPEAT_SECONDS / 0.2))
+    return min(timer.repeat(REPEATS, number)) / number / calls * 1_000_000
+
+
+@pytest.fixture
+def data(register_blocks: dict[str, list[int]]) -> LuxtronikCoordinatorData:
+    """The register blocks as a poll leaves them in the coordinator."""
+    apply_library_overrides()
+    client = Luxtronik("127.0.0.1", DEFAULT_PORT, 1, 10000, safe=False)
+    client.restore(register_blocks)
+    return LuxtronikCoordinatorData(
+        parameters=client.parameters,
+        calculations=client.calculations,
+        visibilities=client.visibilities,
+    )
+
+
+@pytest.fixture
+def coordinator(data: LuxtronikCoordinatorData) -> LuxtronikCoordinator:
+    hass = MagicMock()
+    with patch("homeassistant.helpers.frame.report_usage"):
+        coordinator = LuxtronikCoordinator(
+            hass=hass,
+            client=MagicMock(),
+            config={CONF_HOST: "127.0.0.1", CONF_PORT: DEFAULT_PORT},
+        )
+    coordinator.data = data
+    return coordinator
+
+
+@pytest.fixture(autouse=True)
+def quiet_integration_logger() -> Iterator[None]:
+    """Keep log formatting out of the timings, whatever the debug settings."""
+    logger = logging.getLogger("custom_components.luxtronik2")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    yield
+    logger.setLevel(level)
+
+
+def _entity_keys() -> list[str]:
+    """Every distinct plain register key the predefined entities read."""
+    keys = {
+        str(description.luxtronik_key)
+        for description in _DESCRIPTIONS
+        if "." in str(description.luxtronik_key)
+        and "{" not in str(description.luxtronik_key)
+    }
+    return sorted(keys)
+
+
+def _override_values(
+    data: LuxtronikCoordinatorData, blocks: dict[str, list[int]]
+) -> list[tuple[Base, int]]:
+    """(datatype, raw value) of every register typed by lux_overrides."""
+    override_types = tuple(
+        value
+        for value in vars(lux_overrides).values()
+        if isinstance(value, type)
+        and issubclass(value, Base)
+        and value.__module__ == lux_overrides.__name__
+    )
+    return [
+        (item, blocks[block][index])
+        for block, items in (
+            ("parameters", data.parameters.parameters),
+            ("calculations", data.calculations.calculations),
+        )
+        for index, item in items.items()
+        if isinstance(item, override_types) and index < len(blocks[block])
+    ]
+
+
+def test_hot_functions(
+    register_blocks: dict[str, list[int]],
+    data: LuxtronikCoordinatorData,
+    coordinator: LuxtronikCoordinator,
+    baseline: Callable[[str, dict[str, Metric]], None],
+) -> None:
+    keys = _entity_keys()
+    status = data.calculations.get(LC.C0080_STATUS.split(".", 1)[1])
+    assert status is not None
+    status_value = status.value
+
+    formulas = [
+        (get_sensor_data(data, description.luxtronik_key, raw_value=True), formula)
+        for description in _DESCRIPTIONS
+        if (formula := description.entity_active_formula) is not None
+    ]
+    overrides = _override_values(data, register_blocks)
+
+    payload = {
+        "parameters": _dump_items(data.parameters.parameters),
+        "calculations": _dump_items(data.calculations.calculations),
+        "visibilities": _dump_items(data.visibilities.visibilities),
+    }
+    substitutions = {
+        "123456_789": "0123456789",
+        "123456-789": "0123456789",
+        "127.0.0.1": "**REDACTED_HOST**",
+    }
+
+    def get_all() -> None:
+        for key in keys:
+            get_sensor_data(data, key)
+
+    def exists_all() -> None:
+        for key in keys:
+            key_exists(data, key)
+
+    def get_value_all() -> None:
+        for key in keys:
+            coordinator.get_value(key)
+
+    def formulas_all() -> None:
+        for value, formula in formulas:
+            coordinator._evaluate_visibility_formula(value, formula)
+
+    def from_heatpump_all() -> None:
+        for datatype, raw in overrides:
+            datatype.from_heatpump(raw)
+
+    baseline(
+        "hot_functions",
+        {
+            "get_sensor_data": Metric(_per_call(get_all, len(keys)), "us"),
+            "normalize_sensor_value_status": Metric(
+                _per_call(
+                    lambda: normalize_sensor_value(status_value, data, LC.C0080_STATUS)
+                ),
+                "us",
+            ),
+            "key_exists": Metric(_per_call(exists_all, len(keys)), "us"),
+            "derive_operation_mode": Metric(
+                _per_call(lambda: _derive_operation_mode(status_value, data)), "us"
+            ),
+            "read_smart_grid_inputs": Metric(
+                _per_call(lambda: read_smart_grid_inputs(data)), "us"
+            ),
+            "get_value": Metric(_per_call(get_value_all, len(keys)), "us"),
+            "evaluate_visibility_formula": Metric(
+                _per_call(formulas_all, len(formulas)), "us"
+            ),
+            "diagnostics_substitute": Metric(
+                _per_call(lambda: _substitute(payload, substitutions)), "us"
+            ),
+            "overrides_from_heatpump": Metric(
+                _per_call(from_heatpump_all, len(overrides)), "us"
+            ),
+        },
+    )
@@ -0,0 +1,224 @@
+"""End-to-end benchmarks of the poll cycle against an emulated controller.
+
+Everything from the socket upwards is real: `lux_helper.Luxtronik` reads
+from `tools/luxtronik_emulator.py` over loopback, and the coordinator and
+every platform run in a test Home Assistant. What a change to
+`lux_helper.py`, `common.py` or `base.py` costs shows up here as a change in
+poll latency, CPU time, event-loop blocking, allocations or fan-out time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+import contextlib
+import statistics
+import time
+import tracemalloc
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_TIMEOUT
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.luxtronik2.const import (
+    CONF_HA_SENSOR_PREFIX,
+    CONFIG_ENTRY_VERSION,
+    DOMAIN,
+    LuxPollStat,
+)
+from custom_components.luxtronik2.coordinator import LuxtronikCoordinator
+from tools.luxtronik_emulator import LuxtronikEmulator
+
+from .baseline import Metric
+
+POLLS = 30
+WARMUP_POLLS = 3
+WRITES = 10
+RELOADS = 3
+# Interval of the heartbeat that measures how long the event loop was blocked.
+HEARTBEAT = 0.001
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))]
+
+
+async def _setup(hass: HomeAssistant, emulator: LuxtronikEmulator) -> MockConfigEntry:
+    host, port = emulator.address
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CONFIG_ENTRY_VERSION,
+        data={
+            CONF_HOST: host,
+            CONF_PORT: port,
+            CONF_TIMEOUT: 5.0,
+            CONF_HA_SENSOR_PREFIX: DOMAIN,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    return entry
+
+
+async def _poll(hass: HomeAssistant, coordinator: LuxtronikCoordinator) -> None:
+    """One poll, including the fan-out slices that run after the refresh."""
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.last_update_success
+
+
+@contextlib.asynccontextmanager
+async def _loop_lag() -> AsyncIterator[list[float]]:
+    """Collect how late a 1 ms heartbeat woke up, i.e. how long the loop was busy."""
+    lags: list[float] = []
+    loop = asyncio.get_running_loop()
+
+    async def heartbeat() -> None:
+        while True:
+            started = loop.time()
+            await asyncio.sleep(HEARTBEAT)
+            lags.append(max(0.0, loop.time() - started - HEARTBEAT))
+
+    task = asyncio.create_task(heartbeat())
+    try:
+        yield lags
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+async def test_setup(
+    hass: HomeAssistant,
+    emulator: LuxtronikEmulator,
+    baseline: Callable[[str, dict[str, Metric]], None],
+) -> None:
+    """`async_setup_entry` with an empty store, then a reload reusing its plan."""
+    started = time.perf_counter()
+    entry = await _setup(hass, emulator)
+    cold = time.perf_counter() - started
+
+    reloads: list[float] = []
+    for _ in range(RELOADS):
+        started = time.perf_counter()
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        reloads.append(time.perf_counter() - started)
+
+    baseline(
+        "setup",
+        {
+            "setup_entry": Metric(cold * 1000, "ms"),
+            "reload_entry": Metric(min(reloads) * 1000, "ms"),
+        },
+    )
+
+
+async def test_poll_cycle(
+    hass: HomeAssistant,
+    emulator: LuxtronikEmulator,
+    baseline: Callable[[str, dict[str, Metric]], None],
+) -> None:
+    """Latency, CPU time, loop blocking and fan-out time of a poll.
+
+    CPU time is the whole process's: it includes the emulator's threads,
+    which only pack a few kilobytes per poll.
+    """
+    coordinator: LuxtronikCoordinator = (await _setup(hass, emulator)).runtime_data
+    for _ in range(WARMUP_POLLS):
+        await _poll(hass, coordinator)
+
+    latencies: list[float] = []
+    cpu: list[float] = []
+    async with _loop_lag() as lags:
+        for _ in range(POLLS):
+            started = time.perf_counter()
+            cpu_started = time.process_time()
+            await _poll(hass, coordinator)
+            cpu.append(time.process_time() - cpu_started)
+            latencies.append(time.perf_counter() - started)
+
+    fanout = coordinator.poll_stats.summary(LuxPollStat.FANOUT_TIME)
+    assert fanout is not None
+    baseline(
+        "poll_cycle",
+        {
+            "poll_latency_p50": Metric(_percentile(latencies, 50) * 1000, "ms"),
+            "poll_latency_p95": Metric(_percentile(latencies, 95) * 1000, "ms"),
+            "cpu_per_poll": Metric(statistics.mean(cpu) * 1000, "ms"),
+            "loop_blocked_max": Metric(max(lags) * 1000, "ms"),
+            "loop_blocked_p95": Metric(_percentile(lags, 95) * 1000, "ms"),
+            "fanout_time_p95": Metric((fanout["p95"] or 0) * 1000, "ms"),
+            "poll_bytes": Metric(
+                (coordinator.poll_stats.summary(LuxPollStat.POLL_BYTES) or {})["last"]
+                or 0,
+                "bytes",
+            ),
+        },
+    )
+
+
+async def test_poll_allocations(
+    hass: HomeAssistant,
+    emulator: LuxtronikEmulator,
+    baseline: Callable[[str, dict[str, Metric]], None],
+) -> None:
+    """Peak and retained allocations of a poll, traced by tracemalloc.
+
+    Kept apart from the timing benchmark: tracing slows every allocation
+    down. A retained size that grows with the number of polls is a leak.
+    """
+    coordinator: LuxtronikCoordinator = (await _setup(hass, emulator)).runtime_data
+    for _ in range(WARMUP_POLLS):
+        await _poll(hass, coordinator)
+
+    peaks: list[int] = []
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(POLLS):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await _poll(hass, coordinator)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    baseline(
+        "poll_allocations",
+        {
+            "allocated_peak_per_poll": Metric(statistics.median(peaks) / 1024, "kib"),
+            "retained_per_poll": Metric(max(0, retained) / POLLS / 1024, "kib"),
+        },
+    )
+
+
+async def test_write_confirm(
+    hass: HomeAssistant,
+    emulator: LuxtronikEmulator,
+    baseline: Callable[[str, dict[str, Metric]], None],
+) -> None:
+    """A parameter write, its acknowledgement and the confirming read-back."""
+    coordinator: LuxtronikCoordinator = (await _setup(hass, emulator)).runtime_data
+
+    latencies: list[float] = []
+    for write in range(WRITES):
+        started = time.perf_counter()
+        await coordinator.async_write("ID_Einst_WK_akt", 1.0 + write % 2)
+        latencies.append(time.perf_counter() - started)
+
+    ack = coordinator.poll_stats.summary(LuxPollStat.WRITE_ACK_TIME)
+    assert ack is not None
+    baseline(
+        "write_confirm",
+        {
+            "write_confirm_p50": Metric(_percentile(latencies, 50) * 1000, "ms"),
+            "write_confirm_p95": Metric(_percentile(latencies, 95) * 1000, "ms"),
+            "write_ack_p95": Metric((ack["p95"] or 0) * 1000, "ms"),
+        },
+    )
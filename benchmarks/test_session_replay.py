@@ -0,0 +1,80 @@
+"""Replay of a captured session through the whole integration.
+
+Runs only with `--session PATH`, a session log recorded with the "Record
+session log" option (see session_log.py). The integration is set up on a
+`LuxtronikReplayClient` instead of a socket, and every captured poll is
+refreshed through the coordinator and all platforms as fast as possible -
+the decode and fan-out cost of a real heat pump's register dynamics, with
+no network in the measurement. Compare against baselines recorded from the
+same log.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+import time
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.luxtronik2.const import (
+    CONF_HA_SENSOR_PREFIX,
+    CONFIG_ENTRY_VERSION,
+    DEFAULT_PORT,
+    DOMAIN,
+)
+from custom_components.luxtronik2.coordinator import LuxtronikCoordinator
+from custom_components.luxtronik2.session_log import LuxtronikReplayClient
+
+from .baseline import Metric
+from .test_poll_cycle import _percentile
+
+
+async def test_session_replay(
+    hass: HomeAssistant,
+    request: pytest.FixtureRequest,
+    baseline: Callable[[str, dict[str, Metric]], None],
+) -> None:
+    session: Path | None = request.config.getoption("--session")
+    if session is None:
+        pytest.skip("no --session log given")
+    client = LuxtronikReplayClient(session)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CONFIG_ENTRY_VERSION,
+        data={
+            CONF_HOST: "replay",
+            CONF_PORT: DEFAULT_PORT,
+            CONF_HA_SENSOR_PREFIX: DOMAIN,
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch.object(LuxtronikCoordinator, "create_client", return_value=client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator: LuxtronikCoordinator = entry.runtime_data
+
+    durations: list[float] = []
+    while True:
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        if not coordinator.last_update_success:
+            break
+        durations.append(time.perf_counter() - started)
+    assert durations, f"{session} holds a single poll, nothing left to replay"
+
+    baseline(
+        "session_replay",
+        {
+            "replay_poll_p50": Metric(_percentile(durations, 50) * 1000, "ms"),
+            "replay_poll_p95": Metric(_percentile(durations, 95) * 1000, "ms"),
+        },
+    )
@@ -15,7 +15,12 @@ from homeassistant.const import (
     CONF_TIMEOUT,
     Platform as P,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import ConfigEntryNotReady, ServiceValidationError
 from homeassistant.helpers import device_registry as dr, issue_registry as ir
 from homeassistant.helpers.entity_registry import (
@@ -25,8 +30,10 @@ from homeassistant.helpers.entity_registry import (
 from . import log_capture  # noqa: F401 - attaches the diagnostics log-capture handler
 from .common import convert_to_int_if_possible
 from .const import (
+    ATTR_CALCULATION,
     ATTR_PARAMETER,
     ATTR_VALUE,
+    ATTR_WINDOW,
     CONF_HA_SENSOR_PREFIX,
     CONF_MAX_DATA_LENGTH,
     CONFIG_ENTRY_VERSION,
@@ -35,12 +42,20 @@ from .const import (
     DOMAIN,
     LOGGER,
     PLATFORMS,
+    SERVICE_CALCULATION_HISTORY,
+    SERVICE_CALCULATION_HISTORY_SCHEMA,
     SERVICE_WRITE,
     SERVICE_WRITE_SCHEMA,
     WRITABLE_PARAMETER_PREFIXES,
     SensorKey as SK,
 )
 from .coordinator import LuxtronikCoordinator, connect_and_get_coordinator
+from .counter_cop import LuxtronikCounterCop
+from .cycles import LuxtronikCycleStats
+from .entity_plan import LuxtronikEntityPlan
+from .mode_energy import LuxtronikModeEnergy
+from .mode_time import LuxtronikModeTime
+from .snapshot import LuxtronikSnapshotStore
 
 # endregion Imports
 
@@ -92,7 +107,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: LuxtronikConfigEntry) ->
 
     entry.runtime_data = coordinator
 
+    # Platforms take their entity selection from the stored plan when the
+    # heat pump still matches it (see entity_plan.py).
+    await coordinator.async_load_entity_plan()
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    if coordinator.entity_plan is not None:
+        coordinator.entity_plan.async_schedule_save()
 
     # 🛠️ Update title on initial setup only
     host = config.get(CONF_HOST)
@@ -121,6 +142,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: LuxtronikConfigEntry) ->
             LOGGER.debug("Preserve user-set config entry title: %s", old_title)
 
     setup_hass_services(hass, entry)
+    setup_history_service(hass)
 
     LOGGER.debug("Luxtronik integration setup completed for %s", entry.entry_id)
 
@@ -170,8 +192,58 @@ def setup_hass_services(hass: HomeAssistant, entry: LuxtronikConfigEntry):
     )
 
 
+def setup_history_service(hass: HomeAssistant) -> None:
+    """Register the calculation_history service (once).
+
+    It answers from the in-memory history (see history.py) and returns the
+    statistics as response data, so scripts and automations can use them
+    without any calculation being an entity.
+    """
+
+    if hass.services.has_service(DOMAIN, SERVICE_CALCULATION_HISTORY):
+        return
+
+    async def calculation_history(service: ServiceCall) -> ServiceResponse:
+        """Return min/max/mean/rate of one calculation over a window."""
+        target_entry = _resolve_write_target(
+            hass, service.data, ambiguous_key="ambiguous_target"
+        )
+        if target_entry is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="no_heat_pump_loaded",
+            )
+
+        coordinator = target_entry.runtime_data
+        calculation = service.data[ATTR_CALCULATION]
+        if coordinator.find_calculation(calculation) is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="unknown_calculation",
+                translation_placeholders={"calculation": calculation},
+            )
+        trend = coordinator.calculation_trend(calculation, service.data[ATTR_WINDOW])
+        if trend is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="calculation_not_numeric",
+                translation_placeholders={"calculation": calculation},
+            )
+        return trend
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CALCULATION_HISTORY,
+        calculation_history,
+        schema=SERVICE_CALCULATION_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
 def _resolve_write_target(
-    hass: HomeAssistant, service_data: Mapping[str, Any]
+    hass: HomeAssistant,
+    service_data: Mapping[str, Any],
+    ambiguous_key: str = "ambiguous_write_target",
 ) -> LuxtronikConfigEntry | None:
     """Resolve which loaded Luxtronik config entry a `write` service call targets.
 
@@ -183,6 +255,7 @@ def _resolve_write_target(
     would risk writing a parameter to the wrong physical heat pump.
 
     Returns None only when no target was given and no entry is loaded at all.
+    `ambiguous_key` lets services that do not write word that error their way.
     """
     device_id = service_data.get(ATTR_DEVICE_ID)
     config_entry_id = service_data.get(ATTR_CONFIG_ENTRY_ID)
@@ -224,7 +297,7 @@ def _resolve_write_target(
         if len(loaded_entries) > 1:
             raise ServiceValidationError(
                 translation_domain=DOMAIN,
-                translation_key="ambiguous_write_target",
+                translation_key=ambiguous_key,
                 translation_placeholders={"count": str(len(loaded_entries))},
             )
         return loaded_entries[0] if loaded_entries else None
@@ -260,10 +333,21 @@ async def async_unload_entry(hass: HomeAssistant, entry: LuxtronikConfigEntry) -
     ]
     if not remaining:
         hass.services.async_remove(DOMAIN, SERVICE_WRITE)
+        hass.services.async_remove(DOMAIN, SERVICE_CALCULATION_HISTORY)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted snapshot, entity plan, totals and cycles of a removed entry."""
+    await LuxtronikSnapshotStore(hass, entry.entry_id).async_remove()
+    await LuxtronikEntityPlan(hass, entry.entry_id).async_remove()
+    await LuxtronikModeTime(hass, entry.entry_id).async_remove()
+    await LuxtronikModeEnergy(hass, entry.entry_id).async_remove()
+    await LuxtronikCycleStats(hass, entry.entry_id).async_remove()
+    await LuxtronikCounterCop(hass, entry.entry_id).async_remove()
+
+
 async def update_listener(
     hass: HomeAssistant, config_entry: LuxtronikConfigEntry
 ) -> None:
@@ -53,6 +53,7 @@ class LuxtronikEntity[DescriptionT: LuxtronikEntityDescription](  # type: ignore
     _entity_component_unrecorded_attributes = frozenset(
         {
             SA.LUXTRONIK_KEY,
+            SA.STALE_SINCE,
         }
     )
 
@@ -156,6 +157,20 @@ class LuxtronikEntity[DescriptionT: LuxtronikEntityDescription](  # type: ignore
                 exc_info=err,
             )
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Extra attributes, plus `stale_since` while showing restored data.
+
+        Added here rather than in `_handle_coordinator_update` because many
+        subclasses override that without calling super(), and every entity
+        shows restored data after a restart (see snapshot.py).
+        """
+        attributes = self._attr_extra_state_attributes
+        data = self.coordinator.data
+        if data is None or not data.restored:
+            return attributes
+        return {**attributes, SA.STALE_SINCE: data.polled_at}
+
     def _restore_attr_value(self, value: Any | None) -> Any:
         return value
 
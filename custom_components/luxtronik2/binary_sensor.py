@@ -3,6 +3,7 @@
 # region Imports
 from __future__ import annotations
 
+import logging
 from typing import Any
 
 from homeassistant.components.binary_sensor import ENTITY_ID_FORMAT, BinarySensorEntity
@@ -16,6 +17,7 @@ from .binary_sensor_entities_predefined import BINARY_SENSORS
 from .common import get_sensor_data, key_exists, read_smart_grid_inputs
 from .const import CONF_HA_SENSOR_PREFIX, LOGGER, DeviceKey, SensorKey
 from .coordinator import LuxtronikCoordinator, LuxtronikCoordinatorData
+from .entity_plan import plan_descriptions
 from .model import LuxtronikBinarySensorEntityDescription
 
 # endregion Imports
@@ -32,25 +34,32 @@ async def async_setup_entry(
 
     coordinator = entry.runtime_data
 
-    unavailable_keys = [
-        i.luxtronik_key
-        for i in BINARY_SENSORS
-        if not key_exists(coordinator.data, i.luxtronik_key)
-    ]
-    if unavailable_keys:
-        # Not all models/firmware versions support every parameter;
-        # missing keys are expected and not an error.
-        LOGGER.debug("Not present in Luxtronik data, skipping: %s", unavailable_keys)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        unavailable_keys = [
+            i.luxtronik_key
+            for i in BINARY_SENSORS
+            if not key_exists(coordinator.data, i.luxtronik_key)
+        ]
+        if unavailable_keys:
+            # Not all models/firmware versions support every parameter;
+            # missing keys are expected and not an error.
+            LOGGER.debug(
+                "Not present in Luxtronik data, skipping: %s", unavailable_keys
+            )
 
     async_add_entities(
         [
             LuxtronikBinarySensorEntity(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in BINARY_SENSORS
-            if (
-                coordinator.entity_active(description)
-                and key_exists(coordinator.data, description.luxtronik_key)
+            for description in plan_descriptions(
+                coordinator,
+                "binary_sensor",
+                BINARY_SENSORS,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and key_exists(coordinator.data, description.luxtronik_key)
+                ),
             )
         ]
     )
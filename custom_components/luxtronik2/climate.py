@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass, replace
+import logging
 from typing import Any
 
 from homeassistant.components.climate import (
@@ -33,7 +34,7 @@ from homeassistant.helpers.restore_state import ExtraStoredData
 
 from . import LuxtronikConfigEntry
 from .base import LuxtronikEntity
-from .common import get_sensor_data, key_exists, state_as_number_or_none
+from .common import get_sensor_data, key_exists
 from .const import (
     CONF_HA_SENSOR_INDOOR_TEMPERATURE,
     CONF_HA_SENSOR_PREFIX,
@@ -49,6 +50,8 @@ from .const import (
     SensorKey,
 )
 from .coordinator import LuxtronikCoordinator, LuxtronikCoordinatorData
+from .entity_plan import plan_descriptions
+from .external_sensor import ExternalSensorTracker
 from .model import LuxtronikClimateDescription
 
 # endregion Imports
@@ -216,23 +219,30 @@ async def async_setup_entry(
 
     thermostats = THERMOSTATS_SMART if is_smart_thermostat else THERMOSTATS_OTHER
 
-    unavailable_keys = [
-        i.luxtronik_key
-        for i in thermostats
-        if not key_exists(coordinator.data, i.luxtronik_key)
-    ]
-    if unavailable_keys:
-        # Not all models/firmware versions support every parameter;
-        # missing keys are expected and not an error.
-        LOGGER.debug("Not present in Luxtronik data, skipping: %s", unavailable_keys)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        unavailable_keys = [
+            i.luxtronik_key
+            for i in thermostats
+            if not key_exists(coordinator.data, i.luxtronik_key)
+        ]
+        if unavailable_keys:
+            # Not all models/firmware versions support every parameter;
+            # missing keys are expected and not an error.
+            LOGGER.debug(
+                "Not present in Luxtronik data, skipping: %s", unavailable_keys
+            )
 
     async_add_entities(
         [
             LuxtronikThermostat(hass, entry, coordinator, description)
-            for description in thermostats
-            if (
-                coordinator.entity_active(description)
-                and key_exists(coordinator.data, description.luxtronik_key)
+            for description in plan_descriptions(
+                coordinator,
+                "climate",
+                thermostats,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and key_exists(coordinator.data, description.luxtronik_key)
+                ),
             )
         ]
     )
@@ -345,6 +355,31 @@ class LuxtronikThermostat(LuxtronikEntity[LuxtronikClimateDescription], ClimateE
 
         self._pending_temperature: float | None = None
 
+        # An indoor temperature from a Home Assistant sensor is followed
+        # through its state events rather than read once per poll, so the
+        # thermostat shows a room temperature change when it happens.
+        key = description.luxtronik_key_current_temperature
+        self._indoor_temperature: ExternalSensorTracker | None = (
+            ExternalSensorTracker(
+                key, self._handle_indoor_temperature_change, default=0.0
+            )
+            if key is not None and key.startswith("sensor.")
+            else None
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the indoor temperature sensor, if one is configured."""
+        if self._indoor_temperature is not None:
+            self.async_on_remove(self._indoor_temperature.async_start(self.hass))
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_indoor_temperature_change(self) -> None:
+        if self._indoor_temperature is None:
+            return
+        self._attr_current_temperature = self._indoor_temperature.value
+        self.async_write_ha_state()
+
     @callback
     def _handle_coordinator_update(
         self, data: LuxtronikCoordinatorData | None = None
@@ -383,9 +418,10 @@ class LuxtronikThermostat(LuxtronikEntity[LuxtronikClimateDescription], ClimateE
         if key is None or key == "":
             self._attr_current_temperature = None
         elif key.startswith("sensor."):
-            temp = self.hass.states.get(key)
             self._attr_current_temperature = (
-                state_as_number_or_none(temp, 0.0) if temp is not None else None
+                self._indoor_temperature.value
+                if self._indoor_temperature is not None
+                else None
             )
         elif key != LuxCalculation.UNSET:
             self._attr_current_temperature = get_sensor_data(data, key)
@@ -3,6 +3,8 @@
 # region Imports
 from __future__ import annotations
 
+import asyncio
+from ipaddress import IPv4Interface
 from typing import Any
 
 from homeassistant import config_entries
@@ -16,10 +18,16 @@ from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
 import voluptuous as vol
 
 from .const import (
+    CONF_CHANGE_LOG,
+    CONF_CHANGE_LOG_EVENTS,
+    CONF_FANOUT_SLICE_BUDGET,
     CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION,
     CONF_HA_SENSOR_INDOOR_TEMPERATURE,
     CONF_HA_SENSOR_PREFIX,
     CONF_MAX_DATA_LENGTH,
+    CONF_POLL_WORKER,
+    CONF_SESSION_LOG,
+    CONF_STATISTICS_IMPORT,
     CONF_UPDATE_INTERVAL,
     CONFIG_ENTRY_VERSION,
     DEFAULT_HOST,
@@ -32,11 +40,12 @@ from .const import (
 )
 from .coordinator import (
     LuxtronikConnectionError,
-    LuxtronikCoordinator,
+    LuxtronikIdentity,
     LuxtronikSerialNumberError,
-    connect_and_get_coordinator,
+    async_identify,
 )
-from .lux_helper import discover
+from .lux_helper import async_discover, async_scan_hosts, subnet_scan_hosts
+from .register_changes import parse_index_ranges
 from .schema_helper import build_options_schema, build_user_data_schema
 
 # endregion Imports
@@ -60,6 +69,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         super().__init__()
         self._all_devices: list[dict[str, Any]] = []
         self._available_devices: list[dict[str, Any]] = []
+        self._scan_task: asyncio.Task[list[tuple[str, int]]] | None = None
 
     def _build_config(
         self,
@@ -75,18 +85,21 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_MAX_DATA_LENGTH: max_data_length,
         }
 
-    async def _discover_devices(self) -> list[tuple[str, int | None]]:
-        """Run device discovery in executor.
+    async def _discover_devices(
+        self, expected_host: str | None = None
+    ) -> list[tuple[str, int]]:
+        """Run device discovery on the event loop.
 
         Enumerates every enabled IPv4 adapter via HA's network helper, vs
         just the default adapter we'd get if we passed ``255.255.255.255``.
+        With ``expected_host`` the search stops as soon as that host answers.
         """
         broadcasts = await network.async_get_ipv4_broadcast_addresses(self.hass)
         broadcast_addresses = [str(addr) for addr in broadcasts]
-        return await self.hass.async_add_executor_job(discover, broadcast_addresses)
+        return await async_discover(broadcast_addresses, expected_host=expected_host)
 
     async def _set_unique_id_or_abort(
-        self, coordinator: LuxtronikCoordinator, config: dict[str, Any]
+        self, identity: LuxtronikIdentity, config: dict[str, Any]
     ) -> ConfigFlowResult | None:
         """Set unique ID, returning an abort result if the flow should stop.
 
@@ -95,7 +108,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         host = config[CONF_HOST]
         port = config[CONF_PORT]
         try:
-            serial_unique_id = coordinator.unique_id
+            serial_unique_id = identity.unique_id
         except LuxtronikSerialNumberError as err:
             LOGGER.error("Could not identify device at %s: %s", host, err)
             return self.async_abort(
@@ -167,15 +180,13 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
     def _create_entry(
-        self, config: dict[str, Any], coordinator: LuxtronikCoordinator
+        self, config: dict[str, Any], identity: LuxtronikIdentity
     ) -> ConfigFlowResult:
         if CONF_HA_SENSOR_PREFIX not in config:
-            config[CONF_HA_SENSOR_PREFIX] = f"luxtronik_{coordinator.unique_id}"
+            config[CONF_HA_SENSOR_PREFIX] = f"luxtronik_{identity.unique_id}"
 
-        if coordinator.manufacturer is not None:
-            title = (
-                f"{coordinator.manufacturer} @ {config[CONF_HOST]}:{config[CONF_PORT]}"
-            )
+        if identity.manufacturer is not None:
+            title = f"{identity.manufacturer} @ {config[CONF_HOST]}:{config[CONF_PORT]}"
         else:
             title = f"Luxtronik @ {config[CONF_HOST]}:{config[CONF_PORT]}"
 
@@ -208,6 +219,70 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 errors={"base": "unknown"},
             )
 
+        if not device_list:
+            LOGGER.debug("No heat pump answered the broadcast, probing the subnets")
+            return await self.async_step_scan()
+        return self._async_show_devices(device_list)
+
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Probe the local subnets when no heat pump answered the broadcast.
+
+        Broadcasts do not cross VLANs and are dropped by Wi-Fi client
+        isolation, where the heat pump is still reachable over TCP. The probe
+        runs as a progress step; a form cannot change once shown, so the
+        hosts found are offered by `select_devices` when it completes.
+        """
+        if self._scan_task is None:
+            self._scan_task = self.hass.async_create_task(self._async_scan_subnets())
+        if not self._scan_task.done():
+            return self.async_show_progress(
+                step_id="scan",
+                progress_action="scan",
+                progress_task=self._scan_task,
+            )
+        return self.async_show_progress_done(next_step_id="scan_done")
+
+    async def async_step_scan_done(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Offer what the subnet probe found, or manual entry."""
+        task, self._scan_task = self._scan_task, None
+        device_list: list[tuple[str, int]] = []
+        if task is not None:
+            try:
+                device_list = task.result()
+            except Exception as err:  # pylint: disable=broad-except
+                LOGGER.warning("Probing the local subnets failed: %s", err)
+        return self._async_show_devices(device_list)
+
+    async def _async_scan_subnets(self) -> list[tuple[str, int]]:
+        """Probe every host of the enabled IPv4 adapters' subnets."""
+        adapters = await network.async_get_adapters(self.hass)
+        hosts = subnet_scan_hosts(
+            [
+                IPv4Interface(f"{ip['address']}/{ip['network_prefix']}")
+                for adapter in adapters
+                if adapter["enabled"]
+                for ip in adapter["ipv4"]
+            ]
+        )
+        LOGGER.debug("Probing %d hosts for a Luxtronik heat pump", len(hosts))
+
+        def progress(probed: int) -> None:
+            self.async_update_progress(probed / len(hosts))
+
+        return [
+            (host, DEFAULT_PORT)
+            async for host in async_scan_hosts(hosts, on_probed=progress)
+        ]
+
+    @callback
+    def _async_show_devices(
+        self, device_list: list[tuple[str, int]]
+    ) -> ConfigFlowResult:
+        """Offer the unconfigured heat pumps found, or manual entry."""
         configured_hosts_ports = {
             (entry.data.get(CONF_HOST), entry.data.get(CONF_PORT))
             for entry in self._async_current_entries()
@@ -291,7 +366,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         config = self._build_config(host, int(port))
 
         try:
-            coordinator = await connect_and_get_coordinator(self.hass, config)
+            identity = await async_identify(self.hass, config)
         except LuxtronikConnectionError as err:
             return self.async_abort(
                 reason="cannot_connect",
@@ -301,10 +376,10 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 },
             )
 
-        if abort_result := await self._set_unique_id_or_abort(coordinator, config):
+        if abort_result := await self._set_unique_id_or_abort(identity, config):
             return abort_result
 
-        return self._create_entry(config, coordinator)
+        return self._create_entry(config, identity)
 
     async def async_step_manual_entry(
         self, user_input: dict[str, Any] | None = None
@@ -324,7 +399,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         try:
-            coordinator = await connect_and_get_coordinator(self.hass, config)
+            identity = await async_identify(self.hass, config)
         except LuxtronikConnectionError as err:
             return self.async_abort(
                 reason="cannot_connect",
@@ -335,11 +410,11 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         if abort_result := await self._set_unique_id_or_abort(  # pragma: no cover
-            coordinator, config
+            identity, config
         ):
             return abort_result
 
-        return self._create_entry(config, coordinator)
+        return self._create_entry(config, identity)
 
     async def async_step_dhcp(
         self, discovery_info: DhcpServiceInfo
@@ -364,7 +439,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 )
                 return self.async_abort(reason="already_configured")
 
-            heatpump_list = await self._discover_devices()
+            heatpump_list = await self._discover_devices(discovery_info.ip)
 
             # Check if DHCP device was also discovered as Luxtronik device
             matched = next(
@@ -394,7 +469,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             config = self._build_config(host, int(port or DEFAULT_PORT))
 
             try:
-                coordinator = await connect_and_get_coordinator(self.hass, config)
+                identity = await async_identify(self.hass, config)
             except LuxtronikConnectionError as err:
                 return self.async_abort(
                     reason="cannot_connect",
@@ -405,7 +480,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 )
 
             try:
-                await self.async_set_unique_id(coordinator.unique_id)
+                await self.async_set_unique_id(identity.unique_id)
             except LuxtronikSerialNumberError as err:
                 LOGGER.error(
                     "Could not identify DHCP-discovered device at %s: %s", host, err
@@ -424,7 +499,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 reload_on_update=False,
             )
 
-            return self._create_entry(config, coordinator)
+            return self._create_entry(config, identity)
 
         except AbortFlow:
             raise
@@ -465,7 +540,7 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             LOGGER.debug("Reconfigure built config=%s", config)
 
             try:
-                coordinator = await connect_and_get_coordinator(self.hass, config)
+                identity = await async_identify(self.hass, config)
             except LuxtronikConnectionError as err:
                 LOGGER.warning(
                     "Reconfigure connection failed for host=%s port=%s: %s",
@@ -480,25 +555,25 @@ class LuxtronikFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 try:
                     LOGGER.debug(
-                        "Reconfigure connected and refreshed successfully; entry unique_id=%s, coordinator unique_id=%s",
+                        "Reconfigure identified the device; entry unique_id=%s, device unique_id=%s",
                         reconfigure_entry.unique_id,
-                        coordinator.unique_id,
+                        identity.unique_id,
                     )
-                    await self.async_set_unique_id(coordinator.unique_id)
+                    await self.async_set_unique_id(identity.unique_id)
                     if reconfigure_entry.unique_id is None:
                         LOGGER.debug(
                             "Reconfigure updating entry without existing unique_id"
                         )
                         return self.async_update_reload_and_abort(
                             reconfigure_entry,
-                            unique_id=coordinator.unique_id,
+                            unique_id=identity.unique_id,
                             data_updates=config,
                         )
                     self._abort_if_unique_id_mismatch()
                     LOGGER.debug("Reconfigure unique_id matches; updating entry")
                     return self.async_update_reload_and_abort(
                         reconfigure_entry,
-                        unique_id=coordinator.unique_id,
+                        unique_id=identity.unique_id,
                         data_updates=config,
                     )
                 except AbortFlow as err:
@@ -560,8 +635,15 @@ class LuxtronikOptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the user options step."""
+        errors: dict[str, str] = {}
         try:
             if user_input is not None:
+                try:
+                    parse_index_ranges(user_input.get(CONF_CHANGE_LOG_EVENTS))
+                except ValueError:
+                    errors[CONF_CHANGE_LOG_EVENTS] = "invalid_index_ranges"
+
+            if user_input is not None and not errors:
                 new_options = dict(self.config_entry.options)
                 value = user_input.get(CONF_HA_SENSOR_INDOOR_TEMPERATURE)
                 if value:
@@ -587,6 +669,29 @@ class LuxtronikOptionsFlowHandler(config_entries.OptionsFlow):
                 )
                 new_options[CONF_UPDATE_INTERVAL] = update_interval
 
+                fanout_slice_budget = user_input.get(CONF_FANOUT_SLICE_BUDGET)
+                if fanout_slice_budget is not None:
+                    new_options[CONF_FANOUT_SLICE_BUDGET] = int(fanout_slice_budget)
+
+                if CONF_SESSION_LOG in user_input:
+                    new_options[CONF_SESSION_LOG] = bool(user_input[CONF_SESSION_LOG])
+
+                if CONF_POLL_WORKER in user_input:
+                    new_options[CONF_POLL_WORKER] = bool(user_input[CONF_POLL_WORKER])
+
+                if CONF_STATISTICS_IMPORT in user_input:
+                    new_options[CONF_STATISTICS_IMPORT] = bool(
+                        user_input[CONF_STATISTICS_IMPORT]
+                    )
+
+                if CONF_CHANGE_LOG in user_input:
+                    new_options[CONF_CHANGE_LOG] = bool(user_input[CONF_CHANGE_LOG])
+
+                # Cleared, the field is left out: no events.
+                new_options[CONF_CHANGE_LOG_EVENTS] = (
+                    user_input.get(CONF_CHANGE_LOG_EVENTS) or ""
+                ).strip()
+
                 return self.async_create_entry(title="", data=new_options)
 
             current_indoor_temp = self._get_value(CONF_HA_SENSOR_INDOOR_TEMPERATURE)
@@ -596,6 +701,17 @@ class LuxtronikOptionsFlowHandler(config_entries.OptionsFlow):
             current_interval = self._get_value(
                 CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL_OPTION
             )
+            current_fanout_slice_budget = self._get_value(CONF_FANOUT_SLICE_BUDGET)
+            current_session_log = bool(self._get_value(CONF_SESSION_LOG, False))
+            current_poll_worker = bool(self._get_value(CONF_POLL_WORKER, False))
+            current_statistics_import = bool(
+                self._get_value(CONF_STATISTICS_IMPORT, False)
+            )
+            current_change_log = bool(self._get_value(CONF_CHANGE_LOG, False))
+            # After a rejected submission, show what was typed to correct it.
+            current_change_log_events = (user_input or {}).get(
+                CONF_CHANGE_LOG_EVENTS, self._get_value(CONF_CHANGE_LOG_EVENTS)
+            )
 
             return self.async_show_form(
                 step_id="user",
@@ -603,7 +719,14 @@ class LuxtronikOptionsFlowHandler(config_entries.OptionsFlow):
                     current_indoor_temp=current_indoor_temp,
                     current_power_consumption_sensor=current_power_consumption_sensor,
                     current_interval=current_interval,
+                    current_fanout_slice_budget=current_fanout_slice_budget,
+                    current_session_log=current_session_log,
+                    current_poll_worker=current_poll_worker,
+                    current_statistics_import=current_statistics_import,
+                    current_change_log=current_change_log,
+                    current_change_log_events=current_change_log_events,
                 ),
+                errors=errors,
                 description_placeholders={"name": self.config_entry.title},
             )
 
@@ -3,7 +3,7 @@
 # region Imports
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from enum import Enum, StrEnum
+from enum import Enum, IntEnum, StrEnum
 import logging
 from typing import Final
 
@@ -59,12 +59,145 @@ DEFAULT_UPDATE_INTERVAL_OPTION: Final = next(
 # latch the status indefinitely.
 DHW_TRANSITION_HOLD: Final = timedelta(minutes=5)
 
+# How far apart the heat pump snapshot and an external power sample may be
+# before a COP combining them is withheld, on top of one update interval (the
+# heat output is never fresher than the last poll). Beyond that one side has
+# stopped updating - the meter went silent, or polls are failing - and the
+# ratio would divide a value from one moment by a value from another.
+EXTERNAL_SAMPLE_MAX_SKEW: Final = timedelta(minutes=5)
+
 
 SECOND_TO_HOUR_FACTOR: Final = 1 / 3600
+SECOND_TO_MINUTE_FACTOR: Final = 1 / 60
 
 DEFAULT_DHW_MIN_TEMPERATURE: Final = 30.0
 
 MAX_CAPTURED_LOG_RECORDS: Final = 1000
+
+# Longest stretch, in milliseconds, the coordinator spends calling entity
+# update callbacks before yielding to the event loop (see
+# LuxtronikCoordinator.async_update_listeners). Every entity formats,
+# translates and writes its state in that callback, and with two heat pumps
+# and all entities enabled one uninterrupted pass was long enough to stall the
+# loop on every poll. Asyncio's own debug mode flags a callback at 100 ms;
+# staying well below that keeps other integrations responsive, while a single
+# heat pump with the default entities still finishes within one slice.
+CONF_FANOUT_SLICE_BUDGET: Final = "fanout_slice_budget"
+DEFAULT_FANOUT_SLICE_BUDGET: Final = 20
+FANOUT_SLICE_BUDGET_MIN: Final = 1
+FANOUT_SLICE_BUDGET_MAX: Final = 100
+
+# Samples kept per poll statistic (see poll_stats.py). Two hours of history at
+# the default one-minute interval, twenty minutes at the fastest.
+POLL_STATS_WINDOW: Final = 120
+
+# Calculation history kept in memory per heat pump (see history.py): a day of
+# polls, sized from the update interval. The cap bounds memory at the fastest
+# interval - about 9 MB for a full calculations block at 8640 samples.
+CALCULATION_HISTORY_SPAN: Final = timedelta(hours=24)
+CALCULATION_HISTORY_MAX_SAMPLES: Final = 8640
+
+# Last-known snapshot persisted per config entry (see snapshot.py). Saving is
+# delayed and coalesced: a poll only marks the snapshot dirty, and at most one
+# write per delay reaches the disk - plus the final write Home Assistant
+# flushes on shutdown, which is the one a restart actually starts from.
+SNAPSHOT_STORAGE_VERSION: Final = 1
+SNAPSHOT_SAVE_DELAY: Final = 300
+
+# Time per operating status persisted per config entry (see mode_time.py).
+# Eight days so "yesterday" and "last 7 days" are complete on any day. A gap
+# between two polls longer than MODE_TIME_MAX_GAP - three polls at the
+# slowest interval - is not counted towards any status.
+MODE_TIME_STORAGE_VERSION: Final = 1
+MODE_TIME_SAVE_DELAY: Final = 300
+MODE_TIME_DAYS: Final = 8
+MODE_TIME_MAX_GAP: Final = timedelta(minutes=15)
+
+# Energy per operating status persisted per config entry (see
+# mode_energy.py). Intervals are limited by MODE_TIME_MAX_GAP like above.
+MODE_ENERGY_STORAGE_VERSION: Final = 1
+MODE_ENERGY_SAVE_DELAY: Final = 300
+
+# Compressor cycles and defrosts persisted per config entry (see cycles.py).
+# Statistics cover the last CYCLE_STATS_WINDOW; CYCLE_EVENTS_MAX events of
+# each kind are kept, enough for a 24 h window even at one start every two
+# minutes. A run shorter than SHORT_CYCLE_RUNTIME is a short cycle. An
+# impulse counter step larger than CYCLE_IMPULSES_MAX_STEP between two polls
+# is a counter reset or replacement, not starts. Defrosts per compressor hour
+# are kept per outdoor temperature band of CYCLE_OUTDOOR_BAND °C.
+CYCLE_STORAGE_VERSION: Final = 1
+CYCLE_SAVE_DELAY: Final = 300
+CYCLE_STATS_WINDOW: Final = timedelta(hours=24)
+CYCLE_EVENTS_MAX: Final = 720
+CYCLE_IMPULSES_MAX_STEP: Final = 10
+CYCLE_OUTDOOR_BAND: Final = 5
+SHORT_CYCLE_RUNTIME: Final = timedelta(minutes=10)
+
+# COP from the energy counters persisted per config entry (see
+# counter_cop.py). Buckets kept per period: two days of hours for the last
+# 24 hours, a month of days for the last 30 days, two years of months and a
+# few heating seasons, which start on the first of HEATING_SEASON_START_MONTH
+# so a winter is never split. A counter step above COUNTER_COP_MAX_POWER (kW)
+# over its interval is not energy; a period with less than
+# COUNTER_COP_MIN_ELECTRICAL kWh drawn has no meaningful COP at the counters'
+# 0.1 kWh resolution.
+COUNTER_COP_STORAGE_VERSION: Final = 1
+COUNTER_COP_SAVE_DELAY: Final = 300
+COUNTER_COP_KEEP: Final = {"hour": 48, "day": 31, "month": 25, "season": 5}
+COUNTER_COP_MAX_POWER: Final = 50.0
+COUNTER_COP_MIN_ELECTRICAL: Final = 1.0
+HEATING_SEASON_START_MONTH: Final = 7
+
+# Entity plan persisted per config entry (see entity_plan.py). It is only
+# rewritten when a setup had to rebuild part of it, so the delay just keeps
+# the write off the setup path.
+ENTITY_PLAN_STORAGE_VERSION: Final = 1
+ENTITY_PLAN_SAVE_DELAY: Final = 10
+
+# How long a config flow's identity probe keeps its connection open for the
+# entry setup that normally follows it (see coordinator.async_identify).
+IDENTIFIED_CLIENT_REUSE_TIME: Final = 30
+
+# Session log (see session_log.py): every raw exchange with the controller,
+# appended to a file in the configuration directory while the option is on.
+# A poll is about 6 KB, so at the default interval the cap is reached after
+# roughly a week; the file is then rotated to "<name>.1", keeping one
+# previous file.
+CONF_SESSION_LOG: Final = "session_log"
+SESSION_LOG_FILENAME: Final = "luxtronik2_session_{entry_id}.lxs"
+SESSION_LOG_MAX_BYTES: Final = 64 * 1024 * 1024
+
+# Poll in a separate process (see poll_worker.py): the socket, framing and
+# retries run in a worker process and the blocks arrive in shared memory.
+CONF_POLL_WORKER: Final = "poll_worker"
+
+# Direct long-term statistics (see statistics_import.py): with the option on,
+# hourly mean/min/max of the measurement calculations are imported as
+# external statistics, and those sensors write their state at most this
+# often.
+CONF_STATISTICS_IMPORT: Final = "statistics_import"
+STATISTICS_IMPORT_STATE_INTERVAL: Final = timedelta(minutes=5)
+
+# Register change log (see register_changes.py): every raw value that changed
+# between two polls, appended to a file in the configuration directory while
+# the option is on. A change is 19 bytes, so even a few hundred per poll take
+# weeks to reach the cap; the file is then rotated like the session log. The
+# event fires for the changes inside the configured index ranges.
+CONF_CHANGE_LOG: Final = "register_change_log"
+CONF_CHANGE_LOG_EVENTS: Final = "register_change_events"
+CHANGE_LOG_FILENAME: Final = "luxtronik2_changes_{entry_id}.lxc"
+CHANGE_LOG_MAX_BYTES: Final = 16 * 1024 * 1024
+EVENT_REGISTER_CHANGED: Final = f"{DOMAIN}_register_changed"
+
+# Poll scheduler shared by all heat pumps (see scheduler.py). At most this
+# many reads or writes are on the wire at once, whatever the number of
+# controllers, and routine polls start at least interval / pumps apart -
+# but never more than the maximum gap, so a long interval with few pumps
+# does not push a poll back by minutes. Throughput is reported over the
+# window.
+SCHEDULER_MAX_CONCURRENT: Final = 2
+SCHEDULER_MAX_STAGGER: Final = 5.0
+SCHEDULER_THROUGHPUT_WINDOW: Final = 600
 # endregion Constants Main
 
 # region Conf
@@ -101,6 +234,22 @@ SERVICE_WRITE_SCHEMA = vol.Schema(
     }
 )
 
+SERVICE_CALCULATION_HISTORY: Final = "calculation_history"
+ATTR_CALCULATION: Final = "calculation"
+ATTR_WINDOW: Final = "window"
+DEFAULT_HISTORY_WINDOW: Final = timedelta(hours=1)
+
+SERVICE_CALCULATION_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CALCULATION): cv.string,
+        vol.Optional(
+            ATTR_WINDOW, default=DEFAULT_HISTORY_WINDOW
+        ): cv.positive_time_period,
+        vol.Optional(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
 # Raw parameter name prefixes/names the write_parameter service accepts.
 # Keep in sync with lux_overrides.parameters_to_add_update: every custom
 # (non-"ID_"-prefixed) invented name used there needs an entry here too,
@@ -1012,6 +1161,59 @@ class SensorKey(StrEnum):
     TIMER_VENTILATION_SCHEDULE_SATURDAY = "timer_ventilation_schedule_saturday"
     TIMER_VENTILATION_SCHEDULE_SUNDAY = "timer_ventilation_schedule_sunday"
 
+    POLL_PARAMETERS_READ_TIME = "poll_parameters_read_time"
+    POLL_CALCULATIONS_READ_TIME = "poll_calculations_read_time"
+    POLL_VISIBILITIES_READ_TIME = "poll_visibilities_read_time"
+    POLL_BYTES_READ = "poll_bytes_read"
+    POLL_FRAGMENTED_READS = "poll_fragmented_reads"
+    POLL_READ_RETRIES = "poll_read_retries"
+    POLL_RECONNECTS = "poll_reconnects"
+    POLL_LOCK_WAIT = "poll_lock_wait"
+    POLL_EXECUTOR_DELAY = "poll_executor_delay"
+    POLL_WRITE_ACK_TIME = "poll_write_ack_time"
+    POLL_WRITE_CONFIRM_ATTEMPTS = "poll_write_confirm_attempts"
+    POLL_FANOUT_TIME = "poll_fanout_time"
+    POLL_SCHEDULER_WAIT = "poll_scheduler_wait"
+
+    MODE_TIME_HEATING = "mode_time_heating"
+    MODE_TIME_DOMESTIC_WATER = "mode_time_hot_water"
+    MODE_TIME_SWIMMING_POOL_SOLAR = "mode_time_swimming_pool_solar"
+    MODE_TIME_EVU = "mode_time_evu"
+    MODE_TIME_DEFROST = "mode_time_defrost"
+    MODE_TIME_NO_REQUEST = "mode_time_no_request"
+    MODE_TIME_HEATING_EXTERNAL_SOURCE = "mode_time_heating_external_source"
+    MODE_TIME_COOLING = "mode_time_cooling"
+
+    MODE_ENERGY_HEAT_HEATING = "mode_energy_heat_heating"
+    MODE_ENERGY_HEAT_DOMESTIC_WATER = "mode_energy_heat_hot_water"
+    MODE_ENERGY_HEAT_COOLING = "mode_energy_heat_cooling"
+    MODE_ENERGY_HEAT_SWIMMING_POOL_SOLAR = "mode_energy_heat_swimming_pool_solar"
+    MODE_ENERGY_HEAT_DEFROST = "mode_energy_heat_defrost"
+    MODE_ENERGY_ELECTRICAL_HEATING = "mode_energy_electrical_heating"
+    MODE_ENERGY_ELECTRICAL_DOMESTIC_WATER = "mode_energy_electrical_hot_water"
+    MODE_ENERGY_ELECTRICAL_COOLING = "mode_energy_electrical_cooling"
+    MODE_ENERGY_ELECTRICAL_SWIMMING_POOL_SOLAR = (
+        "mode_energy_electrical_swimming_pool_solar"
+    )
+    MODE_ENERGY_ELECTRICAL_DEFROST = "mode_energy_electrical_defrost"
+
+    COMPRESSOR_CYCLES_PER_HOUR = "compressor_cycles_per_hour"
+    COMPRESSOR_MEAN_RUNTIME = "compressor_mean_runtime"
+    COMPRESSOR_MEDIAN_RUNTIME = "compressor_median_runtime"
+    COMPRESSOR_SHORT_CYCLE_RATE = "compressor_short_cycle_rate"
+    DEFROSTS_LAST_24H = "defrosts_last_24h"
+
+    COUNTER_COP_LAST_7_DAYS = "cop_last_7_days"
+    COUNTER_COP_SEASON = "cop_season"
+    COUNTER_COP_HEATING_LAST_7_DAYS = "cop_heating_last_7_days"
+    COUNTER_COP_HEATING_SEASON = "cop_heating_season"
+    COUNTER_COP_DHW_LAST_7_DAYS = "cop_dhw_last_7_days"
+    COUNTER_COP_DHW_SEASON = "cop_dhw_season"
+    COUNTER_COP_POOL_LAST_7_DAYS = "cop_pool_last_7_days"
+    COUNTER_COP_POOL_SEASON = "cop_pool_season"
+    COUNTER_COP_COOLING_LAST_7_DAYS = "cop_cooling_last_7_days"
+    COUNTER_COP_COOLING_SEASON = "cop_cooling_season"
+
 
 # endregion Keys
 
@@ -1061,5 +1263,60 @@ class SensorAttrKey(StrEnum):
     TIMER_DEFROST = "Abtauen in ID_WEB_Time_AbtIn"
     TIMER_HOT_GAS = "ID_WEB_Time_Heissgas"
 
+    STAT_SAMPLES = "samples"
+    STAT_MEAN = "mean"
+    STAT_P50 = "p50"
+    STAT_P95 = "p95"
+    STAT_MAX = "max"
+    MODE_TIME_YESTERDAY = "yesterday"
+    MODE_TIME_LAST_7_DAYS = "last_7_days"
+    EXTERNAL_SAMPLED_AT = "external_sampled_at"
+    SAMPLE_SKEW = "sample_skew"
+    STALE_SINCE = "stale_since"
+    CYCLE_STARTS = "starts"
+    DEFROSTS_PER_COMPRESSOR_HOUR = "defrosts_per_compressor_hour"
+    COP_LAST_24_HOURS = "last_24_hours"
+    COP_LAST_30_DAYS = "last_30_days"
+    COP_THIS_MONTH = "this_month"
+    COP_PREVIOUS_SEASON = "previous_season"
+    COP_SEASON_HEAT = "season_heat_energy"
+    COP_SEASON_ELECTRICAL = "season_electrical_energy"
+
 
 # endregion Attr Keys
+
+
+# region Poll statistics
+class LuxPollStat(StrEnum):
+    """Measurements kept by poll_stats.LuxtronikPollStats."""
+
+    PARAMETERS_READ_TIME = "parameters_read_time"
+    CALCULATIONS_READ_TIME = "calculations_read_time"
+    VISIBILITIES_READ_TIME = "visibilities_read_time"
+    PARAMETERS_BYTES = "parameters_bytes"
+    CALCULATIONS_BYTES = "calculations_bytes"
+    VISIBILITIES_BYTES = "visibilities_bytes"
+    POLL_BYTES = "poll_bytes"
+    FRAGMENTED_READS = "fragmented_reads"
+    READ_RETRIES = "read_retries"
+    RECONNECTS = "reconnects"
+    LOCK_WAIT = "lock_wait"
+    EXECUTOR_DELAY = "executor_delay"
+    WRITE_ACK_TIME = "write_ack_time"
+    WRITE_CONFIRM_ATTEMPTS = "write_confirm_attempts"
+    FANOUT_TIME = "fanout_time"
+    FANOUT_DURATION = "fanout_duration"
+    FANOUT_SLICES = "fanout_slices"
+    SCHEDULER_WAIT = "scheduler_wait"
+    STAGGER_DELAY = "stagger_delay"
+
+
+class LuxSchedulePriority(IntEnum):
+    """Order in which scheduler.LuxtronikPollScheduler grants its slots."""
+
+    WRITE = 0
+    WRITE_CONFIRM = 1
+    POLL = 2
+
+
+# endregion Poll statistics
@@ -4,46 +4,78 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Mapping
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import operator
+from pathlib import Path
 import re
+import time
 from types import MappingProxyType
 from typing import Any, Final
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_TIMEOUT
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.loader import async_get_integration
 from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
 from packaging.version import InvalidVersion, Version
 
-from .common import get_sensor_data, normalize_sensor_value
+from .common import get_sensor_data, key_exists, normalize_sensor_value
 from .const import (
+    CALCULATION_HISTORY_MAX_SAMPLES,
+    CALCULATION_HISTORY_SPAN,
+    CHANGE_LOG_FILENAME,
     CONF_CALCULATIONS,
+    CONF_CHANGE_LOG,
+    CONF_CHANGE_LOG_EVENTS,
+    CONF_FANOUT_SLICE_BUDGET,
+    CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION,
+    CONF_HA_SENSOR_PREFIX,
     CONF_MAX_DATA_LENGTH,
     CONF_PARAMETERS,
+    CONF_POLL_WORKER,
+    CONF_SESSION_LOG,
+    CONF_STATISTICS_IMPORT,
     CONF_UPDATE_INTERVAL,
     CONF_VISIBILITIES,
+    DEFAULT_FANOUT_SLICE_BUDGET,
     DEFAULT_MAX_DATA_LENGTH,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
     DEFAULT_UPDATE_INTERVAL,
     DHW_TRANSITION_HOLD,
     DOMAIN,
+    FANOUT_SLICE_BUDGET_MAX,
+    FANOUT_SLICE_BUDGET_MIN,
+    IDENTIFIED_CLIENT_REUSE_TIME,
     LOGGER,
     LUX_PARAMETER_MK_SENSORS,
+    PARSED_COUNT_ATTR,
+    SESSION_LOG_FILENAME,
     UPDATE_INTERVAL_OPTIONS,
     DeviceKey,
     LuxCalculation as LC,
     LuxMkTypes,
     LuxOperationMode,
     LuxParameter as LP,
+    LuxPollStat,
     LuxRoomThermostatType,
+    LuxSchedulePriority,
     LuxVisibility as LV,
 )
+from .counter_cop import COP_COUNTERS, LuxtronikCounterCop
+from .cycles import LuxtronikCycleStats
+from .entity_plan import ENTITY_PLAN_SETTINGS, LuxtronikEntityPlan
+from .external_sensor import ExternalSensorTracker
+from .history import CalculationHistory, numeric_scale
 from .lux_helper import Luxtronik, get_manufacturer_by_model
 from .lux_overrides import (
     isolate_instance_data,
@@ -53,7 +85,20 @@ from .lux_overrides import (
     update_Luxtronik_SwitchoffCodes,
     warn_on_unknown_selection_codes,
 )
+from .mode_energy import LuxtronikModeEnergy
+from .mode_time import LuxtronikModeTime
 from .model import LuxtronikCoordinatorData, LuxtronikEntityDescription
+from .poll_stats import LuxtronikPollStats
+from .poll_worker import LuxtronikWorkerClient
+from .register_changes import (
+    ChangeLogWriter,
+    LuxtronikRegisterChanges,
+    parse_index_ranges,
+)
+from .scheduler import LuxtronikPollScheduler, async_get_poll_scheduler
+from .session_log import SessionLogWriter
+from .snapshot import SNAPSHOT_BLOCKS, LuxtronikSnapshot, LuxtronikSnapshotStore
+from .statistics_import import LuxtronikStatisticsImporter
 
 # endregion Imports
 
@@ -83,6 +128,23 @@ WRITE_CONFIRM_MAX_DELAY = 1.0
 LUX_TEMPERATURE_SENTINELS: Final[frozenset[float]] = frozenset({0.0, 5.0, 75.0})
 
 
+def _fanout_slice_budget(config: Mapping[str, Any]) -> float:
+    """Return the configured fan-out slice budget in seconds.
+
+    Stored in milliseconds by the options flow. Anything missing or outside
+    the range the flow offers falls back to the default rather than producing
+    a zero budget (a yield after every entity) or an unbounded one.
+    """
+    raw = config.get(CONF_FANOUT_SLICE_BUDGET)
+    if (
+        isinstance(raw, (int, float))
+        and not isinstance(raw, bool)
+        and FANOUT_SLICE_BUDGET_MIN <= raw <= FANOUT_SLICE_BUDGET_MAX
+    ):
+        return raw / 1000
+    return DEFAULT_FANOUT_SLICE_BUDGET / 1000
+
+
 def _write_confirmed(written: Any, confirmed: Any) -> bool:
     """Return True if a write's post-refresh read-back matches what was written.
 
@@ -120,6 +182,29 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
         self._dhw_hold_until: datetime | None = None
         # Latch for the ventilation module; see has_ventilation.
         self._ventilation_detected = False
+        # See async_update_listeners().
+        self._fanout_slice_budget = _fanout_slice_budget(config)
+        self._fanout_task: asyncio.Task[None] | None = None
+        # See restore_snapshot() and _async_save_snapshot().
+        self.snapshot_store: LuxtronikSnapshotStore | None = None
+        self._restored_snapshot: LuxtronikSnapshot | None = None
+        # See entity_plan.py; bound by async_setup_entry before the platforms.
+        self.entity_plan: LuxtronikEntityPlan | None = None
+        # See scheduler.py; bound for config entries before the first read.
+        self.scheduler: LuxtronikPollScheduler | None = None
+        # See history.py and _record_history().
+        self._history_block: list[int] | None = None
+        # See mode_time.py, mode_energy.py, cycles.py and counter_cop.py;
+        # bound for config entries before the first read.
+        self.mode_time: LuxtronikModeTime | None = None
+        self.mode_energy: LuxtronikModeEnergy | None = None
+        self.cycles: LuxtronikCycleStats | None = None
+        self.counter_cop: LuxtronikCounterCop | None = None
+        # See statistics_import.py; bound while the option is on.
+        self.statistics_importer: LuxtronikStatisticsImporter | None = None
+        # See register_changes.py; bound while the change log or events are on.
+        self.register_changes: LuxtronikRegisterChanges | None = None
+        self._external_power: ExternalSensorTracker | None = None
 
         update_interval: timedelta = DEFAULT_UPDATE_INTERVAL
         raw = config.get(CONF_UPDATE_INTERVAL)
@@ -135,6 +220,14 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
             update_interval=update_interval,
         )
 
+        interval = (self.update_interval or DEFAULT_UPDATE_INTERVAL).total_seconds()
+        self.history = CalculationHistory(
+            min(
+                int(CALCULATION_HISTORY_SPAN.total_seconds() // interval),
+                CALCULATION_HISTORY_MAX_SAMPLES,
+            )
+        )
+
         LOGGER.debug(
             "Coordinator update interval=%s s",
             self.update_interval.total_seconds()
@@ -142,10 +235,154 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
             else None,
         )
 
-    async def _async_update_data(self) -> LuxtronikCoordinatorData:
+    @property
+    def poll_stats(self) -> LuxtronikPollStats:
+        """Return the rolling poll/write statistics of this connection."""
+        return self.client.stats
+
+    @asynccontextmanager
+    async def _async_locked(
+        self, priority: LuxSchedulePriority = LuxSchedulePriority.POLL
+    ) -> AsyncIterator[None]:
+        """Hold the socket lock, recording how long acquiring it took.
+
+        Polls and writes share one socket and queue behind each other here,
+        so a poll stuck behind a slow write confirmation (or the reverse)
+        shows up as lock wait rather than as an unexplained slow read.
+
+        With a scheduler bound, a slot shared with the other heat pumps is
+        taken next, at `priority`; the wait for it is recorded separately.
+        The lock comes first so that a pump never holds a shared slot while
+        queued behind its own socket.
+        """
+        requested = time.monotonic()
         async with self._lock:
+            self.poll_stats.record(LuxPollStat.LOCK_WAIT, time.monotonic() - requested)
+            if self.scheduler is None:
+                yield
+                return
+            requested = time.monotonic()
+            async with self.scheduler.async_slot(priority):
+                self.poll_stats.record(
+                    LuxPollStat.SCHEDULER_WAIT, time.monotonic() - requested
+                )
+                yield
+
+    async def _async_client_call(self, target: Callable[[], None]) -> None:
+        """Run a blocking client call in the executor, recording its queue delay."""
+        submitted = time.monotonic()
+        await self.hass.async_add_executor_job(target)
+        self.poll_stats.record_executor_delay(submitted)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, yielding to the loop between slices.
+
+        The base class calls every entity's update callback in one
+        uninterrupted pass. Each of those formats its value and writes a state
+        - with a few hundred entities (all enabled, or two heat pumps) that
+        pass stalled the event loop for long enough on every poll to delay
+        unrelated integrations and trip asyncio's slow-callback warning.
+
+        Here listeners run in slices of at most `_fanout_slice_budget`: the
+        first slice runs inline, exactly like the base class, so a small
+        installation that fits into one slice behaves as before. Whatever is
+        left continues in a task that yields to the loop between slices. A
+        newer update supersedes a fan-out still in progress - its listeners
+        would otherwise publish data that is already outdated.
+
+        The busy time (callbacks only), the wall time (including the yields)
+        and the slice count are recorded in `poll_stats`.
+        """
+        if self._fanout_task is not None and not self._fanout_task.done():
+            self._fanout_task.cancel()
+        self._fanout_task = None
+
+        pending = deque(self._listeners.values())
+        if not pending:
+            return
+        started = time.monotonic()
+        busy = self._run_fanout_slice(pending)
+        if not pending:
+            self._record_fanout(started, busy, 1)
+            return
+        self._fanout_task = self.hass.async_create_task(
+            self._async_fan_out_remaining(pending, started, busy),
+            f"{DOMAIN} listener fan-out",
+            eager_start=False,
+        )
+
+    async def _async_fan_out_remaining(
+        self,
+        pending: deque[tuple[CALLBACK_TYPE, object | None]],
+        started: float,
+        busy: float,
+    ) -> None:
+        """Run the remaining listener slices, yielding to the loop before each."""
+        slices = 1
+        while pending:
+            await asyncio.sleep(0)
+            busy += self._run_fanout_slice(pending)
+            slices += 1
+        self._record_fanout(started, busy, slices)
+
+    def _run_fanout_slice(
+        self, pending: deque[tuple[CALLBACK_TYPE, object | None]]
+    ) -> float:
+        """Call listeners until the slice budget is spent; return the time taken.
+
+        At least one listener runs per slice, so a single slow entity cannot
+        stall the fan-out. A failing listener is logged and skipped: in the
+        base class it would abort the remaining updates of this poll, here it
+        would also end the task and leave the rest of the entities stale.
+        """
+        slice_started = now = time.monotonic()
+        deadline = slice_started + self._fanout_slice_budget
+        while pending:
+            update_callback, _ = pending.popleft()
             try:
-                await self.hass.async_add_executor_job(self.client.read)
+                update_callback()
+            except Exception:
+                LOGGER.exception("Error updating a Luxtronik entity")
+            now = time.monotonic()
+            if now >= deadline:
+                break
+        return now - slice_started
+
+    def _record_fanout(self, started: float, busy: float, slices: int) -> None:
+        self.poll_stats.record(LuxPollStat.FANOUT_TIME, busy)
+        self.poll_stats.record(LuxPollStat.FANOUT_DURATION, time.monotonic() - started)
+        self.poll_stats.record(LuxPollStat.FANOUT_SLICES, slices)
+
+    async def _async_update_data(self) -> LuxtronikCoordinatorData:
+        if self.scheduler is not None and self.update_interval is not None:
+            await self.scheduler.async_stagger(self.update_interval.total_seconds())
+        return await self._async_read_data(LuxSchedulePriority.POLL)
+
+    async def _async_confirm_refresh(self) -> None:
+        """Re-read after a write, at WRITE_CONFIRM priority.
+
+        Like async_refresh() for this one read: new data is published with
+        async_set_updated_data(), a failed read marks the data stale without
+        raising. A timer poll running meanwhile keeps its own priority.
+        """
+        try:
+            data = await self._async_read_data(LuxSchedulePriority.WRITE_CONFIRM)
+        except UpdateFailed as err:
+            self.last_exception = err
+            if self.last_update_success:
+                LOGGER.error("Error fetching data to confirm a write: %s", err)
+                self.last_update_success = False
+                self.async_update_listeners()
+            return
+        self.async_set_updated_data(data)
+
+    async def _async_read_data(
+        self, priority: LuxSchedulePriority
+    ) -> LuxtronikCoordinatorData:
+        async with self._async_locked(priority):
+            try:
+                await self._async_client_call(self.client.read)
                 LOGGER.debug(
                     "Update coordinator data  (Async, interval=%s s)",
                     self.update_interval.total_seconds()
@@ -156,14 +393,286 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
                     parameters=self.client.parameters,
                     calculations=self.client.calculations,
                     visibilities=self.client.visibilities,
+                    polled_at=dt_util.utcnow(),
                 )
                 self._update_dhw_transition_hold(data)
                 self.data = data
-
-                return self.data
             except Exception as err:
                 raise UpdateFailed(f"Error fetching data: {err}") from err
 
+        self._check_restored_firmware()
+        self._record_history(data)
+        if self.register_changes is not None:
+            self.register_changes.observe(
+                self.client.raw_blocks, data.polled_at or dt_util.utcnow()
+            )
+        self._record_mode_statistics(data)
+        self._record_energy_counters(data)
+        if self.statistics_importer is not None:
+            self.statistics_importer.observe(
+                data, data.polled_at or dt_util.utcnow(), self.firmware_series
+            )
+        self._async_save_snapshot(data)
+        return data
+
+    def _record_mode_statistics(self, data: LuxtronikCoordinatorData) -> None:
+        """Feed this poll to the per-status totals and the cycle detector.
+
+        The status is read once, through the same get_sensor_data() path as
+        the status sensor, so the totals follow exactly what it shows. With
+        an external power meter its latest value closes the electrical
+        trapezoid here too: a meter holding a steady load reports no state
+        changes, and without a sample per poll that energy would be lost.
+        Controllers without calculation 268 are checked first, since reading
+        a missing calculation logs two warnings on every poll.
+        """
+        if self.mode_time is None and self.mode_energy is None and self.cycles is None:
+            return
+        status = get_sensor_data(data, LC.C0080_STATUS)
+        at = data.polled_at or dt_util.utcnow()
+        if self.mode_time is not None:
+            self.mode_time.observe(status, at)
+        if self.mode_energy is not None:
+            self.mode_energy.sample(
+                "heat", get_sensor_data(data, LC.C0257_CURRENT_HEAT_OUTPUT), status, at
+            )
+            if self._external_power is not None:
+                power = self._external_power.value
+            elif key_exists(data, LC.C0268_CURRENT_POWER_CONSUMPTION):
+                power = get_sensor_data(data, LC.C0268_CURRENT_POWER_CONSUMPTION)
+            else:
+                power = None
+            self.mode_energy.sample("electrical", power, status, at)
+        if self.cycles is not None:
+            self.cycles.observe(
+                at,
+                get_sensor_data(data, LC.C0044_COMPRESSOR),
+                get_sensor_data(data, LC.C0057_COMPRESSOR1_IMPULSES),
+                status,
+                get_sensor_data(data, LC.C0015_OUTDOOR_TEMPERATURE),
+            )
+
+    def _record_energy_counters(self, data: LuxtronikCoordinatorData) -> None:
+        """Feed the heat and electrical counters of each circuit to the COP."""
+        if self.counter_cop is None:
+            return
+        self.counter_cop.observe(
+            data.polled_at or dt_util.utcnow(),
+            {
+                circuit: (
+                    get_sensor_data(data, heat_key),
+                    get_sensor_data(data, electrical_key),
+                )
+                for circuit, (heat_key, electrical_key) in COP_COUNTERS.items()
+            },
+        )
+
+    @callback
+    def _handle_external_power(self) -> None:
+        """Integrate the external power meter as soon as it reports."""
+        tracker = self._external_power
+        if self.mode_energy is None or tracker is None or self.data is None:
+            return
+        self.mode_energy.sample(
+            "electrical",
+            tracker.value,
+            get_sensor_data(self.data, LC.C0080_STATUS),
+            tracker.sampled_at or dt_util.utcnow(),
+        )
+
+    def _record_history(self, data: LuxtronikCoordinatorData) -> None:
+        """Append this poll's calculations block to the history.
+
+        The clients replace the raw block with a new list on every successful
+        read and keep the old one when a read fails, so an unchanged list
+        object means no new reading - appending it again would weight the
+        stale values twice in every mean and flatten every rate.
+        """
+        block = self.client.raw_blocks.get(CONF_CALCULATIONS)
+        if block is None or block is self._history_block:
+            return
+        self._history_block = block
+        polled_at = data.polled_at or dt_util.utcnow()
+        try:
+            self.history.append(polled_at.timestamp(), block)
+        except (OverflowError, TypeError) as err:
+            LOGGER.debug("Calculations block not added to the history: %s", err)
+
+    def find_calculation(self, calculation: str | int) -> tuple[int, Any] | None:
+        """Return the index and item of a calculation by index or name.
+
+        Looks the item up in the parsed block directly rather than through
+        Calculations.get(), which logs a warning for unknown names and, with
+        the Modbus client, would add the register to the polled set.
+        """
+        if self.data is None:
+            return None
+        items = self.data.calculations.calculations
+        if isinstance(calculation, int) or str(calculation).isdigit():
+            index = int(calculation)
+            return (index, items[index]) if index in items else None
+        return next(
+            (
+                (index, item)
+                for index, item in items.items()
+                if item.name == calculation
+            ),
+            None,
+        )
+
+    def calculation_trend(
+        self, calculation: str | int, window: timedelta
+    ) -> dict[str, Any] | None:
+        """Return min/max/mean/rate of a calculation over the last `window`.
+
+        The statistics come from the in-memory history (see history.py) and
+        are decoded like the register itself, so a temperature comes back in
+        degrees and its rate in degrees per hour. None if the calculation
+        is unknown or not numeric; `samples` is 0 if nothing was recorded
+        inside the window yet.
+        """
+        found = self.find_calculation(calculation)
+        if found is None:
+            return None
+        index, item = found
+        scale = numeric_scale(item)
+        if scale is None:
+            return None
+        result: dict[str, Any] = {
+            "calculation": item.name,
+            "window": window.total_seconds(),
+            "samples": 0,
+        }
+        stats = self.history.stats(
+            index, window.total_seconds(), dt_util.utcnow().timestamp()
+        )
+        if stats is None:
+            return result
+        result.update(
+            samples=stats.samples,
+            since=dt_util.utc_from_timestamp(stats.since).isoformat(),
+            first=item.from_heatpump(stats.first),
+            last=item.from_heatpump(stats.last),
+            min=item.from_heatpump(stats.minimum),
+            max=item.from_heatpump(stats.maximum),
+            mean=round(stats.mean * scale, 3),
+            rate_per_hour=(
+                None
+                if stats.rate_per_hour is None
+                else round(stats.rate_per_hour * scale, 3)
+            ),
+        )
+        return result
+
+    def restore_snapshot(self, snapshot: LuxtronikSnapshot) -> None:
+        """Take the last-known data from a persisted snapshot (see snapshot.py).
+
+        The blocks go through the client's parsers exactly like a live read,
+        so everything derived from them - serial, firmware, visibilities,
+        which registers exist - is what the last poll before the restart saw.
+        The data is flagged `restored` until the first live refresh replaces it.
+        """
+        self.client.restore(snapshot.blocks)
+        data = LuxtronikCoordinatorData(
+            parameters=self.client.parameters,
+            calculations=self.client.calculations,
+            visibilities=self.client.visibilities,
+            polled_at=snapshot.taken_at,
+            restored=True,
+        )
+        self._update_dhw_transition_hold(data)
+        self.data = data
+        self._restored_snapshot = snapshot
+
+    def _check_restored_firmware(self) -> None:
+        """Reload the entry if the first live read disagrees with the snapshot.
+
+        Entities were created from the snapshot, and which ones exist depends
+        on the firmware (min/max_firmware_version) - after a firmware update
+        during the downtime, that set is wrong until a setup from live data.
+        """
+        snapshot, self._restored_snapshot = self._restored_snapshot, None
+        if snapshot is None or self.config_entry is None:
+            return
+        try:
+            firmware_version = self.firmware_version
+        except (TypeError, ValueError):
+            return
+        if firmware_version != snapshot.firmware_version:
+            LOGGER.info(
+                "Firmware changed from %s to %s since the last snapshot, reloading",
+                snapshot.firmware_version,
+                firmware_version,
+            )
+            self.hass.config_entries.async_schedule_reload(self.config_entry.entry_id)
+
+    def _async_save_snapshot(self, data: LuxtronikCoordinatorData) -> None:
+        """Queue the blocks of this poll for saving as the last-known snapshot.
+
+        Skipped unless all three blocks were read: the client keeps the last
+        good copy of a block that failed, and a snapshot mixing polls is
+        still better than none - but one missing a block entirely cannot be
+        parsed back into a complete heat pump.
+        """
+        if self.snapshot_store is None:
+            return
+        blocks = dict(self.client.raw_blocks)
+        if any(label not in blocks for label in SNAPSHOT_BLOCKS):
+            return
+        try:
+            snapshot = LuxtronikSnapshot(
+                taken_at=data.polled_at or dt_util.utcnow(),
+                unique_id=self.unique_id,
+                firmware_version=self.firmware_version,
+                model=self.model,
+                blocks=blocks,
+            )
+        except (LuxtronikSerialNumberError, TypeError, ValueError):
+            return
+        self.snapshot_store.async_schedule_save(snapshot)
+
+    async def async_load_entity_plan(self) -> None:
+        """Bind the stored entity plan of this config entry (see entity_plan.py)."""
+        if self.config_entry is None:
+            return
+        integration = await async_get_integration(self.hass, DOMAIN)
+        entity_plan = LuxtronikEntityPlan(self.hass, self.config_entry.entry_id)
+        await entity_plan.async_load(
+            self.entity_plan_fingerprint(str(integration.version))
+        )
+        self.entity_plan = entity_plan
+
+    def entity_plan_fingerprint(self, integration_version: str) -> dict[str, Any]:
+        """Return everything a stored entity plan must match to be reused.
+
+        See entity_plan.py for why each part is in here. Only JSON types, and
+        setting values as strings, so the dict loaded back from the store
+        compares equal to a freshly built one.
+        """
+        return {
+            "integration_version": integration_version,
+            "model": self.model,
+            "firmware_version": self.firmware_version,
+            "block_lengths": {
+                label: getattr(group, PARSED_COUNT_ATTR, None)
+                for label, group in (
+                    (CONF_PARAMETERS, self.data.parameters),
+                    (CONF_CALCULATIONS, self.data.calculations),
+                    (CONF_VISIBILITIES, self.data.visibilities),
+                )
+            },
+            "capabilities": {
+                "domestic_water": self.has_domestic_water,
+                "cooling": self.has_cooling,
+                "ventilation": self.has_ventilation,
+                "solar": self._detect_solar_present(),
+                "dhw_circulation_pump": self._detect_dhw_circulation_pump_present(),
+            },
+            "settings": {
+                str(key): str(self.get_value(key)) for key in ENTITY_PLAN_SETTINGS
+            },
+        }
+
     def _update_dhw_transition_hold(self, data: LuxtronikCoordinatorData) -> None:
         """Decide whether this poll falls inside a DHW transition hold.
 
@@ -224,7 +733,7 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
         keeping the optimistic one.
         """
         try:
-            async with self._lock:
+            async with self._async_locked(LuxSchedulePriority.WRITE):
                 # This batch owns the queue. `_write` empties it on every exit
                 # path, but a failure before `_write` is entered - a
                 # `connect()` timeout while the controller reboots, or a
@@ -241,7 +750,7 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
                 LOGGER.debug(
                     "Done: self.client.parameters.set (%d parameter(s))", len(pairs)
                 )
-                await self.hass.async_add_executor_job(self.client.write)
+                await self._async_client_call(self.client.write)
                 LOGGER.debug("Done: self.client.write")
 
             # Refresh after write, retrying the confirming read while the
@@ -251,16 +760,18 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
             # the socket lock above is already released here.
             mismatches: list[str] = []
             delay = WRITE_CONFIRM_INITIAL_DELAY
+            attempts = 0
             for attempt in range(WRITE_CONFIRM_MAX_ATTEMPTS):
+                attempts = attempt + 1
                 if attempt:
                     await asyncio.sleep(delay)
                     delay = min(delay * 2, WRITE_CONFIRM_MAX_DELAY)
 
-                await self.async_refresh()
+                await self._async_confirm_refresh()
                 LOGGER.debug("Coordinator data refreshed!")
 
-                # async_refresh() swallows failures internally (logs, does not
-                # raise) rather than propagating them, so self.data may still
+                # _async_confirm_refresh() swallows failures like
+                # async_refresh() (logs, does not raise), so self.data may still
                 # be the stale pre-write snapshot here. Comparing
                 # newly-written values against stale data would almost always
                 # look like a mismatch, misleadingly implying the device
@@ -302,6 +813,10 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
                     "; ".join(mismatches),
                 )
 
+            # Recorded whether or not the write converged: a controller that
+            # needs four reads to settle (#729) and one that never does are
+            # both worth seeing in the distribution.
+            self.poll_stats.record(LuxPollStat.WRITE_CONFIRM_ATTEMPTS, attempts)
             if mismatches:
                 raise HomeAssistantError(
                     translation_domain=DOMAIN,
@@ -315,6 +830,20 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
         except Exception as err:
             raise LuxtronikWriteError(f"Write error: {err}") from err
 
+    @staticmethod
+    def create_client(config: Mapping[str, Any]) -> Luxtronik:
+        """Create an unconnected client for the configured heat pump."""
+        client_class = (
+            LuxtronikWorkerClient if config.get(CONF_POLL_WORKER) else Luxtronik
+        )
+        return client_class(
+            host=config[CONF_HOST],
+            port=config[CONF_PORT],
+            socket_timeout=config.get(CONF_TIMEOUT, DEFAULT_TIMEOUT),
+            max_data_length=config.get(CONF_MAX_DATA_LENGTH, DEFAULT_MAX_DATA_LENGTH),
+            safe=False,
+        )
+
     @staticmethod
     async def connect(  # pragma: no cover
         hass: HomeAssistant,
@@ -336,18 +865,7 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
         else:
             config = config_entry
 
-        host = config[CONF_HOST]
-        port = config[CONF_PORT]
-        timeout = config.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
-        max_data_length = config.get(CONF_MAX_DATA_LENGTH, DEFAULT_MAX_DATA_LENGTH)
-
-        client = Luxtronik(
-            host=host,
-            port=port,
-            socket_timeout=timeout,
-            max_data_length=max_data_length,
-            safe=False,
-        )
+        client = _new_client(hass, config)
 
         # Test connection
         try:
@@ -487,11 +1005,9 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
                 "Serial number (P0874) is not available - coordinator data "
                 "may not be populated yet"
             )
-        serial_number_model = self.get_value(LP.P0875_SERIAL_NUMBER_MODEL)
-        serial_number_hex = (
-            hex(int(serial_number_model)) if serial_number_model is not None else "0"
+        return _format_serial_number(
+            serial_number_date, self.get_value(LP.P0875_SERIAL_NUMBER_MODEL)
         )
-        return f"{serial_number_date}-{serial_number_hex}".replace("x", "")
 
     @property
     def unique_id(self) -> str:
@@ -871,9 +1387,19 @@ class LuxtronikCoordinator(DataUpdateCoordinator[LuxtronikCoordinatorData]):
 
     async def async_shutdown(self) -> None:
         """Make sure a coordinator is shut down as well as its connection."""
+        if self._fanout_task is not None:
+            self._fanout_task.cancel()
+            self._fanout_task = None
+        if self.scheduler is not None:
+            self.scheduler.unregister(self)
+            self.scheduler = None
         await super().async_shutdown()
         if hasattr(self, "client") and self.client is not None:
             await self.hass.async_add_executor_job(self.client.disconnect)
+            if self.client.session_log is not None:
+                await self.hass.async_add_executor_job(self.client.session_log.close)
+            if self.register_changes is not None:
+                await self.register_changes.async_close()
             del self.client
 
 
@@ -902,29 +1428,173 @@ class LuxtronikSerialNumberError(HomeAssistantError):
     """
 
 
+def _format_serial_number(date: Any, model: Any) -> str:
+    """Join the serial number's date (P0874) and model (P0875) parts."""
+    model_hex = hex(int(model)) if model is not None else "0"
+    return f"{date}-{model_hex}".replace("x", "")
+
+
+@dataclass(frozen=True)
+class LuxtronikIdentity:
+    """What a config flow needs to know about a heat pump (see async_identify).
+
+    Mirrors the coordinator's identity properties, including the
+    LuxtronikSerialNumberError when P0874 could not be read.
+    """
+
+    serial_number_date: Any
+    serial_number_model: Any
+    model: str
+    firmware_version: str
+
+    @property
+    def serial_number(self) -> str:
+        """Return the serial number."""
+        if self.serial_number_date is None:
+            raise LuxtronikSerialNumberError(
+                "Serial number (P0874) is not available - the parameters could "
+                "not be read"
+            )
+        return _format_serial_number(self.serial_number_date, self.serial_number_model)
+
+    @property
+    def unique_id(self) -> str:
+        """Return the unique id."""
+        return self.serial_number.lower().replace("-", "_")
+
+    @property
+    def manufacturer(self) -> str | None:
+        """Return the heatpump manufacturer."""
+        return get_manufacturer_by_model(self.model)
+
+
 _OVERRIDES_APPLIED = False
 
 
+def apply_library_overrides() -> None:
+    """Patch the luxtronik library with the integration's overrides, once.
+
+    Called before the first client is created; anything else that parses
+    register blocks through the library (the benchmarks) calls it too, so it
+    sees the same register definitions the integration does.
+    """
+    global _OVERRIDES_APPLIED
+    # No lock needed: all override calls are synchronous (no await),
+    # so the event loop cannot preempt between the guard check and flag set.
+    if _OVERRIDES_APPLIED:
+        return
+    update_Luxtronik_HeatpumpCodes()
+    update_Luxtronik_SwitchoffCodes()
+    update_Luxtronik_Parameters()
+    isolate_instance_data()
+    record_parsed_block_lengths()
+    warn_on_unknown_selection_codes()
+    _OVERRIDES_APPLIED = True
+    LOGGER.info(
+        "Library overrides applied (HeatpumpCodes, SwitchoffCodes, Parameters, "
+        "instance data isolation, parsed block length recording, unknown "
+        "selection code warning)."
+    )
+
+
+# Clients that identified a heat pump for a config flow, kept connected for
+# the entry setup that usually follows within seconds. Keyed by host and port.
+_IDENTIFIED_CLIENTS: HassKey[dict[tuple[str, int], tuple[Luxtronik, CALLBACK_TYPE]]] = (
+    HassKey(f"{DOMAIN}_identified_clients")
+)
+
+
+async def async_identify(
+    hass: HomeAssistant, config: Mapping[str, Any]
+) -> LuxtronikIdentity:
+    """Read what identifies the heat pump at `config`, without setting it up.
+
+    Config flows only need the serial number, model and firmware to decide
+    whether and how to create an entry. Building a coordinator for that meant
+    a full poll - all three blocks, with four retries each - per candidate
+    device; this reads two blocks with one retry. The connection is kept
+    for `IDENTIFIED_CLIENT_REUSE_TIME`, and the entry setup that follows a
+    successful flow reuses it along with the blocks already read.
+    """
+    apply_library_overrides()
+    host: str = config[CONF_HOST]
+    port: int = config[CONF_PORT]
+    client = LuxtronikCoordinator.create_client(config)
+    try:
+        await hass.async_add_executor_job(client.read_identity)
+    except Exception as err:
+        await hass.async_add_executor_job(client.disconnect)
+        raise LuxtronikConnectionError(host, port, err) from err
+
+    data = LuxtronikCoordinatorData(
+        parameters=client.parameters,
+        calculations=client.calculations,
+        visibilities=client.visibilities,
+    )
+    identity = LuxtronikIdentity(
+        serial_number_date=get_sensor_data(data, LP.P0874_SERIAL_NUMBER),
+        serial_number_model=get_sensor_data(data, LP.P0875_SERIAL_NUMBER_MODEL),
+        model=str(get_sensor_data(data, LC.C0078_MODEL_CODE) or ""),
+        firmware_version=str(get_sensor_data(data, LC.C0081_FIRMWARE_VERSION)),
+    )
+    _park_identified_client(hass, (host, port), client)
+    return identity
+
+
+def _park_identified_client(
+    hass: HomeAssistant, key: tuple[str, int], client: Luxtronik
+) -> None:
+    """Keep an identifying client connected for a short while."""
+    clients = hass.data.setdefault(_IDENTIFIED_CLIENTS, {})
+    if (previous := clients.pop(key, None)) is not None:
+        previous_client, cancel = previous
+        cancel()
+        hass.async_add_executor_job(previous_client.disconnect)
+
+    @callback
+    def _expire(_now: datetime) -> None:
+        if clients.get(key, (None,))[0] is client:
+            del clients[key]
+            hass.async_add_executor_job(client.disconnect)
+
+    clients[key] = (
+        client,
+        async_call_later(hass, IDENTIFIED_CLIENT_REUSE_TIME, _expire),
+    )
+
+
+def _take_identified_client(
+    hass: HomeAssistant, config: Mapping[str, Any]
+) -> Luxtronik | None:
+    """Return the client an identity probe left for this host, if any."""
+    clients = hass.data.get(_IDENTIFIED_CLIENTS)
+    if not clients:
+        return None
+    parked = clients.pop((config[CONF_HOST], config[CONF_PORT]), None)
+    if parked is None:
+        return None
+    client, cancel = parked
+    cancel()
+    LOGGER.debug("Reusing the identity probe's connection to %s", config[CONF_HOST])
+    return client
+
+
+def _new_client(hass: HomeAssistant, config: Mapping[str, Any]) -> Luxtronik:
+    """Return the identity probe's parked client, or a new one for `config`."""
+    # The probe's plain client cannot stand in for a worker; left parked, it
+    # is closed when its reuse time runs out.
+    if config.get(CONF_POLL_WORKER):
+        return LuxtronikCoordinator.create_client(config)
+    return _take_identified_client(hass, config) or LuxtronikCoordinator.create_client(
+        config
+    )
+
+
 async def connect_and_get_coordinator(
     hass: HomeAssistant, config: ConfigEntry | dict[str, Any]
 ) -> LuxtronikCoordinator:
     """Try to connect to a Luxtronik device and return coordinator."""
-    global _OVERRIDES_APPLIED
-    # No lock needed: all override calls are synchronous (no await),
-    # so the event loop cannot preempt between the guard check and flag set.
-    if not _OVERRIDES_APPLIED:
-        update_Luxtronik_HeatpumpCodes()
-        update_Luxtronik_SwitchoffCodes()
-        update_Luxtronik_Parameters()
-        isolate_instance_data()
-        record_parsed_block_lengths()
-        warn_on_unknown_selection_codes()
-        _OVERRIDES_APPLIED = True
-        LOGGER.info(
-            "Library overrides applied (HeatpumpCodes, SwitchoffCodes, Parameters, "
-            "instance data isolation, parsed block length recording, unknown "
-            "selection code warning)."
-        )
+    apply_library_overrides()
 
     config_data: dict[str, Any] = dict(
         config.data if isinstance(config, ConfigEntry) else config
@@ -937,11 +1607,29 @@ async def connect_and_get_coordinator(
 
     entry = config if isinstance(config, ConfigEntry) else None
 
+    snapshot_store: LuxtronikSnapshotStore | None = None
+    if entry is not None:
+        snapshot_store = LuxtronikSnapshotStore(hass, entry.entry_id)
+        coordinator = await _async_restore_coordinator(
+            hass, config_data, entry, snapshot_store
+        )
+        if coordinator is not None:
+            _attach_session_log(hass, coordinator, config_data, entry)
+            _attach_statistics_import(hass, coordinator, config_data, entry)
+            _attach_register_changes(hass, coordinator, config_data, entry)
+            return coordinator
+
     try:  # pragma: no cover
         coordinator = await LuxtronikCoordinator.connect(hass, config_data, entry)
         LOGGER.info("Luxtronik connect to device %s:%s successful!", host, port)
 
-        if isinstance(config, ConfigEntry):
+        if entry is not None:
+            coordinator.snapshot_store = snapshot_store
+            _attach_session_log(hass, coordinator, config_data, entry)
+            _attach_statistics_import(hass, coordinator, config_data, entry)
+            _attach_register_changes(hass, coordinator, config_data, entry)
+            _attach_scheduler(hass, coordinator)
+            await _async_attach_mode_statistics(hass, coordinator, config_data, entry)
             await coordinator.async_config_entry_first_refresh()
             LOGGER.debug(
                 "Initial coordinator refresh completed for %s:%s via config entry",
@@ -969,3 +1657,165 @@ async def connect_and_get_coordinator(
     except Exception as err:
         LOGGER.error("Luxtronik connect to device %s:%s failed: %s", host, port, err)
         raise LuxtronikConnectionError(host, port, err) from err
+
+
+def _attach_scheduler(hass: HomeAssistant, coordinator: LuxtronikCoordinator) -> None:
+    """Have the coordinator share the poll scheduler of all heat pumps.
+
+    Only for a set-up entry, before its first read, so that the first round
+    of polls after a restart is already staggered. A config-flow validation
+    is a single read outside of any rotation.
+    """
+    scheduler = async_get_poll_scheduler(hass)
+    scheduler.register(coordinator)
+    coordinator.scheduler = scheduler
+
+
+async def _async_attach_mode_statistics(
+    hass: HomeAssistant,
+    coordinator: LuxtronikCoordinator,
+    config_data: Mapping[str, Any],
+    entry: ConfigEntry,
+) -> None:
+    """Give the coordinator the totals, cycles and counter COP saved for this entry.
+
+    Loaded before the first read, so that read continues the saved totals
+    instead of starting new ones that the loaded ones would then replace.
+    With an external power meter configured (the same one the COP sensors
+    use), its state events feed the electrical energy between polls.
+    """
+    mode_time = LuxtronikModeTime(hass, entry.entry_id)
+    mode_energy = LuxtronikModeEnergy(hass, entry.entry_id)
+    cycles = LuxtronikCycleStats(hass, entry.entry_id)
+    counter_cop = LuxtronikCounterCop(hass, entry.entry_id)
+    await asyncio.gather(
+        *(store.async_load() for store in (mode_time, mode_energy, cycles, counter_cop))
+    )
+    coordinator.mode_time = mode_time
+    coordinator.mode_energy = mode_energy
+    coordinator.cycles = cycles
+    coordinator.counter_cop = counter_cop
+
+    if entity_id := config_data.get(CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION):
+        tracker = ExternalSensorTracker(entity_id, coordinator._handle_external_power)
+        coordinator._external_power = tracker
+        entry.async_on_unload(tracker.async_start(hass))
+
+
+def _attach_session_log(
+    hass: HomeAssistant,
+    coordinator: LuxtronikCoordinator,
+    config_data: Mapping[str, Any],
+    entry: ConfigEntry,
+) -> None:
+    """Have the client capture its exchanges while the option is on.
+
+    Only for a set-up entry: a config-flow validation is a single read that
+    nobody asked to keep. Turning the option off reloads the entry, which
+    creates a client without a writer.
+    """
+    if not config_data.get(CONF_SESSION_LOG):
+        return
+    path = Path(hass.config.path(SESSION_LOG_FILENAME.format(entry_id=entry.entry_id)))
+    coordinator.client.session_log = SessionLogWriter(path)
+    LOGGER.info("Capturing the Luxtronik session to %s", path)
+
+
+def _attach_statistics_import(
+    hass: HomeAssistant,
+    coordinator: LuxtronikCoordinator,
+    config_data: Mapping[str, Any],
+    entry: ConfigEntry,
+) -> None:
+    """Aggregate the measurement calculations while the option is on.
+
+    The sensor platform tells the importer which sensors to track. The hour
+    in progress is imported when the entry unloads, so a reload (turning the
+    option off included) does not lose it.
+    """
+    if not config_data.get(CONF_STATISTICS_IMPORT):
+        return
+    importer = LuxtronikStatisticsImporter(
+        hass, entry.data[CONF_HA_SENSOR_PREFIX], entry.title
+    )
+    coordinator.statistics_importer = importer
+    entry.async_on_unload(importer.async_flush)
+
+
+def _attach_register_changes(
+    hass: HomeAssistant,
+    coordinator: LuxtronikCoordinator,
+    config_data: Mapping[str, Any],
+    entry: ConfigEntry,
+) -> None:
+    """Diff the raw blocks while the change log or change events are on.
+
+    The options flow only stores ranges that parse, so a failure here is an
+    entry edited by hand: the events are dropped with a warning rather than
+    failing the setup.
+    """
+    try:
+        event_ranges = parse_index_ranges(config_data.get(CONF_CHANGE_LOG_EVENTS))
+    except ValueError as err:
+        LOGGER.warning("Ignoring the register change events: %s", err)
+        event_ranges = {}
+    if not config_data.get(CONF_CHANGE_LOG) and not event_ranges:
+        return
+    writer = None
+    if config_data.get(CONF_CHANGE_LOG):
+        path = Path(
+            hass.config.path(CHANGE_LOG_FILENAME.format(entry_id=entry.entry_id))
+        )
+        writer = ChangeLogWriter(path)
+        LOGGER.info("Logging the Luxtronik register changes to %s", path)
+    coordinator.register_changes = LuxtronikRegisterChanges(
+        hass, entry.entry_id, writer, event_ranges
+    )
+
+
+async def _async_restore_coordinator(
+    hass: HomeAssistant,
+    config_data: Mapping[str, Any],
+    entry: ConfigEntry,
+    snapshot_store: LuxtronikSnapshotStore,
+) -> LuxtronikCoordinator | None:
+    """Set up from the last-known snapshot, refreshing in the background.
+
+    Returns None when there is no usable snapshot (first setup, a different
+    heat pump, an unreadable file), and the caller connects and reads as
+    before. The client is not connected here at all: it connects on the
+    background refresh's first read, so an unreachable heat pump no longer
+    holds up Home Assistant's startup - its entities go unavailable once that
+    refresh fails, like after any other failed poll.
+    """
+    snapshot = await snapshot_store.async_load(entry.unique_id)
+    if snapshot is None:
+        return None
+
+    coordinator = LuxtronikCoordinator(
+        hass=hass,
+        client=_new_client(hass, config_data),
+        config=config_data,
+        config_entry=entry,
+    )
+    coordinator.snapshot_store = snapshot_store
+    try:
+        coordinator.restore_snapshot(snapshot)
+    except Exception as err:
+        # Whatever is wrong with it, a live read is still possible.
+        LOGGER.warning("Could not restore the Luxtronik snapshot: %s", err)
+        # The caller opens its own client; this one may be the identity
+        # probe's connection, which nothing else would close now.
+        await hass.async_add_executor_job(coordinator.client.disconnect)
+        return None
+
+    LOGGER.debug(
+        "Restored Luxtronik snapshot taken at %s, refreshing in the background",
+        snapshot.taken_at,
+    )
+    _attach_scheduler(hass, coordinator)
+    await _async_attach_mode_statistics(hass, coordinator, config_data, entry)
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN} refresh after snapshot restore"
+    )
+    return coordinator
@@ -0,0 +1,189 @@
+"""Rolling and seasonal COP from the controller's own energy counters.
+
+Each poll books the deltas of a circuit's heat and electrical counters into
+local hour, day, month and season buckets, both or neither. A counter that
+goes down restarted from zero; a step above COUNTER_COP_MAX_POWER only
+re-bases the circuit.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timedelta
+from typing import Any, Literal
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    COUNTER_COP_KEEP,
+    COUNTER_COP_MAX_POWER,
+    COUNTER_COP_MIN_ELECTRICAL,
+    COUNTER_COP_SAVE_DELAY,
+    COUNTER_COP_STORAGE_VERSION,
+    HEATING_SEASON_START_MONTH,
+    LuxCalculation as LC,
+    LuxParameter as LP,
+)
+from .store import LuxtronikDelayedStore
+
+type CopCircuit = Literal["heating", "domestic_water", "pool", "cooling"]
+type CopPeriod = Literal["hour", "day", "month", "season"]
+
+_PERIODS: tuple[CopPeriod, ...] = ("hour", "day", "month", "season")
+
+# Circuit -> (heat counter, electrical counter), both in kWh.
+COP_COUNTERS: Mapping[CopCircuit, tuple[LC | LP, LC | LP]] = {
+    "heating": (LC.C0151_HEAT_AMOUNT_HEATING, LP.P1136_HEAT_ENERGY_INPUT),
+    "domestic_water": (LC.C0152_DHW_HEAT_AMOUNT, LP.P1137_DHW_ENERGY_INPUT),
+    "pool": (LC.C0153_POOL_HEAT_AMOUNT, LP.P1138_POOL_ENERGY_INPUT),
+    "cooling": (LP.P1135_COOLING_HEAT_AMOUNT, LP.P1139_COOLING_ENERGY_INPUT),
+}
+
+
+def period_label(period: CopPeriod, at: datetime) -> str:
+    """Return the sortable label of the local `period` that contains `at`."""
+    local = dt_util.as_local(at)
+    if period == "hour":
+        return local.strftime("%Y-%m-%dT%H")
+    if period == "day":
+        return local.date().isoformat()
+    if period == "month":
+        return local.strftime("%Y-%m")
+    start = local.year if local.month >= HEATING_SEASON_START_MONTH else local.year - 1
+    return f"{start}/{(start + 1) % 100:02d}"
+
+
+def _ratio(heat: float, electrical: float) -> float | None:
+    if electrical < COUNTER_COP_MIN_ELECTRICAL:
+        return None
+    return round(heat / electrical, 2)
+
+
+class LuxtronikCounterCop(LuxtronikDelayedStore):
+    """Heat and electrical energy per circuit and period for one heat pump."""
+
+    STORE_NAME = "counter_cop"
+    STORAGE_VERSION = COUNTER_COP_STORAGE_VERSION
+    SAVE_DELAY = COUNTER_COP_SAVE_DELAY
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        super().__init__(hass, entry_id)
+        # period -> label -> circuit -> [heat kWh, electrical kWh]
+        self.periods: dict[str, dict[str, dict[str, list[float]]]] = {}
+        # circuit -> (read at, heat counter, electrical counter)
+        self.readings: dict[str, tuple[float, float, float]] = {}
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        periods = {
+            str(period): {
+                str(label): {
+                    str(circuit): [float(heat), float(electrical)]
+                    for circuit, (heat, electrical) in by_circuit.items()
+                }
+                for label, by_circuit in by_label.items()
+            }
+            for period, by_label in data["periods"].items()
+        }
+        readings = {
+            str(circuit): (float(at), float(heat), float(electrical))
+            for circuit, (at, heat, electrical) in data["readings"].items()
+        }
+        self.periods = periods
+        self.readings = readings
+
+    @callback
+    def observe(self, at: datetime, counters: Mapping[str, tuple[Any, Any]]) -> None:
+        """Book the counter deltas since the last reading of each circuit."""
+        now = at.timestamp()
+        for circuit, (heat, electrical) in counters.items():
+            if not isinstance(heat, int | float) or not isinstance(
+                electrical, int | float
+            ):
+                continue
+            previous = self.readings.get(circuit)
+            if previous is not None and now <= previous[0]:
+                continue
+            self.readings[circuit] = (now, float(heat), float(electrical))
+            if previous is None:
+                continue
+            hours = (now - previous[0]) / 3600
+            heat_delta = self._delta(previous[1], float(heat), hours)
+            electrical_delta = self._delta(previous[2], float(electrical), hours)
+            if heat_delta is None or electrical_delta is None:
+                continue
+            if heat_delta or electrical_delta:
+                self._book(circuit, at, heat_delta, electrical_delta)
+        self._schedule_save()
+
+    @staticmethod
+    def _delta(previous: float, current: float, hours: float) -> float | None:
+        """Return the energy between two readings, or None to re-base."""
+        limit = COUNTER_COP_MAX_POWER * hours
+        delta = current - previous if current >= previous else current
+        return delta if 0 <= delta <= limit else None
+
+    def _book(self, circuit: str, at: datetime, heat: float, electrical: float) -> None:
+        for period in _PERIODS:
+            keep = COUNTER_COP_KEEP[period]
+            by_label = self.periods.setdefault(period, {})
+            bucket = by_label.setdefault(period_label(period, at), {}).setdefault(
+                circuit, [0.0, 0.0]
+            )
+            bucket[0] += heat
+            bucket[1] += electrical
+            for label in sorted(by_label)[:-keep]:
+                del by_label[label]
+
+    def energy(
+        self,
+        circuits: Iterable[str],
+        period: CopPeriod,
+        first: str,
+        last: str | None = None,
+    ) -> tuple[float, float]:
+        """Return (heat, electrical) kWh of `circuits` over labels first..last."""
+        heat = electrical = 0.0
+        circuits = tuple(circuits)
+        for label, by_circuit in self.periods.get(period, {}).items():
+            if label < first or (last is not None and label > last):
+                continue
+            for circuit in circuits:
+                if bucket := by_circuit.get(circuit):
+                    heat += bucket[0]
+                    electrical += bucket[1]
+        return heat, electrical
+
+    def summary(self, circuits: Iterable[str], now: datetime) -> dict[str, Any]:
+        """Return the COP of `circuits` over the rolling and calendar periods."""
+        circuits = tuple(circuits)
+        today = dt_util.as_local(now).date()
+        season = period_label("season", now)
+        previous_season = period_label("season", now - timedelta(days=365))
+        season_heat, season_electrical = self.energy(circuits, "season", season, season)
+        return {
+            "last_24_hours": _ratio(
+                *self.energy(
+                    circuits, "hour", period_label("hour", now - timedelta(hours=23))
+                )
+            ),
+            "last_7_days": _ratio(
+                *self.energy(circuits, "day", (today - timedelta(days=6)).isoformat())
+            ),
+            "last_30_days": _ratio(
+                *self.energy(circuits, "day", (today - timedelta(days=29)).isoformat())
+            ),
+            "this_month": _ratio(
+                *self.energy(circuits, "month", period_label("month", now))
+            ),
+            "season": _ratio(season_heat, season_electrical),
+            "previous_season": _ratio(
+                *self.energy(circuits, "season", previous_season, previous_season)
+            ),
+            "season_heat": round(season_heat, 2),
+            "season_electrical": round(season_electrical, 2),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the JSON-serialisable form written to the store."""
+        return {"periods": self.periods, "readings": self.readings}
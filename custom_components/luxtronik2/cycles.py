@@ -0,0 +1,195 @@
+"""Compressor cycles and defrosts, detected poll by poll.
+
+A start is an off -> on change of the compressor output; impulse counter
+steps beyond the starts seen are cycles between two polls, kept without a
+runtime. A gap longer than MODE_TIME_MAX_GAP forgets an open cycle's start,
+and counter steps across it are not counted.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+import math
+import statistics
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CYCLE_EVENTS_MAX,
+    CYCLE_IMPULSES_MAX_STEP,
+    CYCLE_OUTDOOR_BAND,
+    CYCLE_SAVE_DELAY,
+    CYCLE_STATS_WINDOW,
+    CYCLE_STORAGE_VERSION,
+    MODE_TIME_MAX_GAP,
+    SHORT_CYCLE_RUNTIME,
+    LuxOperationMode,
+)
+from .store import LuxtronikDelayedStore
+
+
+def outdoor_band(temperature: float) -> int:
+    """Return the lower bound of the outdoor temperature band `temperature` is in."""
+    return int(math.floor(temperature / CYCLE_OUTDOOR_BAND) * CYCLE_OUTDOOR_BAND)
+
+
+class LuxtronikCycleStats(LuxtronikDelayedStore):
+    """Compressor cycles and defrosts of one heat pump."""
+
+    STORE_NAME = "cycles"
+    STORAGE_VERSION = CYCLE_STORAGE_VERSION
+    SAVE_DELAY = CYCLE_SAVE_DELAY
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        super().__init__(hass, entry_id)
+        # Epoch seconds of each start.
+        self.starts: deque[float] = deque(maxlen=CYCLE_EVENTS_MAX)
+        # (stopped at, runtime in seconds); None: started and stopped
+        # between two polls.
+        self.runs: deque[tuple[float, float | None]] = deque(maxlen=CYCLE_EVENTS_MAX)
+        # (started at, outdoor temperature)
+        self.defrosts: deque[tuple[float, float | None]] = deque(
+            maxlen=CYCLE_EVENTS_MAX
+        )
+        # Outdoor band -> [defrosts, compressor seconds], lifetime.
+        self.bands: dict[int, list[float]] = {}
+        # The previous poll.
+        self._at: float | None = None
+        self._running: bool | None = None
+        self._started_at: float | None = None
+        self._impulses: int | None = None
+        self._defrosting = False
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        starts = [float(at) for at in data["starts"]]
+        runs = [
+            (float(at), None if runtime is None else float(runtime))
+            for at, runtime in data["runs"]
+        ]
+        defrosts = [
+            (float(at), None if outdoor is None else float(outdoor))
+            for at, outdoor in data["defrosts"]
+        ]
+        bands = {
+            int(band): [float(defrosts), float(seconds)]
+            for band, (defrosts, seconds) in data["bands"].items()
+        }
+        state = data["state"]
+        at = None if state["at"] is None else float(state["at"])
+        running = None if state["running"] is None else bool(state["running"])
+        started_at = None if state["started_at"] is None else float(state["started_at"])
+        impulses = None if state["impulses"] is None else int(state["impulses"])
+        defrosting = bool(state["defrosting"])
+        self.starts.extend(starts)
+        self.runs.extend(runs)
+        self.defrosts.extend(defrosts)
+        self.bands = bands
+        self._at, self._running, self._started_at = at, running, started_at
+        self._impulses, self._defrosting = impulses, defrosting
+
+    @callback
+    def observe(
+        self,
+        at: datetime,
+        running: Any,
+        impulses: Any,
+        status: Any,
+        outdoor: Any,
+    ) -> None:
+        """Detect starts, stops and defrosts since the previous poll."""
+        now = at.timestamp()
+        if self._at is not None and now <= self._at:
+            return
+        connected = self._at is not None and now - self._at <= (
+            MODE_TIME_MAX_GAP.total_seconds()
+        )
+        running = running if isinstance(running, bool) else None
+        impulses = impulses if isinstance(impulses, int) else None
+        outdoor = float(outdoor) if isinstance(outdoor, int | float) else None
+
+        if not connected:
+            self._started_at = None
+        elif self._running and outdoor is not None and self._at is not None:
+            band = self.bands.setdefault(outdoor_band(outdoor), [0.0, 0.0])
+            band[1] += now - self._at
+
+        seen_starts = 0
+        if running is not None and self._running is not None:
+            if running and not self._running:
+                seen_starts = 1
+                self.starts.append(now)
+                self._started_at = now if connected else None
+            elif not running and self._running:
+                if self._started_at is not None:
+                    self.runs.append((now, now - self._started_at))
+                self._started_at = None
+
+        if connected and impulses is not None and self._impulses is not None:
+            missed = impulses - self._impulses - seen_starts
+            if 0 < missed <= CYCLE_IMPULSES_MAX_STEP:
+                for _ in range(missed):
+                    self.starts.append(now)
+                    self.runs.append((now, None))
+
+        defrosting = status == LuxOperationMode.defrost
+        if defrosting and not self._defrosting:
+            self.defrosts.append((now, outdoor))
+            if outdoor is not None:
+                self.bands.setdefault(outdoor_band(outdoor), [0.0, 0.0])[0] += 1
+
+        self._at = now
+        self._running = running
+        self._impulses = impulses if impulses is not None else self._impulses
+        self._defrosting = defrosting
+        self._schedule_save()
+
+    def summary(self, now: datetime) -> dict[str, Any]:
+        """Return the statistics over the last CYCLE_STATS_WINDOW."""
+        window = CYCLE_STATS_WINDOW.total_seconds()
+        since = now.timestamp() - window
+        hours = window / 3600
+        starts = sum(1 for at in self.starts if at >= since)
+        runs = [runtime for at, runtime in self.runs if at >= since]
+        runtimes = [runtime for runtime in runs if runtime is not None]
+        short = sum(
+            1
+            for runtime in runs
+            if runtime is None or runtime < SHORT_CYCLE_RUNTIME.total_seconds()
+        )
+        defrosts = sum(1 for at, _ in self.defrosts if at >= since)
+        return {
+            "starts": starts,
+            "cycles_per_hour": round(starts / hours, 2),
+            "mean_runtime": statistics.fmean(runtimes) if runtimes else None,
+            "median_runtime": statistics.median(runtimes) if runtimes else None,
+            "short_cycle_rate": round(100 * short / len(runs), 1) if runs else None,
+            "defrosts": defrosts,
+            "defrosts_per_compressor_hour": self.defrosts_by_outdoor_band(),
+        }
+
+    def defrosts_by_outdoor_band(self) -> dict[str, float | None]:
+        """Return defrosts per compressor run hour for each outdoor band, in °C."""
+        return {
+            f"{band}..{band + CYCLE_OUTDOOR_BAND}": (
+                round(defrosts / (seconds / 3600), 2) if seconds else None
+            )
+            for band, (defrosts, seconds) in sorted(self.bands.items())
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the JSON-serialisable form written to the store."""
+        return {
+            "starts": list(self.starts),
+            "runs": list(self.runs),
+            "defrosts": list(self.defrosts),
+            "bands": {str(band): values for band, values in self.bands.items()},
+            "state": {
+                "at": self._at,
+                "running": self._running,
+                "started_at": self._started_at,
+                "impulses": self._impulses,
+                "defrosting": self._defrosting,
+            },
+        }
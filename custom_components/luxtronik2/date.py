@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import UTC, date, datetime
+import logging
 
 from homeassistant.components.date import (
     ENTITY_ID_FORMAT,  # pyright: ignore[reportAttributeAccessIssue]
@@ -20,6 +21,7 @@ from .const import (
 )
 from .coordinator import LuxtronikCoordinator, LuxtronikCoordinatorData
 from .date_entities_predefined import CALENDAR_ENTITIES
+from .entity_plan import plan_descriptions
 from .model import LuxtronikDateEntityDescription
 
 PARALLEL_UPDATES = 1
@@ -35,25 +37,32 @@ async def async_setup_entry(  # pragma: no cover
     if not coordinator.last_update_success:
         return
 
-    unavailable_keys = [
-        i.luxtronik_key
-        for i in CALENDAR_ENTITIES
-        if not key_exists(coordinator.data, i.luxtronik_key)
-    ]
-    if unavailable_keys:
-        # Not all models/firmware versions support every parameter;
-        # missing keys are expected and not an error.
-        LOGGER.debug("Not present in Luxtronik data, skipping: %s", unavailable_keys)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        unavailable_keys = [
+            i.luxtronik_key
+            for i in CALENDAR_ENTITIES
+            if not key_exists(coordinator.data, i.luxtronik_key)
+        ]
+        if unavailable_keys:
+            # Not all models/firmware versions support every parameter;
+            # missing keys are expected and not an error.
+            LOGGER.debug(
+                "Not present in Luxtronik data, skipping: %s", unavailable_keys
+            )
 
     async_add_entities(
         [
             LuxtronikDateEntity(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in CALENDAR_ENTITIES
-            if (
-                coordinator.entity_active(description)
-                and key_exists(coordinator.data, description.luxtronik_key)
+            for description in plan_descriptions(
+                coordinator,
+                "date",
+                CALENDAR_ENTITIES,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and key_exists(coordinator.data, description.luxtronik_key)
+                ),
             )
         ]
     )
@@ -13,11 +13,13 @@ from typing import Any, TypeIs
 from homeassistant.components.diagnostics import REDACTED, async_redact_data
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from . import LuxtronikConfigEntry
 from .common import async_get_mac_address
 from .const import LOGGER
 from .coordinator import LuxtronikCoordinator, LuxtronikSerialNumberError
+from .counter_cop import COP_COUNTERS
 from .log_capture import get_captured_log_records
 
 # endregion Imports
@@ -83,6 +85,48 @@ async def async_get_config_entry_diagnostics(
         ),
         "calculations": _dump_items(coordinator.data.calculations.calculations),
         "visibilities": _dump_items(coordinator.data.visibilities.visibilities),
+        # Rolling read/write timings and counters of this connection (see
+        # poll_stats.py), so a "the integration is slow / keeps going
+        # unavailable" report carries the numbers without debug logging.
+        "poll_stats": coordinator.poll_stats.as_dict(),
+        # Shape of the in-memory calculation history (see history.py).
+        "history": coordinator.history.as_dict(),
+        # Compressor cycles and defrosts over the last 24 hours (see
+        # cycles.py), for "is it short-cycling" reports.
+        "cycles": (
+            coordinator.cycles.summary(dt_util.utcnow())
+            if coordinator.cycles is not None
+            else None
+        ),
+        # Hour being aggregated for the statistics import, if on (see
+        # statistics_import.py).
+        "statistics_import": (
+            coordinator.statistics_importer.as_dict()
+            if coordinator.statistics_importer is not None
+            else None
+        ),
+        # Register change log and events, if on (see register_changes.py).
+        "register_changes": (
+            coordinator.register_changes.as_dict()
+            if coordinator.register_changes is not None
+            else None
+        ),
+        # COP per circuit from the energy counters (see counter_cop.py).
+        "counter_cop": (
+            {
+                circuit: coordinator.counter_cop.summary((circuit,), dt_util.utcnow())
+                for circuit in COP_COUNTERS
+            }
+            if coordinator.counter_cop is not None
+            else None
+        ),
+        # Shared by all heat pumps (see scheduler.py): how long this one
+        # waited for the others, and what they poll together.
+        "scheduler": (
+            coordinator.scheduler.as_dict()
+            if coordinator.scheduler is not None
+            else None
+        ),
         "log_records": get_captured_log_records(),
     }
     # Substitute once, over the finished payload. Doing it per-section is how
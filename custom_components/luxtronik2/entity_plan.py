@@ -0,0 +1,211 @@
+"""Which entities a config entry creates, persisted between starts.
+
+Every platform's `async_setup_entry` decides which predefined descriptions
+become entities: `key_exists` (a linear scan of a register block, per
+description), `entity_active` with its firmware gates and capability
+detection, and for the PV mode selector the option list resolved from the
+current mode. That is several hundred descriptions, re-decided on every start
+and every reload although the answer only changes when the heat pump does.
+
+The outcome - the "entity plan" - is stored per config entry: for each group
+of descriptions, which ones were created and the options resolved for them.
+It is reused as long as the fingerprint it was made under still matches
+(`LuxtronikCoordinator.entity_plan_fingerprint`), and everything that decides
+the outcome is in that fingerprint:
+
+- model, firmware version and parsed block lengths, which decide the version
+  gates and which registers exist (see `_register_returned`);
+- the integration version, since descriptions and their gates change between
+  releases;
+- the capabilities `device_key_active` and the solar / DHW-pump visibilities
+  are derived from, as their results rather than their inputs: they are read
+  off operating-hour counters and live temperatures, which differ on every
+  start while the conclusion does not;
+- the few settings a selection reads directly (`ENTITY_PLAN_SETTINGS`).
+
+Descriptions with an `entity_active_formula` are the exception. Their outcome
+depends on the live value of their own register, so they are never taken
+from the plan and are decided again on every start, as before.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import replace
+from hashlib import sha256
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    ENTITY_PLAN_SAVE_DELAY,
+    ENTITY_PLAN_STORAGE_VERSION,
+    LOGGER,
+    LuxParameter as LP,
+)
+from .model import LuxtronikEntityDescription
+
+if TYPE_CHECKING:
+    from .coordinator import LuxtronikCoordinator
+
+# Registers an entity selection reads the value of: the mixing circuit types
+# gate the cooling entities of each circuit, the room thermostat type picks
+# the thermostat set, and the PV mode decides the PV mode selector's options.
+ENTITY_PLAN_SETTINGS = (
+    LP.P0033_ROOM_THERMOSTAT_TYPE,
+    LP.P0042_MIXING_CIRCUIT1_TYPE,
+    LP.P0130_MIXING_CIRCUIT2_TYPE,
+    LP.P0780_MIXING_CIRCUIT3_TYPE,
+    LP.P0119_MODE_PV,
+)
+
+
+def _signature(descriptions: Sequence[LuxtronikEntityDescription]) -> str:
+    """Identify a description table, so a plan is not applied to another one.
+
+    The integration version covers released changes; this also covers a
+    table edited in place (a development install, a hotfix without a
+    version bump), where stored indices would point at different entries.
+    """
+    digest = sha256()
+    for description in descriptions:
+        digest.update(
+            f"{description.key}|{description.luxtronik_key}|"
+            f"{description.device_key};".encode()
+        )
+    return digest.hexdigest()
+
+
+class LuxtronikEntityPlan:
+    """The stored entity plan of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, ENTITY_PLAN_STORAGE_VERSION, f"{DOMAIN}.entity_plan.{entry_id}"
+        )
+        self._fingerprint: dict[str, Any] = {}
+        self._groups: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+
+    async def async_load(self, fingerprint: dict[str, Any]) -> None:
+        """Load the stored plan, keeping it only if `fingerprint` matches."""
+        self._fingerprint = fingerprint
+        data = await self._store.async_load()
+        if not isinstance(data, dict):
+            return
+        if data.get("fingerprint") != fingerprint:
+            LOGGER.debug(
+                "Heat pump changed since the entity plan was stored, rebuilding it"
+            )
+            return
+        groups = data.get("groups")
+        if isinstance(groups, dict):
+            self._groups = groups
+
+    def select[DescriptionT: LuxtronikEntityDescription](
+        self,
+        group: str,
+        descriptions: Sequence[DescriptionT],
+        predicate: Callable[[DescriptionT], bool],
+        resolve: Callable[[DescriptionT], DescriptionT] | None = None,
+    ) -> list[DescriptionT]:
+        """Return the descriptions of `group` to create entities for.
+
+        `predicate` is the platform's own selection, evaluated only when the
+        plan has nothing usable for this group. `resolve` turns a selected
+        description into the one the entity is created from; what it changes
+        is stored as the description's options.
+        """
+        signature = _signature(descriptions)
+        stored = self._groups.get(group)
+        if stored is not None and stored.get("signature") == signature:
+            try:
+                return self._apply(stored, descriptions, predicate, resolve)
+            except (KeyError, TypeError, ValueError):
+                LOGGER.debug("Unreadable entity plan for %s, rebuilding it", group)
+
+        selected: list[int] = []
+        options: dict[str, list[str]] = {}
+        result: list[DescriptionT] = []
+        for index, description in enumerate(descriptions):
+            if not predicate(description):
+                continue
+            resolved = resolve(description) if resolve is not None else description
+            result.append(resolved)
+            if description.entity_active_formula is not None:
+                continue
+            selected.append(index)
+            resolved_options = getattr(resolved, "options", None)
+            if resolved_options != getattr(description, "options", None):
+                options[str(index)] = list(resolved_options or [])
+        self._groups[group] = {
+            "signature": signature,
+            "selected": selected,
+            "options": options,
+        }
+        self._dirty = True
+        return result
+
+    @staticmethod
+    def _apply[DescriptionT: LuxtronikEntityDescription](
+        stored: dict[str, Any],
+        descriptions: Sequence[DescriptionT],
+        predicate: Callable[[DescriptionT], bool],
+        resolve: Callable[[DescriptionT], DescriptionT] | None,
+    ) -> list[DescriptionT]:
+        selected = {int(index) for index in stored["selected"]}
+        options: dict[str, list[str]] = stored["options"]
+        result: list[DescriptionT] = []
+        for index, description in enumerate(descriptions):
+            if description.entity_active_formula is not None:
+                if predicate(description):
+                    result.append(
+                        resolve(description) if resolve is not None else description
+                    )
+            elif index in selected:
+                result.append(
+                    replace(description, options=list(options[str(index)]))  # pyright: ignore[reportCallIssue]
+                    if str(index) in options
+                    else description
+                )
+        return result
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the plan if a group was (re)built during this setup."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._store.async_delay_save(self._data_to_save, ENTITY_PLAN_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"fingerprint": self._fingerprint, "groups": self._groups}
+
+    async def async_remove(self) -> None:
+        """Delete the stored plan."""
+        await self._store.async_remove()
+
+
+def plan_descriptions[DescriptionT: LuxtronikEntityDescription](
+    coordinator: LuxtronikCoordinator,
+    group: str,
+    descriptions: Sequence[DescriptionT],
+    predicate: Callable[[DescriptionT], bool],
+    resolve: Callable[[DescriptionT], DescriptionT] | None = None,
+) -> list[DescriptionT]:
+    """Select a platform's descriptions through the entry's plan, if it has one.
+
+    Without a plan (a coordinator not bound to a config entry) every
+    description is decided directly, exactly as the plan does on a miss.
+    """
+    plan = coordinator.entity_plan
+    if plan is not None:
+        return plan.select(group, descriptions, predicate, resolve)
+    return [
+        resolve(description) if resolve is not None else description
+        for description in descriptions
+        if predicate(description)
+    ]
@@ -0,0 +1,94 @@
+"""Push-based access to a Home Assistant sensor an entity depends on.
+
+Two entities take an input from outside the heat pump: the thermostat's
+indoor temperature override (CONF_HA_SENSOR_INDOOR_TEMPERATURE) and the COP
+sensors' external power meter (CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION).
+Both used to look that sensor up with `hass.states.get` inside
+`_handle_coordinator_update`, so they only ever saw it at poll time: the COP
+lagged the meter by up to a full update interval, and a meter reporting every
+few seconds was sampled once a minute - aliasing any load that cycles faster
+than that into a COP that jumped between unrelated values.
+
+`ExternalSensorTracker` subscribes to the sensor instead and keeps its latest
+value together with when it was sampled, so the owning entity can recompute
+as soon as the input changes and can tell how far the sample is from the
+heat pump snapshot it is combined with.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    EventStateReportedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_state_report_event,
+)
+
+from .common import state_as_number_or_none
+
+
+class ExternalSensorTracker:
+    """Latest numeric value of one external sensor, kept current by events."""
+
+    def __init__(
+        self,
+        entity_id: str,
+        on_change: Callable[[], None],
+        default: float | None = None,
+    ) -> None:
+        self.entity_id = entity_id
+        self._on_change = on_change
+        # Returned for a state that exists but is not a number, matching what
+        # each caller did with `state_as_number_or_none` before.
+        self._default = default
+        self.value: float | None = None
+        self.sampled_at: datetime | None = None
+
+    @callback
+    def async_start(self, hass: HomeAssistant) -> CALLBACK_TYPE:
+        """Seed from the current state and subscribe; return the unsubscriber."""
+        self.update_from_state(hass.states.get(self.entity_id))
+        unsub_changed = async_track_state_change_event(
+            hass, self.entity_id, self._async_state_changed
+        )
+        unsub_reported = async_track_state_report_event(
+            hass, self.entity_id, self._async_state_reported
+        )
+
+        @callback
+        def _unsubscribe() -> None:
+            unsub_changed()
+            unsub_reported()
+
+        return _unsubscribe
+
+    def update_from_state(self, state: State | None) -> None:
+        """Take value and sample time from `state` (None: sensor is gone)."""
+        if state is None:
+            self.value = None
+            self.sampled_at = None
+            return
+        self.value = state_as_number_or_none(state, self._default)
+        self.sampled_at = state.last_reported
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        self.update_from_state(event.data["new_state"])
+        self._on_change()
+
+    @callback
+    def _async_state_reported(self, event: Event[EventStateReportedData]) -> None:
+        # The same value written again. Nothing to recompute, but the sample
+        # is fresh - without this, a meter holding a steady load would look
+        # as if it had stopped reporting.
+        self.sampled_at = event.data["last_reported"]
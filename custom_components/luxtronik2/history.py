@@ -0,0 +1,163 @@
+"""Recent calculation readings kept in memory, one column per register.
+
+Each successful poll appends the raw calculations block to a ring buffer of
+one `array` per register plus one of timestamps; values stay raw and are
+decoded by the caller. Only the event loop touches the buffer, so no lock.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class HistoryStats:
+    """Summary of one register over a window, in raw register units.
+
+    `rate_per_hour` is the least-squares slope over the window rather than
+    last minus first, so a single noisy sample at either end does not swing
+    it; None with fewer than two samples.
+    """
+
+    samples: int
+    since: float
+    first: int
+    last: int
+    minimum: int
+    maximum: int
+    mean: float
+    rate_per_hour: float | None
+
+
+def numeric_scale(item: Any) -> float | None:
+    """Return the factor that turns a raw value of `item` into its decoded one.
+
+    Every numeric luxtronik datatype decodes as raw / divisor, so decoding
+    the raw statistics is one multiplication - including the mean and the
+    rate, which a non-linear decode would not allow. Anything else (a
+    selection, a bool, a timestamp, the version string) has no meaningful
+    mean or trend, and returns None.
+    """
+    try:
+        scale = item.from_heatpump(1)
+    except (TypeError, ValueError):
+        return None
+    if type(scale) not in (int, float) or not scale:
+        return None
+    return float(scale)
+
+
+class CalculationHistory:
+    """Ring buffer of calculations blocks, stored as one column per register."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._times = array("d", bytes(8 * self.capacity))
+        self._columns: list[array[int]] = []
+        # Physical slot the next append goes to, and how many are filled.
+        self._head = 0
+        self.count = 0
+
+    @property
+    def width(self) -> int:
+        """Return the number of registers per sample."""
+        return len(self._columns)
+
+    def append(self, timestamp: float, values: list[int]) -> None:
+        """Record one calculations block read at `timestamp` (epoch seconds).
+
+        A block of a different length - a firmware update changes how many
+        calculations the controller reports - starts the history over,
+        because the columns would no longer line up with the registers.
+        """
+        if len(values) != self.width:
+            self.clear()
+            self._columns = [
+                array("i", bytes(4 * self.capacity)) for _ in range(len(values))
+            ]
+        head = self._head
+        self._times[head] = timestamp
+        for column, value in zip(self._columns, values, strict=True):
+            column[head] = value
+        self._head = (head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        self._columns = []
+        self._head = 0
+        self.count = 0
+
+    def _slot(self, position: int) -> int:
+        """Map a position counted from the oldest sample to its array slot."""
+        return (self._head - self.count + position) % self.capacity
+
+    def _window_start(self, cutoff: float) -> int:
+        """Return the position of the oldest sample at or after `cutoff`.
+
+        Timestamps only ever increase, so a binary search over positions
+        finds the window without scanning the part outside it.
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._times[self._slot(middle)] < cutoff:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def stats(self, index: int, seconds: float, now: float) -> HistoryStats | None:
+        """Return the statistics of register `index` over the last `seconds`.
+
+        None if the register is not in the block or the window holds no
+        samples.
+        """
+        if not 0 <= index < self.width:
+            return None
+        start = self._window_start(now - seconds)
+        slots = [self._slot(position) for position in range(start, self.count)]
+        if not slots:
+            return None
+        column = self._columns[index]
+        values = [column[slot] for slot in slots]
+        times = [self._times[slot] for slot in slots]
+        samples = len(values)
+        mean = sum(values) / samples
+
+        rate_per_hour = None
+        if samples > 1:
+            mean_time = sum(times) / samples
+            spread = sum((time - mean_time) ** 2 for time in times)
+            if spread > 0:
+                slope = (
+                    sum(
+                        (time - mean_time) * (value - mean)
+                        for time, value in zip(times, values, strict=True)
+                    )
+                    / spread
+                )
+                rate_per_hour = slope * 3600
+
+        return HistoryStats(
+            samples=samples,
+            since=times[0],
+            first=values[0],
+            last=values[-1],
+            minimum=min(values),
+            maximum=max(values),
+            mean=mean,
+            rate_per_hour=rate_per_hour,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the buffer's shape, for diagnostics."""
+        return {
+            "capacity": self.capacity,
+            "samples": self.count,
+            "registers": self.width,
+            "oldest": self._times[self._slot(0)] if self.count else None,
+            "newest": self._times[self._slot(self.count - 1)] if self.count else None,
+        }
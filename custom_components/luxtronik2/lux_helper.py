@@ -3,35 +3,56 @@
 # region Imports
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncGenerator, Callable, Iterable, Mapping, Sequence
 import contextlib
+from ipaddress import IPv4Interface
 import socket
 import struct
 import threading
 import time
+from typing import Any
 
 from luxtronik.calculations import Calculations
 from luxtronik.parameters import Parameters
 from luxtronik.visibilities import Visibilities
 
 from .const import (
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    DEFAULT_PORT,
     LOGGER,
     LUX_MODELS_ALPHA_INNOTEC,
     LUX_MODELS_NOVELAN,
     LUX_MODELS_OTHER,
+    LuxPollStat,
 )
+from .poll_stats import LuxtronikPollStats
+from .session_log import SessionLogWriter, encode_values
 
 # endregion Imports
 
 # List of ports that are known to respond to discovery packets.
-# Note: 47808 is also the IANA-reserved standard port for BACnet. discover()
-# only binds it for the brief duration of a broadcast+listen cycle and closes
-# it immediately after, but if another BACnet tool on the same host tries to
-# bind it at the same moment, one of the two will fail to bind.
+# Note: 47808 is also the IANA-reserved standard port for BACnet.
+# async_discover_stream() only binds it for the brief duration of a
+# broadcast+listen cycle and closes it immediately after, but if another
+# BACnet tool on the same host holds it at that moment, discovery carries on
+# with the other port.
 LUXTRONIK_DISCOVERY_PORTS = [4444, 47808]
 
-# Time (in seconds) to wait for response after sending discovery broadcast
+# Time (in seconds) to wait for responses after sending the discovery
+# broadcasts; all ports are asked at once and share it.
 LUXTRONIK_DISCOVERY_TIMEOUT = 2
 
+# Fallback TCP probe of the local subnets (see async_scan_hosts). Probes in
+# flight at once, and how long each may take to connect and answer: a
+# controller on the LAN answers within milliseconds, a missing host never.
+LUXTRONIK_SCAN_CONCURRENCY = 64
+LUXTRONIK_SCAN_CONNECT_TIMEOUT = 0.5
+# Subnets larger than this are narrowed to the /24 around our own address.
+LUXTRONIK_SCAN_MIN_PREFIX = 24
+
 # Content of packet that will be sent for discovering heat pumps
 LUXTRONIK_DISCOVERY_MAGIC_PACKET = "2000;111;1;\x00"
 
@@ -56,78 +77,247 @@ LUXTRONIK_VISIBILITIES_READ = 3005
 # over the measurement while capping the damage from a silent controller.
 LUXTRONIK_WRITE_ACK_TIMEOUT = 5.0
 
+# Retries of a block read by read_identity(), against the four of a poll.
+IDENTITY_READ_RETRIES = 1
+
+# The controller's version string spans calculations 81-90 (see
+# Calculations.parse()); those registers are decoded together.
+CALCULATIONS_VERSION_RANGE = range(81, 91)
+
+# Per-block statistics (read time, bytes), keyed by the label _read() reads
+# each block under.
+_BLOCK_STATS: dict[str, tuple[LuxPollStat, LuxPollStat]] = {
+    CONF_PARAMETERS: (LuxPollStat.PARAMETERS_READ_TIME, LuxPollStat.PARAMETERS_BYTES),
+    CONF_CALCULATIONS: (
+        LuxPollStat.CALCULATIONS_READ_TIME,
+        LuxPollStat.CALCULATIONS_BYTES,
+    ),
+    CONF_VISIBILITIES: (
+        LuxPollStat.VISIBILITIES_READ_TIME,
+        LuxPollStat.VISIBILITIES_BYTES,
+    ),
+}
+
+
+def _parse_discovery_response(data: bytes, ip_address: str) -> tuple[str, int] | None:
+    """Return host and TCP port from a discovery reply, None if it is not one."""
+    res = data.decode("ascii", errors="ignore")
+    # if we receive what we just sent, skip it
+    if res == LUXTRONIK_DISCOVERY_MAGIC_PACKET:
+        return None
+    res_list = res.split(";")
+    # if the response starts with the magic nonsense
+    if not res.startswith(LUXTRONIK_DISCOVERY_RESPONSE_PREFIX):
+        LOGGER.debug(f"Skipping invalid response from {ip_address}: {res_list!s}")
+        return None
+    LOGGER.debug(f"Received valid Luxtronik response from {ip_address}: {res_list!s}")
+    try:
+        res_port: int | None = int(res_list[2])
+    except (ValueError, IndexError):
+        res_port = None
+
+    if res_port is None or res_port < 1 or res_port > 65535:
+        LOGGER.info(
+            f"Response contains [port={res_port}] which is not a valid port number,"
+            "an old Luxtronic software version might be the reason. "
+            "Skipping this port."
+        )
+        return None
+    return ip_address, res_port
 
-def discover(
-    broadcast_addresses: list[str] | None = None,
-) -> list[tuple[str, int | None]]:
-    """Broadcast discovery for Luxtronik heat pumps.
 
-    If you omit ``broadcast_addresses``, fallback to the OS-selected
-    default route.
-    """
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Queues the valid replies arriving on one discovery port."""
+
+    def __init__(self, found: asyncio.Queue[tuple[str, int]]) -> None:
+        self._found = found
 
+    def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+        result = _parse_discovery_response(data, str(addr[0]))
+        if result is not None:
+            self._found.put_nowait(result)
+
+    def error_received(self, exc: Exception) -> None:
+        LOGGER.debug("Discovery socket error: %s", exc)
+
+
+async def async_discover_stream(
+    broadcast_addresses: list[str] | None = None,
+    *,
+    ports: Sequence[int] = LUXTRONIK_DISCOVERY_PORTS,
+    listen_time: float = LUXTRONIK_DISCOVERY_TIMEOUT,
+) -> AsyncGenerator[tuple[str, int]]:
+    """Broadcast discovery for Luxtronik heat pumps, yielding them as they answer.
+
+    Every port and every broadcast address is asked at once, and each heat
+    pump is yielded as soon as its reply arrives, so the whole search takes
+    `listen_time` rather than `listen_time` per port. A caller that has what it needs
+    can stop iterating early. If you omit ``broadcast_addresses``, fallback
+    to the OS-selected default route.
+
+    A port that cannot be bound (47808 held by a BACnet tool) is skipped;
+    OSError is raised only when none of them can be.
+    """
     targets: list[str] = (
         list(broadcast_addresses) if broadcast_addresses else ["255.255.255.255"]
     )
-    results: list[tuple[str, int | None]] = []
-
-    # pylint: disable=too-many-nested-blocks
-    for port in LUXTRONIK_DISCOVERY_PORTS:
-        LOGGER.info("Send discovery packets to port %s on %s", port, targets)
-        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        server.bind(("", port))
-        server.settimeout(LUXTRONIK_DISCOVERY_TIMEOUT)
-
-        # send AIT magic broadcast packet to every target broadcast address
-        magic_bytes = LUXTRONIK_DISCOVERY_MAGIC_PACKET.encode()
-        for target in targets:
-            server.sendto(magic_bytes, (target, port))
-            LOGGER.debug("Sent broadcast request to %s:%s", target, port)
-
-        while True:
+    loop = asyncio.get_running_loop()
+    found: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+    magic_bytes = LUXTRONIK_DISCOVERY_MAGIC_PACKET.encode()
+    transports: list[asyncio.DatagramTransport] = []
+    bind_error: OSError | None = None
+    try:
+        for port in ports:
             try:
-                recv_bytes, con = server.recvfrom(1024)
-                res = recv_bytes.decode("ascii", errors="ignore")
-                # if we receive what we just sent, continue
-                if res == LUXTRONIK_DISCOVERY_MAGIC_PACKET:
-                    continue
-                ip_address = con[0]
-                res_list = res.split(";")
-                # if the response starts with the magic nonsense
-                if res.startswith(LUXTRONIK_DISCOVERY_RESPONSE_PREFIX):
-                    LOGGER.debug(
-                        f"Received valid Luxtronik response from {ip_address}: {res_list!s}"
-                    )
-                    try:
-                        res_port: int | None = int(res_list[2])
-                    except (ValueError, IndexError):
-                        res_port = None
-
-                    if res_port is None or res_port < 1 or res_port > 65535:
-                        LOGGER.info(
-                            f"Response contains [port={res_port}] which is not a valid port number,"
-                            "an old Luxtronic software version might be the reason. "
-                            "Skipping this port."
-                        )
-                    elif (ip_address, res_port) not in results:
-                        LOGGER.info(
-                            f"Discovered Luxtronik heatpump at {ip_address}:{res_port}"
-                        )
-                        results.append((ip_address, res_port))
+                transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _DiscoveryProtocol(found),
+                    local_addr=("0.0.0.0", port),
+                    allow_broadcast=True,
+                )
+            except OSError as err:
+                LOGGER.warning(
+                    "Cannot listen for discovery replies on port %s: %s", port, err
+                )
+                bind_error = err
+                continue
+            transports.append(transport)
+            LOGGER.info("Send discovery packets to port %s on %s", port, targets)
+            # send AIT magic broadcast packet to every target broadcast address
+            for target in targets:
+                transport.sendto(magic_bytes, (target, port))
+                LOGGER.debug("Sent broadcast request to %s:%s", target, port)
+        if not transports:
+            raise bind_error or OSError("No discovery port to listen on")
+
+        seen: set[tuple[str, int]] = set()
+        deadline = loop.time() + listen_time
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                result = await asyncio.wait_for(found.get(), remaining)
+            except TimeoutError:
+                break
+            # A heat pump answers on every port it was asked on.
+            if result in seen:
+                continue
+            seen.add(result)
+            LOGGER.info("Discovered Luxtronik heatpump at %s:%s", *result)
+            yield result
+    finally:
+        for transport in transports:
+            transport.close()
 
-                else:
-                    LOGGER.debug(
-                        f"Skipping invalid response from {ip_address}: {res_list!s}"
-                    )
 
-            # if the timeout triggers, go on and use the other broadcast port
-            except TimeoutError:
+async def async_discover(
+    broadcast_addresses: list[str] | None = None,
+    *,
+    expected_host: str | None = None,
+    ports: Sequence[int] = LUXTRONIK_DISCOVERY_PORTS,
+    listen_time: float = LUXTRONIK_DISCOVERY_TIMEOUT,
+) -> list[tuple[str, int]]:
+    """Collect the heat pumps answering a discovery broadcast.
+
+    With ``expected_host`` - the address DHCP reported - the search ends as
+    soon as that host has answered, one round trip instead of the full
+    `listen_time`; the list then holds only the heat pumps that answered before it.
+    """
+    results: list[tuple[str, int]] = []
+    async with contextlib.aclosing(
+        async_discover_stream(broadcast_addresses, ports=ports, listen_time=listen_time)
+    ) as stream:
+        async for host, port in stream:
+            results.append((host, port))
+            if host == expected_host:
+                LOGGER.debug("Expected host %s answered discovery", host)
                 break
-        server.close()
     return results
 
 
+def subnet_scan_hosts(interfaces: Iterable[IPv4Interface]) -> list[str]:
+    """Every host address around the given local interfaces, theirs excluded.
+
+    Subnets larger than `LUXTRONIK_SCAN_MIN_PREFIX` are narrowed to the /24
+    around the interface's own address: a heat pump is almost always there,
+    and a /16 would be 65,000 probes. Loopback and link-local interfaces are
+    skipped.
+    """
+    interfaces = list(interfaces)
+    own = {str(interface.ip) for interface in interfaces}
+    hosts: dict[str, None] = {}
+    for interface in interfaces:
+        if interface.ip.is_loopback or interface.ip.is_link_local:
+            continue
+        network = interface.network
+        if network.prefixlen < LUXTRONIK_SCAN_MIN_PREFIX:
+            network = IPv4Interface(
+                f"{interface.ip}/{LUXTRONIK_SCAN_MIN_PREFIX}"
+            ).network
+        for address in network.hosts():
+            if (host := str(address)) not in own:
+                hosts[host] = None
+    return list(hosts)
+
+
+async def async_probe_host(
+    host: str, port: int, probe_timeout: float = LUXTRONIK_SCAN_CONNECT_TIMEOUT
+) -> bool:
+    """Return whether a Luxtronik controller listens on host:port.
+
+    An open port is not enough - plenty of devices listen on 8888/8889 - so
+    the probe asks for the visibilities (3005) and checks the header of the
+    answer: the echoed command and a plausible length. The connection is
+    closed without reading the block itself.
+    """
+    try:
+        async with asyncio.timeout(probe_timeout):
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                writer.write(struct.pack(">ii", LUXTRONIK_VISIBILITIES_READ, 0))
+                await writer.drain()
+                command, length = struct.unpack(">ii", await reader.readexactly(8))
+            finally:
+                writer.close()
+    except (OSError, EOFError, TimeoutError):
+        return False
+    return command == LUXTRONIK_VISIBILITIES_READ and length > 0
+
+
+async def async_scan_hosts(
+    hosts: Sequence[str],
+    port: int = DEFAULT_PORT,
+    *,
+    concurrency: int = LUXTRONIK_SCAN_CONCURRENCY,
+    probe_timeout: float = LUXTRONIK_SCAN_CONNECT_TIMEOUT,
+    on_probed: Callable[[int], None] | None = None,
+) -> AsyncGenerator[str]:
+    """Probe `hosts` for a controller, yielding each one as it is confirmed.
+
+    The fallback for networks the discovery broadcast does not reach (VLANs,
+    Wi-Fi client isolation). At most `concurrency` probes are in flight, so
+    a /24 takes about 254 / concurrency * probe_timeout in the worst case -
+    two seconds with the defaults - without flooding the LAN. `on_probed`
+    is called with the number of hosts probed so far, for progress.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str) -> tuple[str, bool]:
+        async with semaphore:
+            return host, await async_probe_host(host, port, probe_timeout)
+
+    tasks = [asyncio.create_task(probe(host)) for host in hosts]
+    try:
+        for probed, next_probe in enumerate(asyncio.as_completed(tasks), 1):
+            host, found = await next_probe
+            if on_probed is not None:
+                on_probed(probed)
+            if found:
+                LOGGER.info("Found Luxtronik heatpump at %s:%s by probing", host, port)
+                yield host
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 def get_manufacturer_by_model(model: str) -> str | None:
     """Return the manufacturer."""
     if model is None:
@@ -175,6 +365,38 @@ def get_manufacturer_firmware_url_by_model(model: str, default_id: int) -> str:
     return f"https://www.heatpump24.com/DownloadArea.php?layout={layout_id}"
 
 
+def apply_changed_registers(
+    parser: Any,
+    items: Mapping[int, Any],
+    previous: Sequence[int] | None,
+    data: Sequence[int],
+    full_parse_range: range | None = None,
+) -> None:
+    """Decode the registers of `data` that differ from `previous`.
+
+    Equivalent to `parser.parse(data)` as long as every other register still
+    holds its previous value, which is the case between two polls of the same
+    client. A changed block length, a register the previous parse did not
+    create, or a change within `full_parse_range` (registers decoded
+    together, like the version string) falls back to a full parse.
+    """
+    if previous is None or len(previous) != len(data):
+        parser.parse(data)
+        return
+    changed = [index for index, old in enumerate(previous) if data[index] != old]
+    if full_parse_range is not None and any(
+        index in full_parse_range for index in changed
+    ):
+        parser.parse(data)
+        return
+    for index in changed:
+        item = items.get(index)
+        if item is None:
+            parser.parse(data)
+            return
+        item.value = item.from_heatpump(data[index])
+
+
 def _is_socket_closed(sock: socket.socket) -> bool:
     try:
         if sock.fileno() < 0:
@@ -243,6 +465,22 @@ class Luxtronik:
         self._socket_timeout = socket_timeout
         self._max_data_length = max_data_length
         self._short_reads = 0
+        self._bytes_read = 0
+        self._poll_bytes = 0
+        self._has_connected = False
+        self.stats = LuxtronikPollStats()
+        # The raw integers of the last successfully parsed block, per label.
+        # Kept so the coordinator can persist them and a restart can parse
+        # them again (see snapshot.py) - the parsed objects cannot be
+        # serialised as they are.
+        self.raw_blocks: dict[str, list[int]] = {}
+        # Status word of the last 3004 response. The parsers have no use for
+        # it; tools/luxtronik_proxy.py relays it to its own clients.
+        self.calculations_status = 0
+        # Set by the coordinator while the session log option is on: every
+        # block read and parameter write is then appended to it (see
+        # session_log.py).
+        self.session_log: SessionLogWriter | None = None
         self.calculations = Calculations()
         self.parameters = Parameters(safe=safe)
         self.visibilities = Visibilities()
@@ -280,6 +518,13 @@ class Luxtronik:
                 self._socket.settimeout(self._socket_timeout)
                 try:
                     self._socket.connect((self._host, self._port))
+                    # Every connection after the first replaced one that
+                    # died - dropped by the controller, or torn down by a
+                    # failed read. A controller that closes idle sockets
+                    # shows up here as one reconnect per poll.
+                    if self._has_connected:
+                        self.stats.record(LuxPollStat.RECONNECTS, 1)
+                    self._has_connected = True
                     LOGGER.debug(
                         "Connected to Luxtronik heatpump %s:%s with timeout %.1fs",
                         self._host,
@@ -291,12 +536,88 @@ class Luxtronik:
                     self._disconnect()
                     raise
 
+    def restore(self, raw_blocks: Mapping[str, list[int]]) -> None:
+        """Parse previously read raw blocks as if they had just been read."""
+        parsers = {
+            "parameters": self.parameters,
+            "calculations": self.calculations,
+            "visibilities": self.visibilities,
+        }
+        for label, data in raw_blocks.items():
+            parser = parsers.get(label)
+            if parser is None:
+                continue
+            parser.parse(list(data))
+            self.raw_blocks[label] = list(data)
+
     def read(self):  # pragma: no cover
         """Read data from heatpump."""
+        self.stats.mark_call_started()
         self._read_write(write=False)
 
+    def read_identity(self) -> None:
+        """Read only the blocks that identify the heat pump.
+
+        Serial number (P0874/P0875), model and firmware are in the parameters
+        and calculations; the visibilities are skipped. A failed block is
+        retried once rather than four times, so probing a device that is not
+        a heat pump, or not answering, fails fast.
+        """
+        self.stats.mark_call_started()
+        self.connect()
+        try:
+            self._read_data(
+                LUXTRONIK_PARAMETERS_READ,
+                LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+                self.parameters,
+                CONF_PARAMETERS,
+                retries=IDENTITY_READ_RETRIES,
+            )
+            self._read_data(
+                LUXTRONIK_CALCULATIONS_READ,
+                LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+                self.calculations,
+                CONF_CALCULATIONS,
+                retries=IDENTITY_READ_RETRIES,
+            )
+        except (OSError, struct.error):
+            self._disconnect()
+            raise
+
+    def read_block(self, command: int) -> list[int] | None:
+        """Read the single block of a 3003/3004/3005 `command`.
+
+        Returns its raw values, or None when the block could not be read -
+        `_read_data` reports that rather than raising. For callers that
+        refresh blocks one at a time instead of as a whole poll.
+        """
+        item_size, parser, label = {
+            LUXTRONIK_PARAMETERS_READ: (
+                LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+                self.parameters,
+                CONF_PARAMETERS,
+            ),
+            LUXTRONIK_CALCULATIONS_READ: (
+                LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+                self.calculations,
+                CONF_CALCULATIONS,
+            ),
+            LUXTRONIK_VISIBILITIES_READ: (
+                LUXTRONIK_SOCKET_READ_SIZE_CHAR,
+                self.visibilities,
+                CONF_VISIBILITIES,
+            ),
+        }[command]
+        self.stats.mark_call_started()
+        self.connect()
+        previous = self.raw_blocks.get(label)
+        self._read_data(command, item_size, parser, label)
+        data = self.raw_blocks.get(label)
+        return data if data is not previous else None
+
     def write(self):  # pragma: no cover
         """Write parameter to heatpump."""
+        self.stats.mark_call_started()
         self._read_write(write=True)
 
     def _read_write(self, write=False):  # pragma: no cover
@@ -322,6 +643,7 @@ class Luxtronik:
             raise
 
     def _read(self):
+        self._poll_bytes = 0
         self._read_data(
             LUXTRONIK_PARAMETERS_READ,
             LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
@@ -340,6 +662,7 @@ class Luxtronik:
             self.visibilities,
             "visibilities",
         )
+        self.stats.record(LuxPollStat.POLL_BYTES, self._poll_bytes)
 
     def _write(self):
         """Flush the queued parameter writes to the heat pump.
@@ -371,6 +694,7 @@ class Luxtronik:
                 LOGGER.warning("Parameter id '%s' or value '%s' invalid!", index, value)
                 continue
             data = struct.pack(">iii", LUXTRONIK_PARAMETERS_WRITE, index, value)
+            sent = time.monotonic()
             sock.sendall(data)
             # The controller acknowledges a 3002 write with two ints: the
             # echoed command (3002) and the echoed *parameter index* - NOT the
@@ -407,6 +731,11 @@ class Luxtronik:
                 ) from err
             finally:
                 sock.settimeout(self._socket_timeout)
+            self.stats.record(LuxPollStat.WRITE_ACK_TIME, time.monotonic() - sent)
+            if self.session_log is not None:
+                self.session_log.record(
+                    LUXTRONIK_PARAMETERS_WRITE, struct.pack(">ii", index, value)
+                )
             LOGGER.debug(
                 "Parameter '%d' set to '%s' (ack cmd=%s echoed_index=%s)",
                 index,
@@ -449,6 +778,7 @@ class Luxtronik:
                 )
             chunks.append(chunk)
             remaining -= len(chunk)
+            self._bytes_read += len(chunk)
             if remaining:
                 # Counted rather than logged: a chatty controller can fragment
                 # every single value, and there are ~1700 of them per poll.
@@ -470,12 +800,16 @@ class Luxtronik:
         self, command: int, item_size: int, parser, label: str, retries: int = 4
     ) -> None:
         """Generic method to read data from the socket with timeout and retry handling."""
+        # Timed across all attempts, retry sleeps included: that is how long
+        # the block held up the poll. The retries are recorded separately.
+        started = time.monotonic()
         for attempt in range(retries + 1):
             # Must be reset per attempt: items read before a failed attempt
             # would otherwise be prepended to the retry's data and shift every
             # index of the reparsed block.
             data = []
             self._short_reads = 0
+            self._bytes_read = 0
             try:
                 # check if connection still exists before reading
                 if self._socket is None or _is_socket_closed(self._socket):
@@ -492,9 +826,11 @@ class Luxtronik:
                 LOGGER.debug("Command %s (%s)", cmd, label)
 
                 # Optional status field for calculations
+                stat = 0
                 if command == LUXTRONIK_CALCULATIONS_READ:
                     stat = self._read_int()
                     LOGGER.debug("Stat %s", stat)
+                    self.calculations_status = stat
 
                 length = self._read_int()
                 if length > self._max_data_length:
@@ -540,6 +876,10 @@ class Luxtronik:
                     self._short_reads,
                 )
                 parser.parse(data)
+                self.raw_blocks[label] = data
+                if self.session_log is not None:
+                    self.session_log.record(command, encode_values(command, data), stat)
+                self._record_block_stats(label, started, attempt)
                 return  # Success, exit after first successful attempt
 
             except (TimeoutError, ConnectionResetError, OSError) as err:
@@ -566,6 +906,7 @@ class Luxtronik:
                         label,
                         err,
                     )
+                    self.stats.record(LuxPollStat.READ_RETRIES, attempt)
                     return
 
             except Exception as err:
@@ -574,3 +915,20 @@ class Luxtronik:
                 )
                 self._disconnect()
                 return
+
+    def _record_block_stats(self, label: str, started: float, retries: int) -> None:
+        """Record the measurements of one successfully read block.
+
+        Bytes and fragments are those of the successful attempt only - both
+        are reset per attempt, like the data itself - while the time covers
+        every attempt it took to get there.
+        """
+        stats = self.stats
+        block_stats = _BLOCK_STATS.get(label)
+        if block_stats is not None:
+            read_time, nbytes = block_stats
+            stats.record(read_time, time.monotonic() - started)
+            stats.record(nbytes, self._bytes_read)
+        stats.record(LuxPollStat.FRAGMENTED_READS, self._short_reads)
+        stats.record(LuxPollStat.READ_RETRIES, retries)
+        self._poll_bytes += self._bytes_read
@@ -0,0 +1,89 @@
+"""Heat and electrical energy per operating status, integrated from power.
+
+Each power sample closes a trapezoid with the previous sample of the same
+quantity, booked to the status at its start. An interval longer than
+MODE_TIME_MAX_GAP is dropped. Only the totals are persisted: after a restart
+the first sample of each quantity only opens a new trapezoid.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Literal
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    MODE_ENERGY_SAVE_DELAY,
+    MODE_ENERGY_STORAGE_VERSION,
+    MODE_TIME_MAX_GAP,
+    LuxOperationMode,
+)
+from .store import LuxtronikDelayedStore
+
+type EnergyQuantity = Literal["heat", "electrical"]
+
+_WATT_SECONDS_PER_KWH = 3_600_000
+
+
+class LuxtronikModeEnergy(LuxtronikDelayedStore):
+    """Lifetime kWh per quantity and operating status for one heat pump."""
+
+    STORE_NAME = "mode_energy"
+    STORAGE_VERSION = MODE_ENERGY_STORAGE_VERSION
+    SAVE_DELAY = MODE_ENERGY_SAVE_DELAY
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        super().__init__(hass, entry_id)
+        # quantity -> status -> kWh
+        self.totals: dict[str, dict[str, float]] = {}
+        # quantity -> (sampled at, watts, status), the open end of the next
+        # trapezoid.
+        self._last: dict[str, tuple[datetime, float, str | None]] = {}
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        self.totals = {
+            str(quantity): {str(mode): float(kwh) for mode, kwh in by_mode.items()}
+            for quantity, by_mode in data["totals"].items()
+        }
+
+    @callback
+    def sample(
+        self, quantity: EnergyQuantity, watts: Any, status: Any, at: datetime
+    ) -> None:
+        """Close the trapezoid since the last `quantity` sample and open a new one.
+
+        A sample that is not a number ends the open trapezoid, like an
+        unknown status does; one older than the last sample (an external
+        meter reporting late) is ignored.
+        """
+        last = self._last.get(quantity)
+        if last is not None and at <= last[0]:
+            return
+        power = max(float(watts), 0.0) if isinstance(watts, int | float) else None
+        if last is not None and power is not None:
+            since, last_power, last_status = last
+            if last_status is not None and at - since <= MODE_TIME_MAX_GAP:
+                by_mode = self.totals.setdefault(quantity, {})
+                by_mode[last_status] = (
+                    by_mode.get(last_status, 0.0)
+                    + ((last_power + power) / 2 * (at - since).total_seconds())
+                    / _WATT_SECONDS_PER_KWH
+                )
+                self._schedule_save()
+        if power is None:
+            self._last.pop(quantity, None)
+            return
+        self._last[quantity] = (
+            at,
+            power,
+            str(status) if status in LuxOperationMode else None,
+        )
+
+    def kwh(self, quantity: EnergyQuantity, status: str) -> float:
+        """Return the lifetime kWh of `quantity` in `status`."""
+        return self.totals.get(quantity, {}).get(status, 0.0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the JSON-serialisable form written to the store."""
+        return {"totals": self.totals}
@@ -0,0 +1,109 @@
+"""Time spent in each operating status, accumulated per poll and persisted.
+
+Each poll interval goes to the status of the previous poll, split at local
+midnight. An interval longer than MODE_TIME_MAX_GAP is not attributed to
+anything.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    MODE_TIME_DAYS,
+    MODE_TIME_MAX_GAP,
+    MODE_TIME_SAVE_DELAY,
+    MODE_TIME_STORAGE_VERSION,
+    LuxOperationMode,
+)
+from .store import LuxtronikDelayedStore
+
+
+class LuxtronikModeTime(LuxtronikDelayedStore):
+    """Seconds per operating status and local day for one heat pump."""
+
+    STORE_NAME = "mode_time"
+    STORAGE_VERSION = MODE_TIME_STORAGE_VERSION
+    SAVE_DELAY = MODE_TIME_SAVE_DELAY
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        super().__init__(hass, entry_id)
+        # ISO date -> status -> seconds, for the last MODE_TIME_DAYS days.
+        self.days: dict[str, dict[str, float]] = {}
+        # The last observation, which the next interval is attributed to.
+        self.status: str | None = None
+        self.observed_at: datetime | None = None
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        days = {
+            str(day): {str(mode): float(seconds) for mode, seconds in by_mode.items()}
+            for day, by_mode in data["days"].items()
+        }
+        status = data["status"]
+        observed_at = (
+            dt_util.parse_datetime(data["observed_at"])
+            if data["observed_at"] is not None
+            else None
+        )
+        self.days = days
+        self.status = str(status) if status is not None else None
+        self.observed_at = observed_at
+
+    @callback
+    def observe(self, status: Any, at: datetime) -> None:
+        """Attribute the time since the last observation, then record `status`.
+
+        A status that is not an operating mode (the register is missing, or
+        an unknown code) ends accumulation until a known one is seen again.
+        """
+        previous, since = self.status, self.observed_at
+        if (
+            previous is not None
+            and since is not None
+            and timedelta(0) < at - since <= MODE_TIME_MAX_GAP
+        ):
+            self._add(previous, since, at)
+        self.status = str(status) if status in LuxOperationMode else None
+        self.observed_at = at
+        self._prune(dt_util.as_local(at).date())
+        self._schedule_save()
+
+    def _add(self, status: str, start: datetime, end: datetime) -> None:
+        """Add start..end to `status`, split at local midnights."""
+        while start < end:
+            day = dt_util.as_local(start).date()
+            midnight = dt_util.start_of_local_day(day + timedelta(days=1))
+            chunk_end = min(end, midnight)
+            by_mode = self.days.setdefault(day.isoformat(), {})
+            by_mode[status] = (
+                by_mode.get(status, 0.0) + (chunk_end - start).total_seconds()
+            )
+            start = chunk_end
+
+    def _prune(self, today: date) -> None:
+        oldest = (today - timedelta(days=MODE_TIME_DAYS - 1)).isoformat()
+        for day in [day for day in self.days if day < oldest]:
+            del self.days[day]
+
+    def seconds(self, status: str, days_ago: int = 0) -> float:
+        """Return the seconds in `status` on one local day (0 = today)."""
+        day = dt_util.now().date() - timedelta(days=days_ago)
+        return self.days.get(day.isoformat(), {}).get(status, 0.0)
+
+    def seconds_last_days(self, status: str, days: int) -> float:
+        """Return the seconds in `status` over the last `days` days, today included."""
+        return sum(self.seconds(status, days_ago) for days_ago in range(days))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the JSON-serialisable form written to the store."""
+        return {
+            "days": self.days,
+            "status": self.status,
+            "observed_at": (
+                self.observed_at.isoformat() if self.observed_at is not None else None
+            ),
+        }
@@ -7,6 +7,7 @@ from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal
+from typing import Literal
 
 from homeassistant.components.binary_sensor import BinarySensorEntityDescription
 from homeassistant.components.climate import (
@@ -36,6 +37,7 @@ from .const import (
     LuxCalculation,
     LuxOperationMode,
     LuxParameter,
+    LuxPollStat,
     LuxVisibility,
     SensorAttrFormat,
     SensorAttrKey,
@@ -56,6 +58,15 @@ class LuxtronikCoordinatorData:
     # Defaulted so every other construction site (tests, diagnostics) is unaffected.
     dhw_transition_hold: bool = False
 
+    # When this snapshot was read, set by LuxtronikCoordinator._async_update_data().
+    # Lets entities that combine it with an external sensor relate the two
+    # samples in time (see LuxtronikCopSensorEntity).
+    polled_at: datetime | None = None
+
+    # True while the data comes from the persisted snapshot rather than a live
+    # read (see snapshot.py); polled_at is then when the snapshot was taken.
+    restored: bool = False
+
 
 @dataclass
 class LuxtronikEntityAttributeDescription:
@@ -180,6 +191,100 @@ class LuxtronikSumSensorDescription(  # type: ignore  # pyright: ignore[reportIn
     summand_keys: tuple[LuxParameter | LuxCalculation, ...] = ()
 
 
+class LuxtronikPollStatSensorDescription(  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+    LuxtronikSensorDescription,
+    SensorEntityDescription,
+    frozen_or_thawed=True,
+):
+    """Class describing sensors that report the connection's own poll statistics.
+
+    The value is not read from the heat pump at all but from the rolling
+    statistics the client and coordinator keep about talking to it (see
+    poll_stats.py): `statistic` picks which figure of the `poll_stat`
+    histogram becomes the state - a tail percentile for timings, the
+    lifetime total for event counts. `factor` applies as usual, e.g. to show
+    seconds as milliseconds. luxtronik_key is intentionally left at its
+    UNSET default, same convention as LuxtronikCopSensorDescription.
+    """
+
+    poll_stat: LuxPollStat = LuxPollStat.PARAMETERS_READ_TIME
+    statistic: Literal["last", "mean", "p50", "p95", "max", "total"] = "p95"
+
+
+class LuxtronikModeTimeSensorDescription(  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+    LuxtronikSensorDescription,
+    SensorEntityDescription,
+    frozen_or_thawed=True,
+):
+    """Class describing sensors that report the time spent in one operating status.
+
+    The value comes from the coordinator's per-day totals (see mode_time.py),
+    not from a register: today's time in `mode` as the state, yesterday and
+    the last seven days as attributes. luxtronik_key stays at its UNSET
+    default, same convention as LuxtronikPollStatSensorDescription.
+    """
+
+    mode: LuxOperationMode = LuxOperationMode.heating
+
+
+class LuxtronikModeEnergySensorDescription(  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+    LuxtronikSensorDescription,
+    SensorEntityDescription,
+    frozen_or_thawed=True,
+):
+    """Class describing sensors that report the energy used in one operating status.
+
+    The value comes from the coordinator's integrated totals (see
+    mode_energy.py): the lifetime kWh of `quantity` - heat delivered or
+    electrical energy drawn - while the status was `mode`. luxtronik_key
+    stays at its UNSET default.
+    """
+
+    mode: LuxOperationMode = LuxOperationMode.heating
+    quantity: Literal["heat", "electrical"] = "heat"
+
+
+class LuxtronikCycleSensorDescription(  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+    LuxtronikSensorDescription,
+    SensorEntityDescription,
+    frozen_or_thawed=True,
+):
+    """Class describing sensors that report compressor cycle and defrost statistics.
+
+    The value is the `statistic` entry of the coordinator's cycle summary
+    over the last 24 hours (see cycles.py); runtimes are in seconds there,
+    so `factor` converts them to the unit shown. luxtronik_key stays at its
+    UNSET default.
+    """
+
+    statistic: Literal[
+        "cycles_per_hour",
+        "mean_runtime",
+        "median_runtime",
+        "short_cycle_rate",
+        "defrosts",
+    ] = "cycles_per_hour"
+
+
+class LuxtronikCounterCopSensorDescription(  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+    LuxtronikSensorDescription,
+    SensorEntityDescription,
+    frozen_or_thawed=True,
+):
+    """Class describing sensors that report COP from the energy counters.
+
+    The value is the ratio of heat to electrical energy booked for
+    `circuits` by the coordinator (see counter_cop.py), over the last seven
+    days or the current heating season depending on `period`; the other
+    periods become attributes. luxtronik_key stays at its UNSET default.
+    """
+
+    circuits: tuple[Literal["heating", "domestic_water", "pool", "cooling"], ...] = (
+        "heating",
+    )
+    period: Literal["last_7_days", "season"] = "season"
+
+
 class LuxtronikNumberDescription(
     LuxtronikEntityDescription,
     NumberEntityDescription,
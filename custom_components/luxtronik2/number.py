@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 from datetime import date, datetime
+import logging
+from typing import Any
 
 from homeassistant.components.number import (
     ENTITY_ID_FORMAT,  # pyright: ignore[reportAttributeAccessIssue]
@@ -27,6 +29,7 @@ from .const import (
     SensorKey,
 )
 from .coordinator import LuxtronikCoordinator, LuxtronikCoordinatorData
+from .entity_plan import plan_descriptions
 from .model import LuxtronikEntityAttributeDescription, LuxtronikNumberDescription
 from .number_entities_predefined import NUMBER_SENSORS
 
@@ -48,25 +51,32 @@ async def async_setup_entry(
     if not coordinator.last_update_success:
         return
 
-    unavailable_keys = [
-        i.luxtronik_key
-        for i in NUMBER_SENSORS
-        if not key_exists(coordinator.data, i.luxtronik_key)
-    ]
-    if unavailable_keys:
-        # Not all models/firmware versions support every parameter;
-        # missing keys are expected and not an error.
-        LOGGER.debug("Not present in Luxtronik data, skipping: %s", unavailable_keys)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        unavailable_keys = [
+            i.luxtronik_key
+            for i in NUMBER_SENSORS
+            if not key_exists(coordinator.data, i.luxtronik_key)
+        ]
+        if unavailable_keys:
+            # Not all models/firmware versions support every parameter;
+            # missing keys are expected and not an error.
+            LOGGER.debug(
+                "Not present in Luxtronik data, skipping: %s", unavailable_keys
+            )
 
     async_add_entities(
         [
             LuxtronikNumberEntity(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in NUMBER_SENSORS
-            if (
-                coordinator.entity_active(description)
-                and key_exists(coordinator.data, description.luxtronik_key)
+            for description in plan_descriptions(
+                coordinator,
+                "number",
+                NUMBER_SENSORS,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and key_exists(coordinator.data, description.luxtronik_key)
+                ),
             )
         ]
     )
@@ -202,7 +212,7 @@ class LuxtronikNumberEntity(LuxtronikEntity[LuxtronikNumberDescription], NumberE
         return self.entity_description.native_max_value
 
     @property
-    def extra_state_attributes(self) -> dict[str, str]:
+    def extra_state_attributes(self) -> dict[str, Any]:
         """Extra attributes, plus a human-readable mode for DHW manual frequency.
 
         Must merge with (not replace) the base-computed attributes - other
@@ -211,7 +221,7 @@ class LuxtronikNumberEntity(LuxtronikEntity[LuxtronikNumberDescription], NumberE
         `_enrich_extra_attributes()` already populated into
         `self._attr_extra_state_attributes`.
         """
-        attributes = dict(self._attr_extra_state_attributes)
+        attributes = dict(super().extra_state_attributes)
         if self.entity_description.key == SensorKey.DHW_MANUAL_FREQUENCY:
             val = self._attr_native_value
             if val == 0:
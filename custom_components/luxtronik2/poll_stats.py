@@ -0,0 +1,140 @@
+"""Rolling poll and write statistics for one Luxtronik connection.
+
+Until this existed, the only way to see how a controller was behaving on the
+wire - how long a block took, how often a value arrived in fragments, how
+many attempts a read needed, how long a write waited for its ack - was to
+enable debug logging. That costs a formatted record per block on every poll
+and is too expensive to leave on, so the data was never there when a slow or
+flaky controller actually needed explaining.
+
+Here every measurement goes into a fixed-size window of recent samples plus
+lifetime totals. Recording is an append under a lock, cheap enough to stay
+on permanently; percentiles are only computed when something reads them
+(the diagnostic sensors once per poll, or a diagnostics download).
+
+The lock is needed because the two sides run on different threads: the
+luxtronik client records from Home Assistant's executor, while the
+coordinator and the entities read and record on the event loop.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+import math
+import threading
+import time
+from typing import Any
+
+from .const import POLL_STATS_WINDOW, LuxPollStat
+
+
+class RollingHistogram:
+    """The most recent samples of one measurement, plus lifetime totals.
+
+    The window holds raw samples rather than pre-binned counts: with at most
+    a few hundred values the percentiles are exact and cheap to compute on
+    read, and the raw values are what a diagnostics dump wants anyway. The
+    totals survive the window rolling over, so counters such as fragmented
+    reads keep increasing for as long as the connection object lives.
+    """
+
+    def __init__(self, window: int = POLL_STATS_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        """Record one sample."""
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    @property
+    def samples(self) -> list[float]:
+        """Return the samples currently in the window, oldest first."""
+        return list(self._samples)
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Return count, total and the window's last/min/max/mean/p50/p95."""
+        ordered = sorted(self._samples)
+        return {
+            "count": self.count,
+            "total": self.total,
+            "window": len(ordered),
+            "last": self._samples[-1] if self._samples else None,
+            "min": ordered[0] if ordered else None,
+            "max": ordered[-1] if ordered else None,
+            "mean": sum(ordered) / len(ordered) if ordered else None,
+            "p50": _percentile(ordered, 50),
+            "p95": _percentile(ordered, 95),
+        }
+
+
+def _percentile(ordered: list[float], percent: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+class LuxtronikPollStats:
+    """All rolling statistics of one heat pump connection.
+
+    Owned by the `Luxtronik` client, because that is where most of the
+    measurements originate and it already exists before the coordinator is
+    built. The coordinator reaches it through `LuxtronikCoordinator.poll_stats`
+    and adds the measurements only it can take (lock wait, executor delay,
+    confirmation attempts).
+    """
+
+    def __init__(self, window: int = POLL_STATS_WINDOW) -> None:
+        self._window = window
+        self._lock = threading.Lock()
+        self._histograms: dict[LuxPollStat, RollingHistogram] = {}
+        self._call_started: float | None = None
+
+    def record(self, stat: LuxPollStat, value: float) -> None:
+        """Add one sample to `stat`."""
+        with self._lock:
+            histogram = self._histograms.get(stat)
+            if histogram is None:
+                histogram = self._histograms[stat] = RollingHistogram(self._window)
+            histogram.add(value)
+
+    def mark_call_started(self) -> None:
+        """Note that a blocking client call has just started on its thread.
+
+        Paired with `record_executor_delay`: the coordinator stamps the time
+        it submitted the call, and the difference to this stamp is how long
+        the job sat in Home Assistant's executor queue before a thread picked
+        it up - time the poll spends waiting that no socket timing shows.
+        """
+        with self._lock:
+            self._call_started = time.monotonic()
+
+    def record_executor_delay(self, submitted: float) -> None:
+        """Record the queue delay of the call submitted at `submitted`.
+
+        A call that never reached `mark_call_started` (it failed before, or
+        the client is not a real `Luxtronik`) leaves an older stamp behind,
+        which the `>=` check discards rather than recording as negative.
+        """
+        with self._lock:
+            started = self._call_started
+        if started is not None and started >= submitted:
+            self.record(LuxPollStat.EXECUTOR_DELAY, started - submitted)
+
+    def summary(self, stat: LuxPollStat) -> dict[str, float | int | None] | None:
+        """Return the summary of `stat`, or None if it was never recorded."""
+        with self._lock:
+            histogram = self._histograms.get(stat)
+            return histogram.summary() if histogram is not None else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every statistic with its summary and current window."""
+        with self._lock:
+            return {
+                stat.value: histogram.summary() | {"samples": histogram.samples}
+                for stat, histogram in sorted(self._histograms.items())
+            }
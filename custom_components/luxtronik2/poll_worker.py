@@ -0,0 +1,413 @@
+"""Polling in a separate process, with the register blocks in shared memory.
+
+A poll costs the Home Assistant process more than the time it waits: about
+1900 values are received one `recv` and one `struct.unpack` at a time,
+reassembled when a segment boundary splits them, retried with sleeps on an
+executor thread - all under the GIL the event loop needs. With several heat
+pumps on a Raspberry Pi that is a visible share of the process's CPU.
+
+With the "poll in a separate process" option, `LuxtronikWorkerClient`
+stands in for `lux_helper.Luxtronik` and starts a worker process that owns
+the real client and its socket. Commands (connect, read, write, disconnect)
+go over a pipe. A read's result - a whole poll or a single block - does not: the worker publishes the raw
+blocks into a `SnapshotBuffer`, a shared memory segment with a version
+counter, and only the version travels back. The Home Assistant side maps
+the segment, copies the arrays out, and decodes only the registers whose raw
+value changed since the previous poll - on a running heat pump that is a few
+dozen of the 1900, mostly temperatures and counters.
+
+Decoding into the library's `Parameters`/`Calculations`/`Visibilities`
+stays in the Home Assistant process: those are the objects every entity
+reads, and they cannot live anywhere else. The poll statistics the worker's
+client records are forwarded with each reply, so the diagnostic sensors and
+downloads show the same figures either way.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Mapping
+import contextlib
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+import pickle
+import struct
+import threading
+from typing import Any, Self
+
+from .const import (
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    LOGGER,
+    LuxPollStat,
+)
+from .lux_helper import (
+    CALCULATIONS_VERSION_RANGE,
+    LUXTRONIK_CALCULATIONS_READ,
+    LUXTRONIK_PARAMETERS_READ,
+    LUXTRONIK_PARAMETERS_WRITE,
+    LUXTRONIK_VISIBILITIES_READ,
+    Luxtronik,
+    apply_changed_registers,
+)
+from .poll_stats import LuxtronikPollStats
+from .session_log import encode_values
+
+_BLOCKS = (CONF_PARAMETERS, CONF_CALCULATIONS, CONF_VISIBILITIES)
+_BLOCK_COMMANDS = {
+    CONF_PARAMETERS: LUXTRONIK_PARAMETERS_READ,
+    CONF_CALCULATIONS: LUXTRONIK_CALCULATIONS_READ,
+    CONF_VISIBILITIES: LUXTRONIK_VISIBILITIES_READ,
+}
+
+# Version counter, 3004 status word, then the length of each block. Native
+# byte order: both sides are the same machine.
+_HEADER = struct.Struct("=qi3i")
+_ITEM_SIZE = 4
+# A reader that keeps finding the version odd or changed gives up after this
+# many attempts; the worker only publishes while a read command is pending,
+# so in practice the first attempt succeeds.
+_LOAD_ATTEMPTS = 3
+
+# The reply to a command may take every attempt of every block timing out:
+# three blocks, five attempts each, one socket timeout plus a second of
+# back-off per attempt. Beyond that the worker is considered hung.
+_REPLY_ATTEMPTS = 3 * 5
+
+
+class SnapshotBuffer:
+    """The three register blocks in one shared memory segment.
+
+    Written by the worker, read by Home Assistant. The version counter is a
+    sequence lock: odd while a publish is in progress, and a reader that
+    sees it change while copying starts over.
+    """
+
+    def __init__(self, shm: SharedMemory, capacity: int, *, owner: bool) -> None:
+        assert shm.buf is not None
+        self._shm = shm
+        self._buf = shm.buf
+        self._capacity = capacity
+        self._owner = owner
+
+    @classmethod
+    def create(cls, capacity: int) -> Self:
+        """Allocate a segment holding up to `capacity` values per block."""
+        size = _HEADER.size + len(_BLOCKS) * capacity * _ITEM_SIZE
+        return cls(SharedMemory(create=True, size=size), capacity, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> Self:
+        """Map a segment created by `create` in another process."""
+        return cls(SharedMemory(name=name, track=False), capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        """Return the name another process attaches with."""
+        return self._shm.name
+
+    def _region(self, block: int, length: int) -> memoryview:
+        start = _HEADER.size + block * self._capacity * _ITEM_SIZE
+        return self._buf[start : start + length * _ITEM_SIZE].cast("i")
+
+    def _version(self) -> int:
+        return struct.unpack_from("=q", self._buf)[0]
+
+    def publish(self, blocks: Mapping[str, list[int]], status: int) -> int:
+        """Write the blocks and return the new (even) version."""
+        lengths = [len(blocks.get(label, ())) for label in _BLOCKS]
+        if max(lengths) > self._capacity:
+            raise ValueError(
+                f"Block of {max(lengths)} values exceeds the snapshot capacity "
+                f"of {self._capacity}"
+            )
+        version = self._version() + 1
+        struct.pack_into("=q", self._buf, 0, version)
+        for block, label in enumerate(_BLOCKS):
+            region = self._region(block, lengths[block])
+            region[:] = array("i", blocks.get(label, ()))
+            region.release()
+        version += 1
+        _HEADER.pack_into(self._buf, 0, version, status, *lengths)
+        return version
+
+    def load(self) -> tuple[int, int, dict[str, list[int]]]:
+        """Return version, 3004 status word and a copy of every block."""
+        for _ in range(_LOAD_ATTEMPTS):
+            version, status, *lengths = _HEADER.unpack_from(self._buf)
+            if version % 2:
+                continue
+            blocks: dict[str, list[int]] = {}
+            for block, label in enumerate(_BLOCKS):
+                region = self._region(block, lengths[block])
+                blocks[label] = region.tolist()
+                region.release()
+            if self._version() == version:
+                return version, status, blocks
+        raise RuntimeError("Poll worker snapshot kept changing while being read")
+
+    def close(self) -> None:
+        """Unmap the segment; the creating side also removes it."""
+        del self._buf
+        self._shm.close()
+        if self._owner:
+            with contextlib.suppress(FileNotFoundError):
+                self._shm.unlink()
+
+
+class _ForwardingStats(LuxtronikPollStats):
+    """Poll statistics that also keep every sample for the next reply."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pending: list[tuple[str, float]] = []
+
+    def record(self, stat: LuxPollStat, value: float) -> None:
+        """Add one sample to `stat`, and to the samples to forward."""
+        super().record(stat, value)
+        self._pending.append((stat.value, value))
+
+    def drain(self) -> list[tuple[str, float]]:
+        """Return and forget the samples recorded since the last call."""
+        pending, self._pending = self._pending, []
+        return pending
+
+
+def _worker_main(
+    conn: Connection,
+    shm_name: str,
+    capacity: int,
+    host: str,
+    port: int,
+    socket_timeout: float,
+    max_data_length: int,
+) -> None:
+    """Serve commands from the Home Assistant process until told to stop."""
+    buffer = SnapshotBuffer.attach(shm_name, capacity)
+    client = Luxtronik(host, port, socket_timeout, max_data_length, safe=False)
+    stats = _ForwardingStats()
+    client.stats = stats
+    try:
+        while True:
+            try:
+                command, argument = conn.recv()
+            except EOFError:
+                return
+            if command == "stop":
+                return
+            try:
+                result: Any = None
+                if command == "connect":
+                    client.connect()
+                elif command == "read":
+                    client.read()
+                    result = buffer.publish(
+                        client.raw_blocks, client.calculations_status
+                    )
+                elif command == "read_block":
+                    if client.read_block(argument) is not None:
+                        result = buffer.publish(
+                            client.raw_blocks, client.calculations_status
+                        )
+                elif command == "write":
+                    client.parameters.queue = dict(argument)
+                    client.write()
+                elif command == "disconnect":
+                    client.disconnect()
+                else:
+                    raise ValueError(f"Unknown poll worker command {command!r}")
+                reply: tuple[str, Any, list[tuple[str, float]]] = (
+                    "ok",
+                    result,
+                    stats.drain(),
+                )
+            except Exception as err:
+                # Relayed to the caller, which raises it in its own thread.
+                reply = ("error", err, stats.drain())
+            try:
+                conn.send(reply)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                # An exception that does not pickle still has to arrive.
+                conn.send(("error", RuntimeError(repr(reply[1])), []))
+    finally:
+        client.disconnect()
+        buffer.close()
+
+
+class LuxtronikWorkerClient(Luxtronik):
+    """A `Luxtronik` whose socket is owned by a worker process.
+
+    The parsers, `raw_blocks`, `stats` and `session_log` live here, as on the
+    plain client; `connect`, `read` and `write` are carried out by the
+    worker. The worker is started on first use and stopped by `disconnect`,
+    so a failed or stopped worker is replaced on the next call.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        socket_timeout: float,
+        max_data_length: int,
+        safe: bool = True,
+    ) -> None:
+        super().__init__(host, port, socket_timeout, max_data_length, safe=safe)
+        self._worker_lock = threading.Lock()
+        self._process: BaseProcess | None = None
+        self._conn: Connection | None = None
+        self._buffer: SnapshotBuffer | None = None
+        self.snapshot_version = 0
+
+    def _start_worker(self) -> Connection:
+        if self._process is not None and self._process.is_alive():
+            assert self._conn is not None
+            return self._conn
+        self._stop_worker()
+        self._buffer = SnapshotBuffer.create(self._max_data_length)
+        # "spawn", never "fork": forking Home Assistant would copy its event
+        # loop, its threads' locks and every open socket into the worker.
+        context = multiprocessing.get_context("spawn")
+        self._conn, child = context.Pipe()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(
+                child,
+                self._buffer.name,
+                self._max_data_length,
+                self._host,
+                self._port,
+                self._socket_timeout,
+                self._max_data_length,
+            ),
+            name=f"luxtronik2 poll worker {self._host}:{self._port}",
+            daemon=True,
+        )
+        self._process.start()
+        child.close()
+        LOGGER.debug("Started poll worker %s", self._process.pid)
+        return self._conn
+
+    def _stop_worker(self) -> None:
+        if self._conn is not None:
+            with contextlib.suppress(OSError, ValueError):
+                self._conn.send(("stop", None))
+        if self._process is not None:
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join(timeout=2)
+            LOGGER.debug("Stopped poll worker %s", self._process.pid)
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+    def _call(self, command: str, argument: Any = None) -> Any:
+        """Send one command to the worker and return its result."""
+        with self._worker_lock:
+            conn = self._start_worker()
+            reply_timeout = _REPLY_ATTEMPTS * (self._socket_timeout + 1)
+            try:
+                conn.send((command, argument))
+                answered = conn.poll(reply_timeout)
+                reply = conn.recv() if answered else None
+            except (EOFError, OSError) as err:
+                self._stop_worker()
+                raise ConnectionError(
+                    f"Poll worker for {self._host} stopped: {err!r}"
+                ) from err
+            if reply is None:
+                self._stop_worker()
+                raise TimeoutError(
+                    f"Poll worker for {self._host} did not answer {command!r} "
+                    f"within {reply_timeout:.0f}s"
+                )
+        status, result, samples = reply
+        self._forward_stats(samples)
+        if status == "error":
+            raise result
+        return result
+
+    def _forward_stats(self, samples: Iterable[tuple[str, float]]) -> None:
+        for stat, value in samples:
+            self.stats.record(LuxPollStat(stat), value)
+
+    def connect(self) -> None:
+        """Have the worker connect to the heat pump."""
+        self._call("connect")
+
+    def _disconnect(self) -> None:
+        with self._worker_lock:
+            self._stop_worker()
+
+    def read(self) -> None:
+        """Have the worker poll, then decode what changed since the last poll."""
+        self.stats.mark_call_started()
+        self.snapshot_version = self._call("read")
+        self._apply_snapshot(_BLOCKS)
+
+    def _apply_snapshot(self, labels: Iterable[str]) -> dict[str, list[int]]:
+        """Decode the `labels` blocks of the published snapshot that changed."""
+        assert self._buffer is not None
+        _, status, blocks = self._buffer.load()
+        self.calculations_status = status
+        containers = (
+            (self.parameters, self.parameters.parameters, None),
+            (
+                self.calculations,
+                self.calculations.calculations,
+                CALCULATIONS_VERSION_RANGE,
+            ),
+            (self.visibilities, self.visibilities.visibilities, None),
+        )
+        for label, (parser, items, full_parse_range) in zip(
+            _BLOCKS, containers, strict=True
+        ):
+            data = blocks[label]
+            if label not in labels or not data:
+                continue
+            apply_changed_registers(
+                parser, items, self.raw_blocks.get(label), data, full_parse_range
+            )
+            self.raw_blocks[label] = data
+            if self.session_log is not None:
+                command = _BLOCK_COMMANDS[label]
+                stat = status if command == LUXTRONIK_CALCULATIONS_READ else 0
+                self.session_log.record(command, encode_values(command, data), stat)
+        return blocks
+
+    def read_identity(self) -> None:
+        """Read through the worker; it has no lighter read to offer."""
+        self.read()
+
+    def read_block(self, command: int) -> list[int] | None:
+        """Have the worker read one block, then decode it if it was read."""
+        self.stats.mark_call_started()
+        version = self._call("read_block", command)
+        if version is None:
+            return None
+        self.snapshot_version = version
+        label = next(
+            label for label, block in _BLOCK_COMMANDS.items() if block == command
+        )
+        return self._apply_snapshot((label,))[label]
+
+    def write(self) -> None:
+        """Have the worker flush the queued parameter writes."""
+        self.stats.mark_call_started()
+        queue = dict(self.parameters.queue)
+        try:
+            self._call("write", queue)
+        finally:
+            self.parameters.queue = {}
+        if self.session_log is not None:
+            for index, value in queue.items():
+                self.session_log.record(
+                    LUXTRONIK_PARAMETERS_WRITE, struct.pack(">ii", index, int(value))
+                )
@@ -0,0 +1,242 @@
+"""Stream of the raw register changes between polls.
+
+Most of lux_overrides.py was worked out by comparing diagnostics downloads
+by hand: download, change a setting on the controller, download again, diff
+~1900 values. Each download forces a refresh, and a register that only moves
+for one poll - a status bit, a counter that steps once an hour - is missed
+between two of them.
+
+The clients already hand the coordinator a new raw block list only when a
+block was read, so LuxtronikRegisterChanges compares each new block with the
+one before it and keeps only the indices whose raw value changed. That works
+on the raw integers, so indices the library has no name for - everything
+above UPSTREAM_MAX_DEFINED_INDEX - are covered like any other. The first
+block of each group after a start is the baseline and produces no changes;
+values of a block that grew (Modbus, before its first full read) are
+baselines too.
+
+With the change log on, the changes are appended to a compact binary file in
+the configuration directory: `CHANGE_LOG_MAGIC`, then one `_RECORD` per
+change (poll time, group, index, old and new raw value), rotated at
+CHANGE_LOG_MAX_BYTES like the session log. `read_change_log` reads it back.
+With event ranges set, each change inside them is also fired as an
+EVENT_REGISTER_CHANGED event, for automations or the developer tools' event
+listener.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+import re
+import struct
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CHANGE_LOG_MAX_BYTES,
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    DOMAIN,
+    EVENT_REGISTER_CHANGED,
+    LOGGER,
+)
+from .session_log import SessionLogWriter
+
+CHANGE_LOG_MAGIC = b"LUXCLOG1"
+
+GROUPS: tuple[str, ...] = (CONF_PARAMETERS, CONF_CALCULATIONS, CONF_VISIBILITIES)
+
+# Poll time, group (index into GROUPS), register index, old and new raw value.
+_RECORD = struct.Struct(">dBHii")
+
+_RANGE = re.compile(r"^\s*([a-z]+)\s*[: ]\s*(\d+)\s*(?:-\s*(\d+))?\s*$")
+
+type IndexRanges = dict[str, tuple[tuple[int, int], ...]]
+
+
+@dataclass(frozen=True)
+class RegisterChange:
+    """One raw value that differed from the previous poll."""
+
+    timestamp: float
+    group: str
+    index: int
+    old: int
+    new: int
+
+
+def parse_index_ranges(text: str | None) -> IndexRanges:
+    """Parse "calculations 260-300, parameters:1158" into ranges per group.
+
+    Raises ValueError for an unknown group or a malformed range.
+    """
+    ranges: dict[str, list[tuple[int, int]]] = {}
+    for part in re.split(r"[,;\n]", (text or "").lower()):
+        if not part.strip():
+            continue
+        match = _RANGE.match(part)
+        if match is None or match[1] not in GROUPS:
+            raise ValueError(f"Invalid index range: {part.strip()!r}")
+        first = int(match[2])
+        last = int(match[3]) if match[3] is not None else first
+        if last < first:
+            raise ValueError(f"Invalid index range: {part.strip()!r}")
+        ranges.setdefault(match[1], []).append((first, last))
+    return {group: tuple(spans) for group, spans in ranges.items()}
+
+
+def diff_block(previous: list[int], current: list[int]) -> list[tuple[int, int, int]]:
+    """Return (index, old, new) for each raw value that changed."""
+    return [
+        (index, old, new)
+        for index, (old, new) in enumerate(zip(previous, current, strict=False))
+        if old != new
+    ]
+
+
+class ChangeLogWriter(SessionLogWriter):
+    """Appends register changes to a change log file, rotating it at a size cap.
+
+    Blocking file I/O, run in the executor like the session log.
+    """
+
+    magic = CHANGE_LOG_MAGIC
+    max_bytes = CHANGE_LOG_MAX_BYTES
+
+    def record_changes(self, changes: list[RegisterChange]) -> None:
+        """Append one poll's changes; a failure is logged, never raised."""
+        self._append(
+            b"".join(
+                _RECORD.pack(
+                    change.timestamp,
+                    GROUPS.index(change.group),
+                    change.index,
+                    change.old,
+                    change.new,
+                )
+                for change in changes
+            )
+        )
+
+
+def read_change_log(path: Path) -> Iterator[RegisterChange]:
+    """Yield the changes of a change log in the order they were recorded."""
+    with path.open("rb") as file:
+        if file.read(len(CHANGE_LOG_MAGIC)) != CHANGE_LOG_MAGIC:
+            raise ValueError(f"{path} is not a Luxtronik change log")
+        while record := file.read(_RECORD.size):
+            if len(record) < _RECORD.size:
+                LOGGER.debug("Change log %s ends in a partial record", path)
+                return
+            timestamp, group, index, old, new = _RECORD.unpack(record)
+            yield RegisterChange(timestamp, GROUPS[group], index, old, new)
+
+
+class LuxtronikRegisterChanges:
+    """Diffs the raw blocks of one heat pump from poll to poll."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        writer: ChangeLogWriter | None,
+        event_ranges: IndexRanges,
+    ) -> None:
+        self._hass = hass
+        self._entry_id = entry_id
+        self.writer = writer
+        self.event_ranges = event_ranges
+        self._blocks: dict[str, list[int]] = {}
+        # Changes not yet handed to the writer, and the task writing them.
+        self._pending: list[RegisterChange] = []
+        self._writing: asyncio.Task[None] | None = None
+        self.polls = 0
+        self.changes = 0
+        self.last_changes = 0
+
+    @callback
+    def observe(self, raw_blocks: Mapping[str, list[int]], at: datetime) -> None:
+        """Log and fire the changes of every block read since the last poll.
+
+        An unchanged list object is a block that was not read this time (see
+        LuxtronikCoordinator._record_history) and is skipped.
+        """
+        timestamp = at.timestamp()
+        changes: list[RegisterChange] = []
+        for group in GROUPS:
+            block = raw_blocks.get(group)
+            previous = self._blocks.get(group)
+            if block is None or block is previous:
+                continue
+            self._blocks[group] = block
+            if previous is None:
+                continue
+            changes.extend(
+                RegisterChange(timestamp, group, index, old, new)
+                for index, old, new in diff_block(previous, block)
+            )
+        self.polls += 1
+        self.last_changes = len(changes)
+        if not changes:
+            return
+        self.changes += len(changes)
+        if self.writer is not None:
+            self._pending.extend(changes)
+            if self._writing is None:
+                self._writing = self._hass.async_create_task(
+                    self._async_write_pending(),
+                    f"{DOMAIN} register change log",
+                    eager_start=False,
+                )
+        for change in changes:
+            if self._in_event_ranges(change):
+                self._hass.bus.async_fire(
+                    EVENT_REGISTER_CHANGED,
+                    {
+                        "entry_id": self._entry_id,
+                        "group": change.group,
+                        "index": change.index,
+                        "old": change.old,
+                        "new": change.new,
+                    },
+                )
+
+    async def _async_write_pending(self) -> None:
+        """Write the queued changes in order, one executor job at a time."""
+        while self._pending and self.writer is not None:
+            changes, self._pending = self._pending, []
+            await self._hass.async_add_executor_job(self.writer.record_changes, changes)
+        self._writing = None
+
+    async def async_close(self) -> None:
+        """Write what is queued, then close the change log."""
+        while self._writing is not None:
+            await self._writing
+        writer, self.writer = self.writer, None
+        if writer is not None:
+            await self._hass.async_add_executor_job(writer.close)
+
+    def _in_event_ranges(self, change: RegisterChange) -> bool:
+        return any(
+            first <= change.index <= last
+            for first, last in self.event_ranges.get(change.group, ())
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters and settings, for diagnostics."""
+        return {
+            "path": str(self.writer.path) if self.writer is not None else None,
+            "event_ranges": {
+                group: [list(span) for span in spans]
+                for group, spans in self.event_ranges.items()
+            },
+            "polls": self.polls,
+            "changes": self.changes,
+            "last_changes": self.last_changes,
+        }
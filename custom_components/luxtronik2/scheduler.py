@@ -0,0 +1,206 @@
+"""One poll scheduler shared by every Luxtronik heat pump in Home Assistant.
+
+Each config entry has its own coordinator with its own interval, and each
+poll is a blocking read in Home Assistant's executor. With one heat pump
+that is all there is to it. With several - a cascade, or one controller per
+building - they were set up in the same second after a restart and, with
+equal intervals, kept polling in the same second for as long as Home
+Assistant ran: a burst of simultaneous reads every interval, each holding an
+executor thread, and a write to one pump queued behind the routine polls of
+all the others.
+
+The scheduler sits between the coordinators and their sockets:
+
+- Routine polls are staggered. Each one reserves a start time at least
+  `interval / pumps` (capped at `SCHEDULER_MAX_STAGGER`) after the previous
+  reservation. The coordinator schedules its next poll from the end of the
+  last one, so the phases spread out on the first round and stay apart.
+- At most `SCHEDULER_MAX_CONCURRENT` reads and writes are on the wire at
+  once, across all pumps.
+- Waiting operations are granted in `LuxSchedulePriority` order: a write,
+  then the reads confirming a write, then routine polls, each in arrival
+  order. A user changing a setting does not wait for a round of polls.
+
+Throughput across all pumps - operations per minute by priority and how busy
+the slots were - is kept for the diagnostics download, alongside the
+scheduler's own wait and stagger statistics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import (
+    DOMAIN,
+    SCHEDULER_MAX_CONCURRENT,
+    SCHEDULER_MAX_STAGGER,
+    SCHEDULER_THROUGHPUT_WINDOW,
+    LuxPollStat,
+    LuxSchedulePriority,
+)
+from .poll_stats import LuxtronikPollStats
+
+if TYPE_CHECKING:
+    from .coordinator import LuxtronikCoordinator
+
+_POLL_SCHEDULER: HassKey[LuxtronikPollScheduler] = HassKey(f"{DOMAIN}_poll_scheduler")
+
+
+class LuxtronikPollScheduler:
+    """Staggers, caps and orders the socket operations of all heat pumps.
+
+    Runs on the event loop only; the operations it grants still run in the
+    executor, the scheduler just decides when they may start.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = SCHEDULER_MAX_CONCURRENT,
+        max_stagger: float = SCHEDULER_MAX_STAGGER,
+        window: float = SCHEDULER_THROUGHPUT_WINDOW,
+    ) -> None:
+        self._max_concurrent = max_concurrent
+        self._max_stagger = max_stagger
+        self._window = window
+        self._coordinators: set[LuxtronikCoordinator] = set()
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._next_poll_at = 0.0
+        self._started = time.monotonic()
+        # (finished, priority, seconds the slot was held) per operation.
+        self._completed: deque[tuple[float, LuxSchedulePriority, float]] = deque()
+        self.peak_concurrent = 0
+        self.stats = LuxtronikPollStats()
+
+    @property
+    def heat_pumps(self) -> int:
+        """Return how many coordinators are registered."""
+        return len(self._coordinators)
+
+    @property
+    def active(self) -> int:
+        """Return how many operations currently hold a slot."""
+        return self._active
+
+    def register(self, coordinator: LuxtronikCoordinator) -> None:
+        """Have `coordinator`'s polls count towards the stagger."""
+        self._coordinators.add(coordinator)
+
+    def unregister(self, coordinator: LuxtronikCoordinator) -> None:
+        """Forget `coordinator`, e.g. when its entry is unloaded."""
+        self._coordinators.discard(coordinator)
+
+    async def async_stagger(self, interval: float) -> float:
+        """Wait for a routine poll's reserved start time; return the delay.
+
+        A single heat pump never waits. Otherwise the poll starts no earlier
+        than the gap after the poll that reserved before it - for any pump.
+        """
+        pumps = len(self._coordinators)
+        if pumps < 2:
+            return 0.0
+        gap = min(interval / pumps, self._max_stagger)
+        now = time.monotonic()
+        start = max(now, self._next_poll_at)
+        self._next_poll_at = start + gap
+        delay = start - now
+        self.stats.record(LuxPollStat.STAGGER_DELAY, delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    @asynccontextmanager
+    async def async_slot(self, priority: LuxSchedulePriority) -> AsyncIterator[None]:
+        """Hold one of the shared slots for the duration of a socket operation."""
+        requested = time.monotonic()
+        await self._acquire(priority)
+        granted = time.monotonic()
+        self.stats.record(LuxPollStat.SCHEDULER_WAIT, granted - requested)
+        try:
+            yield
+        finally:
+            finished = time.monotonic()
+            self._completed.append((finished, priority, finished - granted))
+            self._trim(finished)
+            self._release()
+
+    async def _acquire(self, priority: LuxSchedulePriority) -> None:
+        if self._active < self._max_concurrent and not self._waiters:
+            self._take()
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiter = (int(priority), next(self._sequence), future)
+        heapq.heappush(self._waiters, waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted in the same iteration the caller was cancelled:
+                # hand the slot on rather than losing it.
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _take(self) -> None:
+        self._active += 1
+        self.peak_concurrent = max(self.peak_concurrent, self._active)
+
+    def _release(self) -> None:
+        """Pass the slot to the first waiter in priority order, or free it."""
+        self._active -= 1
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._take()
+                future.set_result(None)
+                return
+
+    def _trim(self, now: float) -> None:
+        """Drop the operations that finished before the window."""
+        while self._completed and self._completed[0][0] < now - self._window:
+            self._completed.popleft()
+
+    def throughput(self) -> dict[str, Any]:
+        """Return the operations per minute and slot utilisation of the window."""
+        now = time.monotonic()
+        self._trim(now)
+        span = max(min(self._window, now - self._started), 1.0)
+        counts = Counter(priority for _, priority, _ in self._completed)
+        busy = sum(held for _, _, held in self._completed)
+        return {
+            "heat_pumps": self.heat_pumps,
+            "max_concurrent": self._max_concurrent,
+            "peak_concurrent": self.peak_concurrent,
+            "window": span,
+            "operations_per_minute": {
+                priority.name.lower(): counts[priority] * 60 / span
+                for priority in LuxSchedulePriority
+            },
+            "utilization": busy / (span * self._max_concurrent),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the throughput and the wait/stagger statistics."""
+        return {"throughput": self.throughput(), "stats": self.stats.as_dict()}
+
+
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> LuxtronikPollScheduler:
+    """Return the scheduler all Luxtronik coordinators of `hass` share."""
+    scheduler = hass.data.get(_POLL_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[_POLL_SCHEDULER] = LuxtronikPollScheduler()
+    return scheduler
@@ -3,15 +3,24 @@ from homeassistant.helpers import selector
 import voluptuous as vol
 
 from .const import (
+    CONF_CHANGE_LOG,
+    CONF_CHANGE_LOG_EVENTS,
+    CONF_FANOUT_SLICE_BUDGET,
     CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION,
     CONF_HA_SENSOR_INDOOR_TEMPERATURE,
     CONF_MAX_DATA_LENGTH,
+    CONF_POLL_WORKER,
+    CONF_SESSION_LOG,
+    CONF_STATISTICS_IMPORT,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_FANOUT_SLICE_BUDGET,
     DEFAULT_HOST,
     DEFAULT_MAX_DATA_LENGTH,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
     DEFAULT_UPDATE_INTERVAL_OPTION,
+    FANOUT_SLICE_BUDGET_MAX,
+    FANOUT_SLICE_BUDGET_MIN,
     UPDATE_INTERVAL_OPTIONS,
 )
 
@@ -38,6 +47,12 @@ def build_options_schema(
     current_indoor_temp: str | None = None,
     current_power_consumption_sensor: str | None = None,
     current_interval: str | None = None,
+    current_fanout_slice_budget: int | None = None,
+    current_session_log: bool = False,
+    current_poll_worker: bool = False,
+    current_statistics_import: bool = False,
+    current_change_log: bool = False,
+    current_change_log_events: str | None = None,
 ) -> vol.Schema:
     interval_options = [
         selector.SelectOptionDict(value=k, label=k) for k in UPDATE_INTERVAL_OPTIONS
@@ -71,5 +86,43 @@ def build_options_schema(
                     mode=selector.SelectSelectorMode.DROPDOWN,
                 )
             ),
+            # No `default`, like the entity fields above: an omitted value
+            # keeps whatever is stored instead of being forced into the
+            # validated output.
+            vol.Optional(
+                CONF_FANOUT_SLICE_BUDGET,
+                description={
+                    "suggested_value": current_fanout_slice_budget
+                    or DEFAULT_FANOUT_SLICE_BUDGET
+                },
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=FANOUT_SLICE_BUDGET_MIN,
+                    max=FANOUT_SLICE_BUDGET_MAX,
+                    step=1,
+                    unit_of_measurement="ms",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+            vol.Optional(
+                CONF_SESSION_LOG,
+                description={"suggested_value": current_session_log},
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_POLL_WORKER,
+                description={"suggested_value": current_poll_worker},
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_STATISTICS_IMPORT,
+                description={"suggested_value": current_statistics_import},
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_CHANGE_LOG,
+                description={"suggested_value": current_change_log},
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_CHANGE_LOG_EVENTS,
+                description={"suggested_value": current_change_log_events},
+            ): selector.TextSelector(),
         }
     )
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import replace
+import logging
 
 from homeassistant.components.select import (
     ENTITY_ID_FORMAT,  # pyright: ignore[reportAttributeAccessIssue]
@@ -27,6 +28,7 @@ from .const import (
     SensorKey as SK,
 )
 from .coordinator import LuxtronikCoordinator, LuxtronikCoordinatorData
+from .entity_plan import plan_descriptions
 from .model import LuxtronikSelectEntityDescription
 from .select_entities_predefined import SELECT_ENTITIES
 
@@ -49,21 +51,33 @@ async def async_setup_entry(
     if not coordinator.last_update_success:
         return
 
-    unavailable_keys = [
-        i.luxtronik_key
-        for i in SELECT_ENTITIES
-        if not key_exists(coordinator.data, i.luxtronik_key)
-    ]
-    if unavailable_keys:
-        # Not all models/firmware versions support every parameter;
-        # missing keys are expected and not an error.
-        LOGGER.debug("Not present in Luxtronik data, skipping: %s", unavailable_keys)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        unavailable_keys = [
+            i.luxtronik_key
+            for i in SELECT_ENTITIES
+            if not key_exists(coordinator.data, i.luxtronik_key)
+        ]
+        if unavailable_keys:
+            # Not all models/firmware versions support every parameter;
+            # missing keys are expected and not an error.
+            LOGGER.debug(
+                "Not present in Luxtronik data, skipping: %s", unavailable_keys
+            )
 
     # Descriptions are defined in select_entities_predefined.py
 
     # ---- Build entities in a compact, data-driven way -----------------
 
-    select_descriptions = build_select_descriptions(coordinator)
+    select_descriptions = plan_descriptions(
+        coordinator,
+        "select",
+        SELECT_ENTITIES,
+        lambda desc: (
+            coordinator.entity_active(desc)
+            and key_exists(coordinator.data, desc.luxtronik_key)
+        ),
+        resolve=lambda desc: resolve_select_description(coordinator, desc),
+    )
 
     async_add_entities(
         [
@@ -81,10 +95,6 @@ async def async_setup_entry(
                 device_info_ident=desc.device_key,
             )
             for desc in select_descriptions
-            if (
-                coordinator.entity_active(desc)
-                and key_exists(coordinator.data, desc.luxtronik_key)
-            )
         ]
     )
 
@@ -93,13 +103,17 @@ def build_select_descriptions(
     coordinator: LuxtronikCoordinator,
 ) -> list[LuxtronikSelectEntityDescription]:
     """Return select descriptions with PV mode options adjusted at runtime."""
-    descriptions: list[LuxtronikSelectEntityDescription] = []
-    for desc in SELECT_ENTITIES:
-        if desc.key == SK.PV_MODE_SELECTOR:
-            descriptions.append(_build_pv_mode_selector_description(coordinator, desc))
-        else:
-            descriptions.append(desc)
-    return descriptions
+    return [resolve_select_description(coordinator, desc) for desc in SELECT_ENTITIES]
+
+
+def resolve_select_description(
+    coordinator: LuxtronikCoordinator,
+    description: LuxtronikSelectEntityDescription,
+) -> LuxtronikSelectEntityDescription:
+    """Return `description` with its options adjusted to the current data."""
+    if description.key == SK.PV_MODE_SELECTOR:
+        return _build_pv_mode_selector_description(coordinator, description)
+    return description
 
 
 def _build_pv_mode_selector_description(
@@ -3,7 +3,9 @@
 # region Imports
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+import logging
+import time
 
 from homeassistant.components.sensor import (
     ENTITY_ID_FORMAT,  # pyright: ignore[reportAttributeAccessIssue]
@@ -21,13 +23,15 @@ from .common import (
     key_exists,
     read_smart_grid_inputs,
     smart_grid_enabled,
-    state_as_number_or_none,
 )
 from .const import (
     CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION,
     CONF_HA_SENSOR_PREFIX,
+    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    EXTERNAL_SAMPLE_MAX_SKEW,
     LOGGER,
+    STATISTICS_IMPORT_STATE_INTERVAL,
     DeviceKey,
     LuxCalculation as LC,
     LuxParameter as LP,
@@ -37,18 +41,31 @@ from .const import (
     SensorKey,
 )
 from .coordinator import LuxtronikCoordinator, LuxtronikCoordinatorData
+from .counter_cop import COP_COUNTERS
+from .entity_plan import plan_descriptions
 from .evu_helper import LuxtronikEVUTracker
+from .external_sensor import ExternalSensorTracker
 from .model import (
     LuxtronikCopSensorDescription,
+    LuxtronikCounterCopSensorDescription,
+    LuxtronikCycleSensorDescription,
     LuxtronikEntityAttributeDescription,
     LuxtronikIndexSensorDescription,
+    LuxtronikModeEnergySensorDescription,
+    LuxtronikModeTimeSensorDescription,
+    LuxtronikPollStatSensorDescription,
     LuxtronikSensorDescription,
     LuxtronikSumSensorDescription,
 )
 from .sensor_entities_predefined import (
     SENSORS,
     SENSORS_COP,
+    SENSORS_COUNTER_COP,
+    SENSORS_CYCLES,
     SENSORS_INDEX,
+    SENSORS_MODE_ENERGY,
+    SENSORS_MODE_TIME,
+    SENSORS_POLL_STATS,
     SENSORS_STATUS,
     SENSORS_SUM,
 )
@@ -71,27 +88,51 @@ async def async_setup_entry(
     if not coordinator.last_update_success:
         return
 
-    unavailable_keys = [
-        i.luxtronik_key
-        for i in SENSORS + SENSORS_STATUS
-        if not key_exists(coordinator.data, i.luxtronik_key)
-        and i.luxtronik_key != LC.UNSET
-    ]
-    if unavailable_keys:
-        # Not all models/firmware versions support every parameter;
-        # missing keys are expected and not an error.
-        LOGGER.debug("Not present in Luxtronik data, skipping: %s", unavailable_keys)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        unavailable_keys = [
+            i.luxtronik_key
+            for i in SENSORS + SENSORS_STATUS
+            if not key_exists(coordinator.data, i.luxtronik_key)
+            and i.luxtronik_key != LC.UNSET
+        ]
+        if unavailable_keys:
+            # Not all models/firmware versions support every parameter;
+            # missing keys are expected and not an error.
+            LOGGER.debug(
+                "Not present in Luxtronik data, skipping: %s", unavailable_keys
+            )
+
+    def status_available(description: LuxtronikSensorDescription) -> bool:
+        # Check if firmware supports the Luxtronik Parameter/Calculation key
+        if key_exists(coordinator.data, description.luxtronik_key):
+            return True
+        # For SmartGrid status sensor, check if required parameters exist.
+        # EVU2 may be read from another register than C0185 at
+        # runtime (#669), but every controller defines C0185,
+        # so this stays a valid presence check.
+        return description.key == SensorKey.SMART_GRID_STATUS and (
+            key_exists(coordinator.data, LP.P1030_SMART_GRID_SWITCH)
+            and key_exists(coordinator.data, LC.C0031_EVU_UNLOCKED)
+            and key_exists(coordinator.data, LC.C0185_EVU2)
+        )
 
+    sensors = plan_descriptions(
+        coordinator,
+        "sensor",
+        SENSORS,
+        lambda description: (
+            coordinator.entity_active(description)
+            and key_exists(coordinator.data, description.luxtronik_key)
+        ),
+    )
+    if coordinator.statistics_importer is not None:
+        coordinator.statistics_importer.track(sensors)
     async_add_entities(
         [
             LuxtronikSensorEntity(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in SENSORS
-            if (
-                coordinator.entity_active(description)
-                and key_exists(coordinator.data, description.luxtronik_key)
-            )
+            for description in sensors
         ]
     )
 
@@ -100,25 +141,14 @@ async def async_setup_entry(
             LuxtronikStatusSensorEntity(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in SENSORS_STATUS
-            if (
-                coordinator.entity_active(description)
-                and (
-                    # Check if firmware supports the Luxtronik Parameter/Calculation key
-                    key_exists(coordinator.data, description.luxtronik_key)
-                    or (
-                        # For SmartGrid status sensor, check if required parameters exist.
-                        # EVU2 may be read from another register than C0185 at
-                        # runtime (#669), but every controller defines C0185,
-                        # so this stays a valid presence check.
-                        description.key == SensorKey.SMART_GRID_STATUS
-                        and (
-                            key_exists(coordinator.data, LP.P1030_SMART_GRID_SWITCH)
-                            and key_exists(coordinator.data, LC.C0031_EVU_UNLOCKED)
-                            and key_exists(coordinator.data, LC.C0185_EVU2)
-                        )
-                    )
-                )
+            for description in plan_descriptions(
+                coordinator,
+                "sensor_status",
+                SENSORS_STATUS,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and status_available(description)
+                ),
             )
         ]
     )
@@ -128,8 +158,9 @@ async def async_setup_entry(
             LuxtronikIndexSensor(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in SENSORS_INDEX
-            if coordinator.entity_active(description)
+            for description in plan_descriptions(
+                coordinator, "sensor_index", SENSORS_INDEX, coordinator.entity_active
+            )
         ]
     )
 
@@ -138,11 +169,36 @@ async def async_setup_entry(
             LuxtronikCopSensorEntity(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in SENSORS_COP
-            if (
-                coordinator.entity_active(description)
-                and key_exists(coordinator.data, description.numerator_key)
-                and key_exists(coordinator.data, description.denominator_key)
+            for description in plan_descriptions(
+                coordinator,
+                "sensor_cop",
+                SENSORS_COP,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and key_exists(coordinator.data, description.numerator_key)
+                    and key_exists(coordinator.data, description.denominator_key)
+                ),
+            )
+        ]
+    )
+
+    async_add_entities(
+        [
+            LuxtronikCounterCopSensorEntity(
+                hass, entry, coordinator, description, description.device_key
+            )
+            for description in plan_descriptions(
+                coordinator,
+                "sensor_counter_cop",
+                SENSORS_COUNTER_COP,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and all(
+                        key_exists(coordinator.data, key)
+                        for circuit in description.circuits
+                        for key in COP_COUNTERS[circuit]
+                    )
+                ),
             )
         ]
     )
@@ -152,15 +208,71 @@ async def async_setup_entry(
             LuxtronikSumSensorEntity(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in SENSORS_SUM
-            if (
-                coordinator.entity_active(description)
-                # One summand is enough: a controller predating the second
-                # register still has a valid total from the first alone.
-                and any(
-                    key_exists(coordinator.data, key)
-                    for key in description.summand_keys
-                )
+            for description in plan_descriptions(
+                coordinator,
+                "sensor_sum",
+                SENSORS_SUM,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    # One summand is enough: a controller predating the second
+                    # register still has a valid total from the first alone.
+                    and any(
+                        key_exists(coordinator.data, key)
+                        for key in description.summand_keys
+                    )
+                ),
+            )
+        ]
+    )
+
+    async_add_entities(
+        [
+            LuxtronikPollStatSensorEntity(
+                hass, entry, coordinator, description, description.device_key
+            )
+            for description in SENSORS_POLL_STATS
+        ]
+    )
+
+    async_add_entities(
+        [
+            LuxtronikModeTimeSensorEntity(
+                hass, entry, coordinator, description, description.device_key
+            )
+            for description in plan_descriptions(
+                coordinator,
+                "sensor_mode_time",
+                SENSORS_MODE_TIME,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and key_exists(coordinator.data, LC.C0080_STATUS)
+                ),
+            )
+        ]
+    )
+
+    async_add_entities(
+        [
+            LuxtronikModeEnergySensorEntity(
+                hass, entry, coordinator, description, description.device_key
+            )
+            for description in SENSORS_MODE_ENERGY
+        ]
+    )
+
+    async_add_entities(
+        [
+            LuxtronikCycleSensorEntity(
+                hass, entry, coordinator, description, description.device_key
+            )
+            for description in plan_descriptions(
+                coordinator,
+                "sensor_cycles",
+                SENSORS_CYCLES,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and key_exists(coordinator.data, LC.C0044_COMPRESSOR)
+                ),
             )
         ]
     )
@@ -171,6 +283,10 @@ class LuxtronikSensorEntity(LuxtronikEntity[LuxtronikSensorDescription], SensorE
 
     _coordinator: LuxtronikCoordinator
 
+    # Last written (available, unknown) and when; see _write_throttled().
+    _written: tuple[bool, bool] | None = None
+    _written_at: float = 0.0
+
     _unrecorded_attributes = frozenset(
         {
             SA.SWITCH_GAP,
@@ -253,8 +369,30 @@ class LuxtronikSensorEntity(LuxtronikEntity[LuxtronikSensorDescription], SensorE
         else:
             self._attr_native_value = value
 
+        if self._write_throttled():
+            return
         super()._handle_coordinator_update()
 
+    def _write_throttled(self) -> bool:
+        """Whether to skip this state write, see statistics_import.py.
+
+        Only sensors whose hourly statistics are imported are throttled, and
+        a change to or from unknown or unavailable is always written.
+        """
+        importer = self.coordinator.statistics_importer
+        if importer is None or self.entity_description.key not in importer.keys:
+            return False
+        now = time.monotonic()
+        written = (self.available, self._attr_native_value is None)
+        if (
+            written == self._written
+            and now - self._written_at
+            < STATISTICS_IMPORT_STATE_INTERVAL.total_seconds()
+        ):
+            return True
+        self._written, self._written_at = written, now
+        return False
+
 
 class LuxtronikStatusSensorEntity(LuxtronikSensorEntity):
     """Luxtronik Status Sensor with extended attr."""
@@ -453,10 +591,22 @@ class LuxtronikCopSensorEntity(LuxtronikSensorEntity):
     pattern climate.py already uses for the indoor-temperature override.
     Only the denominator is overridable this way; the numerator
     (current_heat_output) always comes from the heat pump.
+
+    The external sensor is followed through state events (see
+    external_sensor.py), so the ratio is recomputed whenever the meter
+    reports, against the heat output of the latest poll - instead of sampling
+    the meter once per poll. The two samples are then up to one update
+    interval apart by construction; `sample_skew` shows how far, and a pair
+    further apart than that plus EXTERNAL_SAMPLE_MAX_SKEW is not combined.
     """
 
     entity_description: LuxtronikCopSensorDescription  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
 
+    _unrecorded_attributes = LuxtronikSensorEntity._unrecorded_attributes | {
+        SA.EXTERNAL_SAMPLED_AT,
+        SA.SAMPLE_SKEW,
+    }
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -467,10 +617,31 @@ class LuxtronikCopSensorEntity(LuxtronikSensorEntity):
     ) -> None:
         """Init Luxtronik COP Sensor."""
         super().__init__(hass, entry, coordinator, description, device_info_ident)
-        self._external_power_sensor_entity_id: str | None = entry.options.get(
+        external_power_sensor_entity_id: str | None = entry.options.get(
             CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION,
             entry.data.get(CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION),
         )
+        self._external_power: ExternalSensorTracker | None = (
+            ExternalSensorTracker(
+                external_power_sensor_entity_id, self._handle_external_power_change
+            )
+            if external_power_sensor_entity_id
+            else None
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the external power sensor, if one is configured."""
+        # Before super(): that runs the first _handle_coordinator_update,
+        # which should already see the meter's current value.
+        if self._external_power is not None:
+            self.async_on_remove(self._external_power.async_start(self.hass))
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_external_power_change(self) -> None:
+        """Recompute against the last poll when the power meter reports."""
+        if self.coordinator.data is not None:
+            self._handle_coordinator_update(self.coordinator.data)
 
     @callback
     def _handle_coordinator_update(
@@ -485,13 +656,8 @@ class LuxtronikCopSensorEntity(LuxtronikSensorEntity):
         status = get_sensor_data(data, LC.C0080_STATUS)
         numerator = get_sensor_data(data, descr.numerator_key)
 
-        if self._external_power_sensor_entity_id:
-            external_state = self.hass.states.get(self._external_power_sensor_entity_id)
-            denominator = (
-                state_as_number_or_none(external_state)
-                if external_state is not None
-                else None
-            )
+        if self._external_power is not None:
+            denominator = self._external_denominator(self._external_power, data)
         else:
             denominator = get_sensor_data(data, descr.denominator_key)
 
@@ -509,6 +675,29 @@ class LuxtronikCopSensorEntity(LuxtronikSensorEntity):
 
         self.async_write_ha_state()
 
+    def _external_denominator(
+        self, external_power: ExternalSensorTracker, data: LuxtronikCoordinatorData
+    ) -> float | None:
+        """Return the external power sample, or None if it is unusable.
+
+        Also publishes when the sample was taken and how far it is from the
+        heat pump snapshot, so a COP that looks off can be checked against
+        the timing of its two inputs.
+        """
+        sampled_at = external_power.sampled_at
+        skew: timedelta | None = None
+        if sampled_at is not None and data.polled_at is not None:
+            skew = abs(sampled_at - data.polled_at)
+        self._attr_extra_state_attributes[SA.EXTERNAL_SAMPLED_AT] = sampled_at
+        self._attr_extra_state_attributes[SA.SAMPLE_SKEW] = (
+            None if skew is None else round(skew.total_seconds(), 1)
+        )
+
+        interval = self.coordinator.update_interval or DEFAULT_UPDATE_INTERVAL
+        if skew is not None and skew > interval + EXTERNAL_SAMPLE_MAX_SKEW:
+            return None
+        return external_power.value
+
 
 class LuxtronikSumSensorEntity(LuxtronikSensorEntity):
     """A total across several registers holding one split quantity.
@@ -558,3 +747,240 @@ class LuxtronikSumSensorEntity(LuxtronikSensorEntity):
             self._attr_native_value = total
 
         self.async_write_ha_state()
+
+
+class LuxtronikPollStatSensorEntity(LuxtronikSensorEntity):
+    """One figure from the connection's rolling poll statistics.
+
+    Reads nothing from the heat pump: the value comes from
+    `coordinator.poll_stats`, which the client and coordinator fill while
+    polling and writing (see poll_stats.py). Refreshed with every coordinator
+    update like any other sensor, so it costs one summary of one histogram
+    per poll, and only while the user has enabled it.
+
+    A statistic that has not been recorded yet - no write since startup, no
+    reconnect ever - reports 0 for the event totals, which is the truth, and
+    unknown for everything else, which has no meaningful value yet.
+    """
+
+    entity_description: LuxtronikPollStatSensorDescription  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    _unrecorded_attributes = frozenset(
+        LuxtronikSensorEntity._unrecorded_attributes
+        | {SA.STAT_SAMPLES, SA.STAT_MEAN, SA.STAT_P50, SA.STAT_P95, SA.STAT_MAX}
+    )
+
+    @callback
+    def _handle_coordinator_update(
+        self, data: LuxtronikCoordinatorData | None = None
+    ) -> None:
+        """Handle updated data from the coordinator."""
+        descr = self.entity_description
+        summary = self.coordinator.poll_stats.summary(descr.poll_stat)
+        attr = self._attr_extra_state_attributes
+
+        if summary is None:
+            self._attr_native_value = 0 if descr.statistic == "total" else None
+            for key in (SA.STAT_MEAN, SA.STAT_P50, SA.STAT_P95, SA.STAT_MAX):
+                attr.pop(key, None)
+            attr[SA.STAT_SAMPLES] = 0
+        else:
+            self._attr_native_value = self._scaled(summary[descr.statistic])
+            attr[SA.STAT_SAMPLES] = summary["window"]
+            attr[SA.STAT_MEAN] = self._scaled(summary["mean"])
+            attr[SA.STAT_P50] = self._scaled(summary["p50"])
+            attr[SA.STAT_P95] = self._scaled(summary["p95"])
+            attr[SA.STAT_MAX] = self._scaled(summary["max"])
+
+        self.async_write_ha_state()
+
+    def _scaled(self, value: float | int | None) -> float | None:
+        """Apply the description's factor and precision to one figure."""
+        if value is None:
+            return None
+        value = float(value) * self._value_factor
+        precision = self.entity_description.native_precision
+        return round(value, precision) if precision is not None else value
+
+
+class LuxtronikModeTimeSensorEntity(LuxtronikSensorEntity):
+    """Today's time in one operating status, from the coordinator's totals.
+
+    Replaces a `history_stats` helper over the status sensor: the coordinator
+    adds each poll interval to the status that held during it (see
+    mode_time.py), so this entity only reads three sums per poll instead of
+    querying the recorder. The state restarts from 0 at local midnight,
+    which TOTAL_INCREASING long-term statistics treat as a meter reset.
+    Unknown for a coordinator without totals (outside a config entry).
+    """
+
+    entity_description: LuxtronikModeTimeSensorDescription  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    _unrecorded_attributes = frozenset(
+        LuxtronikSensorEntity._unrecorded_attributes
+        | {SA.MODE_TIME_YESTERDAY, SA.MODE_TIME_LAST_7_DAYS}
+    )
+
+    @callback
+    def _handle_coordinator_update(
+        self, data: LuxtronikCoordinatorData | None = None
+    ) -> None:
+        """Handle updated data from the coordinator."""
+        mode_time = self.coordinator.mode_time
+        mode = self.entity_description.mode
+        attr = self._attr_extra_state_attributes
+
+        if mode_time is None:
+            self._attr_native_value = None
+            attr.pop(SA.MODE_TIME_YESTERDAY, None)
+            attr.pop(SA.MODE_TIME_LAST_7_DAYS, None)
+        else:
+            self._attr_native_value = self._scaled(mode_time.seconds(mode))
+            attr[SA.MODE_TIME_YESTERDAY] = self._scaled(mode_time.seconds(mode, 1))
+            attr[SA.MODE_TIME_LAST_7_DAYS] = self._scaled(
+                mode_time.seconds_last_days(mode, 7)
+            )
+
+        self.async_write_ha_state()
+
+    def _scaled(self, seconds: float) -> float:
+        """Convert seconds to the description's unit and precision."""
+        value = seconds * self._value_factor
+        precision = self.entity_description.native_precision
+        return round(value, precision) if precision is not None else value
+
+
+class LuxtronikModeEnergySensorEntity(LuxtronikSensorEntity):
+    """Lifetime energy of one quantity in one operating status.
+
+    Replaces an integration sensor plus a utility_meter tariff per mode: the
+    coordinator integrates the power itself and books each interval to the
+    status shown during it (see mode_energy.py). This entity only reads one
+    total per poll. Unknown for a coordinator without totals.
+    """
+
+    entity_description: LuxtronikModeEnergySensorDescription  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    @callback
+    def _handle_coordinator_update(
+        self, data: LuxtronikCoordinatorData | None = None
+    ) -> None:
+        """Handle updated data from the coordinator."""
+        mode_energy = self.coordinator.mode_energy
+        descr = self.entity_description
+
+        if mode_energy is None:
+            self._attr_native_value = None
+        else:
+            value = mode_energy.kwh(descr.quantity, descr.mode)
+            precision = descr.native_precision
+            self._attr_native_value = (
+                round(value, precision) if precision is not None else value
+            )
+
+        self.async_write_ha_state()
+
+
+class LuxtronikCycleSensorEntity(LuxtronikSensorEntity):
+    """One compressor cycle or defrost statistic over the last 24 hours.
+
+    The coordinator detects starts, stops and defrosts poll by poll (see
+    cycles.py); this entity summarises the stored events on each update.
+    Cycles per hour carries the start count, the defrost count carries
+    defrosts per compressor hour by outdoor temperature band. Unknown for a
+    coordinator without cycle statistics, and for runtimes and the
+    short-cycle rate until a cycle has ended in the window.
+    """
+
+    entity_description: LuxtronikCycleSensorDescription  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    _unrecorded_attributes = frozenset(
+        LuxtronikSensorEntity._unrecorded_attributes
+        | {SA.CYCLE_STARTS, SA.DEFROSTS_PER_COMPRESSOR_HOUR}
+    )
+
+    @callback
+    def _handle_coordinator_update(
+        self, data: LuxtronikCoordinatorData | None = None
+    ) -> None:
+        """Handle updated data from the coordinator."""
+        cycles = self.coordinator.cycles
+        descr = self.entity_description
+        attr = self._attr_extra_state_attributes
+
+        if cycles is None:
+            self._attr_native_value = None
+            attr.pop(SA.CYCLE_STARTS, None)
+            attr.pop(SA.DEFROSTS_PER_COMPRESSOR_HOUR, None)
+        else:
+            summary = cycles.summary(datetime.now(UTC))
+            value = summary[descr.statistic]
+            if value is not None and descr.statistic.endswith("_runtime"):
+                value *= self._value_factor
+            precision = descr.native_precision
+            self._attr_native_value = (
+                round(value, precision)
+                if value is not None and precision is not None
+                else value
+            )
+            if descr.statistic == "cycles_per_hour":
+                attr[SA.CYCLE_STARTS] = summary["starts"]
+            elif descr.statistic == "defrosts":
+                attr[SA.DEFROSTS_PER_COMPRESSOR_HOUR] = summary[
+                    "defrosts_per_compressor_hour"
+                ]
+
+        self.async_write_ha_state()
+
+
+class LuxtronikCounterCopSensorEntity(LuxtronikSensorEntity):
+    """COP of one or more circuits from the controller's energy counters.
+
+    The coordinator books the counter deltas into hours, days, months and
+    heating seasons (see counter_cop.py); this entity divides the sums. The
+    seven-day sensor carries the last 24 hours and 30 days as attributes,
+    the season sensor this month, the previous season and the season's
+    energy. Unknown until enough electrical energy has been counted.
+    """
+
+    entity_description: LuxtronikCounterCopSensorDescription  # type: ignore  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    _period_attributes = (
+        SA.COP_LAST_24_HOURS,
+        SA.COP_LAST_30_DAYS,
+        SA.COP_THIS_MONTH,
+        SA.COP_PREVIOUS_SEASON,
+        SA.COP_SEASON_HEAT,
+        SA.COP_SEASON_ELECTRICAL,
+    )
+    _unrecorded_attributes = frozenset(
+        LuxtronikSensorEntity._unrecorded_attributes | set(_period_attributes)
+    )
+
+    @callback
+    def _handle_coordinator_update(
+        self, data: LuxtronikCoordinatorData | None = None
+    ) -> None:
+        """Handle updated data from the coordinator."""
+        counter_cop = self.coordinator.counter_cop
+        descr = self.entity_description
+
+        attr = self._attr_extra_state_attributes
+
+        if counter_cop is None:
+            self._attr_native_value = None
+            for key in self._period_attributes:
+                attr.pop(key, None)
+        else:
+            summary = counter_cop.summary(descr.circuits, datetime.now(UTC))
+            self._attr_native_value = summary[descr.period]
+            if descr.period == "last_7_days":
+                attr[SA.COP_LAST_24_HOURS] = summary["last_24_hours"]
+                attr[SA.COP_LAST_30_DAYS] = summary["last_30_days"]
+            else:
+                attr[SA.COP_THIS_MONTH] = summary["this_month"]
+                attr[SA.COP_PREVIOUS_SEASON] = summary["previous_season"]
+                attr[SA.COP_SEASON_HEAT] = summary["season_heat"]
+                attr[SA.COP_SEASON_ELECTRICAL] = summary["season_electrical"]
+
+        self.async_write_ha_state()
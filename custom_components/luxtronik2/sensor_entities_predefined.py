@@ -11,6 +11,7 @@ from homeassistant.const import (
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfFrequency,
+    UnitOfInformation,
     UnitOfPower,
     UnitOfPressure,
     UnitOfTemperature,
@@ -20,10 +21,12 @@ from homeassistant.const import (
 
 from .const import (
     SECOND_TO_HOUR_FACTOR,
+    SECOND_TO_MINUTE_FACTOR,
     DeviceKey,
     LuxCalculation as LC,
     LuxOperationMode,
     LuxParameter as LP,
+    LuxPollStat,
     LuxSmartGridStatus,
     LuxStatus1Option,
     LuxStatus3Option,
@@ -36,8 +39,13 @@ from .const import (
 )
 from .model import (
     LuxtronikCopSensorDescription as cop_descr,
+    LuxtronikCounterCopSensorDescription as counter_cop_descr,
+    LuxtronikCycleSensorDescription as cycle_descr,
     LuxtronikEntityAttributeDescription as attr,
     LuxtronikIndexSensorDescription as descr_index,
+    LuxtronikModeEnergySensorDescription as mode_energy_descr,
+    LuxtronikModeTimeSensorDescription as mode_time_descr,
+    LuxtronikPollStatSensorDescription as poll_descr,
     LuxtronikSensorDescription as descr,
     LuxtronikSumSensorDescription as sum_descr,
 )
@@ -1000,3 +1008,534 @@ SENSORS_SUM: list[sum_descr] = [
     ),
 ]
 # endregion Totals
+
+# region Poll statistics
+# Figures about the connection rather than the heat pump (see poll_stats.py).
+# All disabled by default: they are for diagnosing a slow or flaky controller,
+# and a user who is not doing that has no use for a dozen more entities.
+# Timings are reported as their 95th percentile over the recent window - the
+# typical read is uninteresting, the slow tail is what a complaint is about -
+# and event counts as lifetime totals, which only ever increase.
+SENSORS_POLL_STATS: list[poll_descr] = [
+    poll_descr(
+        key=SensorKey.POLL_PARAMETERS_READ_TIME,
+        poll_stat=LuxPollStat.PARAMETERS_READ_TIME,
+        statistic="p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        factor=1000,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_CALCULATIONS_READ_TIME,
+        poll_stat=LuxPollStat.CALCULATIONS_READ_TIME,
+        statistic="p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        factor=1000,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_VISIBILITIES_READ_TIME,
+        poll_stat=LuxPollStat.VISIBILITIES_READ_TIME,
+        statistic="p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        factor=1000,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_BYTES_READ,
+        poll_stat=LuxPollStat.POLL_BYTES,
+        statistic="last",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        native_precision=0,
+        icon="mdi:download-network-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_FRAGMENTED_READS,
+        poll_stat=LuxPollStat.FRAGMENTED_READS,
+        statistic="total",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_precision=0,
+        icon="mdi:puzzle-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_READ_RETRIES,
+        poll_stat=LuxPollStat.READ_RETRIES,
+        statistic="total",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_precision=0,
+        icon="mdi:replay",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_RECONNECTS,
+        poll_stat=LuxPollStat.RECONNECTS,
+        statistic="total",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_precision=0,
+        icon="mdi:lan-disconnect",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_LOCK_WAIT,
+        poll_stat=LuxPollStat.LOCK_WAIT,
+        statistic="p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        factor=1000,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_SCHEDULER_WAIT,
+        poll_stat=LuxPollStat.SCHEDULER_WAIT,
+        statistic="p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        factor=1000,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_EXECUTOR_DELAY,
+        poll_stat=LuxPollStat.EXECUTOR_DELAY,
+        statistic="p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        factor=1000,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_WRITE_ACK_TIME,
+        poll_stat=LuxPollStat.WRITE_ACK_TIME,
+        statistic="p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        factor=1000,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_WRITE_CONFIRM_ATTEMPTS,
+        poll_stat=LuxPollStat.WRITE_CONFIRM_ATTEMPTS,
+        statistic="mean",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=1,
+        icon="mdi:check-all",
+    ),
+    poll_descr(
+        key=SensorKey.POLL_FANOUT_TIME,
+        poll_stat=LuxPollStat.FANOUT_TIME,
+        statistic="p95",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        factor=1000,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+]
+# endregion Poll statistics
+
+
+# Today's time per operating status (see mode_time.py). Heating and hot water
+# are what most installations track; the rest are opt-in.
+SENSORS_MODE_TIME: list[mode_time_descr] = [
+    mode_time_descr(
+        key=SensorKey.MODE_TIME_HEATING,
+        mode=LuxOperationMode.heating,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        factor=SECOND_TO_HOUR_FACTOR,
+        native_precision=2,
+        icon="mdi:radiator",
+    ),
+    mode_time_descr(
+        key=SensorKey.MODE_TIME_DOMESTIC_WATER,
+        mode=LuxOperationMode.domestic_water,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        factor=SECOND_TO_HOUR_FACTOR,
+        native_precision=2,
+        icon="mdi:water-boiler",
+    ),
+    mode_time_descr(
+        key=SensorKey.MODE_TIME_SWIMMING_POOL_SOLAR,
+        mode=LuxOperationMode.swimming_pool_solar,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        factor=SECOND_TO_HOUR_FACTOR,
+        native_precision=2,
+        icon="mdi:pool",
+    ),
+    mode_time_descr(
+        key=SensorKey.MODE_TIME_EVU,
+        mode=LuxOperationMode.evu,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        factor=SECOND_TO_HOUR_FACTOR,
+        native_precision=2,
+        icon="mdi:transmission-tower-off",
+    ),
+    mode_time_descr(
+        key=SensorKey.MODE_TIME_DEFROST,
+        mode=LuxOperationMode.defrost,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        factor=SECOND_TO_HOUR_FACTOR,
+        native_precision=2,
+        icon="mdi:snowflake-melt",
+    ),
+    mode_time_descr(
+        key=SensorKey.MODE_TIME_NO_REQUEST,
+        mode=LuxOperationMode.no_request,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        factor=SECOND_TO_HOUR_FACTOR,
+        native_precision=2,
+        icon="mdi:sleep",
+    ),
+    mode_time_descr(
+        key=SensorKey.MODE_TIME_HEATING_EXTERNAL_SOURCE,
+        mode=LuxOperationMode.heating_external_source,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        factor=SECOND_TO_HOUR_FACTOR,
+        native_precision=2,
+        icon="mdi:fire",
+    ),
+    mode_time_descr(
+        key=SensorKey.MODE_TIME_COOLING,
+        mode=LuxOperationMode.cooling,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        factor=SECOND_TO_HOUR_FACTOR,
+        native_precision=2,
+        icon="mdi:snowflake",
+    ),
+]
+
+
+# Energy per operating status, integrated from the power registers or the
+# external meter (see mode_energy.py). Not diagnostic, so they can be picked
+# in the energy dashboard. Heating and hot water are enabled by default.
+SENSORS_MODE_ENERGY: list[mode_energy_descr] = [
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_HEAT_HEATING,
+        mode=LuxOperationMode.heating,
+        quantity="heat",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:heat-wave",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_HEAT_DOMESTIC_WATER,
+        mode=LuxOperationMode.domestic_water,
+        quantity="heat",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:heat-wave",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_HEAT_COOLING,
+        mode=LuxOperationMode.cooling,
+        quantity="heat",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:heat-wave",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_HEAT_SWIMMING_POOL_SOLAR,
+        mode=LuxOperationMode.swimming_pool_solar,
+        quantity="heat",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:heat-wave",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_HEAT_DEFROST,
+        mode=LuxOperationMode.defrost,
+        quantity="heat",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:heat-wave",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_ELECTRICAL_HEATING,
+        mode=LuxOperationMode.heating,
+        quantity="electrical",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:lightning-bolt",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_ELECTRICAL_DOMESTIC_WATER,
+        mode=LuxOperationMode.domestic_water,
+        quantity="electrical",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:lightning-bolt",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_ELECTRICAL_COOLING,
+        mode=LuxOperationMode.cooling,
+        quantity="electrical",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:lightning-bolt",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_ELECTRICAL_SWIMMING_POOL_SOLAR,
+        mode=LuxOperationMode.swimming_pool_solar,
+        quantity="electrical",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:lightning-bolt",
+    ),
+    mode_energy_descr(
+        key=SensorKey.MODE_ENERGY_ELECTRICAL_DEFROST,
+        mode=LuxOperationMode.defrost,
+        quantity="electrical",
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        native_precision=2,
+        icon="mdi:lightning-bolt",
+    ),
+]
+
+
+# Compressor cycle and defrost statistics over the last 24 hours (see
+# cycles.py). Cycles per hour and the short-cycle rate are the two figures
+# worth watching; the runtimes and the defrost count are opt-in.
+SENSORS_CYCLES: list[cycle_descr] = [
+    cycle_descr(
+        key=SensorKey.COMPRESSOR_CYCLES_PER_HOUR,
+        statistic="cycles_per_hour",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="1/h",
+        native_precision=2,
+        icon="mdi:sync",
+    ),
+    cycle_descr(
+        key=SensorKey.COMPRESSOR_SHORT_CYCLE_RATE,
+        statistic="short_cycle_rate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        native_precision=1,
+        icon="mdi:sync-alert",
+    ),
+    cycle_descr(
+        key=SensorKey.COMPRESSOR_MEAN_RUNTIME,
+        statistic="mean_runtime",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        factor=SECOND_TO_MINUTE_FACTOR,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    cycle_descr(
+        key=SensorKey.COMPRESSOR_MEDIAN_RUNTIME,
+        statistic="median_runtime",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        factor=SECOND_TO_MINUTE_FACTOR,
+        native_precision=1,
+        icon="mdi:timer-outline",
+    ),
+    cycle_descr(
+        key=SensorKey.DEFROSTS_LAST_24H,
+        statistic="defrosts",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:snowflake-melt",
+    ),
+]
+
+
+# COP from the controller's energy counters (see counter_cop.py): the last
+# seven days and the current heating season, per circuit and for the heating
+# side as a whole (heating, hot water and pool together). Pool and cooling
+# are opt-in, most units have neither.
+SENSORS_COUNTER_COP: list[counter_cop_descr] = [
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_LAST_7_DAYS,
+        circuits=("heating", "domestic_water", "pool"),
+        period="last_7_days",
+        device_key=DeviceKey.heatpump,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_SEASON,
+        circuits=("heating", "domestic_water", "pool"),
+        period="season",
+        device_key=DeviceKey.heatpump,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_HEATING_LAST_7_DAYS,
+        circuits=("heating",),
+        period="last_7_days",
+        device_key=DeviceKey.heating,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_HEATING_SEASON,
+        circuits=("heating",),
+        period="season",
+        device_key=DeviceKey.heating,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_DHW_LAST_7_DAYS,
+        circuits=("domestic_water",),
+        period="last_7_days",
+        device_key=DeviceKey.domestic_water,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_DHW_SEASON,
+        circuits=("domestic_water",),
+        period="season",
+        device_key=DeviceKey.domestic_water,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_POOL_LAST_7_DAYS,
+        circuits=("pool",),
+        period="last_7_days",
+        device_key=DeviceKey.heatpump,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_POOL_SEASON,
+        circuits=("pool",),
+        period="season",
+        device_key=DeviceKey.heatpump,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_COOLING_LAST_7_DAYS,
+        circuits=("cooling",),
+        period="last_7_days",
+        device_key=DeviceKey.cooling,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+    counter_cop_descr(
+        key=SensorKey.COUNTER_COP_COOLING_SEASON,
+        circuits=("cooling",),
+        period="season",
+        device_key=DeviceKey.cooling,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_precision=2,
+        icon="mdi:speedometer",
+    ),
+]
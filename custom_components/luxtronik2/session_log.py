@@ -0,0 +1,275 @@
+"""Capture of the raw exchanges with a controller, and their replay.
+
+A diagnostics download is one moment of one heat pump. Problems that only
+show up over time - a status that flickers for one poll, a counter that
+jumps, a register that drifts until a workaround misfires - need the
+sequence of polls that produced them, and so does profiling the decode path
+on real register dynamics rather than static fixtures.
+
+With the session log enabled, `lux_helper.Luxtronik` appends every exchange
+to a compact binary file: each block it read (the 3003/3004/3005 payload
+exactly as it came off the wire) and each parameter write it sent. The file
+starts with `SESSION_LOG_MAGIC`; each record is a `_RECORD` header (wall
+clock time, command, the 3004 status word, payload length) followed by the
+payload. Records are appended whole, so a file cut short by a crash loses
+at most its last record, which `read_session_log` skips.
+
+`LuxtronikReplayClient` stands in for `Luxtronik` and serves a captured
+session back, one poll per `read()`, either as fast as the caller polls or
+paced like the original.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import struct
+import threading
+import time
+
+from luxtronik.calculations import Calculations
+from luxtronik.parameters import Parameters
+from luxtronik.visibilities import Visibilities
+
+from .const import (
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    LOGGER,
+    SESSION_LOG_MAX_BYTES,
+    LuxPollStat,
+)
+from .poll_stats import LuxtronikPollStats
+
+SESSION_LOG_MAGIC = b"LUXSLOG1"
+
+COMMAND_WRITE = 3002
+COMMAND_BLOCKS = {
+    3003: CONF_PARAMETERS,
+    3004: CONF_CALCULATIONS,
+    3005: CONF_VISIBILITIES,
+}
+
+# Wall clock time, command, status word (3004 only), payload length in bytes.
+_RECORD = struct.Struct(">diiI")
+
+
+@dataclass(frozen=True)
+class SessionExchange:
+    """One captured exchange: a block read or a parameter write."""
+
+    timestamp: float
+    command: int
+    status: int
+    payload: bytes
+
+    @property
+    def values(self) -> list[int]:
+        """The payload decoded as the client decodes it off the wire."""
+        if self.command == 3005:
+            return list(struct.unpack(f">{len(self.payload)}b", self.payload))
+        return list(struct.unpack(f">{len(self.payload) // 4}i", self.payload))
+
+
+def encode_values(command: int, values: list[int]) -> bytes:
+    """Encode block values into the payload bytes the controller sends."""
+    item = "b" if command == 3005 else "i"
+    return struct.pack(f">{len(values)}{item}", *values)
+
+
+class SessionLogWriter:
+    """Appends exchanges to a session log file, rotating it at a size cap.
+
+    Called from the client's executor thread, never from the event loop: the
+    writes are plain blocking file I/O. Subclasses with another record
+    layout set their own `magic` and `max_bytes` and append through
+    `_append`.
+    """
+
+    magic = SESSION_LOG_MAGIC
+    max_bytes = SESSION_LOG_MAX_BYTES
+
+    def __init__(self, path: Path, max_bytes: int | None = None) -> None:
+        self.path = path
+        self._max_bytes = max_bytes if max_bytes is not None else self.max_bytes
+        self._lock = threading.Lock()
+        self._file = None
+
+    def record(self, command: int, payload: bytes, status: int = 0) -> None:
+        """Append one exchange; a failure is logged, never raised to the poll."""
+        self._append(_RECORD.pack(time.time(), command, status, len(payload)) + payload)
+
+    def _append(self, data: bytes) -> None:
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._open()
+                assert self._file is not None
+                self._file.write(data)
+                self._file.flush()
+                if self._file.tell() >= self._max_bytes:
+                    self._rotate()
+            except OSError as err:
+                LOGGER.warning("Could not write %s: %s", self.path, err)
+                self._close()
+
+    def _open(self) -> None:
+        self._file = self.path.open("ab")
+        if self._file.tell() == 0:
+            self._file.write(self.magic)
+
+    def _rotate(self) -> None:
+        self._close()
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        LOGGER.info("%s reached its size limit, rotated it", self.path)
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        """Close the file; a later record opens it again."""
+        with self._lock:
+            self._close()
+
+
+def read_session_log(path: Path) -> Iterator[SessionExchange]:
+    """Yield the exchanges of a session log in the order they were captured."""
+    with path.open("rb") as file:
+        if file.read(len(SESSION_LOG_MAGIC)) != SESSION_LOG_MAGIC:
+            raise ValueError(f"{path} is not a Luxtronik session log")
+        while header := file.read(_RECORD.size):
+            if len(header) < _RECORD.size:
+                LOGGER.debug("Session log %s ends in a partial record", path)
+                return
+            timestamp, command, status, length = _RECORD.unpack(header)
+            payload = file.read(length)
+            if len(payload) < length:
+                LOGGER.debug("Session log %s ends in a partial record", path)
+                return
+            yield SessionExchange(timestamp, command, status, payload)
+
+
+class LuxtronikReplayClient:
+    """Serves a captured session in place of `lux_helper.Luxtronik`.
+
+    Each `read()` parses the next poll of the log - the next parameters,
+    calculations and visibilities blocks - exactly as a live read would.
+    Writes captured in the log are skipped; writes made against the replay
+    are accepted and dropped, since a recording cannot react to them.
+
+    With `realtime`, `read()` sleeps until the next poll is as far from the
+    first as it was when captured; otherwise polls are served as fast as
+    they are requested. At the end of the log `read()` raises
+    `ConnectionError`, as a controller that went away would, unless `loop`
+    starts it over.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        realtime: bool = False,
+        loop: bool = False,
+        safe: bool = True,
+    ) -> None:
+        self.path = path
+        self._realtime = realtime
+        self._loop = loop
+        self._exchanges: Iterator[SessionExchange] = iter(())
+        self._started: float | None = None
+        self._first_captured: float | None = None
+        self.polls = 0
+        self._poll_bytes = 0
+        self.stats = LuxtronikPollStats()
+        self.raw_blocks: dict[str, list[int]] = {}
+        self.calculations_status = 0
+        # Assigned by the coordinator while the session log option is on, as
+        # on the live client; a replay never records into it.
+        self.session_log: SessionLogWriter | None = None
+        self.calculations = Calculations()
+        self.parameters = Parameters(safe=safe)
+        self.visibilities = Visibilities()
+        self.connect()
+
+    def connect(self) -> None:
+        """Start serving from the beginning of the log if nothing is open."""
+        if self._started is None:
+            self._exchanges = read_session_log(self.path)
+            self._started = time.monotonic()
+            self._first_captured = None
+
+    def disconnect(self) -> None:
+        """Nothing to close; kept for the client interface."""
+
+    def restore(self, raw_blocks: Mapping[str, list[int]]) -> None:
+        """Parse previously read raw blocks as if they had just been read."""
+        parsers = {
+            CONF_PARAMETERS: self.parameters,
+            CONF_CALCULATIONS: self.calculations,
+            CONF_VISIBILITIES: self.visibilities,
+        }
+        for label, data in raw_blocks.items():
+            parser = parsers.get(label)
+            if parser is not None:
+                parser.parse(list(data))
+                self.raw_blocks[label] = list(data)
+
+    def read(self) -> None:
+        """Parse the next captured poll."""
+        self.stats.mark_call_started()
+        blocks = self._next_poll()
+        if blocks is None and self._loop and self.polls:
+            self._started = None
+            self.connect()
+            blocks = self._next_poll()
+        if blocks is None:
+            raise ConnectionError(f"Session log {self.path} is exhausted")
+        self.polls += 1
+        self.restore(blocks)
+        self.stats.record(LuxPollStat.POLL_BYTES, self._poll_bytes)
+
+    def read_identity(self) -> None:
+        """Parse the next captured poll; it holds the identifying blocks."""
+        self.read()
+
+    def read_block(self, command: int) -> list[int] | None:
+        """Parse the next captured poll and return the block of `command`."""
+        self.read()
+        return self.raw_blocks.get(COMMAND_BLOCKS[command])
+
+    def write(self) -> None:
+        """Drop the queued writes; a recording cannot act on them."""
+        LOGGER.debug("Replay: dropping write of %s", self.parameters.queue)
+        self.parameters.queue = {}
+
+    def _next_poll(self) -> dict[str, list[int]] | None:
+        """Collect one block of each kind, pacing the first one if realtime."""
+        blocks: dict[str, list[int]] = {}
+        self._poll_bytes = 0
+        for exchange in self._exchanges:
+            label = COMMAND_BLOCKS.get(exchange.command)
+            if label is None:
+                continue
+            if not blocks:
+                self._pace(exchange.timestamp)
+            if label == CONF_CALCULATIONS:
+                self.calculations_status = exchange.status
+            blocks[label] = exchange.values
+            self._poll_bytes += len(exchange.payload)
+            if len(blocks) == len(COMMAND_BLOCKS):
+                return blocks
+        return blocks or None
+
+    def _pace(self, captured: float) -> None:
+        if self._first_captured is None:
+            self._first_captured = captured
+        if not self._realtime or self._started is None:
+            return
+        due = self._started + (captured - self._first_captured)
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
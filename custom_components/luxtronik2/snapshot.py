@@ -0,0 +1,143 @@
+"""Last-known heat pump snapshot, persisted per config entry.
+
+Setting up an entry used to wait for `async_config_entry_first_refresh()`: a
+full read of all three register blocks, which on a slow controller takes tens
+of seconds and, with retries, can run into the minute before it gives up.
+Every Home Assistant restart sat behind that, once per heat pump, even though
+nothing about the installation had changed since the last poll a few minutes
+earlier.
+
+The coordinator therefore keeps the raw blocks of its latest successful poll
+in a `Store`, together with the identity of the controller they came from. At
+startup they are parsed again exactly as if they had just been read, the
+platforms are set up from that data, and the live refresh runs in the
+background. Until it completes, every entity carries a `stale_since`
+attribute with the time the snapshot was taken.
+
+Raw integers are stored rather than decoded values because that is the only
+representation the luxtronik parsers accept, and it keeps restoring identical
+to a real read: the same datatype conversions, the same parsed block lengths
+(which decide which registers exist, see `record_parsed_block_lengths`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+
+SNAPSHOT_BLOCKS = ("parameters", "calculations", "visibilities")
+
+
+@dataclass
+class LuxtronikSnapshot:
+    """The raw blocks of one successful poll and where they came from."""
+
+    taken_at: datetime
+    unique_id: str
+    firmware_version: str
+    model: str
+    blocks: dict[str, list[int]]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the JSON-serialisable form written to the store."""
+        return {
+            "taken_at": self.taken_at.isoformat(),
+            "unique_id": self.unique_id,
+            "firmware_version": self.firmware_version,
+            "model": self.model,
+            # Redundant with the blocks themselves, and kept on purpose: a
+            # truncated or hand-edited file shows up as a mismatch here
+            # instead of as shifted registers after parsing.
+            "block_lengths": {label: len(data) for label, data in self.blocks.items()},
+            "blocks": self.blocks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Any) -> LuxtronikSnapshot | None:
+        """Rebuild a snapshot from the store, or None if it is not usable."""
+        try:
+            taken_at = dt_util.parse_datetime(data["taken_at"])
+            lengths = data["block_lengths"]
+            blocks = {label: list(data["blocks"][label]) for label in SNAPSHOT_BLOCKS}
+            snapshot = cls(
+                taken_at=taken_at,  # pyright: ignore[reportArgumentType]
+                unique_id=str(data["unique_id"]),
+                firmware_version=str(data["firmware_version"]),
+                model=str(data["model"]),
+                blocks=blocks,
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+        if taken_at is None or any(
+            lengths.get(label) != len(block) for label, block in blocks.items()
+        ):
+            return None
+        if not all(
+            isinstance(value, int) for block in blocks.values() for value in block
+        ):
+            return None
+        return snapshot
+
+
+class LuxtronikSnapshotStore:
+    """Loads and saves the snapshot of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}"
+        )
+        self._pending: LuxtronikSnapshot | None = None
+
+    async def async_load(self, unique_id: str | None) -> LuxtronikSnapshot | None:
+        """Return the stored snapshot, if there is one for this heat pump.
+
+        `unique_id` is the config entry's: a snapshot taken from a different
+        serial (the entry was pointed at another unit) is ignored, since its
+        registers would describe the wrong heat pump.
+        """
+        data = await self._store.async_load()
+        if data is None:
+            return None
+        snapshot = LuxtronikSnapshot.from_dict(data)
+        if snapshot is None:
+            LOGGER.warning("Ignoring unreadable Luxtronik snapshot %s", self._store.key)
+            return None
+        if unique_id is not None and snapshot.unique_id != unique_id:
+            LOGGER.debug(
+                "Ignoring Luxtronik snapshot of %s, entry is %s",
+                snapshot.unique_id,
+                unique_id,
+            )
+            return None
+        return snapshot
+
+    @callback
+    def async_schedule_save(self, snapshot: LuxtronikSnapshot) -> None:
+        """Save `snapshot`, coalesced with any save already waiting.
+
+        `Store.async_delay_save` restarts its timer on every call, so calling
+        it once per poll with a delay longer than the interval would postpone
+        the write indefinitely. Only the first call schedules; later ones just
+        replace what that write will contain.
+        """
+        schedule = self._pending is None
+        self._pending = snapshot
+        if schedule:
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        snapshot, self._pending = self._pending, None
+        return snapshot.as_dict() if snapshot is not None else {}
+
+    async def async_remove(self) -> None:
+        """Delete the stored snapshot."""
+        self._pending = None
+        await self._store.async_remove()
@@ -0,0 +1,155 @@
+"""Hourly long-term statistics of the calculations, imported directly.
+
+Each poll adds the measurement calculations to the current hour's count,
+sum, min and max; a finished hour is imported as `luxtronik2:<prefix>_<key>`.
+The hour in progress is imported on unload, and a restart within the hour
+replaces it with the polls since.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, cast
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    STATISTIC_UNIT_TO_UNIT_CONVERTER,
+    async_add_external_statistics,
+)
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util, slugify
+
+from .common import get_sensor_data
+from .const import CONF_CALCULATIONS, DOMAIN, LOGGER
+from .model import LuxtronikSensorDescription
+
+# Metadata keys the running recorder knows. `unit_class` is newer than the
+# oldest supported core, whose metadata insert would choke on it.
+_METADATA_KEYS = (
+    StatisticMetaData.__required_keys__ | StatisticMetaData.__optional_keys__
+)
+
+
+def importable(description: LuxtronikSensorDescription) -> bool:
+    """Whether `description` is a measurement calculation with a unit."""
+    return (
+        description.state_class == SensorStateClass.MEASUREMENT
+        and description.native_unit_of_measurement is not None
+        and str(description.luxtronik_key).startswith(f"{CONF_CALCULATIONS}.")
+    )
+
+
+class LuxtronikStatisticsImporter:
+    """Hourly mean, min and max of the measurement calculations of one heat pump."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        prefix: str,
+        title: str,
+    ) -> None:
+        self._hass = hass
+        self._prefix = prefix
+        self._title = title
+        self._descriptions: dict[str, LuxtronikSensorDescription] = {}
+        self.keys: frozenset[str] = frozenset()
+        self.hour: datetime | None = None
+        # sensor key -> [count, sum, min, max]
+        self.buckets: dict[str, list[float]] = {}
+
+    def track(self, descriptions: Iterable[LuxtronikSensorDescription]) -> None:
+        """Aggregate the importable ones of `descriptions` from the next poll."""
+        for description in descriptions:
+            if importable(description):
+                self._descriptions[str(description.key)] = description
+        self.keys = frozenset(self._descriptions)
+
+    def statistic_id(self, key: str) -> str:
+        """Return the external statistic id of sensor `key`."""
+        return f"{DOMAIN}:{slugify(f'{self._prefix}_{key}')}"
+
+    @callback
+    def observe(self, data: Any, at: datetime, firmware_series: int) -> None:
+        """Add one poll to the current hour, importing the previous one first."""
+        hour = dt_util.as_utc(at).replace(minute=0, second=0, microsecond=0)
+        if self.hour is not None and hour < self.hour:
+            return
+        if self.hour is not None and hour != self.hour:
+            self.async_flush()
+        self.hour = hour
+        for key, description in self._descriptions.items():
+            value = get_sensor_data(data, description.luxtronik_key)
+            if not isinstance(value, int | float) or isinstance(value, bool):
+                continue
+            factor = (description.factor_by_firmware_series or {}).get(
+                firmware_series
+            ) or (description.factor or 1)
+            value = float(value) * factor
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                self.buckets[key] = [1, value, value, value]
+            else:
+                bucket[0] += 1
+                bucket[1] += value
+                bucket[2] = min(bucket[2], value)
+                bucket[3] = max(bucket[3], value)
+
+    @callback
+    def async_flush(self) -> None:
+        """Import the current hour's buckets and start empty."""
+        hour, buckets = self.hour, self.buckets
+        self.buckets = {}
+        if hour is None or not buckets:
+            return
+        if "recorder" not in self._hass.config.components:
+            return
+        for key, (count, total, minimum, maximum) in buckets.items():
+            description = self._descriptions[key]
+            unit = description.native_unit_of_measurement
+            converter = STATISTIC_UNIT_TO_UNIT_CONVERTER.get(unit)
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.ARITHMETIC,
+                has_sum=False,
+                name=f"{self._title} {key.replace('_', ' ')}",
+                source=DOMAIN,
+                statistic_id=self.statistic_id(key),
+                unit_class=converter.UNIT_CLASS if converter is not None else None,
+                unit_of_measurement=unit,
+            )
+            if not metadata.keys() <= _METADATA_KEYS:
+                metadata = cast(
+                    StatisticMetaData,
+                    {k: v for k, v in metadata.items() if k in _METADATA_KEYS},
+                )
+            try:
+                async_add_external_statistics(
+                    self._hass,
+                    metadata,
+                    [
+                        StatisticData(
+                            start=hour,
+                            mean=total / count,
+                            min=minimum,
+                            max=maximum,
+                        )
+                    ],
+                )
+            except HomeAssistantError as err:
+                LOGGER.warning(
+                    "Could not import statistics %s: %s", metadata["statistic_id"], err
+                )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current hour's state, for diagnostics."""
+        return {
+            "hour": self.hour.isoformat() if self.hour is not None else None,
+            "sensors": len(self.keys),
+            "buckets": len(self.buckets),
+        }
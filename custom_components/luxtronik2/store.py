@@ -0,0 +1,63 @@
+"""State of one heat pump kept in a `Store`, saved delayed and coalesced."""
+
+from __future__ import annotations
+
+from typing import Any, ClassVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+
+class LuxtronikDelayedStore:
+    """Base for the per-entry statistics persisted as `<domain>.<name>.<entry>`.
+
+    Subclasses set the class attributes and implement `_restore` and
+    `as_dict`.
+    """
+
+    STORE_NAME: ClassVar[str]
+    STORAGE_VERSION: ClassVar[int]
+    SAVE_DELAY: ClassVar[float]
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, self.STORAGE_VERSION, f"{DOMAIN}.{self.STORE_NAME}.{entry_id}"
+        )
+        self._save_scheduled = False
+
+    async def async_load(self) -> None:
+        """Take the state saved before the last restart, if readable."""
+        data = await self._store.async_load()
+        if not isinstance(data, dict):
+            return
+        try:
+            self._restore(data)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return
+
+    def _restore(self, data: dict[str, Any]) -> None:
+        """Take the state from `data`, raising before any change if unreadable."""
+        raise NotImplementedError
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the JSON-serialisable form written to the store."""
+        raise NotImplementedError
+
+    @callback
+    def _schedule_save(self) -> None:
+        """Save once per delay; see LuxtronikSnapshotStore.async_schedule_save."""
+        if self._save_scheduled:
+            return
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, self.SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_scheduled = False
+        return self.as_dict()
+
+    async def async_remove(self) -> None:
+        """Delete the stored state."""
+        await self._store.async_remove()
@@ -3,6 +3,7 @@
 # region Imports
 from __future__ import annotations
 
+import logging
 from typing import Any
 
 from homeassistant.components.switch import ENTITY_ID_FORMAT, SwitchEntity
@@ -15,6 +16,7 @@ from .base import LuxtronikEntity
 from .common import get_sensor_data, key_exists
 from .const import CONF_HA_SENSOR_PREFIX, LOGGER, DeviceKey
 from .coordinator import LuxtronikCoordinator, LuxtronikCoordinatorData
+from .entity_plan import plan_descriptions
 from .model import LuxtronikSwitchDescription
 from .switch_entities_predefined import SWITCHES
 
@@ -36,25 +38,32 @@ async def async_setup_entry(
     if not coordinator.last_update_success:
         return
 
-    unavailable_keys = [
-        i.luxtronik_key
-        for i in SWITCHES
-        if not key_exists(coordinator.data, i.luxtronik_key)
-    ]
-    if unavailable_keys:
-        # Not all models/firmware versions support every parameter;
-        # missing keys are expected and not an error.
-        LOGGER.debug("Not present in Luxtronik data, skipping: %s", unavailable_keys)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        unavailable_keys = [
+            i.luxtronik_key
+            for i in SWITCHES
+            if not key_exists(coordinator.data, i.luxtronik_key)
+        ]
+        if unavailable_keys:
+            # Not all models/firmware versions support every parameter;
+            # missing keys are expected and not an error.
+            LOGGER.debug(
+                "Not present in Luxtronik data, skipping: %s", unavailable_keys
+            )
 
     async_add_entities(
         [
             LuxtronikSwitchEntity(
                 hass, entry, coordinator, description, description.device_key
             )
-            for description in SWITCHES
-            if (
-                coordinator.entity_active(description)
-                and key_exists(coordinator.data, description.luxtronik_key)
+            for description in plan_descriptions(
+                coordinator,
+                "switch",
+                SWITCHES,
+                lambda description: (
+                    coordinator.entity_active(description)
+                    and key_exists(coordinator.data, description.luxtronik_key)
+                ),
             )
         ]
     )
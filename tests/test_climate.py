@@ -186,6 +186,7 @@ def _mock_coordinator(data=None):
     coord.data = data
     coord.entity_active.return_value = True
     coord.entity_visible.return_value = True
+    coord.entity_plan = None
     coord.get_device.return_value = MagicMock()
     return coord
 
@@ -305,28 +306,44 @@ class TestClimateTemperatureKeyBranches:
         thermostat._handle_coordinator_update(data)
         assert thermostat._attr_current_temperature is None
 
-    def test_key_sensor_reads_from_hass_states(self):
+    def test_key_sensor_reads_tracked_state(self):
+        """The override comes from the tracker, not a state lookup per poll."""
         coord = _mock_coordinator()
         entry = _mock_entry()
+        entry.options = {CONF_HA_SENSOR_INDOOR_TEMPERATURE: "sensor.living_room_temp"}
         hass = MagicMock()
 
         thermostat = LuxtronikThermostat(hass, entry, coord, THERMOSTATS[0])
         _patch_entity(thermostat)
-        thermostat.entity_description = dc_replace(
-            thermostat.entity_description,
-            luxtronik_key_current_temperature="sensor.living_room_temp",
-        )
+        assert thermostat._indoor_temperature is not None
         mock_state = MagicMock()
         mock_state.state = "21.5"
-        thermostat.hass.states.get.return_value = mock_state
+        thermostat._indoor_temperature.update_from_state(mock_state)
         data = make_coordinator_data(
             parameters={"ID_Ba_Hz_akt": LuxMode.automatic},
             calculations={"ID_WEB_WP_BZ_akt": LuxOperationMode.heating},
         )
         thermostat._handle_coordinator_update(data)
-        thermostat.hass.states.get.assert_called_with("sensor.living_room_temp")
+        thermostat.hass.states.get.assert_not_called()
         assert thermostat._attr_current_temperature == 21.5
 
+    def test_indoor_temperature_change_writes_state_without_a_poll(self):
+        coord = _mock_coordinator()
+        entry = _mock_entry()
+        entry.options = {CONF_HA_SENSOR_INDOOR_TEMPERATURE: "sensor.living_room_temp"}
+
+        thermostat = LuxtronikThermostat(MagicMock(), entry, coord, THERMOSTATS[0])
+        _patch_entity(thermostat)
+        tracker = thermostat._indoor_temperature
+        assert tracker is not None
+        event = MagicMock()
+        event.data = {"new_state": MagicMock(state="22.0")}
+
+        tracker._async_state_changed(event)
+
+        assert thermostat._attr_current_temperature == 22.0
+        thermostat.async_write_ha_state.assert_called_once()
+
 
 # ===========================================================================
 # climate.py — unmapped mode value (M7 regression)
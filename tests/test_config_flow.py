@@ -16,10 +16,14 @@ from custom_components.luxtronik2.config_flow import (
     LuxtronikOptionsFlowHandler,
 )
 from custom_components.luxtronik2.const import (
+    CONF_CHANGE_LOG_EVENTS,
+    CONF_FANOUT_SLICE_BUDGET,
     CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION,
     CONF_HA_SENSOR_INDOOR_TEMPERATURE,
     CONF_HA_SENSOR_PREFIX,
     CONF_MAX_DATA_LENGTH,
+    CONF_POLL_WORKER,
+    CONF_SESSION_LOG,
     CONF_UPDATE_INTERVAL,
     DEFAULT_MAX_DATA_LENGTH,
     DEFAULT_PORT,
@@ -106,6 +110,30 @@ class TestFlowHelpers:
         call_kwargs = flow.async_create_entry.call_args[1]
         assert call_kwargs["data"][CONF_HA_SENSOR_PREFIX] == "my_prefix"
 
+    @pytest.mark.asyncio
+    async def test_discover_devices_asks_every_adapter(self):
+        flow = LuxtronikFlowHandler()
+        flow.hass = MagicMock()
+        with (
+            patch(
+                "custom_components.luxtronik2.config_flow.network."
+                "async_get_ipv4_broadcast_addresses",
+                new_callable=AsyncMock,
+                return_value=["192.168.1.255", "10.0.0.255"],
+            ),
+            patch(
+                "custom_components.luxtronik2.config_flow.async_discover",
+                new_callable=AsyncMock,
+                return_value=[("192.168.1.20", 8889)],
+            ) as discover,
+        ):
+            result = await flow._discover_devices("192.168.1.20")
+
+        assert result == [("192.168.1.20", 8889)]
+        discover.assert_awaited_once_with(
+            ["192.168.1.255", "10.0.0.255"], expected_host="192.168.1.20"
+        )
+
 
 # ===========================================================================
 # _set_unique_id_or_abort
@@ -243,7 +271,7 @@ class TestFlowInstanceIsolation:
 
         def _prepare(flow, devices):
             flow.hass = MagicMock()
-            flow.hass.async_add_executor_job = AsyncMock(return_value=devices)
+            flow._discover_devices = AsyncMock(return_value=devices)
             flow._async_current_entries = MagicMock(return_value=[])
             flow.async_show_form = MagicMock(return_value={"type": "form"})
 
@@ -269,7 +297,7 @@ class TestAsyncStepUser:
     async def test_shows_selection_form_when_devices_found(self):
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[("1.2.3.4", 8889)])
+        flow._discover_devices = AsyncMock(return_value=[("1.2.3.4", 8889)])
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_show_form = MagicMock(
             return_value={"type": "form", "step_id": "select_devices"}
@@ -282,7 +310,7 @@ class TestAsyncStepUser:
     async def test_shows_manual_form_when_all_configured(self):
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[("1.2.3.4", 8889)])
+        flow._discover_devices = AsyncMock(return_value=[("1.2.3.4", 8889)])
         existing = MagicMock()
         existing.data = {CONF_HOST: "1.2.3.4", CONF_PORT: 8889}
         flow._async_current_entries = MagicMock(return_value=[existing])
@@ -294,23 +322,75 @@ class TestAsyncStepUser:
         assert flow.async_show_form.call_args[1]["step_id"] == "manual_entry"
 
     @pytest.mark.asyncio
-    async def test_shows_manual_when_no_devices_found(self):
+    async def test_probes_the_subnets_when_no_devices_found(self):
+        flow = LuxtronikFlowHandler()
+        flow.hass = MagicMock()
+        flow._discover_devices = AsyncMock(return_value=[])
+        flow._async_scan_subnets = MagicMock()
+        flow.hass.async_create_task.return_value.done.return_value = False
+        flow.async_show_progress = MagicMock(return_value={"type": "progress"})
+        await flow.async_step_user()
+        flow.hass.async_create_task.assert_called_once()
+        assert flow.async_show_progress.call_args[1]["step_id"] == "scan"
+
+    @pytest.mark.asyncio
+    async def test_scan_done_offers_the_hosts_found(self):
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[])
+        flow._scan_task = MagicMock()
+        flow._scan_task.result.return_value = [("10.0.0.7", 8889)]
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_show_form = MagicMock(return_value={"type": "form"})
-        await flow.async_step_user()
-        flow.async_show_form.assert_called_once()
+        await flow.async_step_scan_done()
+        assert flow.async_show_form.call_args[1]["step_id"] == "select_devices"
+        assert flow._scan_task is None
+
+    @pytest.mark.asyncio
+    async def test_scan_finding_nothing_shows_manual_entry(self):
+        flow = LuxtronikFlowHandler()
+        flow.hass = MagicMock()
+        flow._scan_task = MagicMock()
+        flow._scan_task.result.side_effect = OSError("unreachable")
+        flow._async_current_entries = MagicMock(return_value=[])
+        flow.async_show_form = MagicMock(return_value={"type": "form"})
+        await flow.async_step_scan_done()
+        assert flow.async_show_form.call_args[1]["step_id"] == "manual_entry"
+
+    @pytest.mark.asyncio
+    async def test_scan_probes_the_enabled_adapters(self):
+        flow = LuxtronikFlowHandler()
+        flow.hass = MagicMock()
+        flow.async_update_progress = MagicMock()
+        adapters = [
+            {"enabled": True, "ipv4": [{"address": "10.0.0.5", "network_prefix": 24}]},
+            {"enabled": False, "ipv4": [{"address": "10.9.0.5", "network_prefix": 24}]},
+        ]
+
+        async def scan(hosts, on_probed):
+            assert len(hosts) == 253
+            assert all(host.startswith("10.0.0.") for host in hosts)
+            on_probed(len(hosts))
+            yield "10.0.0.7"
+
+        with (
+            patch(
+                "custom_components.luxtronik2.config_flow.network.async_get_adapters",
+                new_callable=AsyncMock,
+                return_value=adapters,
+            ),
+            patch("custom_components.luxtronik2.config_flow.async_scan_hosts", scan),
+        ):
+            found = await flow._async_scan_subnets()
+
+        assert found == [("10.0.0.7", DEFAULT_PORT)]
+        flow.async_update_progress.assert_called_with(1.0)
 
     @pytest.mark.asyncio
     async def test_discovery_os_error_reshows_manual_form_with_cannot_connect(self):
         """A transient network error during discovery must not kill the flow."""
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(
-            side_effect=OSError("network unreachable")
-        )
+        flow._discover_devices = AsyncMock(side_effect=OSError("network unreachable"))
         flow.async_show_form = MagicMock(return_value={"type": "form"})
         flow.async_abort = MagicMock(return_value={"type": "abort"})
         await flow.async_step_user()
@@ -325,7 +405,7 @@ class TestAsyncStepUser:
         """A last-resort catch-all must also re-show the form, not abort the flow."""
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(side_effect=Exception("boom"))
+        flow._discover_devices = AsyncMock(side_effect=Exception("boom"))
         flow.async_show_form = MagicMock(return_value={"type": "form"})
         flow.async_abort = MagicMock(return_value={"type": "abort"})
         await flow.async_step_user()
@@ -340,7 +420,7 @@ class TestAsyncStepUser:
         """A pump on another subnet must stay reachable while devices are discovered."""
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[("1.2.3.4", 8889)])
+        flow._discover_devices = AsyncMock(return_value=[("1.2.3.4", 8889)])
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_show_form = MagicMock(
             return_value={"type": "form", "step_id": "select_devices"}
@@ -380,7 +460,7 @@ class TestAsyncStepSelectDevices:
         flow.async_abort = MagicMock(return_value={"type": "abort"})
         err = LuxtronikConnectionError("1.2.3.4", 8889, Exception("refused"))
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             side_effect=err,
         ):
@@ -399,7 +479,7 @@ class TestAsyncStepSelectDevices:
         coord = _mock_coordinator()
         coord.async_config_entry_first_refresh = AsyncMock()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -433,7 +513,7 @@ class TestAsyncStepSelectDevices:
         coord = _mock_coordinator()
         coord.async_config_entry_first_refresh = AsyncMock()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -463,7 +543,7 @@ class TestAsyncStepManualEntry:
         flow.async_abort = MagicMock(return_value={"type": "abort"})
         err = LuxtronikConnectionError("1.2.3.4", 8889, Exception("refused"))
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             side_effect=err,
         ):
@@ -480,7 +560,7 @@ class TestAsyncStepManualEntry:
         coord = _mock_coordinator()
         coord.async_config_entry_first_refresh = AsyncMock()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -515,14 +595,14 @@ class TestAsyncStepDhcp:
     async def test_dhcp_discovery_creates_entry(self):
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[("1.2.3.4", 8889)])
+        flow._discover_devices = AsyncMock(return_value=[("1.2.3.4", 8889)])
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_set_unique_id = AsyncMock()
         flow._abort_if_unique_id_configured = MagicMock()
         flow.async_create_entry = MagicMock(return_value={"type": "create_entry"})
         coord = _mock_coordinator()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -547,7 +627,7 @@ class TestAsyncStepDhcp:
         """
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[("1.2.3.4", 8889)])
+        flow._discover_devices = AsyncMock(return_value=[("1.2.3.4", 8889)])
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_set_unique_id = AsyncMock()
         flow._abort_if_unique_id_configured = MagicMock(
@@ -556,7 +636,7 @@ class TestAsyncStepDhcp:
         coord = _mock_coordinator()
         with (
             patch(
-                "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+                "custom_components.luxtronik2.config_flow.async_identify",
                 new_callable=AsyncMock,
                 return_value=coord,
             ),
@@ -564,19 +644,34 @@ class TestAsyncStepDhcp:
         ):
             await flow.async_step_dhcp(self._make_dhcp_info())
 
+    @pytest.mark.asyncio
+    async def test_dhcp_discovery_stops_at_the_dhcp_host(self):
+        flow = LuxtronikFlowHandler()
+        flow.hass = MagicMock()
+        flow._discover_devices = AsyncMock(return_value=[("1.2.3.4", 8889)])
+        flow._async_current_entries = MagicMock(return_value=[])
+        flow.async_abort = MagicMock(return_value={"type": "abort"})
+        with patch(
+            "custom_components.luxtronik2.config_flow.async_identify",
+            new_callable=AsyncMock,
+            side_effect=LuxtronikConnectionError("1.2.3.4", 8889, OSError()),
+        ):
+            await flow.async_step_dhcp(self._make_dhcp_info())
+        flow._discover_devices.assert_awaited_once_with("1.2.3.4")
+
     @pytest.mark.asyncio
     async def test_dhcp_no_match_uses_default_port(self):
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
         # Discovery returns different IP
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[("5.6.7.8", 8889)])
+        flow._discover_devices = AsyncMock(return_value=[("5.6.7.8", 8889)])
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_set_unique_id = AsyncMock()
         flow._abort_if_unique_id_configured = MagicMock()
         flow.async_create_entry = MagicMock(return_value={"type": "create_entry"})
         coord = _mock_coordinator()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -587,12 +682,12 @@ class TestAsyncStepDhcp:
     async def test_dhcp_connection_error_aborts(self):
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[("1.2.3.4", 8889)])
+        flow._discover_devices = AsyncMock(return_value=[("1.2.3.4", 8889)])
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_abort = MagicMock(return_value={"type": "abort"})
         err = LuxtronikConnectionError("1.2.3.4", 8889, Exception("refused"))
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             side_effect=err,
         ):
@@ -603,7 +698,7 @@ class TestAsyncStepDhcp:
     async def test_dhcp_cannot_identify_aborts(self):
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(return_value=[("1.2.3.4", 8889)])
+        flow._discover_devices = AsyncMock(return_value=[("1.2.3.4", 8889)])
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_set_unique_id = AsyncMock(
             side_effect=LuxtronikSerialNumberError("no serial number")
@@ -611,7 +706,7 @@ class TestAsyncStepDhcp:
         flow.async_abort = MagicMock(return_value={"type": "abort"})
         coord = _mock_coordinator()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -628,7 +723,7 @@ class TestAsyncStepDhcp:
     async def test_dhcp_unknown_error_aborts(self):
         flow = LuxtronikFlowHandler()
         flow.hass = MagicMock()
-        flow.hass.async_add_executor_job = AsyncMock(side_effect=Exception("boom"))
+        flow._discover_devices = AsyncMock(side_effect=Exception("boom"))
         flow._async_current_entries = MagicMock(return_value=[])
         flow.async_abort = MagicMock(return_value={"type": "abort"})
         await flow.async_step_dhcp(self._make_dhcp_info())
@@ -778,6 +873,87 @@ class TestOptionsFlow:
         call_kwargs = flow.async_create_entry.call_args[1]
         assert call_kwargs["data"][CONF_UPDATE_INTERVAL] == "1 minute (default)"
 
+    @pytest.mark.asyncio
+    async def test_step_user_saves_fanout_slice_budget(self):
+        entry = MagicMock()
+        entry.data = {CONF_HOST: "1.2.3.4", CONF_PORT: 8889}
+        entry.options = {}
+        entry.title = "Test HP"
+        flow = _make_options_flow(entry)
+        flow.hass = MagicMock()
+        flow.async_create_entry = MagicMock(return_value={"type": "create_entry"})
+        await flow.async_step_user({CONF_FANOUT_SLICE_BUDGET: 35.0})
+        call_kwargs = flow.async_create_entry.call_args[1]
+        assert call_kwargs["data"][CONF_FANOUT_SLICE_BUDGET] == 35
+
+    @pytest.mark.asyncio
+    async def test_step_user_keeps_fanout_slice_budget_when_omitted(self):
+        entry = MagicMock()
+        entry.data = {CONF_HOST: "1.2.3.4", CONF_PORT: 8889}
+        entry.options = {CONF_FANOUT_SLICE_BUDGET: 35}
+        entry.title = "Test HP"
+        flow = _make_options_flow(entry)
+        flow.hass = MagicMock()
+        flow.async_create_entry = MagicMock(return_value={"type": "create_entry"})
+        await flow.async_step_user({})
+        call_kwargs = flow.async_create_entry.call_args[1]
+        assert call_kwargs["data"][CONF_FANOUT_SLICE_BUDGET] == 35
+
+    @pytest.mark.asyncio
+    async def test_step_user_saves_change_events(self):
+        entry = MagicMock()
+        entry.data = {CONF_HOST: "1.2.3.4", CONF_PORT: 8889}
+        entry.options = {}
+        entry.title = "Test HP"
+        flow = _make_options_flow(entry)
+        flow.hass = MagicMock()
+        flow.async_create_entry = MagicMock(return_value={"type": "create_entry"})
+        await flow.async_step_user({CONF_CHANGE_LOG_EVENTS: " calculations 260-300 "})
+        call_kwargs = flow.async_create_entry.call_args[1]
+        assert call_kwargs["data"][CONF_CHANGE_LOG_EVENTS] == "calculations 260-300"
+
+    @pytest.mark.asyncio
+    async def test_step_user_rejects_invalid_change_events(self):
+        entry = MagicMock()
+        entry.data = {CONF_HOST: "1.2.3.4", CONF_PORT: 8889}
+        entry.options = {}
+        entry.title = "Test HP"
+        flow = _make_options_flow(entry)
+        flow.hass = MagicMock()
+        flow.async_create_entry = MagicMock()
+        flow.async_show_form = MagicMock(return_value={"type": "form"})
+        await flow.async_step_user({CONF_CHANGE_LOG_EVENTS: "registers 5"})
+        flow.async_create_entry.assert_not_called()
+        assert flow.async_show_form.call_args[1]["errors"] == {
+            CONF_CHANGE_LOG_EVENTS: "invalid_index_ranges"
+        }
+
+    @pytest.mark.asyncio
+    async def test_step_user_saves_session_log(self):
+        entry = MagicMock()
+        entry.data = {CONF_HOST: "1.2.3.4", CONF_PORT: 8889}
+        entry.options = {}
+        entry.title = "Test HP"
+        flow = _make_options_flow(entry)
+        flow.hass = MagicMock()
+        flow.async_create_entry = MagicMock(return_value={"type": "create_entry"})
+        await flow.async_step_user({CONF_SESSION_LOG: True})
+        call_kwargs = flow.async_create_entry.call_args[1]
+        assert call_kwargs["data"][CONF_SESSION_LOG] is True
+
+    @pytest.mark.asyncio
+    async def test_step_user_saves_poll_worker(self):
+        entry = MagicMock()
+        entry.data = {CONF_HOST: "1.2.3.4", CONF_PORT: 8889}
+        entry.options = {}
+        entry.title = "Test HP"
+        flow = _make_options_flow(entry)
+        flow.hass = MagicMock()
+        flow.async_create_entry = MagicMock(return_value={"type": "create_entry"})
+        await flow.async_step_user({CONF_POLL_WORKER: True})
+        call_kwargs = flow.async_create_entry.call_args[1]
+        assert call_kwargs["data"][CONF_POLL_WORKER] is True
+
     @pytest.mark.asyncio
     async def test_step_user_clears_legacy_indoor_temp_from_data(self):
         """Clearing works even when the value only exists in config_entry.data."""
@@ -877,7 +1053,7 @@ class TestAsyncStepReconfigure:
         err = LuxtronikConnectionError("5.6.7.8", 8889, Exception("refused"))
         user_input = {CONF_HOST: "5.6.7.8", CONF_PORT: 8889}
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             side_effect=err,
         ):
@@ -905,7 +1081,7 @@ class TestAsyncStepReconfigure:
         flow.async_show_form = MagicMock(return_value={"type": "form"})
         user_input = {CONF_HOST: "5.6.7.8", CONF_PORT: 8889}
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             side_effect=Exception("boom"),
         ):
@@ -929,7 +1105,7 @@ class TestAsyncStepReconfigure:
         flow.async_set_unique_id = AsyncMock(side_effect=Exception("boom"))
         coord = _mock_coordinator()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -955,7 +1131,7 @@ class TestAsyncStepReconfigure:
         )
         coord = _mock_coordinator()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -985,7 +1161,7 @@ class TestAsyncStepReconfigure:
         coord = _mock_coordinator()
         coord.async_config_entry_first_refresh = AsyncMock()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -1019,7 +1195,7 @@ class TestAsyncStepReconfigure:
         coord = _mock_coordinator()
         coord.async_config_entry_first_refresh = AsyncMock()
         with patch(
-            "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+            "custom_components.luxtronik2.config_flow.async_identify",
             new_callable=AsyncMock,
             return_value=coord,
         ):
@@ -1060,7 +1236,7 @@ class TestAsyncStepReconfigure:
         coord.async_config_entry_first_refresh = AsyncMock()
         with (
             patch(
-                "custom_components.luxtronik2.config_flow.connect_and_get_coordinator",
+                "custom_components.luxtronik2.config_flow.async_identify",
                 new_callable=AsyncMock,
                 return_value=coord,
             ),
@@ -3,28 +3,43 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+import json
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from luxtronik.calculations import Calculations
 from packaging.version import Version
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from conftest import make_coordinator_data
 from custom_components.luxtronik2.const import (
+    CONF_CALCULATIONS,
+    CONF_FANOUT_SLICE_BUDGET,
+    CONF_POLL_WORKER,
+    CONF_SESSION_LOG,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_FANOUT_SLICE_BUDGET,
     DEFAULT_PORT,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    IDENTIFIED_CLIENT_REUSE_TIME,
     DeviceKey,
     LuxCalculation as LC,
     LuxMkTypes,
     LuxOperationMode,
     LuxParameter as LP,
+    LuxPollStat,
     LuxRoomThermostatType,
+    LuxSchedulePriority,
     LuxStatus3Option,
     LuxVisibility as LV,
 )
@@ -36,11 +51,18 @@ from custom_components.luxtronik2.coordinator import (
     LuxtronikCoordinator,
     LuxtronikSerialNumberError,
     LuxtronikWriteError,
+    _async_restore_coordinator,
+    _new_client,
+    _take_identified_client,
+    async_identify,
 )
+from custom_components.luxtronik2.history import CalculationHistory
 from custom_components.luxtronik2.model import (
     LuxtronikCoordinatorData,
     LuxtronikEntityDescription,
 )
+from custom_components.luxtronik2.poll_stats import LuxtronikPollStats
+from custom_components.luxtronik2.snapshot import LuxtronikSnapshot
 
 # ===========================================================================
 # Helpers
@@ -90,8 +112,24 @@ def _make_coordinator_direct(data=None):
     coord._config = {"host": "1.2.3.4", "port": 8889}
     coord.device_infos = {}
     coord._dhw_hold_until = None
+    coord._fanout_slice_budget = 0.02
+    coord._fanout_task = None
+    coord.snapshot_store = None
+    coord._restored_snapshot = None
+    coord.entity_plan = None
+    coord.scheduler = None
+    coord.history = CalculationHistory(10)
+    coord._history_block = None
+    coord.mode_time = None
+    coord.mode_energy = None
+    coord.cycles = None
+    coord.counter_cop = None
+    coord.statistics_importer = None
+    coord.register_changes = None
+    coord._external_power = None
     coord.async_request_refresh = AsyncMock()
     coord.async_refresh = AsyncMock()
+    coord._async_confirm_refresh = AsyncMock()
     coord.update_interval = DEFAULT_UPDATE_INTERVAL
     coord.last_update_success = True
     if data is None:
@@ -982,7 +1020,7 @@ class TestAsyncWrite:
         coord = _make_coordinator_direct()
         coord.hass.async_add_executor_job = AsyncMock()
 
-        # Make async_refresh update data
+        # Make the confirming refresh update data
         async def fake_refresh():
             coord.data = LuxtronikCoordinatorData(
                 parameters={"test_param": (0, 42)},
@@ -990,7 +1028,7 @@ class TestAsyncWrite:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
         result = await coord.async_write("test_param", 42)
         assert result is not None
 
@@ -1020,7 +1058,7 @@ class TestAsyncWrite:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         with pytest.raises(HomeAssistantError) as exc_info:
             await coord.async_write("test_param", 42)
@@ -1041,7 +1079,7 @@ class TestAsyncWrite:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         result = await coord.async_write("test_param", 21.5)
         assert result is not None
@@ -1080,7 +1118,7 @@ class TestAsyncWriteMany:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         await coord.async_write_many([("p1", "06:00")])
 
@@ -1118,7 +1156,7 @@ class TestAsyncWriteMany:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         await asyncio.gather(
             coord.async_write_many([("p1", "06:00")]),
@@ -1143,7 +1181,7 @@ class TestAsyncWriteMany:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         await coord.async_write_many([("p1", "06:00"), ("p2", "22:00")])
 
@@ -1160,7 +1198,7 @@ class TestAsyncWriteMany:
     async def test_issues_single_refresh(self):
         coord = _make_coordinator_direct()
         coord.hass.async_add_executor_job = AsyncMock()
-        coord.async_refresh = AsyncMock(
+        coord._async_confirm_refresh = AsyncMock(
             side_effect=lambda: setattr(
                 coord,
                 "data",
@@ -1174,7 +1212,7 @@ class TestAsyncWriteMany:
 
         await coord.async_write_many([("p1", "06:00"), ("p2", "22:00")])
 
-        coord.async_refresh.assert_awaited_once()
+        coord._async_confirm_refresh.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_single_pair_matches_async_write_behavior(self):
@@ -1188,7 +1226,7 @@ class TestAsyncWriteMany:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
         result = await coord.async_write_many([("test_param", 42)])
         assert result is not None
 
@@ -1204,7 +1242,7 @@ class TestAsyncWriteMany:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         with pytest.raises(HomeAssistantError) as exc_info:
             await coord.async_write_many([("p1", "06:00"), ("p2", "22:00")])
@@ -1215,7 +1253,7 @@ class TestAsyncWriteMany:
 
     @pytest.mark.asyncio
     async def test_refresh_failure_raises_distinct_error_not_mismatch(self):
-        """DataUpdateCoordinator.async_refresh() swallows failures internally
+        """The confirming refresh swallows failures like async_refresh()
         (logs, does not raise) rather than propagating them. If the post-write
         refresh fails, self.data stays at its stale pre-write value, and
         comparing the newly-written value against stale data would almost
@@ -1227,12 +1265,12 @@ class TestAsyncWriteMany:
         coord.hass.async_add_executor_job = AsyncMock()
 
         async def fake_refresh():
-            # async_refresh() "succeeds" (returns normally, no exception) but
+            # The refresh "succeeds" (returns normally, no exception) but
             # leaves last_update_success False and self.data untouched/stale,
             # exactly like a real transient socket hiccup during the read.
             coord.last_update_success = False
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         with pytest.raises(HomeAssistantError) as exc_info:
             await coord.async_write_many([("p1", "06:00")])
@@ -1256,7 +1294,7 @@ class TestAsyncWriteMany:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         result = await coord.async_write_many([("p1", "06:00")])
         assert result is not None
@@ -1288,7 +1326,7 @@ class TestWriteConfirmRetry:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         with patch(
             "custom_components.luxtronik2.coordinator.asyncio.sleep", new=AsyncMock()
@@ -1315,7 +1353,7 @@ class TestWriteConfirmRetry:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
         sleep_mock = AsyncMock()
 
         with patch(
@@ -1342,7 +1380,7 @@ class TestWriteConfirmRetry:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
         sleep_mock = AsyncMock()
 
         with patch(
@@ -1370,7 +1408,7 @@ class TestWriteConfirmRetry:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
         sleep_mock = AsyncMock()
 
         with (
@@ -1405,7 +1443,7 @@ class TestWriteConfirmRetry:
                 visibilities={},
             )
 
-        coord.async_refresh = fake_refresh
+        coord._async_confirm_refresh = fake_refresh
 
         with (
             patch(
@@ -1800,6 +1838,51 @@ class TestConnectAndGetCoordinator:
         yield
         coord_mod._OVERRIDES_APPLIED = False
 
+    @pytest.fixture(autouse=True)
+    def _no_snapshot(self):
+        """No persisted snapshot: every setup connects and reads live."""
+        with patch(
+            "custom_components.luxtronik2.coordinator.LuxtronikSnapshotStore"
+        ) as store_cls:
+            store_cls.return_value.async_load = AsyncMock(return_value=None)
+            yield store_cls
+
+    @pytest.fixture(autouse=True)
+    def _no_mode_time(self):
+        """No persisted time-per-status totals."""
+        with patch(
+            "custom_components.luxtronik2.coordinator.LuxtronikModeTime"
+        ) as mode_time_cls:
+            mode_time_cls.return_value.async_load = AsyncMock()
+            yield mode_time_cls
+
+    @pytest.fixture(autouse=True)
+    def _no_mode_energy(self):
+        """No persisted energy-per-status totals."""
+        with patch(
+            "custom_components.luxtronik2.coordinator.LuxtronikModeEnergy"
+        ) as mode_energy_cls:
+            mode_energy_cls.return_value.async_load = AsyncMock()
+            yield mode_energy_cls
+
+    @pytest.fixture(autouse=True)
+    def _no_cycles(self):
+        """No persisted compressor cycles."""
+        with patch(
+            "custom_components.luxtronik2.coordinator.LuxtronikCycleStats"
+        ) as cycles_cls:
+            cycles_cls.return_value.async_load = AsyncMock()
+            yield cycles_cls
+
+    @pytest.fixture(autouse=True)
+    def _no_counter_cop(self):
+        """No persisted counter COP buckets."""
+        with patch(
+            "custom_components.luxtronik2.coordinator.LuxtronikCounterCop"
+        ) as counter_cop_cls:
+            counter_cop_cls.return_value.async_load = AsyncMock()
+            yield counter_cop_cls
+
     @pytest.mark.asyncio
     async def test_connect_failure_raises_connection_error(self):
         from custom_components.luxtronik2.coordinator import connect_and_get_coordinator
@@ -1890,6 +1973,8 @@ class TestConnectAndGetCoordinator:
         from custom_components.luxtronik2.coordinator import connect_and_get_coordinator
 
         config_entry = MagicMock(spec=ConfigEntry)
+        config_entry.entry_id = "entry-id"
+        config_entry.unique_id = None
         config_entry.data = {CONF_HOST: "192.168.1.100", CONF_PORT: DEFAULT_PORT}
         config_entry.options = {}
         coordinator = MagicMock()
@@ -1912,6 +1997,8 @@ class TestConnectAndGetCoordinator:
         from custom_components.luxtronik2.coordinator import connect_and_get_coordinator
 
         config_entry = MagicMock(spec=ConfigEntry)
+        config_entry.entry_id = "entry-id"
+        config_entry.unique_id = None
         config_entry.data = {CONF_HOST: "192.168.1.100", CONF_PORT: DEFAULT_PORT}
         config_entry.options = {"update_interval": "5 minutes"}
 
@@ -1924,6 +2011,32 @@ class TestConnectAndGetCoordinator:
         ):
             await connect_and_get_coordinator(MagicMock(), config_entry)
 
+    @pytest.mark.asyncio
+    async def test_session_log_option_attaches_a_writer(self, tmp_path):
+        from custom_components.luxtronik2.coordinator import connect_and_get_coordinator
+        from custom_components.luxtronik2.session_log import SessionLogWriter
+
+        config_entry = MagicMock(spec=ConfigEntry)
+        config_entry.entry_id = "entry-id"
+        config_entry.unique_id = None
+        config_entry.data = {CONF_HOST: "192.168.1.100", CONF_PORT: DEFAULT_PORT}
+        config_entry.options = {CONF_SESSION_LOG: True}
+        coordinator = MagicMock()
+        coordinator.async_config_entry_first_refresh = AsyncMock()
+        hass = MagicMock()
+        hass.config.path = lambda name: str(tmp_path / name)
+
+        with patch(
+            "custom_components.luxtronik2.coordinator.LuxtronikCoordinator.connect",
+            new_callable=AsyncMock,
+            return_value=coordinator,
+        ):
+            await connect_and_get_coordinator(hass, config_entry)
+
+        writer = coordinator.client.session_log
+        assert isinstance(writer, SessionLogWriter)
+        assert writer.path == tmp_path / "luxtronik2_session_entry-id.lxs"
+
 
 # ===========================================================================
 # DHW transition hold (issue #519)
@@ -2012,3 +2125,659 @@ class TestDhwTransitionHold:
             self._data(LuxOperationMode.no_request, recirculation=True)
         )
         assert coord._dhw_hold_until == deadline
+
+
+# ===========================================================================
+# Poll statistics
+# ===========================================================================
+
+
+class TestPollStats:
+    @pytest.mark.asyncio
+    async def test_poll_records_lock_wait(self):
+        coord = _make_coordinator_direct()
+        coord.client.stats = LuxtronikPollStats()
+        coord.hass.async_add_executor_job = AsyncMock()
+        coord._update_dhw_transition_hold = MagicMock()
+
+        await coord._async_update_data()
+
+        summary = coord.poll_stats.summary(LuxPollStat.LOCK_WAIT)
+        assert summary is not None
+        assert summary["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lock_wait_includes_time_queued_behind_a_write(self):
+        """A poll waiting for a write to finish must show that wait."""
+        coord = _make_coordinator_direct()
+        coord.client.stats = LuxtronikPollStats()
+        coord.hass.async_add_executor_job = AsyncMock()
+        coord._update_dhw_transition_hold = MagicMock()
+
+        await coord._lock.acquire()
+        poll = asyncio.create_task(coord._async_update_data())
+        await asyncio.sleep(0.05)
+        coord._lock.release()
+        await poll
+
+        summary = coord.poll_stats.summary(LuxPollStat.LOCK_WAIT)
+        assert summary is not None
+        assert summary["last"] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_write_records_confirmation_attempts(self):
+        coord = _make_coordinator_direct()
+        coord.client.stats = LuxtronikPollStats()
+        coord.hass.async_add_executor_job = AsyncMock()
+        refreshes = 0
+
+        async def fake_refresh():
+            nonlocal refreshes
+            refreshes += 1
+            coord.data = LuxtronikCoordinatorData(
+                parameters={"p1": (0, 42 if refreshes >= 3 else 40)},
+                calculations={},
+                visibilities={},
+            )
+
+        coord._async_confirm_refresh = fake_refresh
+
+        with patch(
+            "custom_components.luxtronik2.coordinator.asyncio.sleep", new=AsyncMock()
+        ):
+            await coord.async_write("p1", 42)
+
+        summary = coord.poll_stats.summary(LuxPollStat.WRITE_CONFIRM_ATTEMPTS)
+        assert summary is not None
+        assert summary["last"] == 3
+
+    @pytest.mark.asyncio
+    async def test_unconfirmed_write_still_records_attempts(self):
+        coord = _make_coordinator_direct()
+        coord.client.stats = LuxtronikPollStats()
+        coord.hass.async_add_executor_job = AsyncMock()
+
+        async def fake_refresh():
+            coord.data = LuxtronikCoordinatorData(
+                parameters={"p1": (0, 40)}, calculations={}, visibilities={}
+            )
+
+        coord._async_confirm_refresh = fake_refresh
+
+        with (
+            patch(
+                "custom_components.luxtronik2.coordinator.asyncio.sleep",
+                new=AsyncMock(),
+            ),
+            pytest.raises(HomeAssistantError),
+        ):
+            await coord.async_write("p1", 42)
+
+        summary = coord.poll_stats.summary(LuxPollStat.WRITE_CONFIRM_ATTEMPTS)
+        assert summary is not None
+        assert summary["last"] == WRITE_CONFIRM_MAX_ATTEMPTS
+
+
+class TestScheduler:
+    def _coordinator(self) -> tuple[LuxtronikCoordinator, MagicMock]:
+        coord = _make_coordinator_direct()
+        coord.client.stats = LuxtronikPollStats()
+        coord.hass.async_add_executor_job = AsyncMock()
+        coord._update_dhw_transition_hold = MagicMock()
+        scheduler = MagicMock()
+        scheduler.async_stagger = AsyncMock(return_value=0.0)
+        priorities: list[LuxSchedulePriority] = []
+
+        @asynccontextmanager
+        async def slot(priority):
+            priorities.append(priority)
+            yield
+
+        scheduler.async_slot = slot
+        scheduler.priorities = priorities
+        coord.scheduler = scheduler
+        del coord._async_confirm_refresh
+        return coord, scheduler
+
+    @pytest.mark.asyncio
+    async def test_routine_poll_is_staggered(self):
+        coord, scheduler = self._coordinator()
+
+        await coord._async_update_data()
+
+        scheduler.async_stagger.assert_awaited_once_with(
+            DEFAULT_UPDATE_INTERVAL.total_seconds()
+        )
+        assert scheduler.priorities == [LuxSchedulePriority.POLL]
+        assert coord.poll_stats.summary(LuxPollStat.SCHEDULER_WAIT)["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_and_its_confirmation_are_prioritised(self):
+        coord, scheduler = self._coordinator()
+
+        confirmed = LuxtronikCoordinatorData(
+            parameters={"p1": (0, 42)}, calculations={}, visibilities={}
+        )
+        coord.async_set_updated_data = MagicMock(
+            side_effect=lambda data: setattr(coord, "data", confirmed)
+        )
+
+        await coord.async_write("p1", 42)
+        await coord._async_update_data()
+
+        assert scheduler.priorities == [
+            LuxSchedulePriority.WRITE,
+            LuxSchedulePriority.WRITE_CONFIRM,
+            LuxSchedulePriority.POLL,
+        ]
+        scheduler.async_stagger.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_confirming_read_marks_the_data_stale(self):
+        coord, _ = self._coordinator()
+        coord.hass.async_add_executor_job = AsyncMock(
+            side_effect=TimeoutError("no answer")
+        )
+        coord.async_update_listeners = MagicMock()
+
+        await coord._async_confirm_refresh()
+
+        assert coord.last_update_success is False
+        assert isinstance(coord.last_exception, UpdateFailed)
+        coord.async_update_listeners.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_unregisters(self):
+        coord, scheduler = self._coordinator()
+        coord.client.session_log = None
+
+        with patch(
+            "homeassistant.helpers.update_coordinator.DataUpdateCoordinator.async_shutdown",
+            new=AsyncMock(),
+        ):
+            await coord.async_shutdown()
+
+        scheduler.unregister.assert_called_once_with(coord)
+        assert coord.scheduler is None
+
+
+# ---------------------------------------------------------------------------
+# Listener fan-out
+# ---------------------------------------------------------------------------
+
+
+def _make_fanout_coordinator(count: int, budget: float = 0.02):
+    """Direct coordinator with `count` listeners that record their call order."""
+    coord = _make_coordinator_direct()
+    coord.client.stats = LuxtronikPollStats()
+    coord._fanout_slice_budget = budget
+    coord.hass.async_create_task = lambda target, name=None, eager_start=True: (
+        asyncio.get_running_loop().create_task(target)
+    )
+    calls: list[int] = []
+    coord._listeners = {
+        index: ((lambda index=index: calls.append(index)), None)
+        for index in range(count)
+    }
+    return coord, calls
+
+
+class TestListenerFanOut:
+    @pytest.mark.parametrize(
+        ("configured", "expected"),
+        [
+            (None, DEFAULT_FANOUT_SLICE_BUDGET / 1000),
+            (50, 0.05),
+            (0, DEFAULT_FANOUT_SLICE_BUDGET / 1000),
+            (10_000, DEFAULT_FANOUT_SLICE_BUDGET / 1000),
+            ("50", DEFAULT_FANOUT_SLICE_BUDGET / 1000),
+        ],
+    )
+    def test_slice_budget_from_config(self, configured, expected):
+        config = {CONF_HOST: "192.168.1.100", CONF_PORT: DEFAULT_PORT}
+        if configured is not None:
+            config[CONF_FANOUT_SLICE_BUDGET] = configured
+        with patch("homeassistant.helpers.frame.report_usage"):
+            coord = LuxtronikCoordinator(
+                hass=MagicMock(), client=MagicMock(), config=config
+            )
+        assert coord._fanout_slice_budget == expected
+
+    @pytest.mark.asyncio
+    async def test_fan_out_within_budget_runs_inline(self):
+        coord, calls = _make_fanout_coordinator(5)
+
+        coord.async_update_listeners()
+
+        assert calls == [0, 1, 2, 3, 4]
+        assert coord._fanout_task is None
+        summary = coord.poll_stats.summary(LuxPollStat.FANOUT_SLICES)
+        assert summary is not None
+        assert summary["last"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fan_out_over_budget_yields_between_slices(self):
+        """With a zero budget every listener gets its own slice."""
+        coord, calls = _make_fanout_coordinator(3, budget=0)
+
+        coord.async_update_listeners()
+
+        # Only the first slice runs inline; the rest waits for the loop.
+        assert calls == [0]
+        assert coord._fanout_task is not None
+        await coord._fanout_task
+
+        assert calls == [0, 1, 2]
+        slices = coord.poll_stats.summary(LuxPollStat.FANOUT_SLICES)
+        assert slices is not None
+        assert slices["last"] == 3
+        busy = coord.poll_stats.summary(LuxPollStat.FANOUT_TIME)
+        wall = coord.poll_stats.summary(LuxPollStat.FANOUT_DURATION)
+        assert busy is not None
+        assert wall is not None
+        assert wall["last"] >= busy["last"]
+
+    @pytest.mark.asyncio
+    async def test_newer_update_supersedes_pending_fan_out(self):
+        coord, calls = _make_fanout_coordinator(3, budget=0)
+
+        coord.async_update_listeners()
+        first = coord._fanout_task
+        coord.async_update_listeners()
+        assert first is not None
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert coord._fanout_task is not None
+        await coord._fanout_task
+
+        # The superseded pass stopped after its inline slice.
+        assert calls == [0, 0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_failing_listener_does_not_stop_the_fan_out(self):
+        coord, calls = _make_fanout_coordinator(3)
+
+        def broken() -> None:
+            raise RuntimeError("boom")
+
+        coord._listeners[1] = (broken, None)
+
+        coord.async_update_listeners()
+
+        assert calls == [0, 2]
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_pending_fan_out(self):
+        coord, calls = _make_fanout_coordinator(3, budget=0)
+        coord.async_update_listeners()
+        task = coord._fanout_task
+        assert task is not None
+
+        with patch(
+            "homeassistant.helpers.update_coordinator.DataUpdateCoordinator.async_shutdown",
+            new=AsyncMock(),
+        ):
+            coord.hass.async_add_executor_job = AsyncMock()
+            await coord.async_shutdown()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert calls == [0]
+
+
+# ---------------------------------------------------------------------------
+# Persisted snapshot
+# ---------------------------------------------------------------------------
+
+_SNAPSHOT_BLOCKS = {"parameters": [1, 2], "calculations": [3], "visibilities": [4]}
+
+
+def _snapshot(firmware_version: str = "V3.90.1") -> LuxtronikSnapshot:
+    return LuxtronikSnapshot(
+        taken_at=datetime(2026, 1, 1, 12, 0, tzinfo=UTC),
+        unique_id="123456_789",
+        firmware_version=firmware_version,
+        model="LWD",
+        blocks=_SNAPSHOT_BLOCKS,
+    )
+
+
+class TestSnapshot:
+    def test_restore_parses_blocks_and_flags_data(self):
+        coord = _make_coordinator_direct()
+        coord._update_dhw_transition_hold = MagicMock()
+
+        coord.restore_snapshot(_snapshot())
+
+        coord.client.restore.assert_called_once_with(_SNAPSHOT_BLOCKS)
+        assert coord.data.restored is True
+        assert coord.data.polled_at == datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+
+    @pytest.mark.asyncio
+    async def test_live_poll_replaces_restored_data(self):
+        coord = _make_coordinator_direct()
+        coord.client.stats = LuxtronikPollStats()
+        coord.hass.async_add_executor_job = AsyncMock()
+        coord._update_dhw_transition_hold = MagicMock()
+        coord.config_entry = None
+        coord.restore_snapshot(_snapshot())
+
+        data = await coord._async_update_data()
+
+        assert data.restored is False
+        assert data.polled_at is not None
+
+    @pytest.mark.asyncio
+    async def test_successful_poll_schedules_a_save(self):
+        coord = _make_coordinator_direct()
+        coord.client.stats = LuxtronikPollStats()
+        coord.client.raw_blocks = dict(_SNAPSHOT_BLOCKS)
+        coord.hass.async_add_executor_job = AsyncMock()
+        coord._update_dhw_transition_hold = MagicMock()
+        coord.snapshot_store = MagicMock()
+
+        with (
+            patch.object(
+                LuxtronikCoordinator,
+                "unique_id",
+                new_callable=PropertyMock,
+                return_value="123456_789",
+            ),
+            patch.object(
+                LuxtronikCoordinator,
+                "firmware_version",
+                new_callable=PropertyMock,
+                return_value="V3.90.1",
+            ),
+            patch.object(
+                LuxtronikCoordinator,
+                "model",
+                new_callable=PropertyMock,
+                return_value="LWD",
+            ),
+        ):
+            await coord._async_update_data()
+
+        coord.snapshot_store.async_schedule_save.assert_called_once()
+        saved = coord.snapshot_store.async_schedule_save.call_args.args[0]
+        assert saved.blocks == _SNAPSHOT_BLOCKS
+        assert saved.unique_id == "123456_789"
+
+    @pytest.mark.asyncio
+    async def test_incomplete_poll_is_not_saved(self):
+        coord = _make_coordinator_direct()
+        coord.client.stats = LuxtronikPollStats()
+        coord.client.raw_blocks = {"parameters": [1, 2]}
+        coord.hass.async_add_executor_job = AsyncMock()
+        coord._update_dhw_transition_hold = MagicMock()
+        coord.snapshot_store = MagicMock()
+
+        await coord._async_update_data()
+
+        coord.snapshot_store.async_schedule_save.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("live_firmware", "reloads"), [("V3.90.1", False), ("V3.91.0", True)]
+    )
+    def test_firmware_change_since_snapshot_reloads_entry(
+        self, live_firmware: str, reloads: bool
+    ):
+        coord = _make_coordinator_direct()
+        coord.config_entry = MagicMock(entry_id="entry-id")
+        coord._restored_snapshot = _snapshot("V3.90.1")
+
+        with patch.object(
+            LuxtronikCoordinator,
+            "firmware_version",
+            new_callable=PropertyMock,
+            return_value=live_firmware,
+        ):
+            coord._check_restored_firmware()
+
+        reload = coord.hass.config_entries.async_schedule_reload
+        assert reload.called is reloads
+        assert coord._restored_snapshot is None
+
+
+class TestEntityPlanFingerprint:
+    _CALCULATIONS = {
+        "ID_WEB_SoftStand": "V3.90.1",
+        "ID_WEB_Zaehler_BetrZeitBW": 150,
+    }
+
+    def test_survives_a_store_round_trip(self):
+        coord = _make_coordinator(calculations=self._CALCULATIONS)
+        fingerprint = coord.entity_plan_fingerprint("2026.08.21")
+        assert json.loads(json.dumps(fingerprint)) == fingerprint
+
+    def test_running_counters_do_not_change_it(self):
+        """Operating hours grow every poll; only "present or not" matters."""
+        before = _make_coordinator(calculations=self._CALCULATIONS)
+        after = _make_coordinator(
+            calculations={**self._CALCULATIONS, "ID_WEB_Zaehler_BetrZeitBW": 151}
+        )
+        assert before.entity_plan_fingerprint("1") == after.entity_plan_fingerprint("1")
+
+    def test_mixing_circuit_type_changes_it(self):
+        before = _make_coordinator(
+            parameters={"ID_Einst_MK1Typ_akt": 0}, calculations=self._CALCULATIONS
+        )
+        after = _make_coordinator(
+            parameters={"ID_Einst_MK1Typ_akt": 3}, calculations=self._CALCULATIONS
+        )
+        assert before.entity_plan_fingerprint("1") != after.entity_plan_fingerprint("1")
+
+
+# ===========================================================================
+# async_identify
+# ===========================================================================
+
+
+def _identity_client(
+    serial_date: int | None = 20230101, serial_model: int = 255
+) -> MagicMock:
+    """A client whose read_identity leaves the identifying registers set."""
+    parameters: dict[str, Any] = {"ID_WP_SerienNummer_HEX": serial_model}
+    if serial_date is not None:
+        parameters["ID_WP_SerienNummer_DATUM"] = serial_date
+    data = make_coordinator_data(
+        parameters=parameters,
+        calculations={
+            "ID_WEB_Code_WP_akt": "LWP",
+            "ID_WEB_SoftStand": "V3.90.1",
+        },
+    )
+    client = MagicMock()
+    client.parameters = data.parameters
+    client.calculations = data.calculations
+    client.visibilities = data.visibilities
+    return client
+
+
+class TestIdentify:
+    CONFIG = {CONF_HOST: "192.168.1.100", CONF_PORT: DEFAULT_PORT}
+
+    async def _identify(self, hass: HomeAssistant, client: MagicMock):
+        with patch.object(LuxtronikCoordinator, "create_client", return_value=client):
+            return await async_identify(hass, self.CONFIG)
+
+    @pytest.mark.asyncio
+    async def test_identity_matches_the_coordinator(self, hass: HomeAssistant):
+        client = _identity_client()
+
+        identity = await self._identify(hass, client)
+
+        client.read_identity.assert_called_once()
+        client.read.assert_not_called()
+        assert identity.serial_number == "20230101-0ff"
+        assert identity.unique_id == "20230101_0ff"
+        assert identity.model == "LWP"
+        assert identity.firmware_version == "V3.90.1"
+        assert identity.manufacturer == "Alpha Innotec"
+        _take_identified_client(hass, self.CONFIG)
+
+    @pytest.mark.asyncio
+    async def test_missing_serial_number_raises(self, hass: HomeAssistant):
+        identity = await self._identify(hass, _identity_client(serial_date=None))
+        _take_identified_client(hass, self.CONFIG)
+
+        with pytest.raises(LuxtronikSerialNumberError):
+            _ = identity.unique_id
+
+    @pytest.mark.asyncio
+    async def test_read_failure_raises_connection_error(self, hass: HomeAssistant):
+        client = _identity_client()
+        client.read_identity.side_effect = TimeoutError("no answer")
+
+        with pytest.raises(LuxtronikConnectionError):
+            await self._identify(hass, client)
+
+        client.disconnect.assert_called_once()
+        assert _take_identified_client(hass, self.CONFIG) is None
+
+    @pytest.mark.asyncio
+    async def test_setup_reuses_the_probe_connection(self, hass: HomeAssistant):
+        client = _identity_client()
+        await self._identify(hass, client)
+
+        assert _take_identified_client(hass, self.CONFIG) is client
+        assert _take_identified_client(hass, self.CONFIG) is None
+        assert (
+            _take_identified_client(
+                hass, {CONF_HOST: "192.168.1.101", CONF_PORT: DEFAULT_PORT}
+            )
+            is None
+        )
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=IDENTIFIED_CLIENT_REUSE_TIME + 1)
+        )
+        await hass.async_block_till_done()
+        client.disconnect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_new_client_prefers_the_probe_connection(self, hass: HomeAssistant):
+        client = _identity_client()
+        await self._identify(hass, client)
+        fresh = MagicMock()
+
+        with patch.object(LuxtronikCoordinator, "create_client", return_value=fresh):
+            assert _new_client(hass, {**self.CONFIG, CONF_POLL_WORKER: True}) is fresh
+            assert _new_client(hass, self.CONFIG) is client
+            assert _new_client(hass, self.CONFIG) is fresh
+
+    @pytest.mark.asyncio
+    async def test_failed_restore_closes_the_probe_connection(
+        self, hass: HomeAssistant
+    ):
+        client = _identity_client()
+        await self._identify(hass, client)
+        snapshot_store = MagicMock()
+        snapshot_store.async_load = AsyncMock(return_value=_snapshot())
+
+        with patch.object(
+            LuxtronikCoordinator, "restore_snapshot", side_effect=ValueError("bad")
+        ):
+            coordinator = await _async_restore_coordinator(
+                hass, self.CONFIG, MagicMock(entry_id="entry-id"), snapshot_store
+            )
+
+        assert coordinator is None
+        client.disconnect.assert_called_once()
+        assert _take_identified_client(hass, self.CONFIG) is None
+
+    @pytest.mark.asyncio
+    async def test_unused_connection_is_closed(self, hass: HomeAssistant):
+        client = _identity_client()
+        await self._identify(hass, client)
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=IDENTIFIED_CLIENT_REUSE_TIME + 1)
+        )
+        await hass.async_block_till_done()
+
+        client.disconnect.assert_called_once()
+        assert _take_identified_client(hass, self.CONFIG) is None
+
+    @pytest.mark.asyncio
+    async def test_second_probe_replaces_the_first(self, hass: HomeAssistant):
+        first = _identity_client()
+        second = _identity_client()
+        await self._identify(hass, first)
+        await self._identify(hass, second)
+        await hass.async_block_till_done()
+
+        first.disconnect.assert_called_once()
+        assert _take_identified_client(hass, self.CONFIG) is second
+
+
+class TestCalculationHistory:
+    def _coordinator(self):
+        coord = _make_coordinator_direct()
+        coord.data = LuxtronikCoordinatorData(
+            parameters=MagicMock(),
+            calculations=Calculations(),
+            visibilities=MagicMock(),
+        )
+        return coord
+
+    def _record(self, coord, seconds_ago: float, flow_raw: int) -> None:
+        block = [0] * 20
+        block[10] = flow_raw
+        coord.client.raw_blocks = {CONF_CALCULATIONS: block}
+        coord._record_history(
+            LuxtronikCoordinatorData(
+                parameters=None,
+                calculations=None,
+                visibilities=None,
+                polled_at=dt_util.utcnow() - timedelta(seconds=seconds_ago),
+            )
+        )
+
+    def test_unchanged_block_is_recorded_once(self):
+        coord = self._coordinator()
+        self._record(coord, 60, 350)
+
+        coord._record_history(
+            LuxtronikCoordinatorData(
+                parameters=None,
+                calculations=None,
+                visibilities=None,
+                polled_at=dt_util.utcnow(),
+            )
+        )
+
+        assert coord.history.count == 1
+
+    def test_trend_is_decoded_like_the_register(self):
+        coord = self._coordinator()
+        self._record(coord, 7200, 300)
+        self._record(coord, 1800, 350)
+        self._record(coord, 0, 370)
+
+        trend = coord.calculation_trend("ID_WEB_Temperatur_TVL", timedelta(hours=1))
+
+        assert trend is not None
+        assert trend["calculation"] == "ID_WEB_Temperatur_TVL"
+        assert trend["samples"] == 2
+        assert (trend["first"], trend["last"]) == (35.0, 37.0)
+        assert (trend["min"], trend["max"], trend["mean"]) == (35.0, 37.0, 36.0)
+        assert trend["rate_per_hour"] == pytest.approx(4.0)
+
+    def test_trend_by_index_and_empty_window(self):
+        coord = self._coordinator()
+
+        trend = coord.calculation_trend(10, timedelta(hours=1))
+
+        assert trend == {
+            "calculation": "ID_WEB_Temperatur_TVL",
+            "window": 3600.0,
+            "samples": 0,
+        }
+
+    @pytest.mark.parametrize("calculation", ["ID_WEB_WP_BZ_akt", "ID_Unknown", 9999])
+    def test_unknown_or_non_numeric_has_no_trend(self, calculation):
+        coord = self._coordinator()
+        self._record(coord, 0, 350)
+
+        assert coord.calculation_trend(calculation, timedelta(hours=1)) is None
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock
 
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_TIMEOUT
@@ -14,10 +15,13 @@ from custom_components.luxtronik2.const import (
     DEFAULT_MAX_DATA_LENGTH,
     DEFAULT_PORT,
     DEFAULT_TIMEOUT,
+    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    EXTERNAL_SAMPLE_MAX_SKEW,
     DeviceKey,
     LuxCalculation as LC,
     LuxOperationMode,
+    SensorAttrKey as SA,
     SensorKey,
 )
 from custom_components.luxtronik2.model import LuxtronikCopSensorDescription
@@ -42,6 +46,7 @@ def _mock_entry():
 def _mock_coordinator(data):
     coord = MagicMock()
     coord.data = data
+    coord.update_interval = DEFAULT_UPDATE_INTERVAL
     coord.last_update_success = True
     coord.entity_active.return_value = True
     coord.entity_visible.return_value = True
@@ -148,7 +153,6 @@ class TestCopSensorHandleCoordinatorUpdate:
         hass = MagicMock()
         external_state = MagicMock()
         external_state.state = "1500"
-        hass.states.get.return_value = external_state
         coord = _mock_coordinator(data)
         description = _heating_cop_description()
         entity = LuxtronikCopSensorEntity(
@@ -157,10 +161,12 @@ class TestCopSensorHandleCoordinatorUpdate:
         entity.hass = hass
         entity.hass.config.time_zone = "UTC"
         entity.async_write_ha_state = MagicMock()
+        assert entity._external_power is not None
+        entity._external_power.update_from_state(external_state)
 
         entity._handle_coordinator_update(data)
 
-        hass.states.get.assert_called_with("sensor.shelly_power")
+        hass.states.get.assert_not_called()
         assert entity._attr_native_value == 4.0
         assert entity._attr_available is True
 
@@ -178,7 +184,6 @@ class TestCopSensorHandleCoordinatorUpdate:
             CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION: "sensor.shelly_power"
         }
         hass = MagicMock()
-        hass.states.get.return_value = None
         coord = _mock_coordinator(data)
         description = _heating_cop_description()
         entity = LuxtronikCopSensorEntity(
@@ -187,6 +192,8 @@ class TestCopSensorHandleCoordinatorUpdate:
         entity.hass = hass
         entity.hass.config.time_zone = "UTC"
         entity.async_write_ha_state = MagicMock()
+        assert entity._external_power is not None
+        entity._external_power.update_from_state(None)
 
         entity._handle_coordinator_update(data)
 
@@ -223,3 +230,95 @@ class TestCopSensorHandleCoordinatorUpdate:
         entity.coordinator.data = None
         entity._handle_coordinator_update(None)
         entity.async_write_ha_state.assert_not_called()
+
+
+# ===========================================================================
+# External power sensor - event-driven recompute and sample alignment
+# ===========================================================================
+
+
+_POLLED_AT = datetime(2026, 1, 1, 12, 0, 0, tzinfo=UTC)
+
+
+def _external_entity(data):
+    entry = _mock_entry()
+    entry.options = {CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION: "sensor.shelly_power"}
+    hass = MagicMock()
+    entity = LuxtronikCopSensorEntity(
+        hass,
+        entry,
+        _mock_coordinator(data),
+        _heating_cop_description(),
+        DeviceKey.heating,
+    )
+    entity.hass = hass
+    entity.hass.config.time_zone = "UTC"
+    entity.async_write_ha_state = MagicMock()
+    return entity
+
+
+def _external_state(value: str, sampled_at: datetime):
+    state = MagicMock()
+    state.state = value
+    state.last_reported = sampled_at
+    return state
+
+
+def _heating_data():
+    data = make_coordinator_data(
+        calculations={
+            "ID_WEB_WP_BZ_akt": LuxOperationMode.heating,
+            "ID_WEB_VD1out": True,
+            "Heat_Output": 6000,
+            "Unknown_Calculation_268": 1500,
+        }
+    )
+    data.polled_at = _POLLED_AT
+    return data
+
+
+class TestCopSensorExternalPowerEvents:
+    def test_meter_change_recomputes_without_a_poll(self):
+        data = _heating_data()
+        entity = _external_entity(data)
+        tracker = entity._external_power
+        assert tracker is not None
+        tracker.update_from_state(_external_state("1500", _POLLED_AT))
+        entity._handle_coordinator_update(data)
+        assert entity._attr_native_value == 4.0
+
+        event = MagicMock()
+        event.data = {
+            "new_state": _external_state("2000", _POLLED_AT + timedelta(seconds=5))
+        }
+        tracker._async_state_changed(event)
+
+        assert entity._attr_native_value == 3.0
+        assert entity.async_write_ha_state.call_count == 2
+
+    def test_sample_skew_is_published(self):
+        data = _heating_data()
+        entity = _external_entity(data)
+        assert entity._external_power is not None
+        sampled_at = _POLLED_AT + timedelta(seconds=12)
+        entity._external_power.update_from_state(_external_state("1500", sampled_at))
+
+        entity._handle_coordinator_update(data)
+
+        attributes = entity._attr_extra_state_attributes
+        assert attributes[SA.EXTERNAL_SAMPLED_AT] == sampled_at
+        assert attributes[SA.SAMPLE_SKEW] == 12.0
+
+    def test_sample_too_far_from_poll_makes_entity_unavailable(self):
+        data = _heating_data()
+        entity = _external_entity(data)
+        assert entity._external_power is not None
+        sampled_at = _POLLED_AT - (
+            DEFAULT_UPDATE_INTERVAL + EXTERNAL_SAMPLE_MAX_SKEW + timedelta(seconds=1)
+        )
+        entity._external_power.update_from_state(_external_state("1500", sampled_at))
+
+        entity._handle_coordinator_update(data)
+
+        assert entity._attr_native_value is None
+        assert entity._attr_available is False
@@ -0,0 +1,185 @@
+"""Tests for custom_components.luxtronik2.counter_cop."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.luxtronik2.const import (
+    CONF_HA_SENSOR_PREFIX,
+    COUNTER_COP_SAVE_DELAY,
+    COUNTER_COP_STORAGE_VERSION,
+    DEFAULT_PORT,
+    DOMAIN,
+    DeviceKey,
+    SensorAttrKey as SA,
+    SensorKey,
+)
+from custom_components.luxtronik2.counter_cop import LuxtronikCounterCop, period_label
+from custom_components.luxtronik2.sensor import LuxtronikCounterCopSensorEntity
+from custom_components.luxtronik2.sensor_entities_predefined import (
+    SENSORS_COUNTER_COP,
+)
+
+_KEY = f"{DOMAIN}.counter_cop.entry-id"
+
+
+@pytest.fixture
+def noon(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    """Today at local noon, with the clock frozen there."""
+    at = dt_util.start_of_local_day() + timedelta(hours=12)
+    freezer.move_to(at)
+    return at
+
+
+def _feed(counter_cop, start, readings, circuit="heating"):
+    """Feed (heat, electrical) counter readings ten minutes apart."""
+    for step, reading in enumerate(readings):
+        counter_cop.observe(start + timedelta(minutes=10 * step), {circuit: reading})
+
+
+class TestLuxtronikCounterCop:
+    def test_deltas_give_rolling_and_seasonal_cop(self, hass, noon):
+        counter_cop = LuxtronikCounterCop(hass, "entry-id")
+        _feed(
+            counter_cop,
+            noon - timedelta(minutes=20),
+            [(1000.0, 300.0), (1004.0, 301.0), (1008.0, 302.0)],
+        )
+        _feed(
+            counter_cop,
+            noon - timedelta(minutes=20),
+            [(500.0, 100.0), (502.0, 101.0), (504.0, 102.0)],
+            "domestic_water",
+        )
+
+        heating = counter_cop.summary(("heating",), noon)
+        both = counter_cop.summary(("heating", "domestic_water"), noon)
+
+        assert heating["last_7_days"] == 4.0
+        assert heating["season"] == 4.0
+        assert (heating["season_heat"], heating["season_electrical"]) == (8.0, 2.0)
+        assert both["last_24_hours"] == 3.0
+        assert both["previous_season"] is None
+
+    def test_counter_reset_and_glitch(self, hass, noon):
+        counter_cop = LuxtronikCounterCop(hass, "entry-id")
+        _feed(
+            counter_cop,
+            noon - timedelta(minutes=30),
+            [
+                (1000.0, 300.0),
+                # Reset: the new readings are the energy since zero.
+                (3.0, 1.0),
+                # A jump of 5000 kWh in ten minutes is not energy.
+                (5003.0, 2.0),
+                (5006.0, 3.0),
+            ],
+        )
+
+        heat, electrical = counter_cop.energy(
+            ("heating",), "day", noon.date().isoformat()
+        )
+
+        assert (heat, electrical) == (6.0, 2.0)
+
+    def test_too_little_electrical_energy_has_no_cop(self, hass, noon):
+        counter_cop = LuxtronikCounterCop(hass, "entry-id")
+        _feed(counter_cop, noon - timedelta(minutes=10), [(10.0, 1.0), (12.0, 1.5)])
+
+        assert counter_cop.summary(("heating",), noon)["last_7_days"] is None
+
+    def test_heating_season_starts_in_july(self):
+        june = datetime(2026, 6, 30, 12, tzinfo=dt_util.get_default_time_zone())
+        july = datetime(2026, 7, 1, 12, tzinfo=dt_util.get_default_time_zone())
+
+        assert period_label("season", june) == "2025/26"
+        assert period_label("season", july) == "2026/27"
+        assert period_label("month", july) == "2026-07"
+
+    @pytest.mark.asyncio
+    async def test_buckets_and_readings_survive_a_restart(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any], noon
+    ):
+        counter_cop = LuxtronikCounterCop(hass, "entry-id")
+        _feed(counter_cop, noon - timedelta(minutes=20), [(100.0, 50.0), (103.0, 51.0)])
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=COUNTER_COP_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        restarted = LuxtronikCounterCop(hass, "entry-id")
+        await restarted.async_load()
+        restarted.observe(noon, {"heating": (106.0, 52.0)})
+
+        assert hass_storage[_KEY]["version"] == COUNTER_COP_STORAGE_VERSION
+        assert restarted.summary(("heating",), noon)["season"] == 3.0
+
+    @pytest.mark.asyncio
+    async def test_unreadable_store_is_ignored(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        hass_storage[_KEY] = {
+            "version": COUNTER_COP_STORAGE_VERSION,
+            "key": _KEY,
+            "data": {"periods": {}, "readings": {"heating": "not a reading"}},
+        }
+        counter_cop = LuxtronikCounterCop(hass, "entry-id")
+
+        await counter_cop.async_load()
+
+        assert counter_cop.readings == {}
+
+
+class TestCounterCopSensor:
+    def _entity(self, counter_cop, key):
+        description = next(d for d in SENSORS_COUNTER_COP if d.key == key)
+        entry = MagicMock()
+        entry.data = {
+            CONF_HOST: "192.168.1.100",
+            CONF_PORT: DEFAULT_PORT,
+            CONF_HA_SENSOR_PREFIX: DOMAIN,
+        }
+        coord = MagicMock()
+        coord.counter_cop = counter_cop
+        coord.get_device.return_value = MagicMock()
+        coord.firmware_series = 3
+        entity = LuxtronikCounterCopSensorEntity(
+            MagicMock(), entry, coord, description, DeviceKey.heatpump
+        )
+        entity.hass = MagicMock()
+        entity.async_write_ha_state = MagicMock()
+        return entity
+
+    def test_season_sensor_reports_month_and_energy(self, hass, noon):
+        counter_cop = LuxtronikCounterCop(hass, "entry-id")
+        _feed(counter_cop, noon - timedelta(minutes=10), [(100.0, 50.0), (107.0, 52.0)])
+        entity = self._entity(counter_cop, SensorKey.COUNTER_COP_HEATING_SEASON)
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value == 3.5
+        attrs = entity._attr_extra_state_attributes
+        assert attrs[SA.COP_THIS_MONTH] == 3.5
+        assert attrs[SA.COP_PREVIOUS_SEASON] is None
+        assert (attrs[SA.COP_SEASON_HEAT], attrs[SA.COP_SEASON_ELECTRICAL]) == (
+            7.0,
+            2.0,
+        )
+        assert SA.COP_LAST_24_HOURS not in attrs
+
+    def test_unknown_without_counters(self):
+        entity = self._entity(None, SensorKey.COUNTER_COP_LAST_7_DAYS)
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value is None
+        assert SA.COP_LAST_30_DAYS not in entity._attr_extra_state_attributes
@@ -0,0 +1,188 @@
+"""Tests for custom_components.luxtronik2.cycles."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.luxtronik2.const import (
+    CONF_HA_SENSOR_PREFIX,
+    CYCLE_SAVE_DELAY,
+    CYCLE_STORAGE_VERSION,
+    DEFAULT_PORT,
+    DOMAIN,
+    MODE_TIME_MAX_GAP,
+    DeviceKey,
+    LuxOperationMode,
+    SensorAttrKey as SA,
+    SensorKey,
+)
+from custom_components.luxtronik2.cycles import LuxtronikCycleStats, outdoor_band
+from custom_components.luxtronik2.sensor import LuxtronikCycleSensorEntity
+from custom_components.luxtronik2.sensor_entities_predefined import SENSORS_CYCLES
+
+_KEY = f"{DOMAIN}.cycles.entry-id"
+_HEATING = LuxOperationMode.heating
+
+
+@pytest.fixture
+def noon(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    """Today at local noon, with the clock frozen there."""
+    at = dt_util.start_of_local_day() + timedelta(hours=12)
+    freezer.move_to(at)
+    return at
+
+
+def _run(cycles, start, polls):
+    """Feed (running, impulses, status, outdoor) polls one minute apart."""
+    for minute, (running, impulses, status, outdoor) in enumerate(polls):
+        cycles.observe(
+            start + timedelta(minutes=minute), running, impulses, status, outdoor
+        )
+
+
+class TestLuxtronikCycleStats:
+    def test_runtimes_and_short_cycles(self, hass, noon):
+        cycles = LuxtronikCycleStats(hass, "entry-id")
+        polls = [(False, 10, _HEATING, 5.0)]
+        polls += [(True, 11, _HEATING, 5.0)] * 20
+        polls += [(False, 11, _HEATING, 5.0)] * 5
+        polls += [(True, 12, _HEATING, 5.0)] * 4
+        polls += [(False, 12, _HEATING, 5.0)]
+        _run(cycles, noon - timedelta(minutes=len(polls)), polls)
+
+        summary = cycles.summary(noon)
+
+        assert summary["starts"] == 2
+        assert summary["cycles_per_hour"] == round(2 / 24, 2)
+        assert summary["mean_runtime"] == 12 * 60
+        assert summary["median_runtime"] == 12 * 60
+        assert summary["short_cycle_rate"] == 50.0
+
+    def test_impulse_counter_catches_cycles_between_polls(self, hass, noon):
+        cycles = LuxtronikCycleStats(hass, "entry-id")
+        polls = [
+            (False, 10, _HEATING, 5.0),
+            (False, 12, _HEATING, 5.0),
+            (True, 13, _HEATING, 5.0),
+        ]
+        _run(cycles, noon - timedelta(minutes=3), polls)
+
+        summary = cycles.summary(noon)
+
+        assert summary["starts"] == 3
+        assert summary["short_cycle_rate"] == 100.0
+        assert summary["mean_runtime"] is None
+
+    def test_gap_forgets_the_open_cycle_and_counter_steps(self, hass, noon):
+        cycles = LuxtronikCycleStats(hass, "entry-id")
+        start = noon - MODE_TIME_MAX_GAP - timedelta(minutes=5)
+
+        cycles.observe(start, True, 10, _HEATING, 5.0)
+        cycles.observe(start + MODE_TIME_MAX_GAP * 2, True, 14, _HEATING, 5.0)
+        cycles.observe(noon + MODE_TIME_MAX_GAP, False, 14, _HEATING, 5.0)
+
+        summary = cycles.summary(noon + MODE_TIME_MAX_GAP)
+        assert (summary["starts"], summary["short_cycle_rate"]) == (0, None)
+
+    def test_defrosts_per_compressor_hour_by_outdoor_band(self, hass, noon):
+        cycles = LuxtronikCycleStats(hass, "entry-id")
+        polls = [(True, 1, _HEATING, -2.0)] * 31
+        polls += [(True, 1, LuxOperationMode.defrost, -2.0)] * 2
+        polls += [(True, 1, _HEATING, -2.0)]
+        _run(cycles, noon - timedelta(minutes=len(polls)), polls)
+
+        summary = cycles.summary(noon)
+
+        assert summary["defrosts"] == 1
+        assert summary["defrosts_per_compressor_hour"] == {"-5..0": 1.82}
+        assert outdoor_band(-0.1) == -5
+        assert outdoor_band(0.0) == 0
+
+    @pytest.mark.asyncio
+    async def test_events_survive_a_restart(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any], noon
+    ):
+        cycles = LuxtronikCycleStats(hass, "entry-id")
+        cycles.observe(noon - timedelta(minutes=2), False, 1, _HEATING, 5.0)
+        cycles.observe(noon - timedelta(minutes=1), True, 2, _HEATING, 5.0)
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=CYCLE_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        restarted = LuxtronikCycleStats(hass, "entry-id")
+        await restarted.async_load()
+        restarted.observe(noon, False, 2, _HEATING, 5.0)
+
+        assert hass_storage[_KEY]["version"] == CYCLE_STORAGE_VERSION
+        summary = restarted.summary(noon)
+        assert (summary["starts"], summary["mean_runtime"]) == (1, 60)
+
+    @pytest.mark.asyncio
+    async def test_unreadable_store_is_ignored(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        hass_storage[_KEY] = {
+            "version": CYCLE_STORAGE_VERSION,
+            "key": _KEY,
+            "data": {"starts": [1.0], "runs": "not a list"},
+        }
+        cycles = LuxtronikCycleStats(hass, "entry-id")
+
+        await cycles.async_load()
+
+        assert (list(cycles.starts), cycles.bands) == ([], {})
+
+
+class TestCycleSensor:
+    def _entity(self, cycles, key):
+        description = next(d for d in SENSORS_CYCLES if d.key == key)
+        entry = MagicMock()
+        entry.data = {
+            CONF_HOST: "192.168.1.100",
+            CONF_PORT: DEFAULT_PORT,
+            CONF_HA_SENSOR_PREFIX: DOMAIN,
+        }
+        coord = MagicMock()
+        coord.cycles = cycles
+        coord.get_device.return_value = MagicMock()
+        coord.firmware_series = 3
+        entity = LuxtronikCycleSensorEntity(
+            MagicMock(), entry, coord, description, DeviceKey.heatpump
+        )
+        entity.hass = MagicMock()
+        entity.async_write_ha_state = MagicMock()
+        return entity
+
+    def test_reports_runtime_in_minutes_and_starts(self, hass, noon):
+        cycles = LuxtronikCycleStats(hass, "entry-id")
+        polls = [(False, 1, _HEATING, 5.0)]
+        polls += [(True, 2, _HEATING, 5.0)] * 15
+        polls += [(False, 2, _HEATING, 5.0)]
+        _run(cycles, noon - timedelta(minutes=len(polls)), polls)
+        runtime = self._entity(cycles, SensorKey.COMPRESSOR_MEAN_RUNTIME)
+        per_hour = self._entity(cycles, SensorKey.COMPRESSOR_CYCLES_PER_HOUR)
+
+        runtime._handle_coordinator_update()
+        per_hour._handle_coordinator_update()
+
+        assert runtime._attr_native_value == 15.0
+        assert per_hour._attr_native_value == 0.04
+        assert per_hour._attr_extra_state_attributes[SA.CYCLE_STARTS] == 1
+        runtime.async_write_ha_state.assert_called_once()
+
+    def test_unknown_without_cycles(self):
+        entity = self._entity(None, SensorKey.DEFROSTS_LAST_24H)
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value is None
@@ -0,0 +1,85 @@
+"""Tests for tools.diagnostics_corpus, on synthetic diagnostics downloads."""
+
+from __future__ import annotations
+
+from collections import Counter
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tools.diagnostics_corpus import (
+    CorpusIndex,
+    build_index,
+    main,
+    parse_item_key,
+)
+
+
+def _download(
+    path: Path,
+    heatpump_id: str,
+    model: str,
+    firmware: str,
+    rbe_version: str,
+    wrapped: bool = True,
+) -> None:
+    payload = {
+        "heatpump_id": heatpump_id,
+        "parameters": {f"{1158:<4d} {'POWER_LIMIT_SWITCH':<60}": "False"},
+        "calculations": {
+            f"{78:<4d} {'ID_WEB_Code_WP_akt':<60}": model,
+            f"{81:<4d} {'ID_WEB_SoftStand':<60}": firmware,
+            f"{258:<4d} {'RBE_Version':<60}": rbe_version,
+        },
+        "visibilities": {f"{0:<4d} {'ID_Visi_NieAnzeigen':<60}": "0"},
+    }
+    dump = {"home_assistant": {}, "data": payload} if wrapped else payload
+    path.write_text(json.dumps(dump), encoding="utf-8")
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> CorpusIndex:
+    downloads = tmp_path / "downloads"
+    downloads.mkdir()
+    _download(downloads / "a.json", "aaa", "LD7", "V3.90.1", "0")
+    _download(downloads / "b.json", "bbb", "LD7", "V3.91.0", "1.3", wrapped=False)
+    _download(downloads / "c.json", "ccc", "LWD", "V2.33", "0")
+    (downloads / "notes.json").write_text('{"foo": 1}', encoding="utf-8")
+    assert build_index([downloads], tmp_path / "index") == 3
+    return CorpusIndex(tmp_path / "index")
+
+
+class TestDiagnosticsCorpus:
+    def test_parse_item_key(self):
+        assert parse_item_key(f"{258:<4d} {'RBE_Version':<60}") == (258, "RBE_Version")
+
+    def test_units_and_names(self, corpus: CorpusIndex):
+        assert [unit.heatpump_id for unit in corpus.units] == ["aaa", "bbb", "ccc"]
+        assert [unit.series for unit in corpus.units] == [3, 3, 2]
+        assert corpus.name("calculations", 258) == "RBE_Version"
+        assert isinstance(corpus.key, np.memmap)
+
+    def test_distribution_by_model_and_series(self, corpus: CorpusIndex):
+        assert corpus.distribution("calculations", 258) == {
+            ("LD7", 3): Counter({"0": 1, "1.3": 1}),
+            ("LWD", 2): Counter({"0": 1}),
+        }
+
+    def test_units_where(self, corpus: CorpusIndex):
+        assert [u.heatpump_id for u in corpus.units_where("calculations", 258)] == [
+            "bbb"
+        ]
+        assert corpus.units_where("parameters", 1158) == []
+        assert [
+            u.file for u in corpus.units_where("calculations", 81, equals="V2.33")
+        ] == ["c.json"]
+        assert corpus.units_where("calculations", 999) == []
+
+    def test_cli_query(self, corpus: CorpusIndex, tmp_path: Path, capsys):
+        main(["units", str(tmp_path / "index"), "calculations 258"])
+
+        out = capsys.readouterr().out
+        assert "bbb LD7 V3.91.0 b.json" in out
+        assert out.endswith("1 of 3 downloads\n")
@@ -0,0 +1,199 @@
+"""Tests for custom_components.luxtronik2.entity_plan."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.luxtronik2.const import (
+    DOMAIN,
+    ENTITY_PLAN_SAVE_DELAY,
+    ENTITY_PLAN_STORAGE_VERSION,
+    LuxCalculation as LC,
+    LuxParameter as LP,
+)
+from custom_components.luxtronik2.entity_plan import (
+    LuxtronikEntityPlan,
+    plan_descriptions,
+)
+from custom_components.luxtronik2.model import LuxtronikSelectEntityDescription
+
+_KEY = f"{DOMAIN}.entity_plan.entry-id"
+_FINGERPRINT = {"model": "LWD", "firmware_version": "V3.90.1"}
+
+_DESCRIPTIONS = [
+    LuxtronikSelectEntityDescription(key="first", luxtronik_key=LP.P0003_MODE_HEATING),
+    LuxtronikSelectEntityDescription(key="second", luxtronik_key=LP.P0004_MODE_DHW),
+    LuxtronikSelectEntityDescription(
+        key="third", luxtronik_key=LC.C0010_FLOW_IN_TEMPERATURE
+    ),
+]
+
+
+def _stored(groups: dict[str, Any], fingerprint: dict[str, Any] | None = None):
+    return {
+        "version": ENTITY_PLAN_STORAGE_VERSION,
+        "key": _KEY,
+        "data": {
+            "fingerprint": fingerprint if fingerprint is not None else _FINGERPRINT,
+            "groups": groups,
+        },
+    }
+
+
+async def _built_plan(hass: HomeAssistant) -> dict[str, Any]:
+    """Build the "select" group once and return what was saved."""
+    plan = LuxtronikEntityPlan(hass, "entry-id")
+    await plan.async_load(_FINGERPRINT)
+    plan.select("select", _DESCRIPTIONS, lambda d: d.key != "second")
+    return plan._data_to_save()
+
+
+class TestLuxtronikEntityPlan:
+    @pytest.mark.asyncio
+    async def test_miss_evaluates_and_records(self, hass: HomeAssistant):
+        plan = LuxtronikEntityPlan(hass, "entry-id")
+        await plan.async_load(_FINGERPRINT)
+
+        result = plan.select("select", _DESCRIPTIONS, lambda d: d.key != "second")
+
+        assert [d.key for d in result] == ["first", "third"]
+        assert plan._data_to_save()["groups"]["select"]["selected"] == [0, 2]
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_the_predicate(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        hass_storage[_KEY] = _stored((await _built_plan(hass))["groups"])
+        plan = LuxtronikEntityPlan(hass, "entry-id")
+        await plan.async_load(_FINGERPRINT)
+        predicate = MagicMock(return_value=True)
+
+        result = plan.select("select", _DESCRIPTIONS, predicate)
+
+        assert [d.key for d in result] == ["first", "third"]
+        predicate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_changed_fingerprint_discards_the_plan(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        """A firmware update can change which entities exist."""
+        hass_storage[_KEY] = _stored((await _built_plan(hass))["groups"])
+        plan = LuxtronikEntityPlan(hass, "entry-id")
+        await plan.async_load({**_FINGERPRINT, "firmware_version": "V3.91.0"})
+
+        result = plan.select("select", _DESCRIPTIONS, lambda d: True)
+
+        assert len(result) == len(_DESCRIPTIONS)
+
+    @pytest.mark.asyncio
+    async def test_changed_table_is_rebuilt(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        """Stored indices must not be applied to a reordered table."""
+        hass_storage[_KEY] = _stored((await _built_plan(hass))["groups"])
+        plan = LuxtronikEntityPlan(hass, "entry-id")
+        await plan.async_load(_FINGERPRINT)
+
+        result = plan.select("select", _DESCRIPTIONS[::-1], lambda d: True)
+
+        assert [d.key for d in result] == ["third", "second", "first"]
+
+    @pytest.mark.asyncio
+    async def test_resolved_options_are_restored(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        plan = LuxtronikEntityPlan(hass, "entry-id")
+        await plan.async_load(_FINGERPRINT)
+        plan.select(
+            "select",
+            _DESCRIPTIONS,
+            lambda d: True,
+            resolve=lambda d: (
+                d.__class__(
+                    key=d.key, luxtronik_key=d.luxtronik_key, options=["a", "b"]
+                )
+                if d.key == "first"
+                else d
+            ),
+        )
+        hass_storage[_KEY] = _stored(plan._data_to_save()["groups"])
+
+        restored = LuxtronikEntityPlan(hass, "entry-id")
+        await restored.async_load(_FINGERPRINT)
+        result = restored.select("select", _DESCRIPTIONS, lambda d: False)
+
+        assert result[0].options == ["a", "b"]
+        assert result[1] is _DESCRIPTIONS[1]
+
+    @pytest.mark.asyncio
+    async def test_formula_descriptions_are_decided_live(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        """Their outcome follows the live register value, not the heat pump."""
+        descriptions = [
+            *_DESCRIPTIONS,
+            LuxtronikSelectEntityDescription(
+                key="formula",
+                luxtronik_key=LP.P0003_MODE_HEATING,
+                entity_active_formula="!= 0",
+            ),
+        ]
+        plan = LuxtronikEntityPlan(hass, "entry-id")
+        await plan.async_load(_FINGERPRINT)
+        plan.select("select", descriptions, lambda d: True)
+        hass_storage[_KEY] = _stored(plan._data_to_save()["groups"])
+
+        restored = LuxtronikEntityPlan(hass, "entry-id")
+        await restored.async_load(_FINGERPRINT)
+        result = restored.select("select", descriptions, lambda d: d.key != "formula")
+
+        assert [d.key for d in result] == ["first", "second", "third"]
+
+    @pytest.mark.asyncio
+    async def test_saves_only_after_a_rebuild(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        plan = LuxtronikEntityPlan(hass, "entry-id")
+        await plan.async_load(_FINGERPRINT)
+        plan.async_schedule_save()
+        plan.select("select", _DESCRIPTIONS, lambda d: True)
+        plan.async_schedule_save()
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=ENTITY_PLAN_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        assert hass_storage[_KEY]["data"]["fingerprint"] == _FINGERPRINT
+        assert hass_storage[_KEY]["data"]["groups"]["select"]["selected"] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_remove_deletes_the_file(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        hass_storage[_KEY] = _stored({})
+        await LuxtronikEntityPlan(hass, "entry-id").async_remove()
+        assert _KEY not in hass_storage
+
+
+class TestPlanDescriptions:
+    def test_without_plan_evaluates_directly(self):
+        coordinator = MagicMock(entity_plan=None)
+
+        result = plan_descriptions(
+            coordinator,
+            "select",
+            _DESCRIPTIONS,
+            lambda d: d.key == "second",
+            resolve=lambda d: d,
+        )
+
+        assert result == [_DESCRIPTIONS[1]]
@@ -71,6 +71,7 @@ def _mock_coordinator(data=None, *, last_update_success: bool = True):
     coord.last_update_success = last_update_success
     coord.entity_active.return_value = True
     coord.entity_visible.return_value = True
+    coord.entity_plan = None
     coord.get_device.return_value = MagicMock()
     coord.async_write = AsyncMock(return_value=data)
     return coord
@@ -627,6 +628,40 @@ class TestSensorAsyncSetupEntry:
 
         assert add.called
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("calculations", "expected"),
+        [
+            ({"ID_WEB_Temperatur_TA": 10.0}, set()),
+            (
+                {"ID_WEB_WP_BZ_akt": "heating", "ID_WEB_VD1out": 1},
+                {"LuxtronikModeTimeSensorEntity", "LuxtronikCycleSensorEntity"},
+            ),
+        ],
+    )
+    async def test_mode_time_and_cycles_need_their_registers(
+        self, calculations, expected
+    ):
+        from custom_components.luxtronik2.sensor import async_setup_entry
+
+        coord = _mock_coordinator(make_coordinator_data(calculations=calculations))
+        entry = _mock_entry()
+        entry.runtime_data = coord
+        add = MagicMock()
+
+        with patch("homeassistant.helpers.frame.report_usage"):
+            await async_setup_entry(MagicMock(), entry, add)
+
+        added = {
+            type(entity).__name__
+            for call in add.call_args_list
+            for entity in call[0][0]
+        }
+        assert (
+            added & {"LuxtronikModeTimeSensorEntity", "LuxtronikCycleSensorEntity"}
+            == expected
+        )
+
 
 # ===========================================================================
 # LuxtronikSensorEntity
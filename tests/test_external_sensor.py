@@ -0,0 +1,99 @@
+"""Tests for custom_components.luxtronik2.external_sensor.
+
+Run against a real `hass`, because what matters here is which state machine
+events the tracker is woken by - a MagicMock hass would only echo back the
+calls the tracker makes.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.luxtronik2.external_sensor import ExternalSensorTracker
+
+_ENTITY_ID = "sensor.shelly_power"
+
+
+class TestExternalSensorTracker:
+    @pytest.mark.asyncio
+    async def test_seeds_from_current_state(self, hass: HomeAssistant):
+        hass.states.async_set(_ENTITY_ID, "1500")
+        tracker = ExternalSensorTracker(_ENTITY_ID, MagicMock())
+
+        unsubscribe = tracker.async_start(hass)
+
+        assert tracker.value == 1500.0
+        state = hass.states.get(_ENTITY_ID)
+        assert state is not None
+        assert tracker.sampled_at == state.last_reported
+        unsubscribe()
+
+    @pytest.mark.asyncio
+    async def test_missing_sensor_has_no_value(self, hass: HomeAssistant):
+        tracker = ExternalSensorTracker(_ENTITY_ID, MagicMock(), default=0.0)
+
+        unsubscribe = tracker.async_start(hass)
+
+        assert tracker.value is None
+        assert tracker.sampled_at is None
+        unsubscribe()
+
+    @pytest.mark.asyncio
+    async def test_state_change_updates_value_and_notifies(self, hass: HomeAssistant):
+        hass.states.async_set(_ENTITY_ID, "1500")
+        on_change = MagicMock()
+        tracker = ExternalSensorTracker(_ENTITY_ID, on_change)
+        unsubscribe = tracker.async_start(hass)
+
+        hass.states.async_set(_ENTITY_ID, "1200")
+        await hass.async_block_till_done()
+
+        assert tracker.value == 1200.0
+        on_change.assert_called_once()
+        unsubscribe()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_report_refreshes_sample_time_only(
+        self, hass: HomeAssistant
+    ):
+        """A steady meter re-reporting its value must not look stale."""
+        hass.states.async_set(_ENTITY_ID, "1500")
+        on_change = MagicMock()
+        tracker = ExternalSensorTracker(_ENTITY_ID, on_change)
+        unsubscribe = tracker.async_start(hass)
+        first_sample = tracker.sampled_at
+
+        hass.states.async_set(_ENTITY_ID, "1500")
+        await hass.async_block_till_done()
+
+        assert tracker.sampled_at is not None
+        assert first_sample is not None
+        assert tracker.sampled_at > first_sample
+        on_change.assert_not_called()
+        unsubscribe()
+
+    @pytest.mark.asyncio
+    async def test_non_numeric_state_falls_back_to_default(self, hass: HomeAssistant):
+        hass.states.async_set(_ENTITY_ID, "unavailable")
+        tracker = ExternalSensorTracker(_ENTITY_ID, MagicMock(), default=0.0)
+
+        unsubscribe = tracker.async_start(hass)
+
+        assert tracker.value == 0.0
+        unsubscribe()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe_stops_updates(self, hass: HomeAssistant):
+        hass.states.async_set(_ENTITY_ID, "1500")
+        on_change = MagicMock()
+        tracker = ExternalSensorTracker(_ENTITY_ID, on_change)
+        tracker.async_start(hass)()
+
+        hass.states.async_set(_ENTITY_ID, "900")
+        await hass.async_block_till_done()
+
+        assert tracker.value == 1500.0
+        on_change.assert_not_called()
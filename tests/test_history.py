@@ -0,0 +1,68 @@
+"""Tests for custom_components.luxtronik2.history."""
+
+from __future__ import annotations
+
+from luxtronik.datatypes import Bool, Celsius, HeatingMode, Version
+import pytest
+
+from custom_components.luxtronik2.history import CalculationHistory, numeric_scale
+
+
+class TestCalculationHistory:
+    def test_window_covers_only_recent_samples(self):
+        history = CalculationHistory(10)
+        for second, value in enumerate([10, 20, 30, 40]):
+            history.append(float(second * 60), [value, -value])
+
+        stats = history.stats(0, seconds=120, now=180.0)
+        negative = history.stats(1, seconds=120, now=180.0)
+
+        assert stats is not None
+        assert negative is not None
+        assert (stats.samples, stats.since) == (3, 60.0)
+        assert (stats.first, stats.last, stats.minimum, stats.maximum) == (
+            20,
+            40,
+            20,
+            40,
+        )
+        assert stats.mean == 30
+        assert stats.rate_per_hour == pytest.approx(600)
+        assert (negative.minimum, negative.maximum) == (-40, -20)
+
+    def test_oldest_samples_are_overwritten(self):
+        history = CalculationHistory(3)
+        for second in range(5):
+            history.append(float(second), [second])
+
+        stats = history.stats(0, seconds=100, now=4.0)
+
+        assert history.count == 3
+        assert stats is not None
+        assert (stats.first, stats.last, stats.samples) == (2, 4, 3)
+        assert history.as_dict()["oldest"] == 2.0
+
+    def test_block_length_change_starts_over(self):
+        history = CalculationHistory(5)
+        history.append(0.0, [1, 2])
+        history.append(1.0, [1, 2, 3])
+
+        assert history.count == 1
+        assert history.width == 3
+
+    def test_empty_window_and_unknown_index(self):
+        history = CalculationHistory(5)
+        history.append(0.0, [1])
+
+        assert history.stats(0, seconds=10, now=100.0) is None
+        assert history.stats(5, seconds=1000, now=100.0) is None
+        single = history.stats(0, seconds=1000, now=100.0)
+        assert single is not None
+        assert single.rate_per_hour is None
+
+
+def test_numeric_scale():
+    assert numeric_scale(Celsius("temperature")) == 0.1
+    assert numeric_scale(Bool("flag")) is None
+    assert numeric_scale(HeatingMode("mode")) is None
+    assert numeric_scale(Version("version")) is None
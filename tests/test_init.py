@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_TIMEOUT, Platform as P
+from homeassistant.core import SupportsResponse
 from homeassistant.exceptions import ConfigEntryNotReady, ServiceValidationError
 import pytest
 
@@ -20,13 +22,16 @@ from custom_components.luxtronik2 import (
     async_setup_entry,
     async_unload_entry,
     setup_hass_services,
+    setup_history_service,
     update_listener,
 )
 from custom_components.luxtronik2.const import (
+    ATTR_CALCULATION,
     ATTR_CONFIG_ENTRY_ID,
     ATTR_DEVICE_ID,
     ATTR_PARAMETER,
     ATTR_VALUE,
+    ATTR_WINDOW,
     CONF_HA_SENSOR_PREFIX,
     CONF_MAX_DATA_LENGTH,
     CONFIG_ENTRY_VERSION,
@@ -35,6 +40,7 @@ from custom_components.luxtronik2.const import (
     DEFAULT_TIMEOUT,
     DOMAIN,
     PLATFORMS,
+    SERVICE_CALCULATION_HISTORY,
     SERVICE_WRITE,
     WRITABLE_PARAMETER_PREFIXES,
     SensorKey as SK,
@@ -69,6 +75,7 @@ def _mock_coordinator(hass):
     coord.async_config_entry_first_refresh = AsyncMock()
     coord.async_shutdown = AsyncMock()
     coord.async_write = AsyncMock()
+    coord.async_load_entity_plan = AsyncMock()
     return coord
 
 
@@ -585,6 +592,7 @@ class TestAsyncSetupEntry:
         coordinator = MagicMock()
         coordinator.manufacturer = "Alpha Innotec"
         coordinator.async_config_entry_first_refresh = AsyncMock()
+        coordinator.async_load_entity_plan = AsyncMock()
 
         with patch(
             "custom_components.luxtronik2.connect_and_get_coordinator",
@@ -606,6 +614,7 @@ class TestAsyncSetupEntry:
         coordinator = MagicMock()
         coordinator.manufacturer = None
         coordinator.async_config_entry_first_refresh = AsyncMock()
+        coordinator.async_load_entity_plan = AsyncMock()
 
         with patch(
             "custom_components.luxtronik2.connect_and_get_coordinator",
@@ -655,6 +664,7 @@ class TestAsyncSetupEntry:
         coordinator.manufacturer = "Alpha Innotec"
         coordinator.unique_id = "20230101_0xff"
         coordinator.async_config_entry_first_refresh = AsyncMock()
+        coordinator.async_load_entity_plan = AsyncMock()
 
         with patch(
             "custom_components.luxtronik2.connect_and_get_coordinator",
@@ -684,6 +694,7 @@ class TestAsyncSetupEntry:
         coordinator.manufacturer = "Alpha Innotec"
         coordinator.unique_id = "20230101_0xff"
         coordinator.async_config_entry_first_refresh = AsyncMock()
+        coordinator.async_load_entity_plan = AsyncMock()
 
         with patch(
             "custom_components.luxtronik2.connect_and_get_coordinator",
@@ -712,6 +723,7 @@ class TestAsyncSetupEntry:
         coordinator.manufacturer = "Alpha Innotec"
         coordinator.get_device = MagicMock()
         coordinator.async_config_entry_first_refresh = AsyncMock()
+        coordinator.async_load_entity_plan = AsyncMock()
 
         with (
             patch(
@@ -886,7 +898,8 @@ class TestAsyncUnloadEntry:
         entry.runtime_data.async_shutdown = AsyncMock()
         result = await async_unload_entry(hass, entry)
         assert result is True
-        hass.services.async_remove.assert_called_once_with(DOMAIN, SERVICE_WRITE)
+        hass.services.async_remove.assert_any_call(DOMAIN, SERVICE_WRITE)
+        hass.services.async_remove.assert_any_call(DOMAIN, SERVICE_CALCULATION_HISTORY)
 
     @pytest.mark.asyncio
     async def test_unload_keeps_service_when_other_entries_remain(self):
@@ -915,7 +928,8 @@ class TestAsyncUnloadEntry:
 
         assert result is True
         entry.runtime_data.async_shutdown.assert_awaited_once()
-        hass.services.async_remove.assert_called_once_with(DOMAIN, SERVICE_WRITE)
+        hass.services.async_remove.assert_any_call(DOMAIN, SERVICE_WRITE)
+        hass.services.async_remove.assert_any_call(DOMAIN, SERVICE_CALCULATION_HISTORY)
 
     @pytest.mark.asyncio
     async def test_unload_with_remaining_entries(self):
@@ -1370,3 +1384,83 @@ class TestWriteParameterServiceTargetSelection:
             "ID_Einst_BWS_akt", 42
         )
         entry_1.runtime_data.async_write.assert_not_awaited()
+
+
+# ===========================================================================
+# calculation_history service handler
+# ===========================================================================
+
+
+class TestCalculationHistoryService:
+    def _setup(self):
+        hass = MagicMock()
+        hass.services.has_service = MagicMock(return_value=False)
+        setup_history_service(hass)
+        return hass, hass.services.async_register.call_args
+
+    def _call(self, calculation="ID_WEB_Temperatur_TVL"):
+        service = MagicMock()
+        service.data = {
+            ATTR_CALCULATION: calculation,
+            ATTR_WINDOW: timedelta(hours=1),
+        }
+        return service
+
+    def test_registers_a_response_only_service(self):
+        hass, call = self._setup()
+
+        assert call.args[1] == SERVICE_CALCULATION_HISTORY
+        assert call.kwargs["supports_response"] is SupportsResponse.ONLY
+
+        hass.services.has_service = MagicMock(return_value=True)
+        hass.services.async_register.reset_mock()
+        setup_history_service(hass)
+        hass.services.async_register.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_returns_the_coordinator_trend(self):
+        hass, call = self._setup()
+        entry = _mock_loaded_config_entry("entry_1", hass)
+        entry.runtime_data.calculation_trend.return_value = {"samples": 3}
+        hass.config_entries.async_entries = MagicMock(return_value=[entry])
+
+        response = await call.args[2](self._call())
+
+        assert response == {"samples": 3}
+        entry.runtime_data.calculation_trend.assert_called_once_with(
+            "ID_WEB_Temperatur_TVL", timedelta(hours=1)
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("found", "trend", "translation_key"),
+        [
+            (None, None, "unknown_calculation"),
+            ((80, MagicMock()), None, "calculation_not_numeric"),
+        ],
+    )
+    async def test_rejects_unknown_and_non_numeric(self, found, trend, translation_key):
+        hass, call = self._setup()
+        entry = _mock_loaded_config_entry("entry_1", hass)
+        entry.runtime_data.find_calculation.return_value = found
+        entry.runtime_data.calculation_trend.return_value = trend
+        hass.config_entries.async_entries = MagicMock(return_value=[entry])
+
+        with pytest.raises(ServiceValidationError) as exc_info:
+            await call.args[2](self._call())
+
+        assert exc_info.value.translation_key == translation_key
+
+    @pytest.mark.asyncio
+    async def test_several_heat_pumps_need_a_target(self):
+        hass, call = self._setup()
+        entries = [
+            _mock_loaded_config_entry("entry_1", hass),
+            _mock_loaded_config_entry("entry_2", hass),
+        ]
+        hass.config_entries.async_entries = MagicMock(return_value=entries)
+
+        with pytest.raises(ServiceValidationError) as exc_info:
+            await call.args[2](self._call())
+
+        assert exc_info.value.translation_key == "ambiguous_target"
@@ -2,24 +2,38 @@
 
 from __future__ import annotations
 
+import asyncio
+from ipaddress import IPv4Interface
 import logging
+import socket
 import struct
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from custom_components.luxtronik2.const import DEFAULT_MAX_DATA_LENGTH, DEFAULT_PORT
+from custom_components.luxtronik2.const import (
+    DEFAULT_MAX_DATA_LENGTH,
+    DEFAULT_PORT,
+    LuxPollStat,
+)
 from custom_components.luxtronik2.lux_helper import (
-    LUXTRONIK_DISCOVERY_MAGIC_PACKET,
+    IDENTITY_READ_RETRIES,
     LUXTRONIK_DISCOVERY_RESPONSE_PREFIX,
     LUXTRONIK_WRITE_ACK_TIMEOUT,
     Luxtronik,
     _is_socket_closed,
-    discover,
+    apply_changed_registers,
+    async_discover,
+    async_discover_stream,
+    async_probe_host,
+    async_scan_hosts,
     get_firmware_download_id,
     get_manufacturer_by_model,
     get_manufacturer_firmware_url_by_model,
+    subnet_scan_hosts,
 )
+from tools.luxtronik_emulator import LuxtronikEmulator, blocks_from_values
 
 # ===========================================================================
 # get_manufacturer_by_model
@@ -228,164 +242,290 @@ class TestLuxtronikClient:
 # ===========================================================================
 
 
+class _FakeEndpoints:
+    """Stands in for the loop's datagram endpoints.
+
+    Records every broadcast and answers the first one on each port with the
+    replies configured for that port, as heat pumps on the LAN would.
+    """
+
+    def __init__(
+        self,
+        replies: dict[int, list[tuple[bytes, str]]] | None = None,
+        unbindable: tuple[int, ...] = (),
+    ) -> None:
+        self._replies = replies or {}
+        self._unbindable = unbindable
+        self.sent: list[tuple[str, int]] = []
+        self.transports: list[MagicMock] = []
+
+    async def __call__(self, factory, local_addr, allow_broadcast):
+        port = local_addr[1]
+        if port in self._unbindable:
+            raise OSError(98, "Address already in use")
+        protocol = factory()
+        transport = MagicMock()
+        pending = list(self._replies.get(port, []))
+
+        def sendto(data, addr):
+            self.sent.append(addr)
+            # The broadcast comes back to our own socket too.
+            protocol.datagram_received(data, ("192.168.1.2", port))
+            while pending:
+                reply, host = pending.pop(0)
+                protocol.datagram_received(reply, (host, port))
+
+        transport.sendto.side_effect = sendto
+        self.transports.append(transport)
+        return transport, protocol
+
+
+def _reply(port: int | str = 8889) -> bytes:
+    return f"{LUXTRONIK_DISCOVERY_RESPONSE_PREFIX}{port};".encode()
+
+
+async def _discover(endpoints: _FakeEndpoints, *args, **kwargs):
+    kwargs.setdefault("listen_time", 0.05)
+    with patch.object(
+        asyncio.get_running_loop(), "create_datagram_endpoint", endpoints
+    ):
+        return await async_discover(*args, **kwargs)
+
+
 class TestDiscover:
-    @patch("custom_components.luxtronik2.lux_helper.socket.socket")
-    def test_discover_finds_heatpump(self, mock_socket_class):
-        mock_sock = MagicMock()
-        mock_sock.fileno.return_value = -1
-        mock_socket_class.return_value = mock_sock
+    @pytest.mark.asyncio
+    async def test_discover_finds_heatpump(self):
+        endpoints = _FakeEndpoints({4444: [(_reply(), "192.168.1.100")]})
 
-        response = f"{LUXTRONIK_DISCOVERY_RESPONSE_PREFIX}8889;".encode()
+        results = await _discover(endpoints)
 
-        # First call returns what we sent (should be skipped), second returns valid response, third times out
-        call_count = 0
+        assert results == [("192.168.1.100", 8889)]
 
-        def recv_side_effect(size):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return LUXTRONIK_DISCOVERY_MAGIC_PACKET.encode(), (
-                    "192.168.1.100",
-                    4444,
-                )
-            elif call_count == 2:
-                return response, ("192.168.1.100", 4444)
-            raise TimeoutError
+    @pytest.mark.asyncio
+    async def test_discover_timeout_no_results(self):
+        assert await _discover(_FakeEndpoints()) == []
 
-        mock_sock.recvfrom = recv_side_effect
+    @pytest.mark.asyncio
+    async def test_discovery_invalid_port(self):
+        endpoints = _FakeEndpoints({4444: [(_reply("not_a_port"), "192.168.1.200")]})
 
-        results = discover()
-        assert ("192.168.1.100", 8889) in results
+        assert await _discover(endpoints) == []
 
-    @patch("custom_components.luxtronik2.lux_helper.socket.socket")
-    def test_discover_timeout_no_results(self, mock_socket_class):
-        mock_sock = MagicMock()
-        mock_sock.fileno.return_value = -1
-        mock_socket_class.return_value = mock_sock
-        mock_sock.recvfrom.side_effect = TimeoutError
-
-        results = discover()
-        assert results == []
-
-    @patch("custom_components.luxtronik2.lux_helper.socket")
-    def test_discovery_valid_port(self, mock_socket_module):
-        sock_instance = MagicMock()
-        mock_socket_module.socket.return_value = sock_instance
-        mock_socket_module.AF_INET = 2
-        mock_socket_module.SOCK_DGRAM = 2
-        mock_socket_module.IPPROTO_UDP = 17
-        mock_socket_module.SOL_SOCKET = 1
-        mock_socket_module.SO_BROADCAST = 6
-
-        magic_packet = "2000;111;1;\x00"
-        valid_response = f"{LUXTRONIK_DISCOVERY_RESPONSE_PREFIX}8888;"
-        sock_instance.recvfrom.side_effect = [
-            (magic_packet.encode(), ("192.168.1.1", 4444)),
-            (valid_response.encode(), ("192.168.1.200", 4444)),
-            TimeoutError(),
-            TimeoutError(),  # second port
-        ]
+    @pytest.mark.asyncio
+    async def test_discovery_invalid_response_prefix(self):
+        endpoints = _FakeEndpoints({4444: [(b"9999;222;garbage;", "192.168.1.200")]})
 
-        results = discover()
-        assert ("192.168.1.200", 8888) in results
-
-    @patch("custom_components.luxtronik2.lux_helper.socket")
-    def test_discovery_invalid_port(self, mock_socket_module):
-        sock_instance = MagicMock()
-        mock_socket_module.socket.return_value = sock_instance
-        mock_socket_module.AF_INET = 2
-        mock_socket_module.SOCK_DGRAM = 2
-        mock_socket_module.IPPROTO_UDP = 17
-        mock_socket_module.SOL_SOCKET = 1
-        mock_socket_module.SO_BROADCAST = 6
-
-        valid_response = f"{LUXTRONIK_DISCOVERY_RESPONSE_PREFIX}not_a_port;"
-        sock_instance.recvfrom.side_effect = [
-            (valid_response.encode(), ("192.168.1.200", 4444)),
-            TimeoutError(),
-            TimeoutError(),
-        ]
+        assert await _discover(endpoints) == []
 
-        results = discover()
-        assert len([r for r in results if r[0] == "192.168.1.200"]) == 0
-
-    @patch("custom_components.luxtronik2.lux_helper.socket")
-    def test_discovery_invalid_response_prefix(self, mock_socket_module):
-        sock_instance = MagicMock()
-        mock_socket_module.socket.return_value = sock_instance
-        mock_socket_module.AF_INET = 2
-        mock_socket_module.SOCK_DGRAM = 2
-        mock_socket_module.IPPROTO_UDP = 17
-        mock_socket_module.SOL_SOCKET = 1
-        mock_socket_module.SO_BROADCAST = 6
-
-        invalid_response = "9999;222;garbage;"
-        sock_instance.recvfrom.side_effect = [
-            (invalid_response.encode(), ("192.168.1.200", 4444)),
-            TimeoutError(),
-            TimeoutError(),
-        ]
+    @pytest.mark.asyncio
+    async def test_heatpump_answering_on_both_ports_is_listed_once(self):
+        endpoints = _FakeEndpoints(
+            {
+                4444: [(_reply(), "192.168.1.100")],
+                47808: [(_reply(), "192.168.1.100"), (_reply(8888), "192.168.1.101")],
+            }
+        )
+
+        results = await _discover(endpoints)
 
-        results = discover()
-        assert ("192.168.1.200", None) not in results
+        assert results == [("192.168.1.100", 8889), ("192.168.1.101", 8888)]
 
-    @patch("custom_components.luxtronik2.lux_helper.socket")
-    def test_discover_default_uses_global_broadcast(self, mock_socket_module):
+    @pytest.mark.asyncio
+    async def test_discover_default_uses_global_broadcast(self):
         """Without an explicit address list, sendto targets 255.255.255.255."""
-        sock_instance = MagicMock()
-        mock_socket_module.socket.return_value = sock_instance
-        mock_socket_module.AF_INET = 2
-        mock_socket_module.SOCK_DGRAM = 2
-        mock_socket_module.IPPROTO_UDP = 17
-        mock_socket_module.SOL_SOCKET = 1
-        mock_socket_module.SO_BROADCAST = 6
-        sock_instance.recvfrom.side_effect = TimeoutError
-
-        discover()
-
-        target_addrs = {call.args[1][0] for call in sock_instance.sendto.call_args_list}
-        assert target_addrs == {"255.255.255.255"}
-
-    @patch("custom_components.luxtronik2.lux_helper.socket")
-    def test_discover_broadcasts_on_every_supplied_address(self, mock_socket_module):
-        """Per-interface broadcasts: each address gets the magic packet on each port."""
-        sock_instance = MagicMock()
-        mock_socket_module.socket.return_value = sock_instance
-        mock_socket_module.AF_INET = 2
-        mock_socket_module.SOCK_DGRAM = 2
-        mock_socket_module.IPPROTO_UDP = 17
-        mock_socket_module.SOL_SOCKET = 1
-        mock_socket_module.SO_BROADCAST = 6
-        sock_instance.recvfrom.side_effect = TimeoutError
+        endpoints = _FakeEndpoints()
+
+        await _discover(endpoints)
+
+        assert endpoints.sent == [("255.255.255.255", 4444), ("255.255.255.255", 47808)]
 
+    @pytest.mark.asyncio
+    async def test_discover_broadcasts_on_every_supplied_address(self):
+        """Per-interface broadcasts: each address gets the magic packet on each port."""
         broadcasts = ["192.168.1.255", "192.168.120.255", "10.0.0.255"]
-        discover(broadcast_addresses=broadcasts)
+        endpoints = _FakeEndpoints()
 
-        # Each address should appear at least once per broadcast port.
-        target_addrs = [call.args[1][0] for call in sock_instance.sendto.call_args_list]
-        for addr in broadcasts:
-            assert target_addrs.count(addr) >= 1, (
-                f"{addr} was not broadcast to; calls: {target_addrs}"
-            )
-        # No fallback to 255.255.255.255 when explicit list is supplied.
-        assert "255.255.255.255" not in target_addrs
+        await _discover(endpoints, broadcast_addresses=broadcasts)
 
-    @patch("custom_components.luxtronik2.lux_helper.socket")
-    def test_discover_empty_address_list_falls_back_to_global(self, mock_socket_module):
+        assert sorted(endpoints.sent) == sorted(
+            (address, port) for address in broadcasts for port in (4444, 47808)
+        )
+
+    @pytest.mark.asyncio
+    async def test_discover_empty_address_list_falls_back_to_global(self):
         """An empty list is treated like None: fall back to 255.255.255.255."""
-        sock_instance = MagicMock()
-        mock_socket_module.socket.return_value = sock_instance
-        mock_socket_module.AF_INET = 2
-        mock_socket_module.SOCK_DGRAM = 2
-        mock_socket_module.IPPROTO_UDP = 17
-        mock_socket_module.SOL_SOCKET = 1
-        mock_socket_module.SO_BROADCAST = 6
-        sock_instance.recvfrom.side_effect = TimeoutError
+        endpoints = _FakeEndpoints()
+
+        await _discover(endpoints, broadcast_addresses=[])
 
-        discover(broadcast_addresses=[])
+        assert {address for address, _ in endpoints.sent} == {"255.255.255.255"}
 
-        target_addrs = {call.args[1][0] for call in sock_instance.sendto.call_args_list}
-        assert target_addrs == {"255.255.255.255"}
+    @pytest.mark.asyncio
+    async def test_expected_host_ends_the_search(self):
+        endpoints = _FakeEndpoints({4444: [(_reply(), "192.168.1.100")]})
+        started = time.monotonic()
+
+        results = await _discover(
+            endpoints, expected_host="192.168.1.100", listen_time=10
+        )
+
+        assert results == [("192.168.1.100", 8889)]
+        assert time.monotonic() - started < 1
+        for transport in endpoints.transports:
+            transport.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_unbindable_port_is_skipped(self):
+        endpoints = _FakeEndpoints({4444: [(_reply(), "192.168.1.100")]}, (47808,))
+
+        assert await _discover(endpoints) == [("192.168.1.100", 8889)]
+
+    @pytest.mark.asyncio
+    async def test_no_bindable_port_raises(self):
+        with pytest.raises(OSError):
+            await _discover(_FakeEndpoints(unbindable=(4444, 47808)))
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("socket_enabled")
+    async def test_replies_over_a_real_socket(self):
+        """The broadcast's own echo is skipped, a heat pump's reply is not."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        stream = async_discover_stream(["127.0.0.1"], ports=[port], listen_time=2)
+        first = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as heatpump:
+            heatpump.sendto(_reply(), ("127.0.0.1", port))
+            assert await first == ("127.0.0.1", 8889)
+        await stream.aclose()
+
+
+class TestSubnetScan:
+    def test_hosts_of_the_subnet_without_our_own_address(self):
+        hosts = subnet_scan_hosts([IPv4Interface("192.168.1.10/24")])
+
+        assert len(hosts) == 253
+        assert "192.168.1.10" not in hosts
+        assert hosts[0] == "192.168.1.1"
+        assert hosts[-1] == "192.168.1.254"
+
+    def test_interfaces_may_be_a_generator(self):
+        hosts = subnet_scan_hosts(
+            IPv4Interface(address) for address in ("192.168.1.10/24",)
+        )
+
+        assert len(hosts) == 253
+        assert "192.168.1.10" not in hosts
+
+    def test_large_subnet_is_narrowed_to_our_slash_24(self):
+        hosts = subnet_scan_hosts([IPv4Interface("10.20.30.40/16")])
+
+        assert len(hosts) == 253
+        assert all(host.startswith("10.20.30.") for host in hosts)
+
+    def test_loopback_and_link_local_are_skipped(self):
+        hosts = subnet_scan_hosts(
+            [IPv4Interface("127.0.0.1/8"), IPv4Interface("169.254.3.4/16")]
+        )
+
+        assert hosts == []
+
+    def test_overlapping_interfaces_are_probed_once(self):
+        hosts = subnet_scan_hosts(
+            [IPv4Interface("192.168.1.10/24"), IPv4Interface("192.168.1.11/25")]
+        )
+
+        assert len(hosts) == len(set(hosts)) == 252
+
+    @pytest.mark.asyncio
+    async def test_scan_yields_confirmed_hosts_within_the_concurrency(self):
+        in_flight = 0
+        peak = 0
+
+        async def probe(host, port, probe_timeout):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return host in {"10.0.0.7", "10.0.0.42"}
+
+        probed: list[int] = []
+        hosts = [f"10.0.0.{i}" for i in range(1, 101)]
+        with patch("custom_components.luxtronik2.lux_helper.async_probe_host", probe):
+            found = [
+                host
+                async for host in async_scan_hosts(
+                    hosts, concurrency=8, on_probed=probed.append
+                )
+            ]
+
+        assert sorted(found) == ["10.0.0.42", "10.0.0.7"]
+        assert peak == 8
+        assert probed[-1] == 100
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("socket_enabled")
+    async def test_probe_confirms_a_controller(self):
+        blocks = blocks_from_values({}, {}, {"ID_Visi_Heizung": 1})
+        with LuxtronikEmulator(blocks) as emulator:
+            assert await async_probe_host(*emulator.address)
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("socket_enabled")
+    async def test_probe_rejects_another_service(self):
+        async def other_service(reader, writer):
+            writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(other_service, "127.0.0.1", 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            assert not await async_probe_host("127.0.0.1", port)
+
+
+class TestReadIdentity:
+    @pytest.mark.usefixtures("socket_enabled")
+    def test_reads_parameters_and_calculations_only(self):
+        blocks = blocks_from_values(
+            {"ID_WP_SerienNummer_DATUM": 20230101},
+            {"ID_WEB_SoftStand": "V3.90.1"},
+            {"ID_Visi_Heizung": 1},
+        )
+        with LuxtronikEmulator(blocks) as emulator:
+            client = Luxtronik(*emulator.address, 2.0, DEFAULT_MAX_DATA_LENGTH)
+            try:
+                client.read_identity()
+            finally:
+                client.disconnect()
+
+        assert set(client.raw_blocks) == {"parameters", "calculations"}
+        assert client.parameters.get("ID_WP_SerienNummer_DATUM").value == 20230101
+        assert client.calculations.get("ID_WEB_SoftStand").value == "V3.90.1"
+
+    def test_failure_is_retried_once_and_disconnects(self):
+        client = Luxtronik("127.0.0.1", 8889, 1, DEFAULT_MAX_DATA_LENGTH)
+        client.connect = MagicMock()
+        client._disconnect = MagicMock()
+        client._read_data = MagicMock(side_effect=TimeoutError("no answer"))
+
+        with pytest.raises(TimeoutError):
+            client.read_identity()
+
+        assert client._read_data.call_args.kwargs["retries"] == IDENTITY_READ_RETRIES
+        client._disconnect.assert_called_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("socket_enabled")
+    async def test_probe_of_a_closed_port_is_false(self):
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            port = unused.getsockname()[1]
+
+        assert not await async_probe_host("127.0.0.1", port)
 
 
 # ===========================================================================
@@ -1322,3 +1462,214 @@ class TestLuxtronikReadData:
         with patch.object(client, "_read_data") as mock_read_data:
             client._read()
             assert mock_read_data.call_count == 3
+
+
+# ===========================================================================
+# Poll statistics
+# ===========================================================================
+
+
+class TestLuxtronikPollStats:
+    @patch("custom_components.luxtronik2.lux_helper.socket.socket")
+    def test_successful_block_records_time_bytes_and_fragments(self, mock_socket_class):
+        from custom_components.luxtronik2.lux_helper import (
+            LUXTRONIK_PARAMETERS_READ,
+            LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+        )
+
+        mock_sock = MagicMock()
+        mock_sock.fileno.return_value = -1
+        mock_socket_class.return_value = mock_sock
+        payload = struct.pack(">iiii", LUXTRONIK_PARAMETERS_READ, 2, 100, 200)
+        # Splits the first item across two recv() calls: one fragmented read.
+        mock_sock.recv.side_effect = _fragmented_recv(payload, [4, 4, 2, 2, 4])
+
+        client = Luxtronik("192.168.1.100", DEFAULT_PORT, 10.0, DEFAULT_MAX_DATA_LENGTH)
+        client._socket = mock_sock
+
+        client._read_data(
+            LUXTRONIK_PARAMETERS_READ,
+            LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+            MagicMock(),
+            "parameters",
+            retries=0,
+        )
+
+        stats = client.stats
+        read_time = stats.summary(LuxPollStat.PARAMETERS_READ_TIME)
+        nbytes = stats.summary(LuxPollStat.PARAMETERS_BYTES)
+        fragmented = stats.summary(LuxPollStat.FRAGMENTED_READS)
+        retries = stats.summary(LuxPollStat.READ_RETRIES)
+        assert read_time is not None and read_time["count"] == 1
+        assert nbytes is not None and nbytes["last"] == 16
+        assert fragmented is not None and fragmented["last"] == 1
+        assert retries is not None and retries["last"] == 0
+
+    @patch("custom_components.luxtronik2.lux_helper.time.sleep")
+    @patch("custom_components.luxtronik2.lux_helper.socket.socket")
+    def test_retries_are_recorded_and_bytes_are_the_successful_attempts(
+        self, mock_socket_class, mock_sleep
+    ):
+        from custom_components.luxtronik2.lux_helper import (
+            LUXTRONIK_PARAMETERS_READ,
+            LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+        )
+
+        mock_sock = MagicMock()
+        mock_sock.fileno.return_value = -1
+        mock_socket_class.return_value = mock_sock
+        responses = [
+            struct.pack(">i", LUXTRONIK_PARAMETERS_READ),
+            TimeoutError("timeout"),
+            struct.pack(">i", LUXTRONIK_PARAMETERS_READ),
+            struct.pack(">i", 1),
+            struct.pack(">i", 99),
+        ]
+        mock_sock.recv.side_effect = responses
+
+        client = Luxtronik("192.168.1.100", DEFAULT_PORT, 10.0, DEFAULT_MAX_DATA_LENGTH)
+        client._socket = mock_sock
+        # The failed attempt disconnects; hand the same mock socket back.
+        client.connect = MagicMock(
+            side_effect=lambda: setattr(client, "_socket", mock_sock)
+        )
+
+        client._read_data(
+            LUXTRONIK_PARAMETERS_READ,
+            LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+            MagicMock(),
+            "parameters",
+            retries=1,
+        )
+
+        retries = client.stats.summary(LuxPollStat.READ_RETRIES)
+        nbytes = client.stats.summary(LuxPollStat.PARAMETERS_BYTES)
+        assert retries is not None and retries["last"] == 1
+        assert nbytes is not None and nbytes["last"] == 12
+
+    @patch("custom_components.luxtronik2.lux_helper.socket.socket")
+    def test_unknown_label_still_records_the_shared_stats(self, mock_socket_class):
+        from custom_components.luxtronik2.lux_helper import (
+            LUXTRONIK_PARAMETERS_READ,
+            LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+        )
+
+        mock_sock = MagicMock()
+        mock_sock.fileno.return_value = -1
+        mock_socket_class.return_value = mock_sock
+        mock_sock.recv.side_effect = _fragmented_recv(
+            struct.pack(">iii", LUXTRONIK_PARAMETERS_READ, 1, 7), []
+        )
+
+        client = Luxtronik("192.168.1.100", DEFAULT_PORT, 10.0, DEFAULT_MAX_DATA_LENGTH)
+        client._socket = mock_sock
+        parser = MagicMock()
+
+        client._read_data(
+            LUXTRONIK_PARAMETERS_READ,
+            LUXTRONIK_SOCKET_READ_SIZE_INTEGER,
+            parser,
+            "other",
+            retries=0,
+        )
+
+        parser.parse.assert_called_once_with([7])
+        assert client.stats.summary(LuxPollStat.READ_RETRIES) is not None
+        assert client.stats.summary(LuxPollStat.PARAMETERS_READ_TIME) is None
+
+    @patch("custom_components.luxtronik2.lux_helper.socket.socket")
+    def test_write_records_ack_time(self, mock_socket_class):
+        mock_sock = MagicMock()
+        mock_sock.fileno.return_value = -1
+        mock_socket_class.return_value = mock_sock
+        mock_sock.recv.side_effect = [struct.pack(">i", 3002), struct.pack(">i", 1)]
+
+        client = Luxtronik("192.168.1.100", DEFAULT_PORT, 10.0, DEFAULT_MAX_DATA_LENGTH)
+        client._socket = mock_sock
+        client.parameters.queue = {1: 42}
+
+        client._write()
+
+        ack = client.stats.summary(LuxPollStat.WRITE_ACK_TIME)
+        assert ack is not None and ack["count"] == 1
+
+    @patch("custom_components.luxtronik2.lux_helper._is_socket_closed")
+    @patch("custom_components.luxtronik2.lux_helper.socket.socket")
+    def test_only_connections_after_the_first_count_as_reconnects(
+        self, mock_socket_class, mock_is_closed
+    ):
+        mock_socket_class.return_value = MagicMock()
+        mock_is_closed.return_value = True
+
+        client = Luxtronik("192.168.1.100", DEFAULT_PORT, 10.0, DEFAULT_MAX_DATA_LENGTH)
+        client.connect()
+        assert client.stats.summary(LuxPollStat.RECONNECTS) is None
+
+        client.connect()
+        client.connect()
+
+        reconnects = client.stats.summary(LuxPollStat.RECONNECTS)
+        assert reconnects is not None and reconnects["total"] == 2
+
+
+class TestRestoreRawBlocks:
+    def test_restore_parses_and_keeps_blocks(self):
+        client = Luxtronik("192.168.1.100", DEFAULT_PORT, 10.0, DEFAULT_MAX_DATA_LENGTH)
+        blocks = {"parameters": [0] * 5, "calculations": [0] * 3, "visibilities": [1]}
+
+        client.restore(blocks)
+
+        assert client.raw_blocks == blocks
+        assert client.visibilities.get(0).value == 1
+
+    def test_unknown_block_is_ignored(self):
+        client = Luxtronik("192.168.1.100", DEFAULT_PORT, 10.0, DEFAULT_MAX_DATA_LENGTH)
+        client.restore({"other": [1, 2]})
+        assert client.raw_blocks == {}
+
+
+class TestApplyChangedRegisters:
+    @staticmethod
+    def _items(count: int) -> dict[int, MagicMock]:
+        items = {}
+        for index in range(count):
+            item = MagicMock()
+            item.from_heatpump.side_effect = lambda raw: raw * 10
+            items[index] = item
+        return items
+
+    def test_only_changed_registers_are_decoded(self):
+        parser = MagicMock()
+        items = self._items(3)
+
+        apply_changed_registers(parser, items, [1, 2, 3], [1, 5, 3])
+
+        parser.parse.assert_not_called()
+        items[0].from_heatpump.assert_not_called()
+        items[1].from_heatpump.assert_called_once_with(5)
+        assert items[1].value == 50
+
+    @pytest.mark.parametrize(
+        ("previous", "data", "items"),
+        [
+            (None, [1, 2], 2),
+            ([1, 2], [1, 2, 3], 3),
+            ([1, 2], [1, 5], 1),
+        ],
+        ids=["first-poll", "length-changed", "unknown-register"],
+    )
+    def test_falls_back_to_a_full_parse(self, previous, data, items):
+        parser = MagicMock()
+
+        apply_changed_registers(parser, self._items(items), previous, data)
+
+        parser.parse.assert_called_once_with(data)
+
+    def test_change_in_full_parse_range_parses_the_block(self):
+        parser = MagicMock()
+
+        apply_changed_registers(
+            parser, self._items(4), [0, 0, 0, 0], [0, 0, 1, 0], range(2, 4)
+        )
+
+        parser.parse.assert_called_once()
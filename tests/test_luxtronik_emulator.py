@@ -0,0 +1,222 @@
+"""Tests for tools.luxtronik_emulator, driven by the real lux_helper client."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import json
+import socket
+import time
+
+import pytest
+
+from custom_components.luxtronik2.const import DEFAULT_MAX_DATA_LENGTH, LuxPollStat
+from custom_components.luxtronik2.lux_helper import (
+    LUXTRONIK_DISCOVERY_MAGIC_PACKET,
+    LUXTRONIK_DISCOVERY_RESPONSE_PREFIX,
+    LUXTRONIK_VISIBILITIES_READ,
+    Luxtronik,
+)
+from tools.luxtronik_emulator import (
+    EmulatorFaults,
+    LuxtronikEmulator,
+    ScenarioStep,
+    blocks_from_dump,
+    blocks_from_values,
+    load_scenario,
+)
+
+# The client and the emulator talk over real loopback sockets.
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+_FLOW_IN = 10  # ID_WEB_Temperatur_TVL
+_HEATING_MODE = 3  # ID_Ba_Hz_akt
+
+
+def _blocks() -> dict[str, list[int]]:
+    return blocks_from_values(
+        parameters={"ID_Ba_Hz_akt": "Party", "ID_Einst_WK_akt": 1.5},
+        calculations={"ID_WEB_SoftStand": "V3.90.1", "ID_WEB_Temperatur_TVL": 30.0},
+        visibilities={"ID_Visi_Heizung": 1},
+    )
+
+
+def _client(emulator: LuxtronikEmulator, socket_timeout: float = 2.0) -> Luxtronik:
+    host, port = emulator.address
+    return Luxtronik(host, port, socket_timeout, DEFAULT_MAX_DATA_LENGTH)
+
+
+def _write(client: Luxtronik, index: int, value: int) -> None:
+    client.parameters.queue = {index: value}
+    client.write()
+
+
+@pytest.fixture
+def emulator() -> Iterator[LuxtronikEmulator]:
+    with LuxtronikEmulator(_blocks()) as running:
+        yield running
+
+
+class TestBlocks:
+    def test_values_are_encoded_as_the_library_decodes_them(self):
+        client = Luxtronik("127.0.0.1", 0, 1, DEFAULT_MAX_DATA_LENGTH)
+        client.restore(_blocks())
+
+        assert client.calculations.get("ID_WEB_SoftStand").value == "V3.90.1"
+        assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 30.0
+        assert client.parameters.get("ID_Ba_Hz_akt").value == "Party"
+        assert client.parameters.get("ID_Einst_WK_akt").value == 1.5
+
+    def test_dump_round_trip(self):
+        """A diagnostics download serves the registers it was taken from."""
+        blocks = _blocks()
+        client = Luxtronik("127.0.0.1", 0, 1, DEFAULT_MAX_DATA_LENGTH)
+        client.restore(blocks)
+        dump = {
+            "data": {
+                "parameters": {
+                    f"{index:<4d} {item.name:<60}": f"{item}"
+                    for index, item in client.parameters.parameters.items()
+                },
+                "calculations": {
+                    f"{index:<4d} {item.name:<60}": f"{item}"
+                    for index, item in client.calculations.calculations.items()
+                },
+            }
+        }
+
+        rebuilt = blocks_from_dump(dump)
+
+        assert rebuilt["parameters"][_HEATING_MODE] == blocks["parameters"][3]
+        assert rebuilt["calculations"][81:90] == blocks["calculations"][81:90]
+        assert rebuilt["calculations"][_FLOW_IN] == 300
+
+    def test_scenario_file(self, tmp_path):
+        path = tmp_path / "scenario.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "values": {"calculations": {"ID_WEB_Temperatur_TVL": 35.0}},
+                    "steps": [
+                        {
+                            "after_polls": 2,
+                            "values": {"calculations": {"10": 40.0}},
+                        }
+                    ],
+                }
+            )
+        )
+
+        blocks, steps = load_scenario(path)
+
+        assert blocks["calculations"][_FLOW_IN] == 350
+        assert steps == [ScenarioStep(2, {"calculations": {_FLOW_IN: 40.0}})]
+
+
+class TestProtocol:
+    def test_read_returns_the_served_blocks(self, emulator: LuxtronikEmulator):
+        client = _client(emulator)
+        client.read()
+        client.disconnect()
+
+        for block in ("parameters", "calculations", "visibilities"):
+            assert client.raw_blocks[block] == emulator.raw(block)
+        assert client.calculations.get("ID_WEB_SoftStand").value == "V3.90.1"
+        assert emulator.polls == 1
+
+    def test_write_is_acknowledged_and_read_back(self, emulator: LuxtronikEmulator):
+        client = _client(emulator)
+        _write(client, _HEATING_MODE, 4)
+        client.read()
+        client.disconnect()
+
+        assert emulator.writes == [(_HEATING_MODE, 4)]
+        assert client.parameters.get("ID_Ba_Hz_akt").value == "Off"
+
+    def test_scenario_steps_land_between_polls(self):
+        steps = [ScenarioStep(2, {"calculations": {_FLOW_IN: 40.0}})]
+        with LuxtronikEmulator(_blocks(), steps=steps) as emulator:
+            client = _client(emulator)
+            client.read()
+            first = client.calculations.get("ID_WEB_Temperatur_TVL").value
+            client.read()
+            client.disconnect()
+
+        assert first == 30.0
+        assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 40.0
+
+    def test_discovery_reply_names_the_tcp_port(self):
+        with (
+            LuxtronikEmulator(_blocks(), discovery_ports=[0]) as emulator,
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock,
+        ):
+            sock.settimeout(2)
+            sock.sendto(
+                LUXTRONIK_DISCOVERY_MAGIC_PACKET.encode(),
+                emulator.discovery_addresses[0],
+            )
+            reply = sock.recv(1024).decode()
+
+        assert reply == f"{LUXTRONIK_DISCOVERY_RESPONSE_PREFIX}{emulator.address[1]};"
+
+
+class TestFaults:
+    def test_fragmented_responses_are_reassembled(self):
+        faults = EmulatorFaults(fragment_size=3, fragment_delay=0)
+        with LuxtronikEmulator(_blocks(), faults=faults) as emulator:
+            client = _client(emulator)
+            client.read()
+            client.disconnect()
+
+        assert client.raw_blocks["calculations"] == emulator.raw("calculations")
+        summary = client.stats.summary(LuxPollStat.FRAGMENTED_READS)
+        assert summary is not None
+        assert summary["total"]
+
+    def test_dropped_ack_times_out(self):
+        faults = EmulatorFaults(drop_ack_probability=1.0)
+        with LuxtronikEmulator(_blocks(), faults=faults) as emulator:
+            client = _client(emulator, socket_timeout=0.2)
+            with pytest.raises(TimeoutError, match="No write acknowledgement"):
+                _write(client, _HEATING_MODE, 4)
+
+        assert emulator.writes == [(_HEATING_MODE, 4)]
+
+    def test_settling_write_reads_back_stale(self):
+        """The stale read-back of #729."""
+        faults = EmulatorFaults(write_settle_delay=0.3)
+        with LuxtronikEmulator(_blocks(), faults=faults) as emulator:
+            client = _client(emulator)
+            _write(client, _HEATING_MODE, 4)
+            client.read()
+            stale = client.parameters.get("ID_Ba_Hz_akt").value
+            time.sleep(0.4)
+            client.read()
+            client.disconnect()
+
+        assert stale == "Party"
+        assert client.parameters.get("ID_Ba_Hz_akt").value == "Off"
+
+    def test_reboot_on_write_drops_the_connection(self):
+        """The write-triggered reboot of #761, recovered from by retrying."""
+        faults = EmulatorFaults(reboot_on_write=True, reboot_duration=0.5)
+        with LuxtronikEmulator(_blocks(), faults=faults) as emulator:
+            client = _client(emulator)
+            with pytest.raises(ConnectionError):
+                _write(client, _HEATING_MODE, 4)
+            client.read()
+            client.disconnect()
+
+        assert client.parameters.get("ID_Ba_Hz_akt").value == "Off"
+        summary = client.stats.summary(LuxPollStat.READ_RETRIES)
+        assert summary is not None
+        assert summary["total"]
+
+    def test_invalid_visibilities_length_is_rejected(self):
+        faults = EmulatorFaults(reported_lengths={LUXTRONIK_VISIBILITIES_READ: 0})
+        with LuxtronikEmulator(_blocks(), faults=faults) as emulator:
+            client = _client(emulator)
+            client.read()
+            client.disconnect()
+
+        assert "calculations" in client.raw_blocks
+        assert "visibilities" not in client.raw_blocks
@@ -0,0 +1,113 @@
+"""Tests for tools.luxtronik_proxy, between the emulator and real clients."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+import socket
+
+import pytest
+
+from custom_components.luxtronik2.const import DEFAULT_MAX_DATA_LENGTH
+from custom_components.luxtronik2.lux_helper import Luxtronik
+from tools.luxtronik_emulator import LuxtronikEmulator, blocks_from_values
+from tools.luxtronik_proxy import LuxtronikProxy
+
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+_HEATING_MODE = 3  # ID_Ba_Hz_akt
+
+
+def _blocks() -> dict[str, list[int]]:
+    return blocks_from_values(
+        parameters={"ID_Ba_Hz_akt": "Party"},
+        calculations={"ID_WEB_Temperatur_TVL": 30.0},
+        visibilities={"ID_Visi_Heizung": 1},
+    )
+
+
+def _client(address: tuple[str, int]) -> Luxtronik:
+    return Luxtronik(*address, 2.0, DEFAULT_MAX_DATA_LENGTH, safe=False)
+
+
+@pytest.fixture
+def emulator() -> Iterator[LuxtronikEmulator]:
+    with LuxtronikEmulator(_blocks(), calculations_status=7) as running:
+        yield running
+
+
+def _served_blocks(emulator: LuxtronikEmulator) -> dict[str, list[int]]:
+    return {
+        block: emulator.raw(block)
+        for block in ("parameters", "calculations", "visibilities")
+    }
+
+
+def _proxy(emulator: LuxtronikEmulator, max_age: float) -> LuxtronikProxy:
+    return LuxtronikProxy(_client(emulator.address), max_age=max_age)
+
+
+def test_clients_share_one_upstream_read(emulator):
+    with _proxy(emulator, max_age=60) as proxy:
+        clients = [_client(proxy.address) for _ in range(3)]
+        try:
+            for client in clients:
+                client.read()
+        finally:
+            for client in clients:
+                client.disconnect()
+
+    assert emulator.polls == 1
+    assert proxy.counters.upstream_reads == 3
+    assert proxy.counters.cache_hits == 6
+    for client in clients:
+        assert client.raw_blocks == _served_blocks(emulator)
+        assert client.calculations_status == 7
+
+
+def test_stale_blocks_are_read_again(emulator):
+    with _proxy(emulator, max_age=0) as proxy:
+        client = _client(proxy.address)
+        try:
+            client.read()
+            emulator.set_raw("calculations", 10, 425)
+            client.read()
+        finally:
+            client.disconnect()
+
+    assert emulator.polls == 2
+    assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 42.5
+
+
+def test_write_passes_through_and_refreshes_parameters(emulator):
+    with _proxy(emulator, max_age=60) as proxy:
+        client = _client(proxy.address)
+        try:
+            client.read()
+            client.parameters.queue = {_HEATING_MODE: 0}
+            client.write()
+            client.read()
+        finally:
+            client.disconnect()
+
+    assert emulator.writes == [(_HEATING_MODE, 0)]
+    assert proxy.counters.writes == 1
+    assert client.parameters.get("ID_Ba_Hz_akt").value == "Automatic"
+    # Only the parameters were dropped from the cache by the write.
+    assert emulator.polls == 2
+    assert proxy.counters.upstream_reads == 4
+
+
+def test_unreachable_controller_closes_the_client_connection():
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+    upstream = Luxtronik("127.0.0.1", port, 0.5, DEFAULT_MAX_DATA_LENGTH)
+
+    with (
+        LuxtronikProxy(upstream) as proxy,
+        socket.create_connection(proxy.address, timeout=5) as conn,
+    ):
+        conn.sendall((3004).to_bytes(4, "big") + bytes(4))
+        assert conn.recv(1) == b""
+
+    assert proxy.counters.failures == 1
@@ -0,0 +1,189 @@
+"""Tests for tools.modbus_client."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.luxtronik2.const import (
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    DEFAULT_MAX_DATA_LENGTH,
+)
+from custom_components.luxtronik2.lux_helper import CALCULATIONS_VERSION_RANGE
+from tools.luxtronik_emulator import LuxtronikEmulator, blocks_from_values
+from tools.modbus_client import (
+    MODBUS_CONFIRM_READS,
+    MODBUS_MAX_REGISTERS,
+    LuxModbusMap,
+    LuxtronikModbusClient,
+    ModbusExceptionError,
+    ModbusFunction,
+    ModbusRegister,
+)
+
+HOLDING = ModbusFunction.READ_HOLDING_REGISTERS
+INPUT = ModbusFunction.READ_INPUT_REGISTERS
+
+
+def _blocks() -> dict[str, list[int]]:
+    return blocks_from_values(
+        {"ID_Einst_WK_akt": 21.5},
+        {"ID_WEB_Temperatur_TVL": 35.2, "ID_WEB_SoftStand": "V3.90.1"},
+        {"ID_Visi_Heizung": 1},
+    )
+
+
+class TestLuxModbusMap:
+    def test_mirror_lays_registers_out_by_index(self):
+        register_map = LuxModbusMap.mirror()
+
+        assert register_map.register(CONF_PARAMETERS, 1) == ModbusRegister(HOLDING, 2)
+        assert register_map.register(CONF_CALCULATIONS, 10) == ModbusRegister(INPUT, 20)
+        assert register_map.locate(INPUT, 20) == (CONF_CALCULATIONS, 10)
+        assert register_map.locate(INPUT, 21) is None
+        assert register_map.lengths[CONF_VISIBILITIES] > 0
+
+    def test_neighbours_share_a_request(self):
+        ranges = LuxModbusMap.mirror().ranges(
+            [(CONF_CALCULATIONS, 10), (CONF_CALCULATIONS, 11), (CONF_CALCULATIONS, 13)]
+        )
+
+        assert [(r.function, r.start, r.count) for r in ranges] == [(INPUT, 20, 8)]
+        assert ranges[0].members == (
+            (CONF_CALCULATIONS, 10, 0),
+            (CONF_CALCULATIONS, 11, 2),
+            (CONF_CALCULATIONS, 13, 6),
+        )
+
+    def test_far_apart_tables_and_long_runs_are_split(self):
+        register_map = LuxModbusMap.mirror()
+
+        ranges = register_map.ranges(
+            [(CONF_CALCULATIONS, 10), (CONF_CALCULATIONS, 100), (CONF_PARAMETERS, 10)]
+        )
+        run = register_map.ranges((CONF_CALCULATIONS, index) for index in range(100))
+
+        assert [(r.function, r.start) for r in ranges] == [
+            (HOLDING, 20),
+            (INPUT, 20),
+            (INPUT, 200),
+        ]
+        assert all(r.count <= MODBUS_MAX_REGISTERS for r in run)
+        assert sum(len(r.members) for r in run) == 100
+
+    def test_unmapped_keys_are_skipped(self):
+        register_map = LuxModbusMap({(CONF_PARAMETERS, 1): ModbusRegister(HOLDING, 7)})
+
+        ranges = register_map.ranges([(CONF_PARAMETERS, 1), (CONF_PARAMETERS, 2)])
+
+        assert [(r.start, r.count) for r in ranges] == [(7, 2)]
+
+
+class TestDemand:
+    def test_get_records_the_register(self):
+        client = LuxtronikModbusClient("127.0.0.1", 502, 1, DEFAULT_MAX_DATA_LENGTH)
+
+        client.calculations.get("ID_WEB_Temperatur_TVL")
+        client.parameters.get("ID_Einst_WK_akt")
+
+        assert client.demand.keys == {(CONF_CALCULATIONS, 10), (CONF_PARAMETERS, 1)}
+
+    def test_version_string_needs_all_its_registers(self):
+        client = LuxtronikModbusClient("127.0.0.1", 502, 1, DEFAULT_MAX_DATA_LENGTH)
+
+        client.calculations.get("ID_WEB_SoftStand")
+
+        assert client.demand.keys == {
+            (CONF_CALCULATIONS, index) for index in CALCULATIONS_VERSION_RANGE
+        }
+
+
+@pytest.mark.usefixtures("socket_enabled")
+class TestAgainstEmulator:
+    def test_first_poll_reads_everything_then_only_what_is_read(self):
+        with LuxtronikEmulator(_blocks(), modbus_port=0) as emulator:
+            client = LuxtronikModbusClient(
+                *emulator.modbus_address, 2.0, DEFAULT_MAX_DATA_LENGTH
+            )
+            try:
+                client.read()
+                full_reads = len(emulator.modbus_reads)
+                assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 35.2
+
+                emulator.set_raw(CONF_CALCULATIONS, 10, 402)
+                emulator.modbus_reads.clear()
+                client.read()
+            finally:
+                client.disconnect()
+
+        assert full_reads > 10
+        assert emulator.modbus_reads == [(INPUT, 20, 2)]
+        assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 40.2
+        assert client.calculations.get("ID_WEB_SoftStand").value == "V3.90.1"
+        assert client.visibilities.get("ID_Visi_Heizung").value == 1
+        assert client.raw_blocks[CONF_CALCULATIONS][10] == 402
+        assert client.last_requests == 1
+
+    def test_write_is_confirmed_by_reading_back_that_register(self):
+        with LuxtronikEmulator(_blocks(), modbus_port=0) as emulator:
+            client = LuxtronikModbusClient(
+                *emulator.modbus_address, 2.0, DEFAULT_MAX_DATA_LENGTH, safe=False
+            )
+            try:
+                client.read()
+                client.calculations.get("ID_WEB_Temperatur_TVL")
+                client.parameters.set("ID_Einst_WK_akt", 22.0)
+                client.write()
+                emulator.modbus_reads.clear()
+                client.read()
+                confirm_reads = list(emulator.modbus_reads)
+                emulator.modbus_reads.clear()
+                client.read()
+            finally:
+                client.disconnect()
+
+        assert emulator.writes == [(1, 220)]
+        assert client.parameters.queue == {}
+        assert confirm_reads == [(HOLDING, 2, 2)]
+        assert client.parameters.get("ID_Einst_WK_akt").value == 22.0
+        # Confirmed: the next poll is a routine one again.
+        assert emulator.modbus_reads[0][0] == INPUT
+
+    def test_unconfirmed_write_stops_being_read_back(self):
+        with LuxtronikEmulator(_blocks(), modbus_port=0) as emulator:
+            client = LuxtronikModbusClient(
+                *emulator.modbus_address, 2.0, DEFAULT_MAX_DATA_LENGTH, safe=False
+            )
+            try:
+                client.read()
+                client.calculations.get("ID_WEB_Temperatur_TVL")
+                # The controller clamps the value: it never reads back.
+                client.parameters.queue = {1: 999}
+                client.write()
+                for _ in range(MODBUS_CONFIRM_READS):
+                    emulator.set_raw(CONF_PARAMETERS, 1, 215)
+                    client.read()
+                emulator.modbus_reads.clear()
+                client.read()
+            finally:
+                client.disconnect()
+
+        assert emulator.modbus_reads == [(INPUT, 20, 2)]
+
+    def test_exception_response_raises_and_disconnects(self):
+        register_map = LuxModbusMap(
+            {(CONF_CALCULATIONS, 10): ModbusRegister(INPUT, 9000)}
+        )
+        with LuxtronikEmulator(_blocks(), modbus_port=0) as emulator:
+            client = LuxtronikModbusClient(
+                *emulator.modbus_address,
+                2.0,
+                DEFAULT_MAX_DATA_LENGTH,
+                register_map=register_map,
+            )
+            with pytest.raises(ModbusExceptionError) as err:
+                client.read()
+
+        assert err.value.code == 2
+        assert client._socket is None
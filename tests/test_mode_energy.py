@@ -0,0 +1,147 @@
+"""Tests for custom_components.luxtronik2.mode_energy."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.luxtronik2.const import (
+    DOMAIN,
+    MODE_ENERGY_SAVE_DELAY,
+    MODE_TIME_MAX_GAP,
+    LuxOperationMode,
+)
+from custom_components.luxtronik2.coordinator import LuxtronikCoordinator
+from custom_components.luxtronik2.external_sensor import ExternalSensorTracker
+from custom_components.luxtronik2.mode_energy import LuxtronikModeEnergy
+from custom_components.luxtronik2.model import LuxtronikCoordinatorData
+
+_KEY = f"{DOMAIN}.mode_energy.entry-id"
+_T0 = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+
+HEATING = LuxOperationMode.heating
+DHW = LuxOperationMode.domestic_water
+
+
+class TestLuxtronikModeEnergy:
+    def test_trapezoid_goes_to_the_status_at_its_start(self, hass: HomeAssistant):
+        energy = LuxtronikModeEnergy(hass, "entry-id")
+
+        energy.sample("heat", 2000, HEATING, _T0)
+        energy.sample("heat", 4000, DHW, _T0 + timedelta(minutes=6))
+        energy.sample("heat", 4000, DHW, _T0 + timedelta(minutes=12))
+
+        assert energy.kwh("heat", HEATING) == pytest.approx(0.3)
+        assert energy.kwh("heat", DHW) == pytest.approx(0.4)
+        assert energy.kwh("electrical", HEATING) == 0
+
+    def test_gaps_missing_values_and_late_samples_are_skipped(
+        self, hass: HomeAssistant
+    ):
+        energy = LuxtronikModeEnergy(hass, "entry-id")
+        after_gap = _T0 + MODE_TIME_MAX_GAP + timedelta(seconds=1)
+
+        energy.sample("electrical", 1000, HEATING, _T0)
+        energy.sample("electrical", 1000, HEATING, after_gap)
+        energy.sample("electrical", 1000, HEATING, after_gap - timedelta(seconds=30))
+        energy.sample("electrical", None, HEATING, after_gap + timedelta(minutes=1))
+        energy.sample("electrical", 1000, HEATING, after_gap + timedelta(minutes=2))
+        energy.sample("electrical", 1000, "unknown", after_gap + timedelta(minutes=3))
+        energy.sample("electrical", 1000, HEATING, after_gap + timedelta(minutes=4))
+
+        assert energy.kwh("electrical", HEATING) == pytest.approx(1 / 60)
+
+    @pytest.mark.asyncio
+    async def test_totals_survive_a_restart(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        energy = LuxtronikModeEnergy(hass, "entry-id")
+        energy.sample("heat", 6000, HEATING, _T0)
+        energy.sample("heat", 6000, HEATING, _T0 + timedelta(minutes=10))
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=MODE_ENERGY_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        restarted = LuxtronikModeEnergy(hass, "entry-id")
+        await restarted.async_load()
+
+        assert hass_storage[_KEY]["data"]["totals"]["heat"]["heating"] == 1.0
+        assert restarted.kwh("heat", HEATING) == 1.0
+
+
+class TestCoordinatorFeed:
+    def _coordinator(self, hass: HomeAssistant) -> LuxtronikCoordinator:
+        coord = object.__new__(LuxtronikCoordinator)
+        coord.mode_time = None
+        coord.mode_energy = LuxtronikModeEnergy(hass, "entry-id")
+        coord.cycles = None
+        coord._external_power = None
+        coord.data = MagicMock()
+        return coord
+
+    def _data(self, at: datetime) -> LuxtronikCoordinatorData:
+        return LuxtronikCoordinatorData(
+            parameters=MagicMock(),
+            calculations=MagicMock(),
+            visibilities=MagicMock(),
+            polled_at=at,
+        )
+
+    def test_external_meter_events_are_integrated_between_polls(
+        self, hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+    ):
+        values = {
+            "calculations.ID_WEB_WP_BZ_akt": HEATING,
+            "calculations.Heat_Output": 3000,
+            "calculations.Unknown_Calculation_268": 9999,
+        }
+        monkeypatch.setattr(
+            "custom_components.luxtronik2.coordinator.get_sensor_data",
+            lambda data, key: values[str(key)],
+        )
+        coord = self._coordinator(hass)
+        tracker = ExternalSensorTracker("sensor.meter", MagicMock())
+        coord._external_power = tracker
+
+        tracker.value = 1000.0
+        coord._record_mode_statistics(self._data(_T0))
+        tracker.value, tracker.sampled_at = 2000.0, _T0 + timedelta(minutes=3)
+        coord._handle_external_power()
+        coord._record_mode_statistics(self._data(_T0 + timedelta(minutes=6)))
+
+        assert coord.mode_energy is not None
+        assert coord.mode_energy.kwh("heat", HEATING) == pytest.approx(0.3)
+        # 1.5 kW for 3 minutes, then 2 kW for 3 minutes; the register's
+        # 9999 W is not used while a meter is configured.
+        assert coord.mode_energy.kwh("electrical", HEATING) == pytest.approx(0.175)
+
+    def test_missing_power_calculation_is_not_read(
+        self, hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+    ):
+        values = {
+            "calculations.ID_WEB_WP_BZ_akt": HEATING,
+            "calculations.Heat_Output": 3000,
+        }
+        monkeypatch.setattr(
+            "custom_components.luxtronik2.coordinator.get_sensor_data",
+            lambda data, key: values[str(key)],
+        )
+        monkeypatch.setattr(
+            "custom_components.luxtronik2.coordinator.key_exists",
+            lambda data, key: str(key) in values,
+        )
+        coord = self._coordinator(hass)
+
+        coord._record_mode_statistics(self._data(_T0))
+        coord._record_mode_statistics(self._data(_T0 + timedelta(minutes=6)))
+
+        assert coord.mode_energy is not None
+        assert coord.mode_energy.kwh("heat", HEATING) == pytest.approx(0.3)
+        assert coord.mode_energy.kwh("electrical", HEATING) == pytest.approx(0.0)
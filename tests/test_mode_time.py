@@ -0,0 +1,167 @@
+"""Tests for custom_components.luxtronik2.mode_time."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.luxtronik2.const import (
+    CONF_HA_SENSOR_PREFIX,
+    DEFAULT_PORT,
+    DOMAIN,
+    MODE_TIME_DAYS,
+    MODE_TIME_MAX_GAP,
+    MODE_TIME_SAVE_DELAY,
+    MODE_TIME_STORAGE_VERSION,
+    DeviceKey,
+    LuxOperationMode,
+    SensorAttrKey as SA,
+    SensorKey,
+)
+from custom_components.luxtronik2.mode_time import LuxtronikModeTime
+from custom_components.luxtronik2.sensor import LuxtronikModeTimeSensorEntity
+from custom_components.luxtronik2.sensor_entities_predefined import SENSORS_MODE_TIME
+
+_KEY = f"{DOMAIN}.mode_time.entry-id"
+
+
+@pytest.fixture
+def noon(hass: HomeAssistant, freezer: FrozenDateTimeFactory):
+    """Today at local noon, with the clock frozen there."""
+    at = dt_util.start_of_local_day() + timedelta(hours=12)
+    freezer.move_to(at)
+    return at
+
+
+class TestLuxtronikModeTime:
+    def test_interval_counts_towards_the_previous_status(self, hass, noon):
+        mode_time = LuxtronikModeTime(hass, "entry-id")
+
+        mode_time.observe(LuxOperationMode.heating, noon - timedelta(minutes=2))
+        mode_time.observe(LuxOperationMode.domestic_water, noon - timedelta(minutes=1))
+        mode_time.observe(LuxOperationMode.domestic_water, noon)
+
+        assert mode_time.seconds(LuxOperationMode.heating) == 60
+        assert mode_time.seconds(LuxOperationMode.domestic_water) == 60
+
+    def test_interval_is_split_at_midnight(self, hass, noon):
+        mode_time = LuxtronikModeTime(hass, "entry-id")
+        midnight = dt_util.start_of_local_day()
+
+        mode_time.observe(LuxOperationMode.defrost, midnight - timedelta(minutes=4))
+        mode_time.observe(LuxOperationMode.defrost, midnight + timedelta(minutes=6))
+
+        assert mode_time.seconds(LuxOperationMode.defrost, days_ago=1) == 240
+        assert mode_time.seconds(LuxOperationMode.defrost) == 360
+        assert mode_time.seconds_last_days(LuxOperationMode.defrost, 7) == 600
+
+    def test_long_gap_and_unknown_status_are_not_counted(self, hass, noon):
+        mode_time = LuxtronikModeTime(hass, "entry-id")
+        gap = MODE_TIME_MAX_GAP + timedelta(minutes=1)
+        start = noon - gap - timedelta(minutes=2)
+
+        mode_time.observe(LuxOperationMode.heating, start)
+        mode_time.observe(LuxOperationMode.heating, start + gap)
+        mode_time.observe(None, start + gap + timedelta(minutes=1))
+        mode_time.observe(LuxOperationMode.heating, noon)
+
+        assert mode_time.seconds(LuxOperationMode.heating) == 60
+
+    def test_old_days_are_dropped(self, hass, noon):
+        mode_time = LuxtronikModeTime(hass, "entry-id")
+        old = noon - timedelta(days=MODE_TIME_DAYS)
+
+        mode_time.observe(LuxOperationMode.heating, old)
+        mode_time.observe(LuxOperationMode.heating, old + timedelta(minutes=1))
+        mode_time.observe(LuxOperationMode.heating, noon)
+
+        assert mode_time.days == {}
+
+    @pytest.mark.asyncio
+    async def test_totals_survive_a_restart(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any], noon
+    ):
+        mode_time = LuxtronikModeTime(hass, "entry-id")
+        mode_time.observe(LuxOperationMode.cooling, noon - timedelta(minutes=1))
+        mode_time.observe(LuxOperationMode.cooling, noon)
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=MODE_TIME_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        restarted = LuxtronikModeTime(hass, "entry-id")
+        await restarted.async_load()
+        restarted.observe(LuxOperationMode.heating, noon + timedelta(minutes=1))
+
+        assert hass_storage[_KEY]["version"] == MODE_TIME_STORAGE_VERSION
+        assert restarted.seconds(LuxOperationMode.cooling) == 120
+
+    @pytest.mark.asyncio
+    async def test_unreadable_store_is_ignored(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        hass_storage[_KEY] = {
+            "version": MODE_TIME_STORAGE_VERSION,
+            "key": _KEY,
+            "data": {"days": ["not", "a", "dict"]},
+        }
+        mode_time = LuxtronikModeTime(hass, "entry-id")
+
+        await mode_time.async_load()
+
+        assert (mode_time.days, mode_time.status) == ({}, None)
+
+
+class TestModeTimeSensor:
+    def _entity(self, mode_time):
+        description = next(
+            d for d in SENSORS_MODE_TIME if d.key == SensorKey.MODE_TIME_HEATING
+        )
+        entry = MagicMock()
+        entry.data = {
+            CONF_HOST: "192.168.1.100",
+            CONF_PORT: DEFAULT_PORT,
+            CONF_HA_SENSOR_PREFIX: DOMAIN,
+        }
+        coord = MagicMock()
+        coord.mode_time = mode_time
+        coord.get_device.return_value = MagicMock()
+        coord.firmware_series = 3
+        entity = LuxtronikModeTimeSensorEntity(
+            MagicMock(), entry, coord, description, DeviceKey.heatpump
+        )
+        entity.hass = MagicMock()
+        entity.async_write_ha_state = MagicMock()
+        return entity
+
+    def test_reports_hours_today_with_yesterday_and_week(self, hass, noon):
+        mode_time = LuxtronikModeTime(hass, "entry-id")
+        yesterday = noon - timedelta(days=1)
+        mode_time.observe(LuxOperationMode.heating, yesterday)
+        mode_time.observe(LuxOperationMode.heating, yesterday + timedelta(minutes=12))
+        mode_time.observe(LuxOperationMode.heating, noon - timedelta(minutes=15))
+        mode_time.observe(LuxOperationMode.no_request, noon)
+        entity = self._entity(mode_time)
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value == 0.25
+        attrs = entity._attr_extra_state_attributes
+        assert attrs[SA.MODE_TIME_YESTERDAY] == 0.2
+        assert attrs[SA.MODE_TIME_LAST_7_DAYS] == 0.45
+        entity.async_write_ha_state.assert_called_once()
+
+    def test_unknown_without_totals(self):
+        entity = self._entity(None)
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value is None
@@ -0,0 +1,221 @@
+"""Tests for custom_components.luxtronik2.poll_stats."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_TIMEOUT
+
+from custom_components.luxtronik2.const import (
+    CONF_HA_SENSOR_PREFIX,
+    CONF_MAX_DATA_LENGTH,
+    DEFAULT_MAX_DATA_LENGTH,
+    DEFAULT_PORT,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    DeviceKey,
+    LuxPollStat,
+    SensorAttrKey as SA,
+)
+from custom_components.luxtronik2.poll_stats import (
+    LuxtronikPollStats,
+    RollingHistogram,
+)
+from custom_components.luxtronik2.sensor import LuxtronikPollStatSensorEntity
+from custom_components.luxtronik2.sensor_entities_predefined import (
+    SENSORS_POLL_STATS,
+)
+
+# ===========================================================================
+# RollingHistogram
+# ===========================================================================
+
+
+class TestRollingHistogram:
+    def test_empty_summary_has_no_figures(self):
+        summary = RollingHistogram(window=5).summary()
+
+        assert summary["count"] == 0
+        assert summary["window"] == 0
+        assert summary["last"] is None
+        assert summary["p95"] is None
+        assert summary["mean"] is None
+
+    def test_summary_of_window(self):
+        histogram = RollingHistogram(window=10)
+        for value in (4.0, 1.0, 3.0, 2.0):
+            histogram.add(value)
+
+        summary = histogram.summary()
+
+        assert summary["last"] == 2.0
+        assert summary["min"] == 1.0
+        assert summary["max"] == 4.0
+        assert summary["mean"] == 2.5
+        assert summary["p50"] == 2.0
+        assert summary["p95"] == 4.0
+
+    def test_window_rolls_over_but_totals_do_not(self):
+        """Lifetime totals are what the event-count sensors report, so they
+        must keep counting after the oldest samples have left the window."""
+        histogram = RollingHistogram(window=3)
+        for value in range(1, 6):
+            histogram.add(value)
+
+        summary = histogram.summary()
+
+        assert histogram.samples == [3, 4, 5]
+        assert summary["window"] == 3
+        assert summary["count"] == 5
+        assert summary["total"] == 15
+
+    def test_p95_is_the_slow_tail(self):
+        histogram = RollingHistogram(window=100)
+        for _ in range(95):
+            histogram.add(0.1)
+        for _ in range(5):
+            histogram.add(2.0)
+
+        assert histogram.summary()["p95"] == 0.1
+        histogram.add(2.0)
+        assert histogram.summary()["p95"] == 2.0
+
+
+# ===========================================================================
+# LuxtronikPollStats
+# ===========================================================================
+
+
+class TestLuxtronikPollStats:
+    def test_unrecorded_stat_has_no_summary(self):
+        assert LuxtronikPollStats().summary(LuxPollStat.WRITE_ACK_TIME) is None
+
+    def test_record_and_summary(self):
+        stats = LuxtronikPollStats()
+        stats.record(LuxPollStat.LOCK_WAIT, 0.5)
+
+        summary = stats.summary(LuxPollStat.LOCK_WAIT)
+
+        assert summary is not None
+        assert summary["last"] == 0.5
+
+    def test_as_dict_includes_samples(self):
+        stats = LuxtronikPollStats(window=2)
+        stats.record(LuxPollStat.RECONNECTS, 1)
+        stats.record(LuxPollStat.RECONNECTS, 1)
+        stats.record(LuxPollStat.RECONNECTS, 1)
+
+        dump = stats.as_dict()
+
+        assert list(dump) == ["reconnects"]
+        assert dump["reconnects"]["samples"] == [1, 1]
+        assert dump["reconnects"]["total"] == 3
+
+    def test_executor_delay_is_start_minus_submit(self):
+        stats = LuxtronikPollStats()
+        with patch(
+            "custom_components.luxtronik2.poll_stats.time.monotonic",
+            return_value=10.25,
+        ):
+            stats.mark_call_started()
+
+        stats.record_executor_delay(10.0)
+
+        summary = stats.summary(LuxPollStat.EXECUTOR_DELAY)
+        assert summary is not None
+        assert summary["last"] == 0.25
+
+    def test_executor_delay_ignores_a_stale_start(self):
+        """A call that never reached the client leaves the previous call's
+        start stamp behind; that must not be recorded as a negative delay."""
+        stats = LuxtronikPollStats()
+        with patch(
+            "custom_components.luxtronik2.poll_stats.time.monotonic",
+            return_value=5.0,
+        ):
+            stats.mark_call_started()
+
+        stats.record_executor_delay(10.0)
+
+        assert stats.summary(LuxPollStat.EXECUTOR_DELAY) is None
+
+    def test_executor_delay_without_any_start_is_ignored(self):
+        stats = LuxtronikPollStats()
+        stats.record_executor_delay(10.0)
+        assert stats.summary(LuxPollStat.EXECUTOR_DELAY) is None
+
+
+# ===========================================================================
+# LuxtronikPollStatSensorEntity
+# ===========================================================================
+
+
+def _make_poll_stat_sensor(key, stats: LuxtronikPollStats):
+    description = next(d for d in SENSORS_POLL_STATS if d.key == key)
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.1.100",
+        CONF_PORT: DEFAULT_PORT,
+        CONF_TIMEOUT: DEFAULT_TIMEOUT,
+        CONF_MAX_DATA_LENGTH: DEFAULT_MAX_DATA_LENGTH,
+        CONF_HA_SENSOR_PREFIX: DOMAIN,
+    }
+    coord = MagicMock()
+    coord.poll_stats = stats
+    coord.entity_visible.return_value = True
+    coord.get_device.return_value = MagicMock()
+    coord.firmware_series = 3
+    entity = LuxtronikPollStatSensorEntity(
+        MagicMock(), entry, coord, description, DeviceKey.heatpump
+    )
+    entity.hass = MagicMock()
+    entity.async_write_ha_state = MagicMock()
+    return entity
+
+
+class TestPollStatSensor:
+    def test_all_disabled_by_default_and_diagnostic(self):
+        for description in SENSORS_POLL_STATS:
+            assert description.entity_registry_enabled_default is False
+            assert description.entity_category == "diagnostic"
+
+    def test_timing_reports_p95_in_milliseconds(self):
+        stats = LuxtronikPollStats()
+        for value in (0.010, 0.020, 0.150):
+            stats.record(LuxPollStat.PARAMETERS_READ_TIME, value)
+        entity = _make_poll_stat_sensor("poll_parameters_read_time", stats)
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value == 150.0
+        attrs = entity._attr_extra_state_attributes
+        assert attrs[SA.STAT_SAMPLES] == 3
+        assert attrs[SA.STAT_P50] == 20.0
+        assert attrs[SA.STAT_MAX] == 150.0
+        entity.async_write_ha_state.assert_called_once()
+
+    def test_counter_reports_lifetime_total(self):
+        stats = LuxtronikPollStats()
+        for value in (0, 3, 2):
+            stats.record(LuxPollStat.FRAGMENTED_READS, value)
+        entity = _make_poll_stat_sensor("poll_fragmented_reads", stats)
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value == 5
+
+    def test_counter_never_recorded_is_zero(self):
+        """No reconnect yet is a fact, not an unknown."""
+        entity = _make_poll_stat_sensor("poll_reconnects", LuxtronikPollStats())
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value == 0
+
+    def test_timing_never_recorded_is_unknown(self):
+        entity = _make_poll_stat_sensor("poll_write_ack_time", LuxtronikPollStats())
+
+        entity._handle_coordinator_update()
+
+        assert entity._attr_native_value is None
+        assert SA.STAT_P95 not in entity._attr_extra_state_attributes
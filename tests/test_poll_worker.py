@@ -0,0 +1,114 @@
+"""Tests for custom_components.luxtronik2.poll_worker."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.luxtronik2.const import (
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    DEFAULT_MAX_DATA_LENGTH,
+    LuxPollStat,
+)
+from custom_components.luxtronik2.lux_helper import LUXTRONIK_CALCULATIONS_READ
+from custom_components.luxtronik2.poll_worker import (
+    LuxtronikWorkerClient,
+    SnapshotBuffer,
+)
+from tools.luxtronik_emulator import LuxtronikEmulator, blocks_from_values
+
+
+class TestSnapshotBuffer:
+    def test_publish_and_load_round_trip(self):
+        buffer = SnapshotBuffer.create(8)
+        reader = SnapshotBuffer.attach(buffer.name, 8)
+        try:
+            version = buffer.publish(
+                {
+                    CONF_PARAMETERS: [1, -2, 3],
+                    CONF_CALCULATIONS: [4, 5],
+                    CONF_VISIBILITIES: [],
+                },
+                status=7,
+            )
+            loaded = reader.load()
+        finally:
+            reader.close()
+            buffer.close()
+
+        assert loaded == (
+            version,
+            7,
+            {
+                CONF_PARAMETERS: [1, -2, 3],
+                CONF_CALCULATIONS: [4, 5],
+                CONF_VISIBILITIES: [],
+            },
+        )
+        assert version % 2 == 0
+
+    def test_block_larger_than_capacity_is_rejected(self):
+        buffer = SnapshotBuffer.create(2)
+        try:
+            with pytest.raises(ValueError, match="capacity"):
+                buffer.publish({CONF_PARAMETERS: [1, 2, 3]}, status=0)
+        finally:
+            buffer.close()
+
+
+@pytest.mark.usefixtures("socket_enabled")
+def test_worker_reads_and_writes_through_shared_memory():
+    blocks = blocks_from_values(
+        {"ID_Einst_WK_akt": 21.5},
+        {"ID_WEB_Temperatur_TVL": 35.2, "ID_WEB_SoftStand": "V3.90.1"},
+        {"ID_Visi_Heizung": 1},
+    )
+    with LuxtronikEmulator(blocks) as emulator:
+        client = LuxtronikWorkerClient(
+            *emulator.address, 5.0, DEFAULT_MAX_DATA_LENGTH, safe=False
+        )
+        try:
+            client.read()
+            first_version = client.snapshot_version
+            emulator.set_raw(CONF_CALCULATIONS, 10, 402)
+            client.read()
+            client.parameters.queue = {1: 220}
+            client.write()
+            process = client._process
+        finally:
+            client.disconnect()
+
+        assert emulator.writes == [(1, 220)]
+
+    assert client.snapshot_version > first_version
+    assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 40.2
+    assert client.calculations.get("ID_WEB_SoftStand").value == "V3.90.1"
+    assert client.parameters.get("ID_Einst_WK_akt").value == 21.5
+    assert client.visibilities.get("ID_Visi_Heizung").value == 1
+    assert client.raw_blocks[CONF_CALCULATIONS][10] == 402
+    assert client.parameters.queue == {}
+    assert client.stats.summary(LuxPollStat.CALCULATIONS_READ_TIME)["count"] == 2
+    assert process is not None
+    assert not process.is_alive()
+    assert client._process is None
+
+
+@pytest.mark.usefixtures("socket_enabled")
+def test_worker_reads_a_single_block():
+    blocks = blocks_from_values(
+        {"ID_Einst_WK_akt": 21.5}, {"ID_WEB_Temperatur_TVL": 35.2}, {}
+    )
+    with LuxtronikEmulator(blocks) as emulator:
+        client = LuxtronikWorkerClient(
+            *emulator.address, 5.0, DEFAULT_MAX_DATA_LENGTH, safe=False
+        )
+        try:
+            values = client.read_block(LUXTRONIK_CALCULATIONS_READ)
+        finally:
+            client.disconnect()
+
+    assert values is not None
+    assert values[10] == 352
+    assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 35.2
+    assert CONF_PARAMETERS not in client.raw_blocks
@@ -0,0 +1,165 @@
+"""Tests for custom_components.luxtronik2.register_changes."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, call
+
+import pytest
+
+from custom_components.luxtronik2.const import (
+    CHANGE_LOG_MAX_BYTES,
+    EVENT_REGISTER_CHANGED,
+)
+from custom_components.luxtronik2.register_changes import (
+    CHANGE_LOG_MAGIC,
+    ChangeLogWriter,
+    LuxtronikRegisterChanges,
+    RegisterChange,
+    diff_block,
+    parse_index_ranges,
+    read_change_log,
+)
+
+_AT = datetime(2026, 1, 1, 10, tzinfo=UTC)
+
+
+def _blocks(calculations, parameters=(0, 0), visibilities=(0,)):
+    return {
+        "parameters": list(parameters),
+        "calculations": list(calculations),
+        "visibilities": list(visibilities),
+    }
+
+
+def _changes(event_ranges=None, writer=None):
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock()
+    hass.async_create_task.side_effect = lambda target, *args, **kwargs: (
+        asyncio.ensure_future(target)
+    )
+    return LuxtronikRegisterChanges(hass, "entry-id", writer, event_ranges or {})
+
+
+class TestParseIndexRanges:
+    def test_groups_single_indices_and_ranges(self):
+        ranges = parse_index_ranges(
+            "calculations 260-300, Parameters:1158; calculations 10"
+        )
+
+        assert ranges == {
+            "calculations": ((260, 300), (10, 10)),
+            "parameters": ((1158, 1158),),
+        }
+
+    def test_empty_is_no_ranges(self):
+        assert parse_index_ranges(None) == {}
+        assert parse_index_ranges(" , ") == {}
+
+    @pytest.mark.parametrize(
+        "text", ["registers 5", "calculations", "calculations 9-3", "calc 1-2"]
+    )
+    def test_invalid_ranges_are_rejected(self, text):
+        with pytest.raises(ValueError):
+            parse_index_ranges(text)
+
+
+class TestChangeLogFile:
+    def test_round_trip_and_rotation(self, tmp_path: Path):
+        path = tmp_path / "changes.lxc"
+        writer = ChangeLogWriter(path, max_bytes=40)
+        writer.record_changes([RegisterChange(1.0, "calculations", 2000, -1, 7)])
+        writer.record_changes([RegisterChange(2.0, "visibilities", 3, 0, 1)])
+        writer.record_changes([RegisterChange(3.0, "parameters", 1158, 5, 6)])
+        writer.close()
+
+        assert ChangeLogWriter(path)._max_bytes == CHANGE_LOG_MAX_BYTES
+        rotated = path.with_name(f"{path.name}.1")
+        assert rotated.read_bytes().startswith(CHANGE_LOG_MAGIC)
+        assert list(read_change_log(rotated)) == [
+            RegisterChange(1.0, "calculations", 2000, -1, 7),
+            RegisterChange(2.0, "visibilities", 3, 0, 1),
+        ]
+        assert list(read_change_log(path)) == [
+            RegisterChange(3.0, "parameters", 1158, 5, 6)
+        ]
+
+    def test_other_files_are_rejected(self, tmp_path: Path):
+        path = tmp_path / "session.lxs"
+        path.write_bytes(b"LUXSLOG1")
+
+        with pytest.raises(ValueError):
+            list(read_change_log(path))
+
+
+class TestLuxtronikRegisterChanges:
+    def test_diff_block_ignores_growth(self):
+        assert diff_block([1, 2, 3], [1, 5, 3, 9]) == [(1, 2, 5)]
+
+    def test_first_poll_is_the_baseline(self):
+        changes = _changes(writer=MagicMock())
+
+        changes.observe(_blocks([1, 2]), _AT)
+
+        assert changes.last_changes == 0
+        changes._hass.async_add_executor_job.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_changes_are_logged_and_fired_in_range(self):
+        writer = MagicMock()
+        changes = _changes({"calculations": ((1, 1),)}, writer)
+        changes.observe(_blocks([1, 2, 3]), _AT)
+
+        changes.observe(_blocks([1, 4, 5], parameters=(0, 9)), _AT + timedelta(1))
+        await changes.async_close()
+
+        job = changes._hass.async_add_executor_job
+        assert job.call_args_list[0].args[0] == writer.record_changes
+        assert job.call_args_list[1] == call(writer.close)
+        assert [
+            (c.group, c.index, c.old, c.new) for c in job.call_args_list[0].args[1]
+        ] == [
+            ("parameters", 1, 0, 9),
+            ("calculations", 1, 2, 4),
+            ("calculations", 2, 3, 5),
+        ]
+        changes._hass.bus.async_fire.assert_called_once_with(
+            EVENT_REGISTER_CHANGED,
+            {
+                "entry_id": "entry-id",
+                "group": "calculations",
+                "index": 1,
+                "old": 2,
+                "new": 4,
+            },
+        )
+        assert (changes.changes, changes.last_changes) == (3, 3)
+
+    @pytest.mark.asyncio
+    async def test_queued_polls_are_written_in_order_before_close(self):
+        writer = MagicMock()
+        changes = _changes(writer=writer)
+        changes.observe(_blocks([1]), _AT)
+        changes.observe(_blocks([2]), _AT + timedelta(1))
+        changes.observe(_blocks([3]), _AT + timedelta(2))
+
+        await changes.async_close()
+        changes.observe(_blocks([4]), _AT + timedelta(3))
+
+        job = changes._hass.async_add_executor_job
+        assert job.call_count == 2
+        assert [c.new for c in job.call_args_list[0].args[1]] == [2, 3]
+        assert job.call_args_list[1] == call(writer.close)
+        assert changes.writer is None
+
+    def test_block_not_read_again_is_skipped(self):
+        changes = _changes({"calculations": ((0, 10),)})
+        blocks = _blocks([1, 2])
+        changes.observe(blocks, _AT)
+        blocks["calculations"][0] = 7
+
+        changes.observe(blocks, _AT + timedelta(1))
+
+        changes._hass.bus.async_fire.assert_not_called()
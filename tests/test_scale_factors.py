@@ -0,0 +1,153 @@
+"""Tests for tools.scale_factors, on synthetic session logs and downloads."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from custom_components.luxtronik2.session_log import SessionLogWriter, encode_values
+from tools.scale_factors import fit_candidates, load_snapshots, main
+
+_HEAT = 151  # calculations, 0.1 kWh per count
+_INPUT = 1136  # parameters, 0.01 kWh per count
+_NOISE = 1137  # parameters, unrelated
+
+
+def _blocks(heat: int, energy_input: int, noise: int) -> dict[str, list[int]]:
+    parameters = [0] * 1200
+    parameters[_INPUT] = energy_input
+    parameters[_NOISE] = noise
+    calculations = [0] * 260
+    calculations[_HEAT] = heat
+    return {
+        "parameters": parameters,
+        "calculations": calculations,
+        "visibilities": [0] * 10,
+    }
+
+
+def _write_session(path: Path, polls: list[dict[str, list[int]]]) -> None:
+    writer = SessionLogWriter(path)
+    for blocks in polls:
+        for command, label in (
+            (3003, "parameters"),
+            (3004, "calculations"),
+            (3005, "visibilities"),
+        ):
+            writer.record(command, encode_values(command, blocks[label]))
+        writer.record(3002, encode_values(3002, [3, 1]))
+    writer.close()
+
+
+def _unit(start_heat: int, start_input: int, cop: float, polls: int = 20):
+    """Polls of a unit whose heat counter grows `cop` times its input."""
+    rng = np.random.default_rng(start_heat)
+    steps = rng.integers(50, 500, polls).cumsum()  # input, in 0.01 kWh
+    return [
+        _blocks(
+            heat=start_heat + round(step * 0.01 * cop / 0.1),
+            energy_input=start_input + int(step),
+            noise=int(rng.integers(0, 1000)),
+        )
+        for step in steps
+    ]
+
+
+class TestScaleFactors:
+    def test_session_logs_of_two_units_fit_one_cop(self, tmp_path: Path):
+        _write_session(tmp_path / "a.lxs", _unit(10_000, 500_000, 4.0))
+        _write_session(tmp_path / "b.lxs", _unit(90_000, 20_000, 4.0))
+
+        snapshots = load_snapshots([tmp_path / "a.lxs", tmp_path / "b.lxs"])
+        fits = fit_candidates(
+            snapshots,
+            ("calculations", _HEAT),
+            {"parameters": ((1130, 1145),)},
+            target_factor=0.1,
+            ratio_range=(1.0, 8.0),
+        )
+
+        assert len(snapshots) == 40
+        assert snapshots.source_names == ["a.lxs", "b.lxs"]
+        best = fits[0]
+        assert (best.group, best.index) == ("parameters", _INPUT)
+        assert best.r == pytest.approx(1.0, abs=1e-4)
+        assert best.factor == 0.01
+        assert best.ratios[0.1] == pytest.approx(0.4, rel=1e-2)
+        assert [fit.index for fit in fits] == [_INPUT, _NOISE]
+
+    def test_lifetime_totals_rule_out_a_factor(self, tmp_path: Path):
+        # Counters that started together: lifetime COP 4 at /100, 0.4 at /10.
+        _write_session(tmp_path / "a.lxs", _unit(0, 0, 4.0))
+        snapshots = load_snapshots([tmp_path / "a.lxs"])
+
+        fit = fit_candidates(
+            snapshots,
+            ("calculations", _HEAT),
+            {"parameters": ((_INPUT, _INPUT),)},
+            target_factor=0.1,
+            ratio_range=(0.3, 8.0),
+            counters=True,
+        )[0]
+
+        assert fit.lifetime_ratio == pytest.approx(0.04, rel=1e-2)
+        assert fit.factor == 0.01
+
+    def test_impossible_cop_is_flagged(self, tmp_path: Path):
+        _write_session(tmp_path / "a.lxs", _unit(0, 0, 0.5))
+
+        fit = fit_candidates(
+            load_snapshots([tmp_path / "a.lxs"]),
+            ("calculations", _HEAT),
+            {"parameters": ((_INPUT, _INPUT),)},
+            target_factor=0.1,
+            ratio_range=(1.0, 8.0),
+            factors=(0.01,),
+        )[0]
+
+        assert fit.impossible
+
+    def test_too_few_snapshots(self, tmp_path: Path):
+        _write_session(tmp_path / "a.lxs", _unit(0, 0, 4.0, polls=2))
+
+        with pytest.raises(ValueError, match="at least 3"):
+            fit_candidates(
+                load_snapshots([tmp_path / "a.lxs"]),
+                ("calculations", _HEAT),
+                {"parameters": ((_INPUT, _INPUT),)},
+            )
+
+    def test_downloads_and_unreadable_files(self, tmp_path: Path, capsys):
+        for number in range(3):
+            dump = {
+                "data": {
+                    "heatpump_id": "abc",
+                    "parameters": {f"{_INPUT} HEAT_ENERGY_INPUT": 100 + number},
+                    "calculations": {
+                        f"{_HEAT} ID_WEB_WMZ_heizung": 10.0 + 0.5 * number
+                    },
+                    "visibilities": {},
+                }
+            }
+            (tmp_path / f"dump{number}.json").write_text(json.dumps(dump))
+        (tmp_path / "broken.json").write_text("{")
+
+        main(
+            [
+                *(str(path) for path in sorted(tmp_path.glob("*.json"))),
+                "--target",
+                f"calculations {_HEAT}",
+                "--target-factor",
+                "0.1",
+                "--candidates",
+                f"parameters {_INPUT}",
+                "--json",
+            ]
+        )
+
+        rows = json.loads(capsys.readouterr().out)
+        assert rows[0]["register"] == f"parameters {_INPUT}"
+        assert rows[0]["r"] == pytest.approx(1.0)
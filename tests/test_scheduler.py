@@ -0,0 +1,223 @@
+"""Tests for custom_components.luxtronik2.scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.luxtronik2.const import LuxPollStat, LuxSchedulePriority
+from custom_components.luxtronik2.scheduler import (
+    LuxtronikPollScheduler,
+    async_get_poll_scheduler,
+)
+
+
+async def _hold(
+    scheduler: LuxtronikPollScheduler,
+    priority: LuxSchedulePriority,
+    order: list[str],
+    name: str,
+    release: asyncio.Event,
+) -> None:
+    async with scheduler.async_slot(priority):
+        order.append(name)
+        await release.wait()
+
+
+class TestSlots:
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        scheduler = LuxtronikPollScheduler(max_concurrent=2)
+        release = asyncio.Event()
+        order: list[str] = []
+        tasks = [
+            asyncio.create_task(
+                _hold(scheduler, LuxSchedulePriority.POLL, order, str(i), release)
+            )
+            for i in range(5)
+        ]
+        await asyncio.sleep(0)
+
+        assert order == ["0", "1"]
+        assert scheduler.active == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["0", "1", "2", "3", "4"]
+        assert scheduler.active == 0
+        assert scheduler.peak_concurrent == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_are_granted_before_polls(self):
+        scheduler = LuxtronikPollScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        order: list[str] = []
+        tasks = [
+            asyncio.create_task(
+                _hold(scheduler, LuxSchedulePriority.POLL, order, "busy", release)
+            )
+        ]
+        await asyncio.sleep(0)
+        for name, priority in (
+            ("poll", LuxSchedulePriority.POLL),
+            ("confirm", LuxSchedulePriority.WRITE_CONFIRM),
+            ("write", LuxSchedulePriority.WRITE),
+        ):
+            tasks.append(
+                asyncio.create_task(_hold(scheduler, priority, order, name, release))
+            )
+            await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert order == ["busy", "write", "confirm", "poll"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        scheduler = LuxtronikPollScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        order: list[str] = []
+        busy = asyncio.create_task(
+            _hold(scheduler, LuxSchedulePriority.POLL, order, "busy", release)
+        )
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(
+            _hold(scheduler, LuxSchedulePriority.POLL, order, "cancelled", release)
+        )
+        await asyncio.sleep(0)
+        waiting.cancel()
+        release.set()
+        await busy
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert scheduler.active == 0
+        await _hold(scheduler, LuxSchedulePriority.POLL, order, "next", release)
+        assert order == ["busy", "next"]
+
+    @pytest.mark.asyncio
+    async def test_failing_operation_releases_its_slot(self):
+        scheduler = LuxtronikPollScheduler(max_concurrent=1)
+
+        with pytest.raises(TimeoutError):
+            async with scheduler.async_slot(LuxSchedulePriority.WRITE):
+                raise TimeoutError
+
+        assert scheduler.active == 0
+        assert scheduler.stats.summary(LuxPollStat.SCHEDULER_WAIT)["count"] == 1
+
+
+class TestStagger:
+    @pytest.mark.asyncio
+    async def test_single_heat_pump_never_waits(self):
+        scheduler = LuxtronikPollScheduler()
+        scheduler.register(MagicMock())
+
+        assert await scheduler.async_stagger(60) == 0.0
+        assert await scheduler.async_stagger(60) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_polls_are_spread_over_the_interval(self):
+        scheduler = LuxtronikPollScheduler(max_stagger=100)
+        for _ in range(3):
+            scheduler.register(MagicMock())
+
+        with (
+            patch(
+                "custom_components.luxtronik2.scheduler.time.monotonic",
+                return_value=1000.0,
+            ),
+            patch("custom_components.luxtronik2.scheduler.asyncio.sleep") as sleep,
+        ):
+            delays = [await scheduler.async_stagger(30) for _ in range(3)]
+
+        assert delays == [0.0, 10.0, 20.0]
+        assert [call.args[0] for call in sleep.call_args_list] == [10.0, 20.0]
+
+    @pytest.mark.asyncio
+    async def test_gap_is_capped(self):
+        scheduler = LuxtronikPollScheduler(max_stagger=5)
+        for _ in range(2):
+            scheduler.register(MagicMock())
+
+        with (
+            patch(
+                "custom_components.luxtronik2.scheduler.time.monotonic",
+                return_value=1000.0,
+            ),
+            patch("custom_components.luxtronik2.scheduler.asyncio.sleep"),
+        ):
+            delays = [await scheduler.async_stagger(300) for _ in range(2)]
+
+        assert delays == [0.0, 5.0]
+
+    @pytest.mark.asyncio
+    async def test_unregistered_pump_no_longer_counts(self):
+        scheduler = LuxtronikPollScheduler()
+        first, second = MagicMock(), MagicMock()
+        scheduler.register(first)
+        scheduler.register(second)
+        scheduler.unregister(second)
+
+        assert scheduler.heat_pumps == 1
+        assert await scheduler.async_stagger(60) == 0.0
+
+
+class TestThroughput:
+    @pytest.mark.asyncio
+    async def test_counts_operations_by_priority(self):
+        scheduler = LuxtronikPollScheduler(window=60)
+        scheduler._started -= 60
+        scheduler.register(MagicMock())
+        for priority in (
+            LuxSchedulePriority.POLL,
+            LuxSchedulePriority.POLL,
+            LuxSchedulePriority.WRITE,
+        ):
+            async with scheduler.async_slot(priority):
+                pass
+
+        throughput = scheduler.throughput()
+
+        assert throughput["heat_pumps"] == 1
+        assert throughput["operations_per_minute"]["poll"] == pytest.approx(2, rel=0.01)
+        assert throughput["operations_per_minute"]["write"] == pytest.approx(
+            1, rel=0.01
+        )
+        assert throughput["operations_per_minute"]["write_confirm"] == 0
+        assert 0 <= throughput["utilization"] < 0.01
+
+    @pytest.mark.asyncio
+    async def test_completed_operations_stay_within_the_window(self):
+        scheduler = LuxtronikPollScheduler(window=1)
+        clock = 1000.0
+
+        with patch(
+            "custom_components.luxtronik2.scheduler.time.monotonic",
+            side_effect=lambda: clock,
+        ):
+            for _ in range(5001):
+                clock += 0.01
+                async with scheduler.async_slot(LuxSchedulePriority.POLL):
+                    pass
+
+        assert len(scheduler._completed) <= 101
+
+    def test_as_dict_carries_stats(self):
+        scheduler = LuxtronikPollScheduler()
+        scheduler.stats.record(LuxPollStat.STAGGER_DELAY, 1.5)
+
+        result = scheduler.as_dict()
+
+        assert result["stats"]["stagger_delay"]["last"] == 1.5
+        assert result["throughput"]["operations_per_minute"]["poll"] == 0
+
+
+def test_scheduler_is_shared_per_hass():
+    hass = MagicMock()
+    hass.data = {}
+
+    assert async_get_poll_scheduler(hass) is async_get_poll_scheduler(hass)
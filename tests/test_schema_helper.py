@@ -12,11 +12,13 @@ import voluptuous as vol
 import voluptuous_serialize
 
 from custom_components.luxtronik2.const import (
+    CONF_FANOUT_SLICE_BUDGET,
     CONF_HA_SENSOR_CURRENT_POWER_CONSUMPTION,
     CONF_HA_SENSOR_INDOOR_TEMPERATURE,
     CONF_UPDATE_INTERVAL,
     DEFAULT_PORT,
     DEFAULT_UPDATE_INTERVAL_OPTION,
+    FANOUT_SLICE_BUDGET_MAX,
 )
 from custom_components.luxtronik2.schema_helper import (
     build_options_schema,
@@ -163,6 +165,16 @@ class TestBuildOptionsSchema:
             if key != cleared_key:
                 assert result[key] == value
 
+    def test_fanout_slice_budget_is_accepted(self):
+        schema = build_options_schema(current_fanout_slice_budget=50)
+        result = cast(dict[str, Any], schema({CONF_FANOUT_SLICE_BUDGET: 50}))
+        assert result[CONF_FANOUT_SLICE_BUDGET] == 50
+
+    def test_fanout_slice_budget_above_range_is_rejected(self):
+        schema = build_options_schema()
+        with pytest.raises(vol.Invalid):
+            schema({CONF_FANOUT_SLICE_BUDGET: FANOUT_SLICE_BUDGET_MAX + 1})
+
     def test_default_schema_is_json_serializable(self):
         """Regression test for issue #656.
 
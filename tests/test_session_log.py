@@ -0,0 +1,257 @@
+"""Tests for session_log: capturing a controller session and replaying it."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.luxtronik2.const import (
+    CONF_HA_SENSOR_PREFIX,
+    CONFIG_ENTRY_VERSION,
+    DEFAULT_MAX_DATA_LENGTH,
+    DEFAULT_PORT,
+    DOMAIN,
+    LuxPollStat,
+)
+from custom_components.luxtronik2.coordinator import LuxtronikCoordinator
+from custom_components.luxtronik2.lux_helper import Luxtronik
+from custom_components.luxtronik2.session_log import (
+    SESSION_LOG_MAGIC,
+    LuxtronikReplayClient,
+    SessionLogWriter,
+    encode_values,
+    read_session_log,
+)
+from tools.luxtronik_emulator import LuxtronikEmulator, blocks_from_values
+
+
+def _blocks(flow_in: float = 30.0) -> dict[str, list[int]]:
+    return blocks_from_values(
+        parameters={"ID_Ba_Hz_akt": "Party"},
+        calculations={"ID_WEB_Temperatur_TVL": flow_in},
+        visibilities={"ID_Visi_Heizung": 1},
+    )
+
+
+def _record_poll(writer: SessionLogWriter, blocks: dict[str, list[int]]) -> None:
+    for command, label in (
+        (3003, "parameters"),
+        (3004, "calculations"),
+        (3005, "visibilities"),
+    ):
+        writer.record(command, encode_values(command, blocks[label]))
+
+
+@pytest.fixture
+def log_path(tmp_path: Path) -> Path:
+    return tmp_path / "session.lxs"
+
+
+class TestSessionLogFile:
+    def test_round_trip(self, log_path):
+        writer = SessionLogWriter(log_path)
+        writer.record(3004, encode_values(3004, [1, -2, 3]), status=7)
+        writer.record(3005, encode_values(3005, [0, 1, -1]))
+        writer.record(3002, encode_values(3002, [894, 0]))
+        writer.close()
+
+        exchanges = list(read_session_log(log_path))
+
+        assert [e.command for e in exchanges] == [3004, 3005, 3002]
+        assert exchanges[0].values == [1, -2, 3]
+        assert exchanges[0].status == 7
+        assert exchanges[1].values == [0, 1, -1]
+        assert exchanges[2].values == [894, 0]
+        assert exchanges[0].timestamp <= exchanges[2].timestamp
+
+    def test_reopening_appends_without_a_second_header(self, log_path):
+        for value in (1, 2):
+            writer = SessionLogWriter(log_path)
+            writer.record(3004, encode_values(3004, [value]))
+            writer.close()
+
+        assert log_path.read_bytes().count(SESSION_LOG_MAGIC) == 1
+        assert [e.values for e in read_session_log(log_path)] == [[1], [2]]
+
+    def test_rotates_at_the_size_cap(self, log_path):
+        writer = SessionLogWriter(log_path, max_bytes=64)
+        for value in range(4):
+            writer.record(3004, encode_values(3004, [value] * 8))
+        writer.close()
+
+        rotated = log_path.with_name(f"{log_path.name}.1")
+        assert rotated.exists()
+        assert [e.values[0] for e in read_session_log(rotated)] == [2, 3]
+        assert not log_path.exists()
+
+    def test_truncated_tail_is_skipped(self, log_path):
+        writer = SessionLogWriter(log_path)
+        writer.record(3004, encode_values(3004, [1, 2]))
+        writer.record(3004, encode_values(3004, [3, 4]))
+        writer.close()
+        log_path.write_bytes(log_path.read_bytes()[:-3])
+
+        assert [e.values for e in read_session_log(log_path)] == [[1, 2]]
+
+    def test_rejects_other_files(self, log_path):
+        log_path.write_bytes(b"{}")
+
+        with pytest.raises(ValueError, match="not a Luxtronik session log"):
+            list(read_session_log(log_path))
+
+    def test_write_failure_does_not_raise(self, tmp_path):
+        writer = SessionLogWriter(tmp_path / "missing" / "session.lxs")
+
+        writer.record(3004, encode_values(3004, [1]))
+
+
+class TestReplayClient:
+    def test_serves_one_poll_per_read(self, log_path):
+        writer = SessionLogWriter(log_path)
+        _record_poll(writer, _blocks(30.0))
+        writer.record(3002, encode_values(3002, [3, 0]))
+        _record_poll(writer, _blocks(42.5))
+        writer.close()
+
+        client = LuxtronikReplayClient(log_path)
+        client.read()
+        assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 30.0
+        assert client.parameters.get("ID_Ba_Hz_akt").value == "Party"
+        client.read()
+        assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 42.5
+        assert client.raw_blocks == _blocks(42.5)
+        blocks = _blocks()
+        assert client.stats.summary(LuxPollStat.POLL_BYTES)["last"] == (
+            4 * len(blocks["parameters"])
+            + 4 * len(blocks["calculations"])
+            + len(blocks["visibilities"])
+        )
+
+    def test_exhausted_log_raises_connection_error(self, log_path):
+        writer = SessionLogWriter(log_path)
+        _record_poll(writer, _blocks())
+        writer.close()
+
+        client = LuxtronikReplayClient(log_path)
+        client.read()
+        with pytest.raises(ConnectionError):
+            client.read()
+
+    def test_loop_starts_over(self, log_path):
+        writer = SessionLogWriter(log_path)
+        _record_poll(writer, _blocks(30.0))
+        _record_poll(writer, _blocks(42.5))
+        writer.close()
+
+        client = LuxtronikReplayClient(log_path, loop=True)
+        for _ in range(3):
+            client.read()
+
+        assert client.polls == 3
+        assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 30.0
+
+    def test_realtime_paces_polls_like_the_capture(self, log_path):
+        with patch(
+            "custom_components.luxtronik2.session_log.time.time",
+            side_effect=[100.0] * 3 + [110.0] * 3,
+        ):
+            writer = SessionLogWriter(log_path)
+            _record_poll(writer, _blocks(30.0))
+            _record_poll(writer, _blocks(42.5))
+            writer.close()
+
+        client = LuxtronikReplayClient(log_path, realtime=True)
+        with patch("custom_components.luxtronik2.session_log.time.sleep") as sleep:
+            client.read()
+            sleep.assert_not_called()
+            client.read()
+
+        sleep.assert_called_once()
+        assert 9.0 < sleep.call_args[0][0] <= 10.0
+
+    def test_client_members_the_coordinator_reads(self, log_path):
+        writer = SessionLogWriter(log_path)
+        _record_poll(writer, _blocks(30.0))
+        blocks = _blocks(42.5)
+        writer.record(3003, encode_values(3003, blocks["parameters"]))
+        writer.record(3004, encode_values(3004, blocks["calculations"]), 2)
+        writer.record(3005, encode_values(3005, blocks["visibilities"]))
+        writer.close()
+
+        client = LuxtronikReplayClient(log_path)
+        assert client.session_log is None
+        client.read_identity()
+        assert client.calculations.get("ID_WEB_Temperatur_TVL").value == 30.0
+        assert client.calculations_status == 0
+
+        assert client.read_block(3004) == blocks["calculations"]
+        assert client.calculations_status == 2
+
+    def test_write_is_dropped(self, log_path):
+        writer = SessionLogWriter(log_path)
+        _record_poll(writer, _blocks())
+        writer.close()
+
+        client = LuxtronikReplayClient(log_path)
+        client.parameters.queue = {3: 0}
+        client.write()
+
+        assert client.parameters.queue == {}
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_entry_on_the_replay_client_unloads(hass: HomeAssistant, log_path):
+    writer = SessionLogWriter(log_path)
+    for _ in range(3):
+        _record_poll(writer, _blocks())
+    writer.close()
+    client = LuxtronikReplayClient(log_path, loop=True)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=CONFIG_ENTRY_VERSION,
+        data={
+            CONF_HOST: "replay",
+            CONF_PORT: DEFAULT_PORT,
+            CONF_HA_SENSOR_PREFIX: DOMAIN,
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch.object(LuxtronikCoordinator, "create_client", return_value=client):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.NOT_LOADED
+
+
+@pytest.mark.usefixtures("socket_enabled")
+def test_capture_from_a_live_client_replays_identically(log_path):
+    """What the real client read is exactly what the replay parses."""
+    with LuxtronikEmulator(_blocks()) as emulator:
+        host, port = emulator.address
+        client = Luxtronik(host, port, 2.0, DEFAULT_MAX_DATA_LENGTH)
+        client.session_log = SessionLogWriter(log_path)
+        try:
+            client.read()
+            client.parameters.queue = {3: 0}
+            client.write()
+        finally:
+            client.disconnect()
+            client.session_log.close()
+
+    commands = [e.command for e in read_session_log(log_path)]
+    assert commands == [3003, 3004, 3005, 3002]
+
+    replay = LuxtronikReplayClient(log_path)
+    replay.read()
+    assert replay.raw_blocks == client.raw_blocks
@@ -13,24 +13,34 @@ entity registry, platform setup, services - runs for real.
 from __future__ import annotations
 
 import asyncio
+from datetime import timedelta
+import threading
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_HOST, CONF_PORT, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
 from homeassistant.util.unit_system import US_CUSTOMARY_SYSTEM
 import pytest
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.luxtronik2.const import (
     CONF_HA_SENSOR_PREFIX,
     CONFIG_ENTRY_VERSION,
     DEFAULT_PORT,
     DOMAIN,
+    ENTITY_PLAN_SAVE_DELAY,
     SERVICE_WRITE,
+    SNAPSHOT_STORAGE_VERSION,
     SensorKey,
 )
+from custom_components.luxtronik2.poll_stats import LuxtronikPollStats
+from custom_components.luxtronik2.scheduler import async_get_poll_scheduler
 from tests.conftest import (
     DEFAULT_CALCULATIONS,
     DEFAULT_PARAMETERS,
@@ -74,11 +84,23 @@ class FakeLuxtronikClient:
         self.connected = False
         self.disconnected = False
         self.fail_read = False
+        self.stats = LuxtronikPollStats()
+        self.raw_blocks: dict[str, list[int]] = {}
+        self.session_log = None
+        self.restored: dict[str, list[int]] | None = None
+        self.read_gate: threading.Event | None = None
 
     def connect(self) -> None:
         self.connected = True
 
+    def restore(self, raw_blocks: dict[str, list[int]]) -> None:
+        # The fake groups cannot parse; they keep their values and the test
+        # checks what would have been parsed.
+        self.restored = raw_blocks
+
     def read(self) -> None:
+        if self.read_gate is not None:
+            self.read_gate.wait(timeout=5)
         if self.fail_read:
             raise OSError("simulated read failure")
 
@@ -254,6 +276,9 @@ async def test_unload_disconnects_client_and_unregisters_service(
     assert await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
     assert hass.services.has_service(DOMAIN, SERVICE_WRITE)
+    scheduler = async_get_poll_scheduler(hass)
+    assert entry.runtime_data.scheduler is scheduler
+    assert scheduler.heat_pumps == 1
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
@@ -261,6 +286,7 @@ async def test_unload_disconnects_client_and_unregisters_service(
     assert entry.state is ConfigEntryState.NOT_LOADED
     assert client.disconnected is True
     assert not hass.services.has_service(DOMAIN, SERVICE_WRITE)
+    assert scheduler.heat_pumps == 0
 
 
 async def test_migration_from_v1_reaches_current_version(
@@ -296,3 +322,82 @@ async def test_migration_from_v1_reaches_current_version(
     # still absent, so a v1 entry keeps "luxtronik" through to the latest
     # version.
     assert entry.data[CONF_HA_SENSOR_PREFIX] == "luxtronik"
+
+
+async def test_setup_restores_snapshot_without_waiting_for_the_heat_pump(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    hass_storage: dict[str, Any],
+) -> None:
+    """With a persisted snapshot, setup completes before the first live read."""
+    client = FakeLuxtronikClient(
+        host="192.168.1.100", port=DEFAULT_PORT, socket_timeout=10, max_data_length=1024
+    )
+    client.read_gate = threading.Event()
+    _patch_client(monkeypatch, client)
+
+    entry = _make_entry()
+    entry.add_to_hass(hass)
+    blocks = {"parameters": [1, 2], "calculations": [3], "visibilities": [4]}
+    hass_storage[f"{DOMAIN}.snapshot.{entry.entry_id}"] = {
+        "version": SNAPSHOT_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.snapshot.{entry.entry_id}",
+        "data": {
+            "taken_at": "2026-01-01T12:00:00+00:00",
+            "unique_id": "123456_789",
+            "firmware_version": "V3.90.1",
+            "model": "LWD",
+            "block_lengths": {"parameters": 2, "calculations": 1, "visibilities": 1},
+            "blocks": blocks,
+        },
+    }
+
+    try:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert entry.state is ConfigEntryState.LOADED
+        assert client.restored == blocks
+        entity_id = f"number.{DOMAIN}_{SensorKey.DHW_TARGET_TEMPERATURE}"
+        state = hass.states.get(entity_id)
+        assert state is not None
+        assert state.attributes["stale_since"] is not None
+    finally:
+        client.read_gate.set()
+
+    await hass.async_block_till_done(wait_background_tasks=True)
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert "stale_since" not in state.attributes
+
+
+async def test_second_setup_reuses_the_entity_plan(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    hass_storage: dict[str, Any],
+) -> None:
+    """A reload with an unchanged heat pump creates the same entities from the plan."""
+    client = FakeLuxtronikClient(
+        host="192.168.1.100", port=DEFAULT_PORT, socket_timeout=10, max_data_length=1024
+    )
+    _patch_client(monkeypatch, client)
+
+    entry = _make_entry()
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    first_setup = set(hass.states.async_entity_ids())
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=ENTITY_PLAN_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+    stored = hass_storage[f"{DOMAIN}.entity_plan.{entry.entry_id}"]["data"]
+    assert stored["groups"]["number"]["selected"]
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert set(hass.states.async_entity_ids()) == first_setup
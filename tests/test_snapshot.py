@@ -0,0 +1,132 @@
+"""Tests for custom_components.luxtronik2.snapshot."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.luxtronik2.const import (
+    DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from custom_components.luxtronik2.snapshot import (
+    LuxtronikSnapshot,
+    LuxtronikSnapshotStore,
+)
+
+_KEY = f"{DOMAIN}.snapshot.entry-id"
+
+
+def _snapshot(**overrides: Any) -> LuxtronikSnapshot:
+    values: dict[str, Any] = {
+        "taken_at": datetime(2026, 1, 1, 12, 0, tzinfo=UTC),
+        "unique_id": "123456_789",
+        "firmware_version": "V3.90.1",
+        "model": "LWD",
+        "blocks": {"parameters": [1, 2], "calculations": [3], "visibilities": [4]},
+    }
+    values.update(overrides)
+    return LuxtronikSnapshot(**values)
+
+
+class TestLuxtronikSnapshot:
+    def test_round_trip(self):
+        snapshot = _snapshot()
+        assert LuxtronikSnapshot.from_dict(snapshot.as_dict()) == snapshot
+
+    def test_block_lengths_are_stored(self):
+        assert _snapshot().as_dict()["block_lengths"] == {
+            "parameters": 2,
+            "calculations": 1,
+            "visibilities": 1,
+        }
+
+    def test_length_mismatch_is_rejected(self):
+        """A truncated block must not be parsed into shifted registers."""
+        data = _snapshot().as_dict()
+        data["blocks"]["parameters"] = [1]
+        assert LuxtronikSnapshot.from_dict(data) is None
+
+    def test_missing_block_is_rejected(self):
+        data = _snapshot().as_dict()
+        del data["blocks"]["visibilities"]
+        assert LuxtronikSnapshot.from_dict(data) is None
+
+    def test_non_integer_value_is_rejected(self):
+        data = _snapshot().as_dict()
+        data["blocks"]["calculations"] = ["3"]
+        assert LuxtronikSnapshot.from_dict(data) is None
+
+    @pytest.mark.parametrize("data", [None, {}, [], {"taken_at": "not a date"}])
+    def test_malformed_data_is_rejected(self, data):
+        assert LuxtronikSnapshot.from_dict(data) is None
+
+
+class TestLuxtronikSnapshotStore:
+    @pytest.mark.asyncio
+    async def test_load_without_file(self, hass: HomeAssistant):
+        store = LuxtronikSnapshotStore(hass, "entry-id")
+        assert await store.async_load("123456_789") is None
+
+    @pytest.mark.asyncio
+    async def test_load_returns_stored_snapshot(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        hass_storage[_KEY] = {
+            "version": SNAPSHOT_STORAGE_VERSION,
+            "key": _KEY,
+            "data": _snapshot().as_dict(),
+        }
+        store = LuxtronikSnapshotStore(hass, "entry-id")
+        assert await store.async_load("123456_789") == _snapshot()
+
+    @pytest.mark.asyncio
+    async def test_load_ignores_snapshot_of_another_heat_pump(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        hass_storage[_KEY] = {
+            "version": SNAPSHOT_STORAGE_VERSION,
+            "key": _KEY,
+            "data": _snapshot(unique_id="999999_1").as_dict(),
+        }
+        store = LuxtronikSnapshotStore(hass, "entry-id")
+        assert await store.async_load("123456_789") is None
+
+    @pytest.mark.asyncio
+    async def test_saves_are_coalesced_to_the_latest_snapshot(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        """Saving every poll must neither postpone the write nor write each one."""
+        store = LuxtronikSnapshotStore(hass, "entry-id")
+        store.async_schedule_save(_snapshot(model="first"))
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY / 2)
+        )
+        store.async_schedule_save(_snapshot(model="latest"))
+        assert _KEY not in hass_storage
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        assert hass_storage[_KEY]["data"]["model"] == "latest"
+
+    @pytest.mark.asyncio
+    async def test_remove_deletes_the_file(
+        self, hass: HomeAssistant, hass_storage: dict[str, Any]
+    ):
+        hass_storage[_KEY] = {
+            "version": SNAPSHOT_STORAGE_VERSION,
+            "key": _KEY,
+            "data": _snapshot().as_dict(),
+        }
+        store = LuxtronikSnapshotStore(hass, "entry-id")
+        await store.async_remove()
+        assert _KEY not in hass_storage
@@ -0,0 +1,167 @@
+"""Tests for custom_components.luxtronik2.statistics_import."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components.recorder.models import StatisticMeanType
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.const import CONF_HOST, CONF_PORT, UnitOfTemperature
+
+from custom_components.luxtronik2.const import (
+    CONF_HA_SENSOR_PREFIX,
+    DEFAULT_PORT,
+    DOMAIN,
+    DeviceKey,
+    LuxCalculation as LC,
+    LuxParameter as LP,
+    SensorKey,
+)
+from custom_components.luxtronik2.model import LuxtronikSensorDescription
+from custom_components.luxtronik2.sensor import LuxtronikSensorEntity
+from custom_components.luxtronik2.statistics_import import (
+    LuxtronikStatisticsImporter,
+    importable,
+)
+
+_FLOW_IN = LuxtronikSensorDescription(
+    key=SensorKey.FLOW_IN_TEMPERATURE,
+    luxtronik_key=LC.C0010_FLOW_IN_TEMPERATURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+)
+_HOUR = datetime(2026, 1, 1, 10, tzinfo=UTC)
+_IMPORT = "custom_components.luxtronik2.statistics_import.async_add_external_statistics"
+
+
+def _data(value):
+    data = MagicMock()
+    data.calculations.get.return_value = SimpleNamespace(value=value)
+    return data
+
+
+def _importer():
+    hass = MagicMock()
+    hass.config.components = {"recorder"}
+    importer = LuxtronikStatisticsImporter(hass, "luxtronik", "Heat pump")
+    importer.track([_FLOW_IN])
+    return importer
+
+
+class TestLuxtronikStatisticsImporter:
+    def test_only_measurement_calculations_are_imported(self):
+        parameter = LuxtronikSensorDescription(
+            key="p",
+            luxtronik_key=LP.P0001_HEATING_TARGET_CORRECTION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        )
+        total = LuxtronikSensorDescription(
+            key="t",
+            luxtronik_key=LC.C0010_FLOW_IN_TEMPERATURE,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        )
+
+        assert importable(_FLOW_IN)
+        assert not importable(parameter)
+        assert not importable(total)
+        importer = _importer()
+        importer.track([parameter, total])
+        assert importer.keys == {"flow_in_temperature"}
+
+    def test_finished_hour_is_imported(self):
+        importer = _importer()
+        with patch(_IMPORT) as add:
+            for minute, value in ((0, 30.0), (20, 34.0), (40, 32.0)):
+                importer.observe(_data(value), _HOUR + timedelta(minutes=minute), 3)
+            add.assert_not_called()
+
+            importer.observe(_data(40.0), _HOUR + timedelta(hours=1), 3)
+
+        add.assert_called_once()
+        _, metadata, statistics = add.call_args.args
+        assert metadata["statistic_id"] == f"{DOMAIN}:luxtronik_flow_in_temperature"
+        assert metadata["mean_type"] == StatisticMeanType.ARITHMETIC
+        assert metadata["unit_class"] == "temperature"
+        assert statistics == [{"start": _HOUR, "mean": 32.0, "min": 30.0, "max": 34.0}]
+        assert importer.buckets["flow_in_temperature"] == [1, 40.0, 40.0, 40.0]
+
+    def test_metadata_keys_unknown_to_the_core_are_left_out(self):
+        importer = _importer()
+        importer.observe(_data(30.0), _HOUR, 3)
+        known = frozenset(
+            {
+                "has_mean",
+                "has_sum",
+                "mean_type",
+                "name",
+                "source",
+                "statistic_id",
+                "unit_of_measurement",
+            }
+        )
+
+        with (
+            patch(_IMPORT) as add,
+            patch(
+                "custom_components.luxtronik2.statistics_import._METADATA_KEYS", known
+            ),
+        ):
+            importer.async_flush()
+
+        metadata = add.call_args.args[1]
+        assert "unit_class" not in metadata
+        assert metadata["mean_type"] == StatisticMeanType.ARITHMETIC
+
+    def test_flush_without_recorder_drops_the_hour(self):
+        importer = _importer()
+        importer._hass.config.components = set()
+        importer.observe(_data(30.0), _HOUR, 3)
+
+        with patch(_IMPORT) as add:
+            importer.async_flush()
+
+        add.assert_not_called()
+        assert importer.buckets == {}
+
+
+class TestStateWriteThrottle:
+    def _entity(self, importer):
+        entry = MagicMock()
+        entry.data = {
+            CONF_HOST: "192.168.1.100",
+            CONF_PORT: DEFAULT_PORT,
+            CONF_HA_SENSOR_PREFIX: DOMAIN,
+        }
+        coord = MagicMock()
+        coord.statistics_importer = importer
+        coord.data = _data(30.0)
+        coord.get_device.return_value = MagicMock()
+        coord.firmware_series = 3
+        entity = LuxtronikSensorEntity(
+            MagicMock(), entry, coord, _FLOW_IN, DeviceKey.heating
+        )
+        entity.hass = MagicMock()
+        entity.async_write_ha_state = MagicMock()
+        return entity
+
+    def test_imported_sensor_writes_at_most_every_interval(self):
+        entity = self._entity(_importer())
+
+        entity._handle_coordinator_update()
+        entity._handle_coordinator_update()
+        entity.coordinator.data = _data(None)
+        entity._handle_coordinator_update()
+
+        assert entity.async_write_ha_state.call_count == 2
+
+    def test_without_import_every_update_is_written(self):
+        entity = self._entity(None)
+
+        entity._handle_coordinator_update()
+        entity._handle_coordinator_update()
+
+        assert entity.async_write_ha_state.call_count == 2
@@ -93,6 +93,7 @@ def _mock_coordinator(data=None):
     coord.data = data
     coord.entity_active.return_value = True
     coord.entity_visible.return_value = True
+    coord.entity_plan = None
     coord.get_device.return_value = MagicMock()
     coord.last_update_success = True
     return coord
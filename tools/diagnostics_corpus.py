@@ -0,0 +1,326 @@
+"""Columnar index over a corpus of diagnostics downloads, and queries on it.
+
+Several decisions in the integration rest on "the diagnostics corpus": the
+RFV rail analysis in `common.read_smart_grid_inputs`, the sentinel values in
+`coordinator.LUX_TEMPERATURE_SENTINELS`, the scale of the energy counters in
+`lux_overrides`. Each such question - what does register X read across
+models and controller generations, which units have calculation 258 set -
+meant loading and parsing hundreds of JSON files again.
+
+`build_index` parses every download once. The register sections written by
+`diagnostics._dump_items` are keyed "<index> <name>" (padded) with the
+decoded value as a string; each value becomes one row of a few NumPy
+columns:
+
+- `unit`: row in `units.json`, one per file, with its `heatpump_id`, model
+  (calculation 78), firmware (calculation 81) and controller series (the
+  firmware's major version, as `LuxtronikCoordinator.firmware_series`);
+- `key`: group and index packed as `group * 65536 + index`, groups numbered
+  as in `register_changes.GROUPS`;
+- `number`: the value as a float - NaN if it is not a number, booleans 0/1;
+- `text`: the value as a row in `strings.json`.
+
+Rows are sorted by key and saved as `.npy` files, which `CorpusIndex` maps
+into memory: a query for one register is a binary search for its slice, so
+it touches only that register's rows however large the corpus is. Build
+once, query interactively::
+
+    python -m tools.diagnostics_corpus build corpus/ downloads/
+    python -m tools.diagnostics_corpus distribution corpus/ "calculations 258"
+    python -m tools.diagnostics_corpus units corpus/ "calculations 258"
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import asdict, dataclass
+import json
+import logging
+import math
+from pathlib import Path
+import re
+import sys
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from custom_components.luxtronik2.register_changes import GROUPS, parse_index_ranges
+
+LOGGER = logging.getLogger(__name__)
+
+_MODEL_INDEX = 78  # calculations, ID_WEB_Code_WP_akt
+_FIRMWARE_INDEX = 81  # calculations, ID_WEB_SoftStand
+_KEY_STRIDE = 65536
+
+_COLUMNS = ("unit", "key", "number", "text")
+
+# Dimensions a distribution can be split by.
+UNIT_FIELDS = ("model", "firmware", "series", "heatpump_id")
+
+
+@dataclass(frozen=True)
+class CorpusUnit:
+    """The heat pump one download came from."""
+
+    file: str
+    heatpump_id: str | None
+    model: str | None
+    firmware: str | None
+    series: int | None
+
+
+def parse_item_key(key: str) -> tuple[int, str]:
+    """Split a `_dump_items` key "<index> <name>" into index and name."""
+    index, _, name = key.strip().partition(" ")
+    return int(index), name.strip()
+
+
+def register_key(group: str, index: int) -> int:
+    """Return the packed `key` column value of a register."""
+    return GROUPS.index(group) * _KEY_STRIDE + index
+
+
+def _number(text: str) -> float:
+    if text in ("True", "False"):
+        return float(text == "True")
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def _series(firmware: str | None) -> int | None:
+    match = re.search(r"\d+", firmware or "")
+    return int(match[0]) if match else None
+
+
+def _read_download(
+    path: Path,
+) -> tuple[CorpusUnit, Iterator[tuple[str, int, str, str]]]:
+    """Return the unit of a download and its (group, index, name, value) items."""
+    dump = json.loads(path.read_text(encoding="utf-8"))
+    payload: Mapping[str, Any] = dump.get("data", dump)
+    if not any(isinstance(payload.get(group), Mapping) for group in GROUPS):
+        raise ValueError("no register sections")
+    calculations = {
+        parse_item_key(key)[0]: str(value)
+        for key, value in (payload.get("calculations") or {}).items()
+    }
+    model = calculations.get(_MODEL_INDEX)
+    if model is None:
+        heatpump = (payload.get("devices") or {}).get("heatpump") or {}
+        model = heatpump.get("model")
+    firmware = calculations.get(_FIRMWARE_INDEX)
+    unit = CorpusUnit(
+        file=path.name,
+        heatpump_id=payload.get("heatpump_id"),
+        model=model,
+        firmware=firmware,
+        series=_series(firmware),
+    )
+
+    def items() -> Iterator[tuple[str, int, str, str]]:
+        for group in GROUPS:
+            for key, value in (payload.get(group) or {}).items():
+                index, name = parse_item_key(key)
+                yield group, index, name, str(value)
+
+    return unit, items()
+
+
+def _expand(paths: Iterable[Path]) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(path.rglob("*.json"))
+        else:
+            yield path
+
+
+def build_index(paths: Iterable[Path], directory: Path) -> int:
+    """Index the downloads in `paths` (files or directories) into `directory`.
+
+    Files that are not readable downloads are skipped with a warning.
+    Returns the number of downloads indexed.
+    """
+    units: list[dict[str, Any]] = []
+    names: dict[str, dict[int, Counter[str]]] = {group: {} for group in GROUPS}
+    strings: dict[str, int] = {}
+    unit_column: list[int] = []
+    key_column: list[int] = []
+    number_column: list[float] = []
+    text_column: list[int] = []
+    for path in _expand(paths):
+        try:
+            unit, items = _read_download(path)
+            rows = list(items)
+        except (OSError, ValueError, AttributeError, TypeError) as err:
+            LOGGER.warning("Skipping %s: %s", path, err)
+            continue
+        for group, index, name, value in rows:
+            names[group].setdefault(index, Counter())[name] += 1
+            unit_column.append(len(units))
+            key_column.append(register_key(group, index))
+            number_column.append(_number(value))
+            text_column.append(strings.setdefault(value, len(strings)))
+        units.append(asdict(unit))
+    order = np.argsort(np.array(key_column, dtype=np.int64), kind="stable")
+    directory.mkdir(parents=True, exist_ok=True)
+    for column, values, dtype in (
+        ("unit", unit_column, np.int32),
+        ("key", key_column, np.int64),
+        ("number", number_column, np.float64),
+        ("text", text_column, np.int32),
+    ):
+        np.save(directory / f"{column}.npy", np.array(values, dtype=dtype)[order])
+    (directory / "units.json").write_text(json.dumps(units), encoding="utf-8")
+    (directory / "strings.json").write_text(json.dumps(list(strings)), encoding="utf-8")
+    (directory / "names.json").write_text(
+        json.dumps(
+            {
+                group: {
+                    str(index): counts.most_common(1)[0][0]
+                    for index, counts in sorted(by_index.items())
+                }
+                for group, by_index in names.items()
+            }
+        ),
+        encoding="utf-8",
+    )
+    return len(units)
+
+
+class CorpusIndex:
+    """A built index, its columns mapped into memory."""
+
+    def __init__(self, directory: Path) -> None:
+        self.units = [
+            CorpusUnit(**unit)
+            for unit in json.loads((directory / "units.json").read_text("utf-8"))
+        ]
+        self.strings: list[str] = json.loads(
+            (directory / "strings.json").read_text("utf-8")
+        )
+        self.names: dict[str, dict[str, str]] = json.loads(
+            (directory / "names.json").read_text("utf-8")
+        )
+        columns: dict[str, npt.NDArray[Any]] = {
+            column: np.load(directory / f"{column}.npy", mmap_mode="r")
+            for column in _COLUMNS
+        }
+        self.unit = columns["unit"]
+        self.key = columns["key"]
+        self.number = columns["number"]
+        self.text = columns["text"]
+
+    def name(self, group: str, index: int) -> str | None:
+        """Return the name the downloads give a register, if any."""
+        return self.names.get(group, {}).get(str(index))
+
+    def _rows(self, group: str, index: int) -> slice:
+        key = register_key(group, index)
+        return slice(
+            int(np.searchsorted(self.key, key, side="left")),
+            int(np.searchsorted(self.key, key, side="right")),
+        )
+
+    def distribution(
+        self, group: str, index: int, by: Sequence[str] = ("model", "series")
+    ) -> dict[tuple[Any, ...], Counter[str]]:
+        """Count the values of a register per combination of unit fields."""
+        rows = self._rows(group, index)
+        result: dict[tuple[Any, ...], Counter[str]] = {}
+        for unit, text in zip(self.unit[rows], self.text[rows], strict=True):
+            fields = asdict(self.units[unit])
+            bucket = tuple(fields[field] for field in by)
+            result.setdefault(bucket, Counter())[self.strings[text]] += 1
+        return result
+
+    def units_where(
+        self, group: str, index: int, equals: str | None = None
+    ) -> list[CorpusUnit]:
+        """Return the units whose register reads `equals`, or is nonzero.
+
+        Without `equals`, a non-numeric value counts as set unless it is
+        empty or "None".
+        """
+        rows = self._rows(group, index)
+        if equals is not None:
+            wanted = self.strings.index(equals) if equals in self.strings else -1
+            match = self.text[rows] == wanted
+        else:
+            numbers = self.number[rows]
+            texts = np.array(
+                [self.strings[text] not in ("", "None") for text in self.text[rows]],
+                dtype=bool,
+            )
+            match = np.where(np.isnan(numbers), texts, numbers != 0)
+        return [self.units[unit] for unit in self.unit[rows][match]]
+
+
+def _parse_register(text: str) -> tuple[str, int]:
+    try:
+        ranges = parse_index_ranges(text)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err)) from None
+    spans = [span for group_spans in ranges.values() for span in group_spans]
+    if len(spans) != 1 or spans[0][0] != spans[0][1]:
+        raise argparse.ArgumentTypeError(f"Not a single register: {text!r}")
+    return next(iter(ranges)), spans[0][0]
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index diagnostics downloads")
+    build.add_argument("index", type=Path)
+    build.add_argument("files", nargs="+", type=Path, help="downloads or folders")
+    distribution = commands.add_parser(
+        "distribution", help="values of a register per model and series"
+    )
+    distribution.add_argument("index", type=Path)
+    distribution.add_argument("register", type=_parse_register)
+    distribution.add_argument(
+        "--by", nargs="+", choices=UNIT_FIELDS, default=["model", "series"]
+    )
+    distribution.add_argument("--top", type=int, default=10)
+    units = commands.add_parser("units", help="units where a register is set")
+    units.add_argument("index", type=Path)
+    units.add_argument("register", type=_parse_register)
+    units.add_argument("--equals", help="this value instead of any nonzero one")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Build an index or answer one query on it."""
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "build":
+        count = build_index(args.files, args.index)
+        LOGGER.info("Indexed %s downloads into %s", count, args.index)
+        return
+    corpus = CorpusIndex(args.index)
+    group, index = args.register
+    sys.stdout.write(f"{group} {index} {corpus.name(group, index) or ''}\n")
+    if args.command == "distribution":
+        for bucket, counts in sorted(
+            corpus.distribution(group, index, args.by).items(), key=str
+        ):
+            values = ", ".join(
+                f"{value} ({count})" for value, count in counts.most_common(args.top)
+            )
+            label = " ".join(str(field) for field in bucket)
+            sys.stdout.write(f"  {label}: {values}\n")
+        return
+    matches = corpus.units_where(group, index, args.equals)
+    for unit in matches:
+        sys.stdout.write(
+            f"  {unit.heatpump_id or '-'} {unit.model} {unit.firmware} {unit.file}\n"
+        )
+    sys.stdout.write(f"{len(matches)} of {len(corpus.units)} downloads\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,705 @@
+"""Local emulator of a Luxtronik 2.x controller, for tests and benchmarks.
+
+Speaks the binary protocol exactly as `lux_helper.Luxtronik` expects it on
+the wire: 3003/3004/3005 block reads (the 3004 response carrying its status
+word ahead of the length), 3002 writes acknowledged with the echoed command
+and parameter *index* (not the value, see `_flush_queue`), and the UDP
+discovery reply on 4444/47808. With a `modbus_port`, the same registers are
+also served over Modbus TCP in the layout of
+`modbus_client.LuxModbusMap.mirror()`
+(or the map given). Nothing else about a controller is modelled -
+there is no heating logic, registers only change when written or scripted.
+
+Register values come from a diagnostics download (the `parameters`,
+`calculations` and `visibilities` sections written by `_dump_items`), from
+named values as in `tests/conftest.py`, or from a JSON scenario combining
+either with scripted changes over successive polls.
+
+`EmulatorFaults` reproduces the transport misbehaviour the integration has
+had to handle in the field:
+
+- `latency`: delay before every response;
+- `fragment_size`: responses dribbled out in small TCP segments, which is
+  what the `_read_exact` loop exists for;
+- `drop_ack_probability`: 3002 writes left unacknowledged;
+- `reboot_on_write`: the connection drops on a write and the controller is
+  unreachable for `reboot_duration` seconds (#761);
+- `write_settle_delay`: a written value only becomes readable after a delay,
+  like the set points of #729 that read back stale for a few seconds;
+- `reported_lengths`: a block header announcing a different item count than
+  the payload it precedes, to exercise the oversized-length guard.
+
+Run standalone, it serves until interrupted::
+
+    python -m tools.luxtronik_emulator --dump diagnostics.json --port 8889
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Iterable, Mapping, Sequence
+import contextlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import cache
+import json
+import logging
+from pathlib import Path
+import random
+import socket
+import struct
+import threading
+import time
+from typing import Any, Self
+
+from luxtronik.calculations import Calculations
+from luxtronik.datatypes import Base, Bool, SelectionBase, Timestamp, Version
+from luxtronik.parameters import Parameters
+from luxtronik.visibilities import Visibilities
+
+from custom_components.luxtronik2.lux_helper import (
+    LUXTRONIK_CALCULATIONS_READ,
+    LUXTRONIK_DISCOVERY_MAGIC_PACKET,
+    LUXTRONIK_DISCOVERY_PORTS,
+    LUXTRONIK_DISCOVERY_RESPONSE_PREFIX,
+    LUXTRONIK_PARAMETERS_READ,
+    LUXTRONIK_PARAMETERS_WRITE,
+    LUXTRONIK_VISIBILITIES_READ,
+)
+from tools.modbus_client import MODBUS_EXCEPTION_FLAG, LuxModbusMap, ModbusFunction
+
+LOGGER = logging.getLogger(__name__)
+
+BLOCKS = ("parameters", "calculations", "visibilities")
+
+_READ_COMMANDS = {
+    LUXTRONIK_PARAMETERS_READ: "parameters",
+    LUXTRONIK_CALCULATIONS_READ: "calculations",
+    LUXTRONIK_VISIBILITIES_READ: "visibilities",
+}
+
+# What `diagnostics.TO_REDACT` / `SERIAL_PARAMETER_INDICES` leave in a dump.
+_REDACTED = "**REDACTED**"
+
+# The controller version string occupies calculations 81-89, one character
+# per register (see Calculations.parse()).
+_VERSION_LENGTH = 9
+
+# Modbus exception codes the emulator answers with.
+_MODBUS_ILLEGAL_FUNCTION = 1
+_MODBUS_ILLEGAL_ADDRESS = 2
+_MBAP = struct.Struct(">HHHB")
+
+
+class _ModbusFault(Exception):
+    """A Modbus request the emulator answers with an exception code."""
+
+    def __init__(self, code: int) -> None:
+        super().__init__(code)
+        self.code = code
+
+
+# How often the accept and discovery loops look up from a blocking call to
+# notice `stop()`: closing a listening socket does not wake a thread blocked
+# in accept() on every platform.
+_STOP_POLL_INTERVAL = 0.05
+
+
+def _definitions(block: str) -> dict[int, Base]:
+    """Return the library's datatype per index of `block`.
+
+    The class-level definitions, read only - the same dicts
+    `UPSTREAM_MAX_DEFINED_INDEX` is computed from.
+    """
+    if block == "parameters":
+        return Parameters.parameters
+    if block == "calculations":
+        return Calculations.calculations
+    return Visibilities.visibilities
+
+
+def _default_length(block: str) -> int:
+    return max(_definitions(block)) + 1
+
+
+def _int32(value: int) -> int:
+    """Wrap `value` into the signed 32 bit range the protocol carries."""
+    return (int(value) + 2**31) % 2**32 - 2**31
+
+
+def to_raw(datatype: Base | None, value: Any) -> int:
+    """Convert a decoded value back to the integer the controller sends.
+
+    Inverse of `from_heatpump`, best effort: a value that cannot be mapped
+    back (an unknown selection code shows up as "None") becomes 0.
+    """
+    if value is None or value in (_REDACTED, "None"):
+        return 0
+    if datatype is None:
+        return _int32(round(float(value)))
+    if isinstance(datatype, SelectionBase):
+        if not isinstance(value, str):
+            return _int32(int(value))
+        return _int32(datatype.to_heatpump(value) or 0)
+    if isinstance(datatype, Bool):
+        return int(value in (True, "True", "true", "1", 1))
+    if isinstance(datatype, Timestamp):
+        if not isinstance(value, datetime):
+            value = datetime.fromisoformat(str(value))
+        return _int32(int(value.timestamp()))
+    try:
+        number: Any = float(value)
+    except (TypeError, ValueError):
+        # IP addresses and other strings with their own conversion.
+        return _int32(datatype.to_heatpump(value))
+    raw = round(datatype.to_heatpump(number))
+    # to_heatpump truncates (int(23.3 * 10) == 232), so look at the
+    # neighbours for the raw value that actually decodes to `value`.
+    for candidate in (raw, raw + 1, raw - 1):
+        with contextlib.suppress(TypeError, ValueError):
+            if abs(float(datatype.from_heatpump(candidate)) - number) < 1e-6:
+                return _int32(candidate)
+    return _int32(raw)
+
+
+def _set_version(raw: list[int], index: int, version: str) -> None:
+    chars = [ord(char) for char in version[:_VERSION_LENGTH]]
+    chars += [0] * (_VERSION_LENGTH - len(chars))
+    raw[index : index + _VERSION_LENGTH] = chars
+
+
+def _apply_values(raw: list[int], block: str, values: Mapping[int, Any]) -> None:
+    definitions = _definitions(block)
+    for index, value in sorted(values.items()):
+        datatype = definitions.get(index)
+        if index >= len(raw):
+            raw.extend([0] * (index + 1 - len(raw)))
+        if isinstance(datatype, Version):
+            if len(raw) < index + _VERSION_LENGTH:
+                raw.extend([0] * (index + _VERSION_LENGTH - len(raw)))
+            _set_version(raw, index, str(value))
+        else:
+            raw[index] = to_raw(datatype, value)
+
+
+@cache
+def _indices(block: str) -> dict[str, int]:
+    return {datatype.name: index for index, datatype in _definitions(block).items()}
+
+
+def _index_of(block: str, name: str) -> int:
+    try:
+        return _indices(block)[name]
+    except KeyError:
+        raise KeyError(f"{block} has no register named {name!r}") from None
+
+
+def blocks_from_values(
+    parameters: Mapping[str, Any] | None = None,
+    calculations: Mapping[str, Any] | None = None,
+    visibilities: Mapping[str, Any] | None = None,
+) -> dict[str, list[int]]:
+    """Build full-size raw blocks from decoded values keyed by register name.
+
+    Registers not given, or not defined by the library, read 0. The shape
+    is that of `tests/conftest.py`'s DEFAULT_PARAMETERS /
+    DEFAULT_CALCULATIONS / DEFAULT_VISIBILITIES.
+    """
+    blocks: dict[str, list[int]] = {}
+    for block, values in zip(
+        BLOCKS, (parameters, calculations, visibilities), strict=True
+    ):
+        raw = [0] * _default_length(block)
+        indexed: dict[int, Any] = {}
+        for name, value in (values or {}).items():
+            try:
+                indexed[_index_of(block, name)] = value
+            except KeyError:
+                # Fixture data names a few registers only the integration's
+                # overrides define; they read 0 like any unset register.
+                LOGGER.warning("Skipping unknown %s register %s", block, name)
+        _apply_values(raw, block, indexed)
+        blocks[block] = raw
+    return blocks
+
+
+def blocks_from_dump(dump: Mapping[str, Any]) -> dict[str, list[int]]:
+    """Build raw blocks from a diagnostics download.
+
+    Accepts the file as downloaded (the integration's payload under
+    "data") or that payload itself. Keys are `_dump_items`' "<index> <name>"
+    and values the decoded strings, so the block length is that of the
+    controller the dump came from.
+    """
+    payload = dump.get("data", dump)
+    blocks: dict[str, list[int]] = {}
+    for block in BLOCKS:
+        section: Mapping[str, Any] = payload.get(block) or {}
+        values = {
+            int(key.split(maxsplit=1)[0]): value for key, value in section.items()
+        }
+        raw = [0] * (max(values) + 1 if values else _default_length(block))
+        _apply_values(raw, block, values)
+        blocks[block] = raw
+    return blocks
+
+
+@dataclass
+class EmulatorFaults:
+    """Transport misbehaviour to reproduce; the defaults are a healthy unit."""
+
+    latency: float = 0.0
+    fragment_size: int | None = None
+    fragment_delay: float = 0.001
+    drop_ack_probability: float = 0.0
+    reboot_on_write: bool = False
+    reboot_duration: float = 2.0
+    write_settle_delay: float = 0.0
+    reported_lengths: dict[int, int] = field(default_factory=dict)
+    seed: int | None = None
+
+
+@dataclass
+class ScenarioStep:
+    """Register changes applied once the emulator has served `after_polls`."""
+
+    after_polls: int
+    values: dict[str, dict[int, Any]]
+
+
+def load_scenario(path: Path) -> tuple[dict[str, list[int]], list[ScenarioStep]]:
+    """Read a JSON scenario: initial data plus scripted changes.
+
+    ``{"dump": "diagnostics.json", "values": {"calculations":
+    {"ID_WEB_Temperatur_TVL": 35.0}}, "steps": [{"after_polls": 3, "values":
+    {"calculations": {"ID_WEB_Temperatur_TVL": 40.0}}}]}`` - "dump" is
+    resolved relative to the scenario file, "values" and every step's
+    "values" are decoded values keyed by register name or index.
+    """
+    scenario = json.loads(path.read_text(encoding="utf-8"))
+    if "dump" in scenario:
+        dump_path = path.parent / scenario["dump"]
+        blocks = blocks_from_dump(json.loads(dump_path.read_text(encoding="utf-8")))
+    else:
+        blocks = blocks_from_values()
+    for block, values in _by_index(scenario.get("values", {})).items():
+        _apply_values(blocks[block], block, values)
+    steps = [
+        ScenarioStep(int(step["after_polls"]), _by_index(step.get("values", {})))
+        for step in scenario.get("steps", [])
+    ]
+    return blocks, steps
+
+
+def _by_index(values: Mapping[str, Mapping[str, Any]]) -> dict[str, dict[int, Any]]:
+    return {
+        block: {
+            int(key) if str(key).isdigit() else _index_of(block, key): value
+            for key, value in named.items()
+        }
+        for block, named in values.items()
+    }
+
+
+class LuxtronikEmulator:
+    """A controller on a local TCP port, served from background threads."""
+
+    def __init__(
+        self,
+        blocks: Mapping[str, Sequence[int]],
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: EmulatorFaults | None = None,
+        steps: Iterable[ScenarioStep] = (),
+        calculations_status: int = 0,
+        discovery_ports: Sequence[int] = (),
+        modbus_port: int | None = None,
+        register_map: LuxModbusMap | None = None,
+    ) -> None:
+        self.faults = faults or EmulatorFaults()
+        self.calculations_status = calculations_status
+        self.writes: list[tuple[int, int]] = []
+        self.polls = 0
+        self._blocks = {block: list(blocks[block]) for block in BLOCKS}
+        self._steps = sorted(steps, key=lambda step: step.after_polls)
+        self._pending_writes: list[tuple[float, int, int]] = []
+        self._down_until = 0.0
+        self._random = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._connections: set[socket.socket] = set()
+        self._server = socket.create_server((host, port))
+        self._server.settimeout(_STOP_POLL_INTERVAL)
+        self._address: tuple[str, int] = self._server.getsockname()[:2]
+        # (function, first register, count) of every Modbus read served.
+        self.modbus_reads: list[tuple[int, int, int]] = []
+        self._register_map = register_map or LuxModbusMap.mirror()
+        self._modbus_server: socket.socket | None = None
+        if modbus_port is not None:
+            self._modbus_server = socket.create_server((host, modbus_port))
+            self._modbus_server.settimeout(_STOP_POLL_INTERVAL)
+        self._discovery_sockets = [
+            self._bind_discovery(host, discovery_port)
+            for discovery_port in discovery_ports
+        ]
+        self._discovery_addresses: list[tuple[str, int]] = [
+            sock.getsockname()[:2] for sock in self._discovery_sockets
+        ]
+
+    @classmethod
+    def from_dump(cls, dump: Mapping[str, Any], **kwargs: Any) -> Self:
+        """Serve the registers of a diagnostics download."""
+        return cls(blocks_from_dump(dump), **kwargs)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Host and TCP port the emulator listens on."""
+        return self._address
+
+    @property
+    def modbus_address(self) -> tuple[str, int]:
+        """Host and TCP port of the Modbus listener."""
+        if self._modbus_server is None:
+            raise RuntimeError("The emulator was started without a Modbus port")
+        return self._modbus_server.getsockname()[:2]
+
+    @property
+    def discovery_addresses(self) -> list[tuple[str, int]]:
+        """Host and UDP port of every discovery listener."""
+        return list(self._discovery_addresses)
+
+    def raw(self, block: str) -> list[int]:
+        """Return a copy of the registers of `block` as currently served."""
+        with self._lock:
+            self._apply_due_writes()
+            return list(self._blocks[block])
+
+    def set_raw(self, block: str, index: int, value: int) -> None:
+        """Change one register, as the controller itself would."""
+        with self._lock:
+            self._blocks[block][index] = _int32(value)
+
+    def start(self) -> Self:
+        """Start serving."""
+        self._spawn(self._accept_loop, self._server, self._serve)
+        if self._modbus_server is not None:
+            self._spawn(self._accept_loop, self._modbus_server, self._serve_modbus)
+        for sock in self._discovery_sockets:
+            self._spawn(self._discovery_loop, sock)
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close every socket."""
+        self._stopped.set()
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            with contextlib.suppress(OSError):
+                conn.shutdown(socket.SHUT_RDWR)
+            with contextlib.suppress(OSError):
+                conn.close()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._server.close()
+        if self._modbus_server is not None:
+            self._modbus_server.close()
+        for sock in self._discovery_sockets:
+            sock.close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _spawn(self, target: Any, *args: Any) -> None:
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    @staticmethod
+    def _bind_discovery(host: str, port: int) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.settimeout(_STOP_POLL_INTERVAL)
+        return sock
+
+    def _discovery_loop(self, sock: socket.socket) -> None:
+        magic = LUXTRONIK_DISCOVERY_MAGIC_PACKET.encode()
+        reply = f"{LUXTRONIK_DISCOVERY_RESPONSE_PREFIX}{self.address[1]};".encode()
+        while not self._stopped.is_set():
+            try:
+                data, sender = sock.recvfrom(1024)
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            if data == magic:
+                with contextlib.suppress(OSError):
+                    sock.sendto(reply, sender)
+
+    def _accept_loop(
+        self, server: socket.socket, serve: Callable[[socket.socket], None]
+    ) -> None:
+        while not self._stopped.is_set():
+            try:
+                conn, _ = server.accept()
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            if time.monotonic() < self._down_until:
+                # Still "rebooting": the port answers, the controller does not.
+                conn.close()
+                continue
+            # Accepted sockets inherit the listener's timeout; a client may
+            # idle between polls for as long as it likes.
+            conn.settimeout(None)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self._connections.add(conn)
+            self._spawn(serve, conn)
+
+    def _serve(self, conn: socket.socket) -> None:
+        try:
+            while not self._stopped.is_set():
+                header = self._recv_exact(conn, 8)
+                if header is None:
+                    return
+                command, argument = struct.unpack(">ii", header)
+                if command == LUXTRONIK_PARAMETERS_WRITE:
+                    payload = self._recv_exact(conn, 4)
+                    if payload is None:
+                        return
+                    if not self._write(conn, argument, struct.unpack(">i", payload)[0]):
+                        return
+                elif command in _READ_COMMANDS:
+                    self._send(conn, self._read_response(command))
+                else:
+                    LOGGER.warning("Unknown command %s, closing connection", command)
+                    return
+        except OSError:
+            return
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+            with contextlib.suppress(OSError):
+                conn.close()
+
+    def _serve_modbus(self, conn: socket.socket) -> None:
+        try:
+            while not self._stopped.is_set():
+                header = self._recv_exact(conn, _MBAP.size)
+                if header is None:
+                    return
+                transaction, _, length, unit = _MBAP.unpack(header)
+                pdu = self._recv_exact(conn, length - 1)
+                if pdu is None:
+                    return
+                try:
+                    response = self._modbus_response(pdu[0], pdu[1:])
+                except _ModbusFault as fault:
+                    response = bytes((pdu[0] | MODBUS_EXCEPTION_FLAG, fault.code))
+                self._send(
+                    conn,
+                    _MBAP.pack(transaction, 0, len(response) + 1, unit) + response,
+                )
+        except OSError:
+            return
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+            with contextlib.suppress(OSError):
+                conn.close()
+
+    def _modbus_response(self, function: int, data: bytes) -> bytes:
+        """Answer one Modbus PDU; raise _ModbusFault for an exception response."""
+        if function in (
+            ModbusFunction.READ_HOLDING_REGISTERS,
+            ModbusFunction.READ_INPUT_REGISTERS,
+        ):
+            start, count = struct.unpack(">HH", data[:4])
+            with self._lock:
+                self.modbus_reads.append((function, start, count))
+                self._apply_due_writes()
+                words = [
+                    self._modbus_word(function, address)
+                    for address in range(start, start + count)
+                ]
+            return bytes((function, 2 * count)) + struct.pack(f">{count}H", *words)
+        if function == ModbusFunction.WRITE_MULTIPLE_REGISTERS:
+            address, count = struct.unpack(">HH", data[:4])
+            key = self._register_map.locate(
+                ModbusFunction.READ_HOLDING_REGISTERS, address
+            )
+            if key is None or key[0] != "parameters" or count != 2:
+                raise _ModbusFault(_MODBUS_ILLEGAL_ADDRESS)
+            value = struct.unpack(">i", data[5:9])[0]
+            with self._lock:
+                self.writes.append((key[1], value))
+                due = time.monotonic() + self.faults.write_settle_delay
+                self._pending_writes.append((due, key[1], value))
+                self._apply_due_writes()
+            return bytes((function,)) + data[:4]
+        raise _ModbusFault(_MODBUS_ILLEGAL_FUNCTION)
+
+    def _modbus_word(self, function: int, address: int) -> int:
+        """Return one 16 bit register: a half of a mapped 32 bit value."""
+        for word, first in enumerate((address, address - 1)):
+            key = self._register_map.locate(function, first)
+            if key is None:
+                continue
+            block, index = key
+            values = self._blocks[block]
+            value = values[index] if index < len(values) else 0
+            return struct.unpack(">2H", struct.pack(">i", value))[word]
+        raise _ModbusFault(_MODBUS_ILLEGAL_ADDRESS)
+
+    @staticmethod
+    def _recv_exact(conn: socket.socket, count: int) -> bytes | None:
+        chunks = b""
+        while len(chunks) < count:
+            chunk = conn.recv(count - len(chunks))
+            if not chunk:
+                return None
+            chunks += chunk
+        return chunks
+
+    def _read_response(self, command: int) -> bytes:
+        block = _READ_COMMANDS[command]
+        with self._lock:
+            if command == LUXTRONIK_PARAMETERS_READ:
+                # A poll reads parameters first; count polls there, so a
+                # step lands between polls rather than inside one.
+                self.polls += 1
+                self._apply_steps()
+            self._apply_due_writes()
+            values = list(self._blocks[block])
+        length = self.faults.reported_lengths.get(command, len(values))
+        if command == LUXTRONIK_CALCULATIONS_READ:
+            header = struct.pack(">iii", command, self.calculations_status, length)
+        else:
+            header = struct.pack(">ii", command, length)
+        item = "b" if command == LUXTRONIK_VISIBILITIES_READ else "i"
+        return header + struct.pack(f">{len(values)}{item}", *values)
+
+    def _write(self, conn: socket.socket, index: int, value: int) -> bool:
+        """Store a 3002 write; return False if the connection is gone."""
+        with self._lock:
+            self.writes.append((index, value))
+            due = time.monotonic() + self.faults.write_settle_delay
+            self._pending_writes.append((due, index, value))
+            self._apply_due_writes()
+        if self.faults.reboot_on_write:
+            self._down_until = time.monotonic() + self.faults.reboot_duration
+            return False
+        if self._random.random() < self.faults.drop_ack_probability:
+            return True
+        self._send(conn, struct.pack(">ii", LUXTRONIK_PARAMETERS_WRITE, index))
+        return True
+
+    def _apply_due_writes(self) -> None:
+        now = time.monotonic()
+        remaining = []
+        for due, index, value in self._pending_writes:
+            if due <= now:
+                self._blocks["parameters"][index] = _int32(value)
+            else:
+                remaining.append((due, index, value))
+        self._pending_writes = remaining
+
+    def _apply_steps(self) -> None:
+        while self._steps and self._steps[0].after_polls <= self.polls:
+            step = self._steps.pop(0)
+            for block, values in step.values.items():
+                _apply_values(self._blocks[block], block, values)
+
+    def _send(self, conn: socket.socket, data: bytes) -> None:
+        if self.faults.latency:
+            time.sleep(self.faults.latency)
+        size = self.faults.fragment_size
+        if not size:
+            conn.sendall(data)
+            return
+        for start in range(0, len(data), size):
+            conn.sendall(data[start : start + size])
+            time.sleep(self.faults.fragment_delay)
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--dump", type=Path, help="diagnostics download to serve")
+    source.add_argument("--scenario", type=Path, help="JSON scenario to serve")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8889)
+    parser.add_argument(
+        "--modbus-port", type=int, help="also serve the registers over Modbus TCP"
+    )
+    parser.add_argument(
+        "--discovery", action="store_true", help="answer UDP discovery on 4444/47808"
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fragment-size", type=int)
+    parser.add_argument("--drop-ack-probability", type=float, default=0.0)
+    parser.add_argument("--reboot-on-write", action="store_true")
+    parser.add_argument("--reboot-duration", type=float, default=2.0)
+    parser.add_argument("--write-settle-delay", type=float, default=0.0)
+    parser.add_argument(
+        "--reported-length",
+        action="append",
+        default=[],
+        metavar="COMMAND=LENGTH",
+        help="announce LENGTH items in the header of COMMAND (3003/3004/3005)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Serve an emulated controller until interrupted."""
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    steps: list[ScenarioStep] = []
+    if args.scenario is not None:
+        blocks, steps = load_scenario(args.scenario)
+    elif args.dump is not None:
+        blocks = blocks_from_dump(json.loads(args.dump.read_text(encoding="utf-8")))
+    else:
+        blocks = blocks_from_values()
+    faults = EmulatorFaults(
+        latency=args.latency,
+        fragment_size=args.fragment_size,
+        drop_ack_probability=args.drop_ack_probability,
+        reboot_on_write=args.reboot_on_write,
+        reboot_duration=args.reboot_duration,
+        write_settle_delay=args.write_settle_delay,
+        reported_lengths={
+            int(command): int(length)
+            for command, length in (
+                option.split("=", 1) for option in args.reported_length
+            )
+        },
+    )
+    emulator = LuxtronikEmulator(
+        blocks,
+        host=args.host,
+        port=args.port,
+        faults=faults,
+        steps=steps,
+        discovery_ports=LUXTRONIK_DISCOVERY_PORTS if args.discovery else (),
+        modbus_port=args.modbus_port,
+    )
+    with emulator:
+        LOGGER.info("Emulated Luxtronik controller on %s:%s", *emulator.address)
+        if args.modbus_port is not None:
+            LOGGER.info("Modbus TCP on %s:%s", *emulator.modbus_address)
+        with contextlib.suppress(KeyboardInterrupt):
+            while True:
+                time.sleep(3600)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""Local proxy sharing one Luxtronik controller connection between many clients.
+
+A controller accepts very few simultaneous TCP connections, and every client
+polls it on its own schedule: a production and a test Home Assistant, a
+vendor tool and a script each open their own socket on 8889, and the
+controller starts refusing or resetting them.
+
+The proxy holds the only upstream connection, a `lux_helper.Luxtronik`
+client, and speaks the controller's protocol to any number of downstream
+clients:
+
+- 3003/3004/3005 reads are served from a cache per block. A block older than
+  `max_age` is read again on the next request for it; requests arriving while
+  that read is in flight wait for it rather than starting their own. However
+  many clients poll, the controller sees at most one read per block per
+  `max_age`.
+- 3002 writes are passed through one at a time and acknowledged only once the
+  controller has acknowledged them. A write drops the cached parameters, so
+  the next read - typically the writer confirming its value - is fresh.
+
+When the controller cannot be read, or a write fails, the downstream
+connection is closed, as the controller itself would: clients already
+handle that and reconnect. Run it on a host that can reach the controller
+and point every client at the proxy instead::
+
+    python -m tools.luxtronik_proxy --upstream 192.168.1.50 --port 8889
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+import contextlib
+from dataclasses import dataclass
+import logging
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Self
+
+from custom_components.luxtronik2.const import DEFAULT_MAX_DATA_LENGTH, DEFAULT_PORT
+from custom_components.luxtronik2.lux_helper import (
+    LUXTRONIK_CALCULATIONS_READ,
+    LUXTRONIK_PARAMETERS_READ,
+    LUXTRONIK_PARAMETERS_WRITE,
+    LUXTRONIK_VISIBILITIES_READ,
+    Luxtronik,
+)
+from custom_components.luxtronik2.session_log import encode_values
+
+LOGGER = logging.getLogger(__name__)
+
+_READ_COMMANDS = (
+    LUXTRONIK_PARAMETERS_READ,
+    LUXTRONIK_CALCULATIONS_READ,
+    LUXTRONIK_VISIBILITIES_READ,
+)
+
+# Default freshness of a cached block: the integration's fastest update
+# interval, so a Home Assistant polling at that rate always gets new data.
+DEFAULT_MAX_AGE = 10.0
+DEFAULT_UPSTREAM_TIMEOUT = 60.0
+
+
+@dataclass
+class ProxyCounters:
+    """What the proxy did since it started."""
+
+    upstream_reads: int = 0
+    cache_hits: int = 0
+    writes: int = 0
+    failures: int = 0
+
+
+class _CachedBlock:
+    """The encoded response of one block and when it was read upstream."""
+
+    __slots__ = ("fetched", "response")
+
+    def __init__(self, response: bytes, fetched: float) -> None:
+        self.response = response
+        self.fetched = fetched
+
+
+class LuxtronikProxy:
+    """Serves one upstream controller to many downstream clients."""
+
+    def __init__(
+        self,
+        upstream: Luxtronik,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        self.upstream = upstream
+        self.max_age = max_age
+        self.counters = ProxyCounters()
+        # Held for every upstream exchange: the controller sees one request
+        # at a time, and a block that went stale is read once, not once per
+        # waiting client.
+        self._upstream_lock = threading.Lock()
+        self._cache: dict[int, _CachedBlock] = {}
+        self._server = _ThreadingServer((host, port), _Handler)
+        self._server.proxy = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Host and TCP port the proxy listens on."""
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> Self:
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving, close the downstream and the upstream connections."""
+        self._server.shutdown()
+        self._server.close_connections()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        with self._upstream_lock:
+            self.upstream.disconnect()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def read_response(self, command: int) -> bytes | None:
+        """Return the response to a block read, or None if it cannot be read."""
+        with self._upstream_lock:
+            cached = self._cache.get(command)
+            if cached is not None and time.monotonic() - cached.fetched < self.max_age:
+                self.counters.cache_hits += 1
+                return cached.response
+            try:
+                values = self.upstream.read_block(command)
+            except OSError as err:
+                LOGGER.warning("Upstream read of %s failed: %s", command, err)
+                values = None
+            if values is None:
+                self.counters.failures += 1
+                return None
+            self.counters.upstream_reads += 1
+            response = self._encode(command, values)
+            self._cache[command] = _CachedBlock(response, time.monotonic())
+            return response
+
+    def write(self, index: int, value: int) -> bool:
+        """Pass one parameter write upstream; True once it was acknowledged."""
+        with self._upstream_lock:
+            # Whatever the outcome, the cached parameters may now be wrong.
+            self._cache.pop(LUXTRONIK_PARAMETERS_READ, None)
+            self.upstream.parameters.queue = {index: value}
+            try:
+                self.upstream.write()
+            except (OSError, struct.error) as err:
+                LOGGER.warning("Upstream write of parameter %s failed: %s", index, err)
+                self.counters.failures += 1
+                return False
+            self.counters.writes += 1
+            return True
+
+    def _encode(self, command: int, values: list[int]) -> bytes:
+        if command == LUXTRONIK_CALCULATIONS_READ:
+            header = struct.pack(
+                ">iii", command, self.upstream.calculations_status, len(values)
+            )
+        else:
+            header = struct.pack(">ii", command, len(values))
+        return header + encode_values(command, values)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    proxy: LuxtronikProxy
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._connections: set[socket.socket] = set()
+        self._connections_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def track(self, conn: socket.socket, open_: bool) -> None:
+        with self._connections_lock:
+            if open_:
+                self._connections.add(conn)
+            else:
+                self._connections.discard(conn)
+
+    def close_connections(self) -> None:
+        """Wake every handler blocked in recv so their threads end."""
+        with self._connections_lock:
+            connections = list(self._connections)
+        for conn in connections:
+            with contextlib.suppress(OSError):
+                conn.shutdown(socket.SHUT_RDWR)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """One downstream client, served until it disconnects."""
+
+    request: socket.socket
+    server: _ThreadingServer
+
+    def handle(self) -> None:
+        proxy = self.server.proxy
+        conn = self.request
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.track(conn, True)
+        try:
+            while True:
+                header = self._recv_exact(8)
+                if header is None:
+                    return
+                command, argument = struct.unpack(">ii", header)
+                if command == LUXTRONIK_PARAMETERS_WRITE:
+                    payload = self._recv_exact(4)
+                    if payload is None:
+                        return
+                    if not proxy.write(argument, struct.unpack(">i", payload)[0]):
+                        return
+                    conn.sendall(
+                        struct.pack(">ii", LUXTRONIK_PARAMETERS_WRITE, argument)
+                    )
+                elif command in _READ_COMMANDS:
+                    response = proxy.read_response(command)
+                    if response is None:
+                        return
+                    conn.sendall(response)
+                else:
+                    LOGGER.warning("Unknown command %s, closing connection", command)
+                    return
+        except OSError:
+            return
+        finally:
+            self.server.track(conn, False)
+
+    def _recv_exact(self, count: int) -> bytes | None:
+        chunks = b""
+        while len(chunks) < count:
+            chunk = self.request.recv(count - len(chunks))
+            if not chunk:
+                return None
+            chunks += chunk
+        return chunks
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--upstream", required=True, help="controller host")
+    parser.add_argument("--upstream-port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--upstream-timeout", type=float, default=DEFAULT_UPSTREAM_TIMEOUT
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE,
+        help="seconds a block is served from the cache before it is read again",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Proxy a controller until interrupted."""
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    upstream = Luxtronik(
+        args.upstream,
+        args.upstream_port,
+        args.upstream_timeout,
+        DEFAULT_MAX_DATA_LENGTH,
+        safe=False,
+    )
+    proxy = LuxtronikProxy(
+        upstream, host=args.host, port=args.port, max_age=args.max_age
+    )
+    with proxy:
+        LOGGER.info(
+            "Proxying %s:%s on %s:%s", args.upstream, args.upstream_port, *proxy.address
+        )
+        with contextlib.suppress(KeyboardInterrupt):
+            while True:
+                time.sleep(3600)
+                LOGGER.info("%s", proxy.counters)
+
+
+if __name__ == "__main__":
+    main()
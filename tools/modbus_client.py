@@ -0,0 +1,506 @@
+"""Modbus TCP client against the emulator's register layout, for experiments.
+
+The Luxtronik protocol on port 8889 only knows whole blocks: every poll is
+three requests returning about 1900 values, however few of them Home
+Assistant actually shows. Over Modbus TCP any range of registers can be
+read and a single one written.
+
+`LuxtronikModbusClient` stands in for `lux_helper.Luxtronik` - the same
+parsers, `raw_blocks`, `stats`, `read` and `write` - but talks Modbus:
+
+- Each register of the three blocks has an address in a `LuxModbusMap`.
+  Parameters are holding registers; calculations and visibilities are input
+  registers. A value takes two 16 bit registers, high word first, and is the
+  same raw integer the 8889 protocol sends, so the library's datatypes
+  decode it unchanged.
+- A routine poll reads only the registers that were read through the
+  parsers since the last full read. Entities and the coordinator read every
+  value with `get`, so a disabled entity's registers drop out and a register
+  the coordinator derives state from stays in. The first poll, and one every
+  `MODBUS_FULL_READ_INTERVAL`, reads every mapped register and starts the
+  count over, which forgets registers nothing reads any more.
+- Registers are coalesced into range reads: neighbours up to
+  `MODBUS_MAX_GAP` registers apart share one request, up to the 125
+  registers a Modbus read may return.
+- A write is one "write multiple registers" request per parameter. The
+  reads that confirm it (see coordinator.async_write_many) read back only
+  the written registers, until each one holds its written value or
+  `MODBUS_CONFIRM_READS` reads have passed.
+
+The only map, `LuxModbusMap.mirror()`, lays the registers out by their
+Luxtronik index, and tools/luxtronik_emulator.py serves that layout with
+`--modbus-port`. It is not the numbering of any real firmware: on a
+controller it would read and write the wrong registers, so it lives here and
+not in the integration. Supporting a controller needs a map of its own,
+built from `ModbusRegister` entries the same way and checked against that
+firmware's register table.
+
+The session log is not written on this transport: it records exchanges of
+the 8889 protocol (see session_log.py).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from enum import IntEnum
+import itertools
+import struct
+import time
+from typing import Any, NamedTuple, Self
+
+from luxtronik.calculations import Calculations
+from luxtronik.parameters import Parameters
+from luxtronik.visibilities import Visibilities
+
+from custom_components.luxtronik2.const import (
+    CONF_CALCULATIONS,
+    CONF_PARAMETERS,
+    CONF_VISIBILITIES,
+    LOGGER,
+    LuxPollStat,
+)
+from custom_components.luxtronik2.lux_helper import (
+    CALCULATIONS_VERSION_RANGE,
+    LUXTRONIK_CALCULATIONS_READ,
+    LUXTRONIK_PARAMETERS_READ,
+    LUXTRONIK_VISIBILITIES_READ,
+    Luxtronik,
+    apply_changed_registers,
+)
+
+_BLOCKS = (CONF_PARAMETERS, CONF_CALCULATIONS, CONF_VISIBILITIES)
+_BLOCK_BY_COMMAND = {
+    LUXTRONIK_PARAMETERS_READ: CONF_PARAMETERS,
+    LUXTRONIK_CALCULATIONS_READ: CONF_CALCULATIONS,
+    LUXTRONIK_VISIBILITIES_READ: CONF_VISIBILITIES,
+}
+
+MODBUS_UNIT_ID = 1
+# Every mapped register is read at least this often; in between, only the
+# registers read since the last full read are polled.
+MODBUS_FULL_READ_INTERVAL = 3600
+# Registers one read request may return, by the Modbus specification.
+MODBUS_MAX_REGISTERS = 125
+# Reading a few registers nobody asked for is cheaper than a round trip of
+# its own: neighbours at most this many registers apart share a request.
+MODBUS_MAX_GAP = 8
+# First input register of the visibilities in the mirrored layout, clear of
+# the calculations below it.
+MODBUS_VISIBILITIES_BASE = 5000
+# Polls that read back only the written registers after a write. Matches the
+# coordinator's WRITE_CONFIRM_MAX_ATTEMPTS, after which it gives up anyway.
+MODBUS_CONFIRM_READS = 6
+# Bit set in the function code of an exception response.
+MODBUS_EXCEPTION_FLAG = 0x80
+
+# Transaction, protocol (always 0), length of what follows, unit.
+_MBAP = struct.Struct(">HHHB")
+# Registers per value: the raw values are 32 bit.
+_WORDS = 2
+
+
+class ModbusFunction(IntEnum):
+    """The Modbus function codes this transport uses."""
+
+    READ_HOLDING_REGISTERS = 3
+    READ_INPUT_REGISTERS = 4
+    WRITE_MULTIPLE_REGISTERS = 16
+
+
+class ModbusExceptionError(OSError):
+    """The controller answered a request with a Modbus exception code.
+
+    An OSError, like every other failed exchange: the client disconnects and
+    the coordinator reports the poll as failed.
+    """
+
+    def __init__(self, function: int, code: int) -> None:
+        super().__init__(f"Modbus function {function} failed with exception {code}")
+        self.function = function
+        self.code = code
+
+
+class ModbusRegister(NamedTuple):
+    """Where one Luxtronik value lives: read function and first register."""
+
+    function: ModbusFunction
+    address: int
+
+
+class ModbusRange(NamedTuple):
+    """One read request and the values it returns.
+
+    `members` holds block, index and the offset of the value in the range,
+    in registers.
+    """
+
+    function: ModbusFunction
+    start: int
+    count: int
+    members: tuple[tuple[str, int, int], ...]
+
+
+class LuxModbusMap:
+    """The Modbus register of each (block, index) a controller exposes."""
+
+    def __init__(self, registers: Mapping[tuple[str, int], ModbusRegister]) -> None:
+        self._registers = dict(registers)
+        self._locations = {register: key for key, register in self._registers.items()}
+        self.lengths = {
+            block: 1 + max((i for b, i in self._registers if b == block), default=-1)
+            for block in _BLOCKS
+        }
+
+    @classmethod
+    def mirror(cls) -> Self:
+        """Lay out every register the library defines by its Luxtronik index.
+
+        The emulator's layout, for tests and benchmarks; not a real firmware's.
+        """
+        registers: dict[tuple[str, int], ModbusRegister] = {}
+        layout = (
+            (
+                CONF_PARAMETERS,
+                Parameters.parameters,
+                ModbusFunction.READ_HOLDING_REGISTERS,
+                0,
+            ),
+            (
+                CONF_CALCULATIONS,
+                Calculations.calculations,
+                ModbusFunction.READ_INPUT_REGISTERS,
+                0,
+            ),
+            (
+                CONF_VISIBILITIES,
+                Visibilities.visibilities,
+                ModbusFunction.READ_INPUT_REGISTERS,
+                MODBUS_VISIBILITIES_BASE,
+            ),
+        )
+        for block, definitions, function, base in layout:
+            for index in range(max(definitions) + 1):
+                registers[block, index] = ModbusRegister(
+                    function, base + _WORDS * index
+                )
+        return cls(registers)
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        return iter(self._registers)
+
+    def register(self, block: str, index: int) -> ModbusRegister | None:
+        """Return the register of a value, or None if it is not mapped."""
+        return self._registers.get((block, index))
+
+    def locate(self, function: int, address: int) -> tuple[str, int] | None:
+        """Return the (block, index) whose value starts at `address`."""
+        try:
+            return self._locations.get(
+                ModbusRegister(ModbusFunction(function), address)
+            )
+        except ValueError:
+            return None
+
+    def ranges(
+        self, keys: Iterable[tuple[str, int]], max_gap: int = MODBUS_MAX_GAP
+    ) -> list[ModbusRange]:
+        """Coalesce the registers of `keys` into as few read requests as fit."""
+        located = sorted(
+            (register.function, register.address, block, index)
+            for block, index in set(keys)
+            if (register := self._registers.get((block, index))) is not None
+        )
+        ranges: list[ModbusRange] = []
+        members: list[tuple[str, int, int]] = []
+        function = ModbusFunction.READ_INPUT_REGISTERS
+        start = end = 0
+        for next_function, address, block, index in located:
+            if members and (
+                next_function != function
+                or address - end > max_gap
+                or address + _WORDS - start > MODBUS_MAX_REGISTERS
+            ):
+                ranges.append(ModbusRange(function, start, end - start, tuple(members)))
+                members = []
+            if not members:
+                function, start, end = next_function, address, address
+            members.append((block, index, address - start))
+            end = max(end, address + _WORDS)
+        if members:
+            ranges.append(ModbusRange(function, start, end - start, tuple(members)))
+        return ranges
+
+
+class RegisterDemand:
+    """The (block, index) of every value read through the parsers."""
+
+    def __init__(self) -> None:
+        self._keys_by_item: dict[int, tuple[str, int]] = {}
+        self.keys: set[tuple[str, int]] = set()
+
+    def watch(self, block: str, items: Mapping[int, Any]) -> None:
+        """Count reads of the items of one parser."""
+        for index, item in items.items():
+            self._keys_by_item[id(item)] = (block, index)
+
+    def note(self, item: Any) -> None:
+        """Record that `item` was read."""
+        key = self._keys_by_item.get(id(item))
+        if key is None:
+            return
+        block, index = key
+        if block == CONF_CALCULATIONS and index in CALCULATIONS_VERSION_RANGE:
+            # The version string is decoded from all of its registers.
+            self.keys.update(
+                (CONF_CALCULATIONS, version_index)
+                for version_index in CALCULATIONS_VERSION_RANGE
+            )
+        else:
+            self.keys.add(key)
+
+
+class _DemandParameters(Parameters):
+    def __init__(self, demand: RegisterDemand, safe: bool = True) -> None:
+        super().__init__(safe=safe)
+        self.demand = demand
+        demand.watch(CONF_PARAMETERS, self.parameters)
+
+    def get(self, target: Any) -> Any:
+        item = super().get(target)
+        self.demand.note(item)
+        return item
+
+
+class _DemandCalculations(Calculations):
+    def __init__(self, demand: RegisterDemand) -> None:
+        super().__init__()
+        self.demand = demand
+        demand.watch(CONF_CALCULATIONS, self.calculations)
+
+    def get(self, target: Any) -> Any:
+        item = super().get(target)
+        self.demand.note(item)
+        return item
+
+
+class _DemandVisibilities(Visibilities):
+    def __init__(self, demand: RegisterDemand) -> None:
+        super().__init__()
+        self.demand = demand
+        demand.watch(CONF_VISIBILITIES, self.visibilities)
+
+    def get(self, target: Any) -> Any:
+        item = super().get(target)
+        self.demand.note(item)
+        return item
+
+
+class LuxtronikModbusClient(Luxtronik):
+    """A `Luxtronik` that polls and writes over Modbus TCP."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        socket_timeout: float,
+        max_data_length: int,
+        safe: bool = True,
+        register_map: LuxModbusMap | None = None,
+        unit_id: int = MODBUS_UNIT_ID,
+    ) -> None:
+        super().__init__(host, port, socket_timeout, max_data_length, safe=safe)
+        self.register_map = register_map or LuxModbusMap.mirror()
+        self.demand = RegisterDemand()
+        self.parameters = _DemandParameters(self.demand, safe=safe)
+        self.calculations = _DemandCalculations(self.demand)
+        self.visibilities = _DemandVisibilities(self.demand)
+        self._unit_id = unit_id
+        self._transactions = itertools.count(1)
+        self._last_full_read: float | None = None
+        # Written parameter values not yet read back, and how many polls
+        # have read them back so far.
+        self._unconfirmed: dict[int, int] = {}
+        self._confirm_reads = 0
+        # Range requests the last poll took.
+        self.last_requests = 0
+
+    def read(self) -> None:
+        """Poll what is being read, or everything when a full read is due."""
+        self.stats.mark_call_started()
+        if self._unconfirmed:
+            self._poll((CONF_PARAMETERS, index) for index in self._unconfirmed)
+            self._check_confirmed()
+            return
+        last = self._last_full_read
+        if last is None or time.monotonic() - last >= MODBUS_FULL_READ_INTERVAL:
+            self._poll(None, _BLOCKS)
+            return
+        self._poll(set(self.demand.keys))
+
+    def read_identity(self) -> None:
+        """Read every mapped parameter and calculation, nothing else."""
+        self.stats.mark_call_started()
+        self._poll(None, (CONF_PARAMETERS, CONF_CALCULATIONS))
+
+    def read_block(self, command: int) -> list[int] | None:
+        """Read every mapped register of the block of a 3003/3004/3005 `command`."""
+        block = _BLOCK_BY_COMMAND[command]
+        self.stats.mark_call_started()
+        self._poll(None, (block,))
+        return self.raw_blocks.get(block)
+
+    def write(self) -> None:
+        """Write each queued parameter, then have the next polls confirm them.
+
+        Like the 8889 client, the queue is emptied whether or not the writes
+        succeed (see `Luxtronik._write`).
+        """
+        self.stats.mark_call_started()
+        self._confirm_reads = 0
+        try:
+            self.connect()
+            for index, value in list(self.parameters.queue.items()):
+                if isinstance(value, float):
+                    value = int(value)
+                if not isinstance(index, int) or not isinstance(value, int):
+                    LOGGER.warning(
+                        "Parameter id '%s' or value '%s' invalid!", index, value
+                    )
+                    continue
+                register = self.register_map.register(CONF_PARAMETERS, index)
+                if (
+                    register is None
+                    or register.function != ModbusFunction.READ_HOLDING_REGISTERS
+                ):
+                    raise ValueError(
+                        f"Parameter {index} has no holding register in the Modbus map"
+                    )
+                sent = time.monotonic()
+                self._write_registers(register.address, struct.pack(">i", value))
+                self.stats.record(LuxPollStat.WRITE_ACK_TIME, time.monotonic() - sent)
+                self._unconfirmed[index] = value
+                LOGGER.debug("Parameter '%d' set to '%s' over Modbus", index, value)
+        except (OSError, struct.error):
+            self._disconnect()
+            raise
+        finally:
+            self.parameters.queue = {}
+
+    def _check_confirmed(self) -> None:
+        """Drop written values that read back; give up after a few polls."""
+        data = self.raw_blocks.get(CONF_PARAMETERS, [])
+        self._unconfirmed = {
+            index: value
+            for index, value in self._unconfirmed.items()
+            if index >= len(data) or data[index] != value
+        }
+        self._confirm_reads += 1
+        if self._confirm_reads >= MODBUS_CONFIRM_READS:
+            self._unconfirmed = {}
+
+    def _poll(
+        self,
+        keys: Iterable[tuple[str, int]] | None,
+        blocks: Iterable[str] = _BLOCKS,
+    ) -> None:
+        """Read the registers of `keys`, or all mapped ones of `blocks`."""
+        full = keys is None
+        blocks = tuple(blocks)
+        if keys is None:
+            keys = [key for key in self.register_map if key[0] in blocks]
+        ranges = self.register_map.ranges(keys)
+        values: dict[str, dict[int, int]] = {block: {} for block in _BLOCKS}
+        self._poll_bytes = 0
+        try:
+            self.connect()
+            for request in ranges:
+                data = self._read_registers(
+                    request.function, request.start, request.count
+                )
+                for block, index, offset in request.members:
+                    values[block][index] = struct.unpack_from(">i", data, offset * 2)[0]
+        except (OSError, struct.error):
+            self._disconnect()
+            raise
+        self.last_requests = len(ranges)
+        self.stats.record(LuxPollStat.POLL_BYTES, self._poll_bytes)
+        self._apply(values)
+        if full and blocks == _BLOCKS:
+            self._last_full_read = time.monotonic()
+            self.demand.keys.clear()
+
+    def _apply(self, values: Mapping[str, Mapping[int, int]]) -> None:
+        """Merge the values read into `raw_blocks` and decode what changed."""
+        containers = (
+            (CONF_PARAMETERS, self.parameters, self.parameters.parameters, None),
+            (
+                CONF_CALCULATIONS,
+                self.calculations,
+                self.calculations.calculations,
+                CALCULATIONS_VERSION_RANGE,
+            ),
+            (
+                CONF_VISIBILITIES,
+                self.visibilities,
+                self.visibilities.visibilities,
+                None,
+            ),
+        )
+        for block, parser, items, full_parse_range in containers:
+            changed = values[block]
+            if not changed:
+                continue
+            previous = self.raw_blocks.get(block)
+            data = list(previous) if previous is not None else []
+            length = max(self.register_map.lengths[block], max(changed) + 1)
+            if len(data) < length:
+                data.extend([0] * (length - len(data)))
+            for index, value in changed.items():
+                data[index] = value
+            apply_changed_registers(parser, items, previous, data, full_parse_range)
+            self.raw_blocks[block] = data
+
+    def _request(self, function: ModbusFunction, body: bytes) -> bytes:
+        """Send one request and return the data of its response."""
+        if self._socket is None:
+            raise OSError("Cannot send: socket is not connected")
+        transaction = next(self._transactions) & 0xFFFF
+        pdu = bytes((function,)) + body
+        self._socket.sendall(
+            _MBAP.pack(transaction, 0, len(pdu) + 1, self._unit_id) + pdu
+        )
+        self._bytes_read = 0
+        answered, protocol, length, _ = _MBAP.unpack(self._read_exact(_MBAP.size))
+        if answered != transaction or protocol != 0 or length < 3:
+            # Not the answer to this request: the stream is out of step, and
+            # only a new connection brings it back in line.
+            raise OSError(
+                f"Unexpected Modbus response header ({answered}, {protocol}, "
+                f"{length}) to transaction {transaction}"
+            )
+        response = self._read_exact(length - 1)
+        self._poll_bytes += self._bytes_read
+        if response[0] == function | MODBUS_EXCEPTION_FLAG:
+            raise ModbusExceptionError(function, response[1])
+        if response[0] != function:
+            raise OSError(f"Modbus response to function {response[0]}, not {function}")
+        return response[1:]
+
+    def _read_registers(
+        self, function: ModbusFunction, start: int, count: int
+    ) -> bytes:
+        data = self._request(function, struct.pack(">HH", start, count))
+        if data[0] != 2 * count or len(data) != 1 + 2 * count:
+            raise OSError(
+                f"Modbus read of {count} registers at {start} returned {data[0]} bytes"
+            )
+        return data[1:]
+
+    def _write_registers(self, address: int, payload: bytes) -> None:
+        count = len(payload) // 2
+        echo = self._request(
+            ModbusFunction.WRITE_MULTIPLE_REGISTERS,
+            struct.pack(">HHB", address, count, len(payload)) + payload,
+        )
+        if struct.unpack(">HH", echo[:4]) != (address, count):
+            raise OSError(f"Modbus write to {address} acknowledged as {echo.hex()}")
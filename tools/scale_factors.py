@@ -0,0 +1,378 @@
+"""Offline regression of raw registers against a known quantity.
+
+The scale factors in `lux_overrides.parameters_to_add_update` - `Energy2`'s
+/100 on the energy-input parameters against `Energy`'s /10, and
+`AUX_HEATER_ENERGY_FACTOR_BY_SERIES` - were found by regressing candidate
+registers on a quantity whose scale was already known, across snapshots,
+and throwing out the factors that made the physics impossible: at /10 the
+energy inputs gave a marginal COP of 0.64 against the heat-quantity
+calculations (#734), which no compressor can deliver.
+
+This tool does that in one pass. Snapshots come from session logs (every
+poll is one) and diagnostics downloads (one each, turned back into raw
+values by the emulator's `blocks_from_dump`); each block becomes one NumPy
+matrix, a row per snapshot and a column per index, so every candidate
+register is fitted at once:
+
+- The target - a register with a known factor, such as calculation 151 in
+  0.1 kWh - is regressed on every candidate column by least squares. Values
+  are centred per source (heat pump) first, so snapshots of several units
+  fit one slope instead of the offsets between their lifetime totals.
+- Candidates are ranked by the absolute correlation coefficient.
+- For each factor of `SCALE_FACTORS`, the slope gives the implied ratio of
+  the target to the scaled candidate - the marginal COP for heat over
+  electrical energy. Factors whose ratio falls outside the plausible range
+  are rejected; with `counters`, so are those whose ratio of the lifetime
+  totals is. The surviving factor closest to the middle of the range (on a
+  log scale) is proposed; a candidate with none left is flagged impossible.
+
+Run it over any mix of files::
+
+    python -m tools.scale_factors --target "calculations 151" \\
+        --target-factor 0.1 --candidates "parameters 1130-1145" \\
+        --ratio 1 8 --counters session.lxs dumps/*.json
+
+NumPy comes with Home Assistant, so it is available wherever the test suite
+runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+import json
+import logging
+import math
+from pathlib import Path
+import sys
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from custom_components.luxtronik2.lux_overrides import update_Luxtronik_Parameters
+from custom_components.luxtronik2.register_changes import (
+    GROUPS,
+    IndexRanges,
+    parse_index_ranges,
+)
+from custom_components.luxtronik2.session_log import (
+    COMMAND_BLOCKS,
+    SESSION_LOG_MAGIC,
+    read_session_log,
+)
+from tools.luxtronik_emulator import blocks_from_dump
+
+LOGGER = logging.getLogger(__name__)
+
+# Factors a controller register is scaled by, raw count -> unit.
+SCALE_FACTORS: tuple[float, ...] = (1.0, 0.1, 0.01, 0.001)
+
+# Fewer snapshots than this fit any two registers perfectly.
+MIN_SNAPSHOTS = 3
+
+
+@dataclass
+class Snapshots:
+    """Raw blocks of many polls: one row per snapshot, one column per index."""
+
+    timestamps: npt.NDArray[np.float64]
+    sources: npt.NDArray[np.int64]
+    source_names: list[str]
+    blocks: dict[str, npt.NDArray[np.int64]]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+@dataclass(frozen=True)
+class CandidateFit:
+    """How well one raw register explains the target, and at which scale."""
+
+    group: str
+    index: int
+    slope: float
+    r: float
+    lifetime_ratio: float | None
+    ratios: dict[float, float]
+    factor: float | None
+
+    @property
+    def impossible(self) -> bool:
+        """No factor gives a physically plausible ratio."""
+        return self.factor is None
+
+
+def _session_polls(path: Path) -> Iterator[tuple[float, dict[str, list[int]]]]:
+    """Yield (time, blocks) per poll of a session log.
+
+    A poll is complete with its visibilities block, the last one read; writes
+    and blocks of an interrupted poll are skipped.
+    """
+    blocks: dict[str, list[int]] = {}
+    started: float | None = None
+    for exchange in read_session_log(path):
+        label = COMMAND_BLOCKS.get(exchange.command)
+        if label is None:
+            continue
+        if started is None:
+            started = exchange.timestamp
+        blocks[label] = exchange.values
+        if len(blocks) == len(GROUPS):
+            yield started, blocks
+            blocks, started = {}, None
+        elif label == GROUPS[-1]:
+            blocks, started = {}, None
+
+
+def _read_file(path: Path) -> Iterator[tuple[str, float, dict[str, list[int]]]]:
+    """Yield (source, time, blocks) for each snapshot in a log or download."""
+    with path.open("rb") as file:
+        is_session_log = file.read(len(SESSION_LOG_MAGIC)) == SESSION_LOG_MAGIC
+    if is_session_log:
+        for timestamp, blocks in _session_polls(path):
+            yield path.name, timestamp, blocks
+        return
+    dump = json.loads(path.read_text(encoding="utf-8"))
+    payload = dump.get("data", dump)
+    source = payload.get("heatpump_id") or path.name
+    yield source, path.stat().st_mtime, blocks_from_dump(dump)
+
+
+def load_snapshots(paths: Iterable[Path]) -> Snapshots:
+    """Read session logs and diagnostics downloads into one set of snapshots.
+
+    Blocks shorter than the longest one seen are padded with zeros. Files
+    that are neither are skipped with a warning.
+    """
+    rows: list[tuple[int, float, dict[str, list[int]]]] = []
+    source_names: list[str] = []
+    for path in paths:
+        try:
+            for source, timestamp, blocks in _read_file(path):
+                if source not in source_names:
+                    source_names.append(source)
+                rows.append((source_names.index(source), timestamp, blocks))
+        except (OSError, ValueError, AttributeError) as err:
+            LOGGER.warning("Skipping %s: %s", path, err)
+    matrices: dict[str, npt.NDArray[np.int64]] = {}
+    for group in GROUPS:
+        width = max((len(blocks[group]) for _, _, blocks in rows), default=0)
+        matrix = np.zeros((len(rows), width), dtype=np.int64)
+        for row, (_, _, blocks) in enumerate(rows):
+            values = blocks[group]
+            matrix[row, : len(values)] = values
+        matrices[group] = matrix
+    return Snapshots(
+        timestamps=np.array([timestamp for _, timestamp, _ in rows], dtype=float),
+        sources=np.array([source for source, _, _ in rows], dtype=np.int64),
+        source_names=source_names,
+        blocks=matrices,
+    )
+
+
+def _centred(
+    values: npt.NDArray[np.float64], sources: npt.NDArray[np.int64]
+) -> npt.NDArray[np.float64]:
+    """Subtract each source's mean from its rows, column by column."""
+    count = np.bincount(sources).astype(float)
+    if values.ndim == 1:
+        return values - (np.bincount(sources, weights=values) / count)[sources]
+    # A one-hot product sums the rows per source far faster than np.add.at.
+    onehot = sources[None, :] == np.arange(len(count))[:, None]
+    sums = onehot.astype(float) @ values
+    return values - (sums / count[:, None])[sources]
+
+
+def _pick_factor(
+    ratios: Mapping[float, float],
+    lifetime_ratio: float | None,
+    ratio_range: tuple[float, float],
+) -> float | None:
+    low, high = ratio_range
+    middle = math.sqrt(low * high)
+    plausible = [
+        factor
+        for factor, ratio in ratios.items()
+        if low <= ratio <= high
+        and (lifetime_ratio is None or low <= lifetime_ratio / factor <= high)
+    ]
+    if not plausible:
+        return None
+    return min(plausible, key=lambda factor: abs(math.log(ratios[factor] / middle)))
+
+
+def fit_candidates(
+    snapshots: Snapshots,
+    target: tuple[str, int],
+    candidates: IndexRanges,
+    *,
+    target_factor: float = 1.0,
+    ratio_range: tuple[float, float] = (0.5, 2.0),
+    counters: bool = False,
+    factors: Sequence[float] = SCALE_FACTORS,
+) -> list[CandidateFit]:
+    """Fit the target on every candidate register, best correlated first.
+
+    Candidates that never change within a source, and the target itself,
+    are left out. `counters` also requires the ratio of the lifetime totals
+    (the median over the snapshots of target over candidate) to be
+    plausible, which only makes sense for counters that started together.
+    """
+    if len(snapshots) < MIN_SNAPSHOTS:
+        raise ValueError(
+            f"{len(snapshots)} snapshots, at least {MIN_SNAPSHOTS} are needed"
+        )
+    target_group, target_index = target
+    y_raw = snapshots.blocks[target_group][:, target_index] * target_factor
+    y = _centred(y_raw.astype(float), snapshots.sources)
+    syy = float(y @ y)
+    if syy == 0:
+        raise ValueError(f"{target_group} {target_index} never changes")
+    fits: list[CandidateFit] = []
+    for group, spans in candidates.items():
+        block = snapshots.blocks[group]
+        columns = np.unique(
+            np.concatenate(
+                [
+                    np.arange(first, min(last, block.shape[1] - 1) + 1)
+                    for first, last in spans
+                ]
+            )
+        ).astype(np.int64)
+        if group == target_group:
+            columns = columns[columns != target_index]
+        if not len(columns):
+            continue
+        raw = block[:, columns].astype(float)
+        x = _centred(raw, snapshots.sources)
+        sxx = np.einsum("ij,ij->j", x, x)
+        varying = sxx > 0
+        columns, raw, x, sxx = (
+            columns[varying],
+            raw[:, varying],
+            x[:, varying],
+            sxx[varying],
+        )
+        sxy = x.T @ y
+        slopes = sxy / sxx
+        rs = sxy / np.sqrt(sxx * syy)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lifetime = np.nanmedian(
+                np.where(raw != 0, y_raw[:, None] / raw, np.nan), axis=0
+            )
+        for column, slope, r, level in zip(columns, slopes, rs, lifetime, strict=True):
+            lifetime_ratio = float(level) if counters and np.isfinite(level) else None
+            ratios = {factor: float(slope) / factor for factor in factors}
+            fits.append(
+                CandidateFit(
+                    group=group,
+                    index=int(column),
+                    slope=float(slope),
+                    r=float(r),
+                    lifetime_ratio=lifetime_ratio,
+                    ratios=ratios,
+                    factor=_pick_factor(ratios, lifetime_ratio, ratio_range),
+                )
+            )
+    fits.sort(key=lambda fit: abs(fit.r), reverse=True)
+    return fits
+
+
+def _parse_target(text: str) -> tuple[str, int]:
+    ranges = parse_index_ranges(text)
+    spans = [span for group_spans in ranges.values() for span in group_spans]
+    if len(spans) != 1 or spans[0][0] != spans[0][1]:
+        raise argparse.ArgumentTypeError(f"Not a single register: {text!r}")
+    return next(iter(ranges)), spans[0][0]
+
+
+def _parse_ranges(text: str) -> IndexRanges:
+    try:
+        return parse_index_ranges(text)
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(str(err)) from None
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", type=Path, help="session logs and dumps")
+    parser.add_argument(
+        "--target", required=True, type=_parse_target, help='e.g. "calculations 151"'
+    )
+    parser.add_argument(
+        "--target-factor", type=float, default=1.0, help="known scale of the target"
+    )
+    parser.add_argument(
+        "--candidates",
+        type=_parse_ranges,
+        default={group: ((0, 2**16),) for group in GROUPS[:2]},
+        help='index ranges to fit, e.g. "parameters 1130-1145" (default: all)',
+    )
+    parser.add_argument(
+        "--ratio",
+        nargs=2,
+        type=float,
+        default=(0.5, 2.0),
+        metavar=("MIN", "MAX"),
+        help="plausible target/candidate ratio, e.g. 1 8 for a COP",
+    )
+    parser.add_argument(
+        "--counters", action="store_true", help="also check the lifetime totals"
+    )
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    return parser.parse_args(argv)
+
+
+def _as_row(fit: CandidateFit) -> dict[str, Any]:
+    return {
+        "register": f"{fit.group} {fit.index}",
+        "r": round(fit.r, 4),
+        "slope": fit.slope,
+        "lifetime_ratio": fit.lifetime_ratio,
+        "ratios": {
+            str(factor): round(ratio, 3) for factor, ratio in fit.ratios.items()
+        },
+        "factor": fit.factor,
+        "impossible": fit.impossible,
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Print the best-correlated candidates and their plausible factors."""
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    # Dumps hold values decoded with the integration's overrides; undo them
+    # with the same datatypes.
+    update_Luxtronik_Parameters()
+    snapshots = load_snapshots(args.files)
+    LOGGER.info(
+        "%s snapshots from %s sources", len(snapshots), len(snapshots.source_names)
+    )
+    try:
+        fits = fit_candidates(
+            snapshots,
+            args.target,
+            args.candidates,
+            target_factor=args.target_factor,
+            ratio_range=(args.ratio[0], args.ratio[1]),
+            counters=args.counters,
+        )
+    except ValueError as err:
+        sys.exit(str(err))
+    rows = [_as_row(fit) for fit in fits[: args.top]]
+    if args.json:
+        sys.stdout.write(json.dumps(rows, indent=2) + "\n")
+        return
+    for row in rows:
+        ratios = "  ".join(f"/{1 / float(f):g}: {r}" for f, r in row["ratios"].items())
+        verdict = "impossible" if row["impossible"] else f"factor {row['factor']:g}"
+        sys.stdout.write(
+            f"{row['register']:<20} r={row['r']:+.4f}  {ratios}  -> {verdict}\n"
+        )
+
+
+if __name__ == "__main__":
+    main()